@@ -14,14 +14,20 @@ from .cli_request import app as request_app
 from .cli_session import app as session_app
 from .cli_tool import app as tool_app
 from .cli_view import app as view_app
+from .client import COMPRESSION_CHOICES
 from .config import (
     Config,
+    env_default_compression,
     env_default_host,
+    env_default_placement,
+    env_default_pool,
     env_default_port,
+    env_default_priority,
     env_default_session,
     env_default_timeout,
 )
 from .endpoint import parse_endpoint
+from .routing import normalize_policy
 
 
 app = make_app(name="bnk", help="bnk: binaryninja knife")
@@ -32,6 +38,9 @@ app.add_typer(py_app, name="py")
 app.add_typer(tool_app, name="tool")
 app.add_typer(edit_app, name="edit")
 
+# command groups whose commands go through serverlib tool calls
+_TOOL_GROUPS = ("tool", "edit")
+
 
 @app.callback()
 def main_cb(
@@ -59,6 +68,9 @@ def main_cb(
     json_output: bool = typer.Option(
         False, "-j", "--json", help="json"
     ),
+    ndjson: bool = typer.Option(
+        False, "--ndjson", help="one json record per line, streamed"
+    ),
     pretty: bool = typer.Option(False, "--pretty", "-P", help="pretty json"),
     tool_root: Optional[Path] = typer.Option(
         None,
@@ -67,22 +79,107 @@ def main_cb(
         envvar="BNK_TOOL_ROOT",
         help="serverlib root",
     ),
+    priority: str = typer.Option(
+        env_default_priority(),
+        "--priority",
+        help="interactive|batch",
+    ),
+    pool: Optional[str] = typer.Option(
+        env_default_pool(),
+        "--pool",
+        help="server pool: json file or HOST:PORT,... (ignored with --connect)",
+    ),
+    placement: Optional[str] = typer.Option(
+        env_default_placement(),
+        "--placement",
+        help="new-session placement: least-loaded|least-memory|sticky",
+    ),
+    compress: str = typer.Option(
+        env_default_compression(),
+        "--compress",
+        help="compress large payloads: zlib|lzma|off",
+    ),
+    fields: Optional[str] = typer.Option(
+        None,
+        "--fields",
+        help="tool output fields to keep, comma-separated",
+    ),
+    where: Optional[str] = typer.Option(
+        None, "--where", help="filter tool records, e.g. \"size > 0x100\""
+    ),
+    sort: Optional[str] = typer.Option(
+        None, "--sort", help="sort tool records by fields, -field for descending"
+    ),
+    top: Optional[int] = typer.Option(
+        None, "--top", help="keep only the first N tool records (after --sort)"
+    ),
+    group_by: Optional[str] = typer.Option(
+        None, "--group-by", help="count tool records per field value(s)"
+    ),
+    sum_fields: Optional[str] = typer.Option(
+        None, "--sum", help="with --group-by: also total these fields"
+    ),
 ) -> None:
     if connect:
         try:
             host, port = parse_endpoint(connect)
         except ValueError as exc:
             raise typer.BadParameter(str(exc)) from exc
+        # an explicit endpoint bypasses routing
+        pool = None
+    if placement:
+        try:
+            placement = normalize_policy(placement)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc)) from exc
+    compress = compress.strip().lower()
+    if compress not in COMPRESSION_CHOICES:
+        raise typer.BadParameter(
+            f"--compress must be one of: {', '.join(COMPRESSION_CHOICES)}"
+        )
+    if top is not None and top < 0:
+        raise typer.BadParameter("--top must be >= 0")
+    if sum_fields and not group_by:
+        raise typer.BadParameter("--sum needs --group-by")
+    query = {
+        key: value
+        for key, value in (
+            ("where", where),
+            ("sort", sort),
+            ("limit", top),
+            ("group_by", group_by),
+            ("sum", sum_fields),
+        )
+        if value is not None
+    }
+    if (fields or query) and ctx.invoked_subcommand not in _TOOL_GROUPS:
+        # only serverlib tool calls trim and query their records
+        raise typer.BadParameter(
+            "--fields/--where/--sort/--top/--group-by/--sum only apply to "
+            "tool and edit commands"
+        )
+    if json_output and ndjson:
+        raise typer.BadParameter("--json and --ndjson are mutually exclusive")
+    priority = priority.strip().lower()
+    if priority not in {"interactive", "batch"}:
+        raise typer.BadParameter("--priority must be interactive or batch")
     ctx.obj = Config(
         host=host,
         port=port,
         timeout=timeout,
         session=session,
         json_output=json_output,
+        ndjson=ndjson,
         pretty=pretty,
         tool_root=(
             str(tool_root.expanduser().resolve()) if tool_root is not None else None
         ),
+        priority=priority,
+        pool=pool,
+        placement=placement,
+        compression=compress,
+        fields=(fields or "").strip() or None,
+        query=query or None,
     )
 
 
@@ -90,7 +187,7 @@ def main_cb(
 def ping(ctx: typer.Context) -> None:
     cfg = cfg_from_ctx(ctx)
     out = with_client(cfg, lambda c: {"core_version": c.core_version()})
-    print_value(cfg, out if cfg.json_output else out["core_version"])
+    print_value(cfg, out if cfg.json_output or cfg.ndjson else out["core_version"])
 
 
 def main() -> None:
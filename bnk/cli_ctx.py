@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import json
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Callable, Dict, TypeVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
 
 import typer
 
 from .client import ConnectConfig, KnifeClient
 from .config import Config
-from .output import dump_json, format_text
-from .serverlib import ServerlibCall, make_tool_call_code, make_tool_list_code
+from .output import dump_json, write_ndjson, write_text
+from .routing import PlacementCache, Router, ServerPool, default_placement_path
 from .tool_root import find_tool_root
 
 
@@ -30,10 +31,63 @@ def require_session(cfg: Config) -> str:
     return cfg.session
 
 
+def router(cfg: Config) -> Router:
+    try:
+        pool = ServerPool.parse(cfg.pool or "")
+    except (OSError, ValueError, KeyError) as exc:
+        raise BnkError(f"invalid server pool {cfg.pool!r}: {exc}") from exc
+    if cfg.placement:
+        pool = replace(pool, policy=cfg.placement)
+    return Router(pool, PlacementCache(default_placement_path()))
+
+
+def routed(cfg: Config, *, binary_path: str = "") -> Config:
+    """``cfg`` pointed at the pool server holding (or chosen for) its session."""
+    if not cfg.pool:
+        return cfg
+    r = router(cfg)
+    if cfg.session:
+        try:
+            server = r.resolve(cfg.session, binary_path=binary_path)
+        except RuntimeError as exc:
+            raise BnkError(str(exc)) from exc
+    else:
+        # commands without a session talk to the first pool server
+        server = r.pool.servers[0]
+    return replace(cfg, host=server.host, port=server.port, pool=None)
+
+
+def pool_session_list(cfg: Config) -> list[Dict[str, Any]]:
+    """Sessions across every reachable pool server, tagged with the server."""
+    out: list[Dict[str, Any]] = []
+    for server in router(cfg).pool.servers:
+        try:
+            with KnifeClient(
+                ConnectConfig(
+                    host=server.host,
+                    port=server.port,
+                    timeout=cfg.timeout,
+                    compression=cfg.compression,
+                )
+            ) as c:
+                sessions = c.session_list()
+        except (EOFError, OSError) as exc:
+            typer.echo(f"warning: {server.name} unreachable: {exc}", err=True)
+            continue
+        out.extend(dict(item, server=server.name) for item in sessions)
+    return out
+
+
 def connect(cfg: Config) -> KnifeClient:
+    cfg = routed(cfg)
     try:
         return KnifeClient(
-            ConnectConfig(host=cfg.host, port=cfg.port, timeout=cfg.timeout)
+            ConnectConfig(
+                host=cfg.host,
+                port=cfg.port,
+                timeout=cfg.timeout,
+                compression=cfg.compression,
+            )
         )
     except (EOFError, OSError) as exc:
         raise BnkError(f"could not connect to {cfg.host}:{cfg.port}: {exc}") from exc
@@ -41,10 +95,16 @@ def connect(cfg: Config) -> KnifeClient:
 
 T = TypeVar("T")
 
+PROFILE_SORTS = ("cumulative", "tottime", "calls")
+
+# rows per server round trip when a result is streamed back
+STREAM_PAGE_ROWS = 5000
+
 
 def _attempt_server_interrupt(cfg: Config) -> Dict[str, Any]:
     short_timeout = 2.0
     try:
+        cfg = routed(cfg)
         with KnifeClient(
             ConnectConfig(host=cfg.host, port=cfg.port, timeout=short_timeout)
         ) as c:
@@ -54,35 +114,46 @@ def _attempt_server_interrupt(cfg: Config) -> Dict[str, Any]:
     return out
 
 
-def with_client(cfg: Config, fn: Callable[[KnifeClient], T]) -> T:
-    with connect(cfg) as c:
-        try:
-            return fn(c)
-        except TimeoutError as exc:
-            msg = f"request timed out after {cfg.timeout:g}s"
-            interrupt = _attempt_server_interrupt(cfg)
-            if interrupt.get("interrupted"):
-                name = interrupt.get("name")
-                elapsed = interrupt.get("elapsed_s")
-                details = f"interrupt sent to active request"
-                if name:
-                    details += f" ({name})"
-                if isinstance(elapsed, (int, float)):
-                    details += f" at {elapsed:.2f}s"
-                msg = f"{msg}; {details}"
+def _client_error(cfg: Config, exc: Exception) -> BnkError:
+    if isinstance(exc, BnkError):
+        return exc
+    if isinstance(exc, TimeoutError):
+        msg = f"request timed out after {cfg.timeout:g}s"
+        interrupt = _attempt_server_interrupt(cfg)
+        if interrupt.get("interrupted"):
+            name = interrupt.get("name")
+            elapsed = interrupt.get("elapsed_s")
+            details = f"interrupt sent to active request"
+            if name:
+                details += f" ({name})"
+            if isinstance(elapsed, (int, float)):
+                details += f" at {elapsed:.2f}s"
+            msg = f"{msg}; {details}"
+        else:
+            err = interrupt.get("error")
+            if err:
+                msg = f"{msg}; interrupt attempt failed: {err}"
             else:
-                err = interrupt.get("error")
-                if err:
-                    msg = f"{msg}; interrupt attempt failed: {err}"
-                else:
-                    msg = f"{msg}; no active request to interrupt"
-            raise BnkError(msg) from exc
-        except BnkError:
+                msg = f"{msg}; no active request to interrupt"
+        return BnkError(msg)
+    message = str(exc).strip() or exc.__class__.__name__
+    message = message.split("========= Remote Traceback", 1)[0].rstrip()
+    return BnkError(message)
+
+
+def _call_client(cfg: Config, c: KnifeClient, fn: Callable[[KnifeClient], T]) -> T:
+    try:
+        return fn(c)
+    except Exception as exc:
+        err = _client_error(cfg, exc)
+        if err is exc:
             raise
-        except Exception as exc:
-            message = str(exc).strip() or exc.__class__.__name__
-            message = message.split("========= Remote Traceback", 1)[0].rstrip()
-            raise BnkError(message) from exc
+        raise err from exc
+
+
+def with_client(cfg: Config, fn: Callable[[KnifeClient], T]) -> T:
+    with connect(cfg) as c:
+        return _call_client(cfg, c, fn)
 
 
 def with_session(cfg: Config, fn: Callable[[KnifeClient], T]) -> T:
@@ -94,11 +165,79 @@ def with_session(cfg: Config, fn: Callable[[KnifeClient], T]) -> T:
     return with_client(cfg, wrapped)
 
 
+def session_exec(
+    cfg: Config,
+    fn: Callable[[KnifeClient, Optional[int]], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Run an exec request, streaming a large result back page by page.
+
+    ``fn`` gets the client and the page size to request. When the server
+    keeps the rest of the result behind a cursor, ``result`` becomes a lazy
+    iterator that holds the connection open until the last page is read.
+    """
+    session = require_session(cfg)
+    # --json prints a single document, so it still needs the whole result
+    page_rows = None if cfg.json_output and not cfg.ndjson else STREAM_PAGE_ROWS
+    c = connect(cfg)
+    try:
+        out = _call_client(cfg, c, lambda c: fn(c, page_rows))
+    except BaseException:
+        c.close()
+        raise
+    if not out.get("cursor"):
+        c.close()
+        return out
+    out = dict(out)
+    out["result"] = _paged_rows(cfg, c, session, out, page_rows or STREAM_PAGE_ROWS)
+    return out
+
+
+def _paged_rows(
+    cfg: Config,
+    c: KnifeClient,
+    session: str,
+    payload: Dict[str, Any],
+    page_rows: int,
+) -> Iterator[Any]:
+    rows = c.iter_result(session, payload, page_rows=page_rows)
+    try:
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            except Exception as exc:
+                raise _client_error(cfg, exc) from exc
+            yield row
+    finally:
+        rows.close()
+        c.close()
+
+
+def _ndjson_value(value: Any) -> Any:
+    # stdout stays pure records; captured output and failures go to stderr
+    if not (isinstance(value, dict) and {"ok", "stdout", "stderr"} <= value.keys()):
+        return value
+    err = typer.get_text_stream("stderr")
+    for key in ("stdout", "stderr"):
+        text = str(value.get(key) or "")
+        if text:
+            err.write(text if text.endswith("\n") else text + "\n")
+    if isinstance(value.get("profile"), dict):
+        err.write(dump_json({"profile": value["profile"]}, pretty=False) + "\n")
+    if not value.get("ok", False):
+        raise BnkError(str(value.get("error") or "request failed").rstrip())
+    return value.get("result", [])
+
+
 def print_value(cfg: Config, value: Any) -> None:
+    if cfg.ndjson:
+        write_ndjson(_ndjson_value(value), typer.get_text_stream("stdout"))
+        return
     if cfg.json_output:
         typer.echo(dump_json(value, pretty=cfg.pretty))
         return
-    typer.echo(format_text(value))
+    write_text(value, typer.get_text_stream("stdout"))
 
 
 def tool_root(cfg: Config) -> Path:
@@ -123,24 +262,85 @@ def tool_root(cfg: Config) -> Path:
     )
 
 
-def _run_in_session(cfg: Config, code: str) -> Any:
-    session = require_session(cfg)
-    return with_session(
-        cfg, lambda c: c.run_code(session, code, capture_output=True)
-    )
+# shared by every command that takes --profile, so defaults and help agree
+PROFILE_OPTION = typer.Option(
+    False, "--profile", help="profile on the server and report hot functions"
+)
+PROFILE_TOP_OPTION = typer.Option(
+    25, "--profile-top", help="number of profile rows to return"
+)
+PROFILE_SORT_OPTION = typer.Option(
+    PROFILE_SORTS[0],
+    "--profile-sort",
+    help=f"{', '.join(PROFILE_SORTS[:-1])} or {PROFILE_SORTS[-1]}",
+)
+PROFILE_DUMP_OPTION = typer.Option(
+    None, "--profile-dump", help="also write full pstats data to this server path"
+)
+
+
+def profile_options(
+    enabled: bool, *, top: int, sort: str, dump: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    if not enabled:
+        if dump:
+            raise typer.BadParameter("--profile-dump requires --profile")
+        return None
+    if top < 1:
+        raise typer.BadParameter("--profile-top must be >= 1")
+    sort = sort.strip().lower()
+    if sort not in PROFILE_SORTS:
+        raise typer.BadParameter(
+            f"--profile-sort must be one of: {', '.join(PROFILE_SORTS)}"
+        )
+    out: Dict[str, Any] = {"top": top, "sort": sort}
+    if dump:
+        # written on the server host, not locally
+        out["dump"] = dump
+    return out
 
 
 def serverlib_list(cfg: Config) -> Any:
+    if cfg.fields or cfg.query:
+        raise BnkError(
+            "--fields and the query options apply to tool calls, not tool list"
+        )
     root = tool_root(cfg)
-    code = make_tool_list_code(root)
-    return _run_in_session(cfg, code)
+    session = require_session(cfg)
+    return session_exec(
+        cfg,
+        lambda c, page_rows: c.tool_list(
+            session, tool_root=root, priority=cfg.priority, label="tool.list"
+        ),
+    )
 
 
-def serverlib_call(cfg: Config, tool: str, params: Dict[str, Any]) -> Any:
+def serverlib_call(
+    cfg: Config,
+    tool: str,
+    params: Dict[str, Any],
+    *,
+    profile: Optional[Dict[str, Any]] = None,
+) -> Any:
     root = tool_root(cfg)
-    call = ServerlibCall(tool=tool, params=params)
-    code = make_tool_call_code(root, call)
-    return _run_in_session(cfg, code)
+    session = require_session(cfg)
+    if cfg.fields and "fields" not in params:
+        params = dict(params, fields=cfg.fields)
+    if cfg.query and "query" not in params:
+        params = dict(params, query=cfg.query)
+    return session_exec(
+        cfg,
+        lambda c, page_rows: c.tool_call(
+            session,
+            tool,
+            params,
+            tool_root=root,
+            priority=cfg.priority,
+            label=f"tool:{tool}",
+            profile=profile,
+            page_rows=page_rows,
+        ),
+    )
 
 
 def parse_kv_args(items: list[str]) -> Dict[str, Any]:
@@ -294,6 +294,48 @@ def tag_func_remove_type(
     )
 
 
+@app.command("import")
+def edit_import(
+    ctx: typer.Context,
+    path: str = typer.Argument(..., help="csv/tsv/json/jsonl mapping file"),
+    local_path: bool = typer.Option(
+        True,
+        "--local/--remote",
+        "-L/-R",
+        help="client vs server path",
+        show_default=False,
+    ),
+    fmt: str = typer.Option(
+        "auto", "--format", "-f", help="auto|csv|tsv|json|jsonl"
+    ),
+    kind: str = typer.Option("auto", "--kind", "-k", help="auto|function|data"),
+    create_functions: bool = typer.Option(
+        False, "--create-functions", "-c", help="create missing functions"
+    ),
+    analysis: str = typer.Option("none", "--analysis", "-A", help="none|update|wait"),
+    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="resolve only"),
+    conflict_limit: int = typer.Option(100, "--conflict-limit", "-l"),
+) -> None:
+    if local_path:
+        p = Path(path).expanduser().resolve()
+        if not p.exists():
+            raise typer.BadParameter(f"path does not exist: {p}")
+        path = str(p)
+    _edit(
+        ctx,
+        "edit.import",
+        {
+            "path": path,
+            "format": fmt,
+            "kind": kind,
+            "create_functions": create_functions,
+            "analysis": analysis,
+            "dry_run": dry_run,
+            "conflict_limit": conflict_limit,
+        },
+    )
+
+
 @db_app.command("status")
 def db_status(ctx: typer.Context) -> None:
     _edit(ctx, "edit.db.status", {})
@@ -2,11 +2,22 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 import typer
 
 from .cli_app import CONTEXT_SETTINGS, make_app
-from .cli_ctx import cfg_from_ctx, print_value, require_session, with_session
+from .cli_ctx import (
+    PROFILE_DUMP_OPTION,
+    PROFILE_OPTION,
+    PROFILE_SORT_OPTION,
+    PROFILE_TOP_OPTION,
+    cfg_from_ctx,
+    print_value,
+    profile_options,
+    require_session,
+    session_exec,
+)
 
 
 app = make_app()
@@ -22,12 +33,23 @@ def _run_session_code(
     code: str,
     *,
     argv: list[str],
+    label: str,
+    profile: Optional[Dict[str, Any]] = None,
 ) -> None:
     cfg = cfg_from_ctx(ctx)
     session = require_session(cfg)
-    out = with_session(
+    out = session_exec(
         cfg,
-        lambda c: c.run_code(session, code, argv=argv, capture_output=True),
+        lambda c, page_rows: c.run_code(
+            session,
+            code,
+            argv=argv,
+            capture_output=True,
+            priority=cfg.priority,
+            label=label,
+            profile=profile,
+            page_rows=page_rows,
+        ),
     )
     print_value(cfg, out)
 
@@ -44,10 +66,19 @@ def py_exec(
     argv: list[str] = typer.Option(
         [], "--argv", "-a", help="sys.argv[1:]"
     ),
+    profile: bool = PROFILE_OPTION,
+    profile_top: int = PROFILE_TOP_OPTION,
+    profile_sort: str = PROFILE_SORT_OPTION,
+    profile_dump: Optional[str] = PROFILE_DUMP_OPTION,
 ) -> None:
+    profile_opts = profile_options(
+        profile, top=profile_top, sort=profile_sort, dump=profile_dump
+    )
     if code == "-":
         code = sys.stdin.read()
-    _run_session_code(ctx, code, argv=list(argv))
+    _run_session_code(
+        ctx, code, argv=list(argv), label="py.exec", profile=profile_opts
+    )
 
 
 @app.command("eval")
@@ -59,7 +90,7 @@ def py_eval(
     ),
 ) -> None:
     code = f"__result__ = ({expr})"
-    _run_session_code(ctx, code, argv=list(argv))
+    _run_session_code(ctx, code, argv=list(argv), label="py.eval")
 
 
 @app.command("run", context_settings=RUN_CONTEXT_SETTINGS)
@@ -72,19 +103,30 @@ def py_run(
         "-a",
         help="sys.argv[1:]",
     ),
+    profile: bool = PROFILE_OPTION,
+    profile_top: int = PROFILE_TOP_OPTION,
+    profile_sort: str = PROFILE_SORT_OPTION,
+    profile_dump: Optional[str] = PROFILE_DUMP_OPTION,
 ) -> None:
     cfg = cfg_from_ctx(ctx)
     session = require_session(cfg)
+    profile_opts = profile_options(
+        profile, top=profile_top, sort=profile_sort, dump=profile_dump
+    )
     path = path.expanduser().resolve()
     script_argv = _script_argv(ctx, list(argv))
 
-    out = with_session(
+    out = session_exec(
         cfg,
-        lambda c: c.run_file(
+        lambda c, page_rows: c.run_file(
             session,
             str(path),
             argv=script_argv,
             capture_output=True,
+            priority=cfg.priority,
+            label="py.run",
+            profile=profile_opts,
+            page_rows=page_rows,
         ),
     )
     print_value(cfg, out)
@@ -21,3 +21,15 @@ def request_interrupt(ctx: typer.Context) -> None:
     cfg = cfg_from_ctx(ctx)
     out = with_client(cfg, lambda c: c.request_interrupt(cfg.session))
     print_value(cfg, out)
+
+
+@app.command("stats")
+def request_stats(
+    ctx: typer.Context,
+    reset: bool = typer.Option(
+        False, "--reset", "-r", help="clear the histograms after reading them"
+    ),
+) -> None:
+    cfg = cfg_from_ctx(ctx)
+    out = with_client(cfg, lambda c: c.request_stats(reset=reset))
+    print_value(cfg, out)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import time
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -8,21 +10,32 @@ import typer
 
 from .cli_app import make_app
 from .cli_ctx import (
+    BnkError,
     cfg_from_ctx,
+    pool_session_list,
     print_value,
     require_session,
+    routed,
+    router,
     with_client,
     with_session,
 )
+from .client import KnifeClient
 
 
 app = make_app()
 
+# server-side wait slice; kept well below the rpc timeout
+_WAIT_STEP_S = 30.0
+
 
 @app.command("list")
 def session_list(ctx: typer.Context) -> None:
     cfg = cfg_from_ctx(ctx)
-    out = with_client(cfg, lambda c: c.session_list())
+    if cfg.pool:
+        out = pool_session_list(cfg)
+    else:
+        out = with_client(cfg, lambda c: c.session_list())
     print_value(cfg, out)
 
 
@@ -32,6 +45,7 @@ def session_open(
 ) -> None:
     cfg = cfg_from_ctx(ctx)
     sess = name or require_session(cfg)
+    cfg = replace(cfg, session=sess)
     out = with_client(cfg, lambda c: c.session_open(sess))
     print_value(cfg, out)
 
@@ -65,9 +79,19 @@ def session_load(
     options_json: Optional[str] = typer.Option(
         None, "--options-json", "-O", help="load options JSON"
     ),
+    background: bool = typer.Option(
+        False, "--background", "-b", help="return a job id immediately"
+    ),
+    upload: bool = typer.Option(
+        False,
+        "--upload",
+        help="send the local file to the server first (skipped if it already has it)",
+    ),
 ) -> None:
     cfg = cfg_from_ctx(ctx)
     session = require_session(cfg)
+    if upload and not local_path:
+        raise typer.BadParameter("--upload needs a local path")
     if local_path:
         p = Path(path).expanduser().resolve()
         if not p.exists():
@@ -85,15 +109,70 @@ def session_load(
         if not isinstance(options, dict):
             raise typer.BadParameter("--options-json must be a json object")
 
-    out = with_client(
-        cfg,
-        lambda c: c.session_load(
+    def load(c: KnifeClient) -> Dict[str, Any]:
+        target = path_str
+        sent: Optional[Dict[str, Any]] = None
+        if upload:
+            sent = c.upload_file(path_str)
+            target = sent["path"]
+        out = c.session_load(
             session,
-            path_str,
+            target,
             update_analysis=update_analysis,
             options=options,
+            background=background,
+        )
+        if sent is not None:
+            out["upload"] = sent
+        return out
+
+    # sticky placement keys off the binary's content, so route before loading
+    cfg = routed(cfg, binary_path=path_str if local_path else "")
+    out = with_client(cfg, load)
+    print_value(cfg, out)
+
+
+def _wait_for_load(
+    c: KnifeClient, session: str, *, max_wait: float, rpc_timeout: float
+) -> Dict[str, Any]:
+    step = _WAIT_STEP_S
+    if rpc_timeout > 0:
+        step = min(step, max(0.1, rpc_timeout / 2))
+    deadline = None if max_wait <= 0 else time.monotonic() + max_wait
+
+    while True:
+        chunk = step
+        if deadline is not None:
+            chunk = max(0.0, min(step, deadline - time.monotonic()))
+        out = c.session_wait(session, timeout=chunk)
+        if out.get("done"):
+            return out
+        if deadline is not None and time.monotonic() >= deadline:
+            return out
+
+
+@app.command("wait")
+def session_wait(
+    ctx: typer.Context,
+    max_wait: float = typer.Option(
+        0.0, "--max-wait", "-w", help="seconds (0 waits forever)"
+    ),
+) -> None:
+    cfg = cfg_from_ctx(ctx)
+    session = require_session(cfg)
+    out = with_client(
+        cfg,
+        lambda c: _wait_for_load(
+            c, session, max_wait=max_wait, rpc_timeout=cfg.timeout
         ),
     )
+    load = out.get("load") or {}
+    if load.get("state") == "failed":
+        raise BnkError(f"load failed: {load.get('error', '')}")
+    if not out.get("done"):
+        percent = load.get("percent")
+        details = f" ({percent}% analyzed)" if percent is not None else ""
+        raise BnkError(f"load still running after {max_wait:g}s{details}")
     print_value(cfg, out)
 
 
@@ -149,5 +228,8 @@ def session_close(
 ) -> None:
     cfg = cfg_from_ctx(ctx)
     sess = name or require_session(cfg)
+    cfg = replace(cfg, session=sess)
     out = with_client(cfg, lambda c: c.session_close(sess))
+    if cfg.pool:
+        router(cfg).forget(sess)
     print_value(cfg, out)
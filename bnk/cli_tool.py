@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import json
+import sys
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 import typer
 
 from .cli_app import make_app
 from .cli_ctx import (
+    PROFILE_DUMP_OPTION,
+    PROFILE_OPTION,
+    PROFILE_SORT_OPTION,
+    PROFILE_TOP_OPTION,
     cfg_from_ctx,
     parse_kv_args,
     print_value,
+    profile_options,
     serverlib_call,
     serverlib_list,
 )
@@ -52,8 +59,15 @@ def tool_call(
         None, "--params-json", "-J", help="json object"
     ),
     arg: list[str] = typer.Option([], "--arg", "-a", help="KEY=VALUE"),
+    profile: bool = PROFILE_OPTION,
+    profile_top: int = PROFILE_TOP_OPTION,
+    profile_sort: str = PROFILE_SORT_OPTION,
+    profile_dump: Optional[str] = PROFILE_DUMP_OPTION,
 ) -> None:
     cfg = cfg_from_ctx(ctx)
+    profile_opts = profile_options(
+        profile, top=profile_top, sort=profile_sort, dump=profile_dump
+    )
 
     params: Dict[str, Any] = {}
     if params_json:
@@ -67,10 +81,92 @@ def tool_call(
     params.update(parse_kv_args(list(kv)))
     params.update(parse_kv_args(list(arg)))
 
-    out = serverlib_call(cfg, tool, params)
+    out = serverlib_call(cfg, tool, params, profile=profile_opts)
     print_value(cfg, out)
 
 
+@app.command("pipeline")
+def tool_pipeline(
+    ctx: typer.Context,
+    stages: str = typer.Argument(..., help="json list of stages, a file, or '-'"),
+) -> None:
+    text = stages
+    if stages == "-":
+        text = sys.stdin.read()
+    elif Path(stages).expanduser().is_file():
+        text = Path(stages).expanduser().read_text(encoding="utf-8")
+    try:
+        parsed = json.loads(text)
+    except Exception as exc:
+        raise typer.BadParameter(f"invalid pipeline json: {exc}") from exc
+    if not isinstance(parsed, list):
+        raise typer.BadParameter("pipeline must be a json list of stages")
+    _call(ctx, "pipeline.run", {"stages": parsed})
+
+
+@app.command("search")
+def tool_search(
+    ctx: typer.Context,
+    patterns: list[str] = typer.Argument(..., help="patterns, or a file / '-' of them"),
+    kinds: Optional[str] = typer.Option(
+        None, "--kinds", "-k", help="functions,imports,symbols,strings"
+    ),
+    symbol_type: str = typer.Option("data", "--symbol-type", "-t"),
+    case_insensitive: bool = typer.Option(
+        True,
+        "--case-insensitive/--case-sensitive",
+        "-i/-I",
+        show_default=False,
+    ),
+    regex: bool = typer.Option(
+        False, "--regex/--no-regex", "-r/-R", show_default=False
+    ),
+    limit: Optional[int] = typer.Option(
+        None, "--limit", "-l", help="max matches per pattern"
+    ),
+) -> None:
+    items: list[str] = []
+    for item in patterns:
+        if item == "-":
+            items.extend(sys.stdin.read().splitlines())
+        elif Path(item).expanduser().is_file():
+            text = Path(item).expanduser().read_text(encoding="utf-8")
+            items.extend(text.splitlines())
+        else:
+            items.append(item)
+    _call(
+        ctx,
+        "search.many",
+        {
+            "patterns": [item for item in items if item],
+            "kinds": kinds,
+            "symbol_type": symbol_type,
+            "case_insensitive": case_insensitive,
+            "regex": regex,
+            "limit": limit,
+        },
+    )
+
+
+@app.command("addr")
+def tool_addr(
+    ctx: typer.Context,
+    addrs: list[str] = typer.Argument(..., help="addresses, or a file / '-' of them"),
+) -> None:
+    items: list[str] = []
+    for item in addrs:
+        if item == "-":
+            items.extend(sys.stdin.read().split())
+        elif Path(item).expanduser().is_file():
+            items.extend(Path(item).expanduser().read_text(encoding="utf-8").split())
+        else:
+            items.append(item)
+    if len(items) == 1 and items == addrs:
+        _call(ctx, "addr.info", {"addr": items[0]})
+    else:
+        _call(ctx, "addr.info-many", {"addrs": items})
+
+
 @app.command("summary")
 def tool_summary(
     ctx: typer.Context,
@@ -268,6 +364,46 @@ def tool_functions(
         )
 
 
+@app.command("data")
+def tool_data(
+    ctx: typer.Context,
+    pattern: Optional[str] = typer.Argument(None, help="name pattern"),
+    section: Optional[str] = typer.Option(None, "--section", "-S"),
+    type_pattern: Optional[str] = typer.Option(
+        None, "--type", "-t", help="substring of the variable type"
+    ),
+    case_insensitive: bool = typer.Option(
+        True,
+        "--case-insensitive/--case-sensitive",
+        "-i/-I",
+        show_default=False,
+    ),
+    regex: bool = typer.Option(
+        False, "--regex/--no-regex", "-r/-R", show_default=False
+    ),
+    limit: Optional[int] = typer.Option(None, "--limit", "-l"),
+) -> None:
+    if pattern:
+        _call(
+            ctx,
+            "data.like",
+            {
+                "pattern": pattern,
+                "section": section,
+                "type_pattern": type_pattern,
+                "case_insensitive": case_insensitive,
+                "regex": regex,
+                "limit": limit,
+            },
+        )
+    else:
+        _call(
+            ctx,
+            "data.list",
+            {"section": section, "type_pattern": type_pattern, "limit": limit},
+        )
+
+
 @app.command("symbols")
 def tool_symbols(
     ctx: typer.Context,
@@ -282,6 +418,12 @@ def tool_symbols(
     regex: bool = typer.Option(
         False, "--regex/--no-regex", "-r/-R", show_default=False
     ),
+    match: str = typer.Option(
+        "substring",
+        "--match",
+        "-m",
+        help="substring|prefix|glob (prefix and glob use a name index)",
+    ),
     limit: Optional[int] = typer.Option(None, "--limit", "-l"),
 ) -> None:
     _call(
@@ -292,6 +434,7 @@ def tool_symbols(
             "symbol_type": symbol_type,
             "case_insensitive": case_insensitive,
             "regex": regex,
+            "match": match,
             "limit": limit,
         },
     )
@@ -397,3 +540,47 @@ def tool_tags_function(
             "auto": _auto_flag_value(auto=auto, user=user),
         },
     )
+
+
+@tags_app.command("range")
+def tool_tags_range(
+    ctx: typer.Context,
+    start: str = typer.Argument(..., help="first address"),
+    end: str = typer.Argument(..., help="end address (exclusive)"),
+    tag_type: Optional[str] = typer.Option(None, "--type", "-t"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-l"),
+    auto: bool = typer.Option(False, "--auto", "-a", help="auto tags"),
+    user: bool = typer.Option(False, "--user", "-u", help="user tags"),
+) -> None:
+    _call(
+        ctx,
+        "tags.range",
+        {
+            "start": start,
+            "end": end,
+            "tag_type": tag_type,
+            "limit": limit,
+            "auto": _auto_flag_value(auto=auto, user=user),
+        },
+    )
+
+
+@tags_app.command("rollup")
+def tool_tags_rollup(
+    ctx: typer.Context,
+    name_or_addr: Optional[str] = typer.Argument(None, help="one function"),
+    tag_type: Optional[str] = typer.Option(None, "--type", "-t"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-l"),
+    auto: bool = typer.Option(False, "--auto", "-a", help="auto tags"),
+    user: bool = typer.Option(False, "--user", "-u", help="user tags"),
+) -> None:
+    _call(
+        ctx,
+        "tags.rollup",
+        {
+            "name_or_addr": name_or_addr,
+            "tag_type": tag_type,
+            "limit": limit,
+            "auto": _auto_flag_value(auto=auto, user=user),
+        },
+    )
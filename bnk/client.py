@@ -1,34 +1,90 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 
 import rpyc
 from rpyc.utils.classic import obtain
 
+from .serverlib import ServerlibCall, make_tool_call_code, make_tool_list_code
+from .wire import WireCodec
+from .wire import decode as decode_wire
+
+
+UPLOAD_CHUNK_BYTES = 4 * 1024 * 1024
+
+COMPRESSION_OFF = "off"
+COMPRESSION_CHOICES = ("zlib", "lzma", COMPRESSION_OFF)
+
+
+def file_sha256(path: str) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for data in iter(lambda: fh.read(UPLOAD_CHUNK_BYTES), b""):
+            digest.update(data)
+            size += len(data)
+    return digest.hexdigest(), size
+
 
 @dataclass(frozen=True)
 class ConnectConfig:
     host: str
     port: int
     timeout: float
+    # payload compression to offer the server ("off" sends raw pickles)
+    compression: str = "zlib"
 
 
 class KnifeClient:
+    _wire = WireCodec()
+
     def __init__(self, cfg: ConnectConfig):
         self._cfg = cfg
         timeout = None if cfg.timeout == 0 else float(cfg.timeout)
+        # the server cancels work the client has stopped waiting for
+        self._deadline_s = timeout
         self._conn = rpyc.connect(
             cfg.host,
             int(cfg.port),
             config={"sync_request_timeout": timeout},
         )
         self.root = self._conn.root
+        if cfg.compression and cfg.compression != COMPRESSION_OFF:
+            self._wire = self._negotiate_wire(cfg.compression)
+
+    def _negotiate_wire(self, codec: str) -> WireCodec:
+        # servers without compression support keep sending raw pickles
+        negotiate = getattr(self.root, "wire_negotiate", None)
+        if negotiate is None:
+            return WireCodec()
+        out = dict(self._obtain(negotiate([codec])))
+        return WireCodec(
+            name=str(out.get("codec") or ""), min_bytes=int(out["min_bytes"])
+        )
+
+    def _encode_text(self, text: str) -> Any:
+        """Request text as a compressed envelope when that pays off."""
+        if not self._wire.name:
+            return text
+        raw = text.encode("utf-8")
+        data = self._wire.encode(raw)
+        return text if data is raw else data
 
     def _obtain(self, value: Any) -> Any:
         return obtain(value)
 
+    def _decode_payload(self, value: Any) -> Dict[str, Any]:
+        # exec payloads arrive pickled by the server; older servers return a netref
+        if isinstance(value, bytes):
+            return dict(pickle.loads(decode_wire(value)))
+        return dict(self._obtain(value))
+
     def close(self) -> None:
         try:
             self._conn.close()
@@ -60,25 +116,78 @@ class KnifeClient:
         *,
         argv: Optional[List[str]] = None,
         capture_output: bool = True,
+        priority: Optional[str] = None,
+        label: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        page_rows: Optional[int] = None,
     ) -> Dict[str, Any]:
         fn = getattr(self.root, method)
-        return dict(
-            self._obtain(
-                fn(
-                    session,
-                    payload,
-                    argv=argv or [],
-                    capture_output=bool(capture_output),
-                )
+        profile_json = None
+        if profile is not None:
+            profile_json = json.dumps(profile)
+        if method == "run_code":
+            payload = self._encode_text(payload)
+        return self._decode_payload(
+            fn(
+                session,
+                payload,
+                argv=argv or [],
+                capture_output=bool(capture_output),
+                priority=priority,
+                deadline_s=self._deadline_s,
+                label=label,
+                profile_json=profile_json,
+                page_rows=page_rows,
             )
         )
 
+    def result_fetch(
+        self, session: str, cursor: str, *, max_rows: int = 1000
+    ) -> Dict[str, Any]:
+        return self._decode_payload(
+            self.root.result_fetch(
+                session,
+                cursor,
+                max_rows=max_rows,
+                deadline_s=self._deadline_s,
+                label="result.fetch",
+            )
+        )
+
+    def result_close(self, session: str, cursor: str) -> Dict[str, Any]:
+        return dict(self._obtain(self.root.result_close(session, cursor)))
+
+    def iter_result(
+        self, session: str, payload: Dict[str, Any], *, page_rows: int = 1000
+    ) -> Iterator[Any]:
+        """Rows of a paged exec result, fetching later pages as they are consumed."""
+        cursor = payload.get("cursor")
+        try:
+            yield from payload.get("result") or []
+            while cursor:
+                page = self.result_fetch(session, cursor, max_rows=page_rows)
+                if not page.get("ok", False):
+                    cursor = None
+                    raise RuntimeError(page.get("error") or "result fetch failed")
+                cursor = page.get("cursor")
+                yield from page.get("rows") or []
+        finally:
+            # abandoned early (e.g. a closed pipe): free the server-side rows
+            if cursor:
+                try:
+                    self.result_close(session, cursor)
+                except Exception:
+                    pass
+
     def request_status(self, session: Optional[str] = None) -> Dict[str, Any]:
         return self._request_control("request_status", session)
 
     def request_interrupt(self, session: Optional[str] = None) -> Dict[str, Any]:
         return self._request_control("request_interrupt", session)
 
+    def request_stats(self, *, reset: bool = False) -> Dict[str, Any]:
+        return dict(self._obtain(self.root.request_stats(reset=reset)))
+
     # session ops
 
     def session_open(self, name: str) -> Dict[str, Any]:
@@ -120,6 +229,7 @@ class KnifeClient:
         *,
         update_analysis: bool = True,
         options: Optional[Dict[str, Any]] = None,
+        background: bool = False,
     ) -> Dict[str, Any]:
         options_json = None
         if options is not None:
@@ -131,13 +241,59 @@ class KnifeClient:
                     path,
                     update_analysis=update_analysis,
                     options_json=options_json,
+                    background=background,
+                    deadline_s=None if background else self._deadline_s,
                 )
             )
         )
 
+    def session_wait(
+        self, session: str, *, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return dict(self._obtain(self.root.session_wait(session, timeout=timeout)))
+
     def session_detach(self, session: str) -> Dict[str, Any]:
         return dict(self._obtain(self.root.session_detach(session)))
 
+    # uploads
+
+    def upload_file(
+        self,
+        path: str,
+        *,
+        chunk_size: int = UPLOAD_CHUNK_BYTES,
+    ) -> Dict[str, Any]:
+        """Copy a local file to the server's upload store; returns its server path."""
+        sha256, size = file_sha256(path)
+        name = os.path.basename(path)
+        out: Dict[str, Any] = {"sha256": sha256, "size": size}
+        existing = str(self._obtain(self.root.upload_has(sha256, name))["path"])
+        if existing:
+            return dict(out, path=existing, uploaded=False)
+
+        started = dict(self._obtain(self.root.upload_begin(sha256, size, name)))
+        if started.get("exists"):
+            return dict(out, path=str(started["path"]), uploaded=False)
+        upload_id = str(started["upload_id"])
+        try:
+            offset = 0
+            with open(path, "rb") as fh:
+                for data in iter(lambda: fh.read(chunk_size), b""):
+                    packed = self._wire.encode(data)
+                    if packed is data:
+                        self.root.upload_chunk(upload_id, offset, data)
+                    else:
+                        self.root.upload_chunk(upload_id, offset, packed, encoded=True)
+                    offset += len(data)
+            finished = dict(self._obtain(self.root.upload_finish(upload_id)))
+        except BaseException:
+            try:
+                self.root.upload_abort(upload_id)
+            except Exception:
+                pass
+            raise
+        return dict(out, path=str(finished["path"]), uploaded=True)
+
     # view ops
 
     def view_list(
@@ -161,6 +317,10 @@ class KnifeClient:
         *,
         argv: Optional[List[str]] = None,
         capture_output: bool = True,
+        priority: Optional[str] = None,
+        label: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        page_rows: Optional[int] = None,
     ) -> Dict[str, Any]:
         return self._session_exec(
             "run_code",
@@ -168,8 +328,67 @@ class KnifeClient:
             code,
             argv=argv,
             capture_output=capture_output,
+            priority=priority,
+            label=label,
+            profile=profile,
+            page_rows=page_rows,
         )
 
+    def tool_call(
+        self,
+        session: str,
+        tool: str,
+        params: Dict[str, Any],
+        *,
+        tool_root: Path,
+        priority: Optional[str] = None,
+        label: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        page_rows: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Run one serverlib tool; read-only tools can share the session."""
+        fn = getattr(self.root, "session_tool_call", None)
+        if fn is None:
+            # older servers only run code; send the exec bootstrap instead
+            call = ServerlibCall(tool=tool, params=params)
+            code = make_tool_call_code(tool_root, call)
+            return self.run_code(
+                session,
+                code,
+                priority=priority,
+                label=label,
+                profile=profile,
+                page_rows=page_rows,
+            )
+        return self._decode_payload(
+            fn(
+                session,
+                tool,
+                self._encode_text(json.dumps(params)),
+                str(tool_root.resolve()),
+                priority=priority,
+                deadline_s=self._deadline_s,
+                label=label,
+                profile_json=None if profile is None else json.dumps(profile),
+                page_rows=page_rows,
+            )
+        )
+
+    def tool_list(
+        self,
+        session: str,
+        *,
+        tool_root: Path,
+        priority: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """The serverlib tools, from the server's loaded registry."""
+        fn = getattr(self.root, "tool_list", None)
+        if fn is None:
+            code = make_tool_list_code(tool_root)
+            return self.run_code(session, code, priority=priority, label=label)
+        return self._decode_payload(fn(str(tool_root.resolve())))
+
     def run_file(
         self,
         session: str,
@@ -177,6 +396,10 @@ class KnifeClient:
         *,
         argv: Optional[List[str]] = None,
         capture_output: bool = True,
+        priority: Optional[str] = None,
+        label: Optional[str] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        page_rows: Optional[int] = None,
     ) -> Dict[str, Any]:
         return self._session_exec(
             "session_run_file",
@@ -184,4 +407,8 @@ class KnifeClient:
             path,
             argv=argv,
             capture_output=capture_output,
+            priority=priority,
+            label=label,
+            profile=profile,
+            page_rows=page_rows,
         )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 @dataclass(frozen=True)
@@ -12,8 +12,18 @@ class Config:
     timeout: float = 3600.0
     session: Optional[str] = None
     json_output: bool = False
+    ndjson: bool = False
     pretty: bool = False
     tool_root: Optional[str] = None
+    priority: str = "interactive"
+    # server pool spec (json file or HOST:PORT list); sessions are routed
+    pool: Optional[str] = None
+    placement: Optional[str] = None
+    compression: str = "zlib"
+    # output fields kept by serverlib tools (comma-separated); None keeps all
+    fields: Optional[str] = None
+    # server-side where/sort/limit/group_by/sum applied to list results
+    query: Optional[Dict[str, Any]] = None
 
 
 def env_default_host() -> str:
@@ -42,3 +52,19 @@ def env_default_timeout() -> float:
 
 def env_default_session() -> Optional[str]:
     return os.environ.get("BNK_SESSION")
+
+
+def env_default_priority() -> str:
+    return os.environ.get("BNK_PRIORITY", "interactive")
+
+
+def env_default_pool() -> Optional[str]:
+    return os.environ.get("BNK_POOL") or None
+
+
+def env_default_placement() -> Optional[str]:
+    return os.environ.get("BNK_PLACEMENT") or None
+
+
+def env_default_compression() -> str:
+    return os.environ.get("BNK_COMPRESS", "zlib")
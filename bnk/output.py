@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass
-from typing import Any, Iterable, Optional
+from functools import cached_property
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, Optional, TextIO
 
 
 _TABLE_CELL_MAX = 120
 
+_NEEDS_ESCAPE = re.compile(r"[\x00-\x1f\x7f\\]")
+
+# rows used to fix column widths before streaming the rest of a table
+_TABLE_SAMPLE_ROWS = 1000
+
 _HEX_FIELD_PAIRS = [
     ("address", "address_hex"),
     ("start", "start_hex"),
@@ -66,6 +74,79 @@ def format_text(value: Any) -> str:
     return renderer.text()
 
 
+def write_text(
+    value: Any,
+    out: TextIO,
+    *,
+    sample_rows: int = _TABLE_SAMPLE_ROWS,
+) -> None:
+    """Write ``format_text(value)`` to ``out``, streaming record lists.
+
+    Lists (or iterators) of flat records, on their own or as the ``result``
+    of a run payload, are laid out from the first ``sample_rows`` records and
+    then written one row at a time, so huge results neither need every cell
+    formatted up front nor wait for the last row before the first is shown.
+    Cells wider than the sample simply push the rest of their row right.
+    """
+    if isinstance(value, dict) and _is_run_result(value):
+        result = value.get("result")
+        if isinstance(result, (list, Iterator)):
+            bare = _is_bare_result(value)
+            head = _TextRenderer()
+            if not bare:
+                head.run_header(value, indent=0)
+            _write_rendered(head, out)
+            _write_records(
+                result, out, sample_rows=sample_rows, indent=0 if bare else 2
+            )
+            tail = _TextRenderer()
+            tail.profile(value.get("profile"), indent=0)
+            _write_rendered(tail, out)
+            return
+
+    if isinstance(value, (list, Iterator)):
+        _write_records(value, out, sample_rows=sample_rows, indent=0)
+        return
+    out.write(format_text(value) + "\n")
+
+
+def write_ndjson(value: Any, out: TextIO) -> None:
+    """Write one compact JSON document per line; lists give a line per item."""
+    if isinstance(value, (list, Iterator)):
+        for item in value:
+            out.write(dump_json(item, pretty=False) + "\n")
+        return
+    out.write(dump_json(value, pretty=False) + "\n")
+
+
+def _write_records(
+    value: Iterable[Any], out: TextIO, *, sample_rows: int, indent: int
+) -> None:
+    records = iter(value)
+    sample = list(islice(records, max(1, sample_rows)))
+    layout = None
+    if all(isinstance(rec, dict) for rec in sample):
+        layout = _TableLayout.measure(sample)
+    if layout is None:
+        sample.extend(records)
+        renderer = _TextRenderer()
+        renderer.render(sample, indent=indent)
+        _write_rendered(renderer, out)
+        return
+
+    pad = " " * indent
+    for line in layout.header_lines():
+        out.write(pad + line + "\n")
+    for rec in chain(sample, records):
+        out.write(pad + layout.row_line(rec) + "\n")
+
+
+def _write_rendered(renderer: "_TextRenderer", out: TextIO) -> None:
+    text = renderer.text()
+    if text:
+        out.write(text + "\n")
+
+
 def _jsonable(value: Any) -> Any:
     if value is None:
         return None
@@ -99,6 +180,17 @@ def _is_run_result(value: dict[str, Any]) -> bool:
     return "ok" in value and "stdout" in value and "stderr" in value
 
 
+def _is_bare_result(value: dict[str, Any]) -> bool:
+    # a clean run with nothing else to report renders as just its result
+    return (
+        bool(value.get("ok", False))
+        and not value.get("stdout")
+        and not value.get("stderr")
+        and "exit_code" not in value
+        and "result" in value
+    )
+
+
 def _listing_from_mapping(value: dict[str, Any]) -> Optional[_Listing]:
     records = value.get("lines")
     if not isinstance(records, list):
@@ -164,45 +256,29 @@ def _drop_redundant_fields(fields: list[str]) -> list[str]:
 
 
 def _table_lines(records: list[dict[str, Any]]) -> Optional[list[str]]:
-    if not records:
-        return None
-
-    cols = _ordered_columns(records)
-    if not cols:
+    layout = _TableLayout.measure(records)
+    if layout is None:
         return None
-
-    rows: list[list[str]] = []
-    widths: dict[str, int] = {col: len(col) for col in cols}
-    align_right: dict[str, bool] = {col: True for col in cols}
-
-    for rec in records:
-        row: list[str] = []
-        for col in cols:
-            value = rec.get(col, "")
-            text = _table_cell_text(value)
-            if text is None:
-                return None
-
-            if value is not None and not isinstance(value, (int, float)):
-                align_right[col] = False
-
-            widths[col] = max(widths[col], len(text))
-            row.append(text)
-        rows.append(row)
-
-    return _render_table(cols, rows, widths=widths, align_right=align_right)
+    out = layout.header_lines()
+    out.extend(layout.row_line(rec) for rec in records)
+    return out
 
 
 def _table_cell_text(value: Any) -> Optional[str]:
-    if not _is_scalar(value):
+    if isinstance(value, str):
+        text = _escape_table_text(value)
+    elif _is_scalar(value):
+        text = _escape_table_text(_to_text(value))
+    else:
         return None
-    text = _escape_table_text(_to_text(value))
     if len(text) > _TABLE_CELL_MAX:
         return f"{text[: _TABLE_CELL_MAX - 3]}..."
     return text
 
 
 def _escape_table_text(text: str) -> str:
+    if _NEEDS_ESCAPE.search(text) is None:
+        return text
     out: list[str] = []
     for char in text:
         code = ord(char)
@@ -221,26 +297,78 @@ def _escape_table_text(text: str) -> str:
     return "".join(out)
 
 
-def _render_table(
-    cols: list[str],
-    rows: list[list[str]],
-    *,
-    widths: dict[str, int],
-    align_right: dict[str, bool],
-) -> list[str]:
-    def render_row(values: Iterable[str]) -> str:
-        parts: list[str] = []
-        for col, cell in zip(cols, values):
-            width = widths[col]
-            if align_right.get(col, False):
-                parts.append(cell.rjust(width))
-            else:
-                parts.append(cell.ljust(width))
-        return "  ".join(parts).rstrip()
-
-    out = [render_row(cols), render_row(["-" * widths[col] for col in cols])]
-    out.extend(render_row(row) for row in rows)
-    return out
+@dataclass(frozen=True)
+class _TableLayout:
+    cols: list[str]
+    widths: dict[str, int]
+    align_right: dict[str, bool]
+    known: frozenset[str]
+
+    @classmethod
+    def measure(cls, records: list[dict[str, Any]]) -> Optional["_TableLayout"]:
+        if not records:
+            return None
+
+        cols = _ordered_columns(records)
+        if not cols:
+            return None
+
+        col_widths: dict[str, int] = {col: len(col) for col in cols}
+        align_right: dict[str, bool] = {col: True for col in cols}
+
+        for rec in records:
+            for col in cols:
+                value = rec.get(col, "")
+                text = _table_cell_text(value)
+                if text is None:
+                    return None
+
+                if value is not None and not isinstance(value, (int, float)):
+                    align_right[col] = False
+
+                col_widths[col] = max(col_widths[col], len(text))
+
+        known = frozenset(str(key) for rec in records for key in rec.keys())
+        return cls(cols, col_widths, align_right, known)
+
+    def header_lines(self) -> list[str]:
+        return [
+            self._render(self.cols),
+            self._render(["-" * self.widths[col] for col in self.cols]),
+        ]
+
+    def row_line(self, rec: Any) -> str:
+        if not isinstance(rec, dict):
+            return _stream_cell_text(rec)
+
+        line = self._render([_stream_cell_text(rec.get(col, "")) for col in self.cols])
+        if self.known.issuperset(rec):
+            return line
+        # keys first seen after the width sample still show up, just unaligned
+        extra = [
+            f"{key}={_stream_cell_text(value)}"
+            for key, value in rec.items()
+            if str(key) not in self.known
+        ]
+        return f"{line}  {'  '.join(extra)}"
+
+    @cached_property
+    def _template(self) -> str:
+        return "  ".join(
+            f"{{:{'>' if self.align_right.get(col, False) else '<'}{self.widths[col]}}}"
+            for col in self.cols
+        )
+
+    def _render(self, values: Iterable[str]) -> str:
+        return self._template.format(*values).rstrip()
+
+
+def _stream_cell_text(value: Any) -> str:
+    text = _table_cell_text(value)
+    if text is not None:
+        return text
+    # rows past the sample cannot demote the table to block output any more
+    return _table_cell_text(dump_json(value, pretty=False)) or ""
 
 
 class _TextRenderer:
@@ -286,28 +414,35 @@ class _TextRenderer:
         self._plain_mapping(value, indent=indent)
 
     def _run_result(self, value: dict[str, Any], *, indent: int) -> None:
+        if _is_bare_result(value):
+            self.render(value.get("result"), indent=indent)
+        else:
+            self.run_header(value, indent=indent)
+            if "result" in value:
+                self.render(value.get("result"), indent=indent + 2)
+        self.profile(value.get("profile"), indent=indent)
+
+    def run_header(self, value: dict[str, Any], *, indent: int) -> None:
+        """What a run payload shows above its result, up to ``result:``."""
         ok = bool(value.get("ok", False))
-        stdout = str(value.get("stdout", ""))
-        stderr = str(value.get("stderr", ""))
-        has_exit_code = "exit_code" in value
-        exit_code = value.get("exit_code") if has_exit_code else None
-        has_result = "result" in value
-        result = value.get("result", None)
-
-        if ok and not stdout and not stderr and not has_exit_code and has_result:
-            self.render(result, indent=indent)
-            return
+        exit_code = value.get("exit_code")
 
         self._emit(indent, f"ok: {'true' if ok else 'false'}")
-        self._block("stdout", stdout, indent=indent)
-        self._block("stderr", stderr, indent=indent)
+        self._block("stdout", str(value.get("stdout", "")), indent=indent)
+        self._block("stderr", str(value.get("stderr", "")), indent=indent)
         if not ok:
             self._block("error", str(value.get("error", "")), indent=indent)
         if exit_code is not None:
             self._emit(indent, f"exit_code: {_to_text(exit_code)}")
-        if has_result:
+        if "result" in value:
             self._emit(indent, "result:")
-            self.render(result, indent=indent + 2)
+
+    def profile(self, profile: Any, *, indent: int) -> None:
+        """The ``profile:`` block of a profiled run, if there is one."""
+        if not isinstance(profile, dict):
+            return
+        self._emit(indent, "profile:")
+        self.render(profile, indent=indent + 2)
 
     def _listing(self, listing: _Listing, *, indent: int) -> None:
         self._emit(indent, listing.header)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .client import COMPRESSION_OFF, ConnectConfig, KnifeClient, file_sha256
+from .endpoint import parse_endpoint
+
+
+POLICY_LEAST_LOADED = "least-loaded"
+POLICY_LEAST_MEMORY = "least-memory"
+POLICY_STICKY = "sticky"
+POLICIES = (POLICY_LEAST_LOADED, POLICY_LEAST_MEMORY, POLICY_STICKY)
+
+# probes only ask for counters; a server this slow is treated as down
+PROBE_TIMEOUT_S = 5.0
+
+
+def default_placement_path() -> str:
+    return os.environ.get("BNK_PLACEMENTS") or os.path.join(
+        os.path.expanduser("~"), ".cache", "bnk", "placements.json"
+    )
+
+
+def normalize_policy(value: Optional[str]) -> str:
+    text = (value or POLICY_LEAST_LOADED).strip().lower()
+    if text not in POLICIES:
+        raise ValueError(f"placement policy must be one of: {', '.join(POLICIES)}")
+    return text
+
+
+@dataclass(frozen=True)
+class PoolServer:
+    name: str
+    host: str
+    port: int
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+@dataclass(frozen=True)
+class ServerPool:
+    servers: Tuple[PoolServer, ...]
+    policy: str = POLICY_LEAST_LOADED
+
+    def get(self, name: str) -> Optional[PoolServer]:
+        for server in self.servers:
+            if server.name == name:
+                return server
+        return None
+
+    @classmethod
+    def from_json(cls, data: Any) -> "ServerPool":
+        if isinstance(data, list):
+            data = {"servers": data}
+        if not isinstance(data, dict):
+            raise ValueError("pool config must be a json object or list")
+        servers: List[PoolServer] = []
+        for raw in data.get("servers") or []:
+            if isinstance(raw, str):
+                host, port = parse_endpoint(raw)
+                name = raw.strip()
+            elif isinstance(raw, dict):
+                host, port = str(raw["host"]), int(raw.get("port", 18812))
+                name = str(raw.get("name") or f"{host}:{port}")
+            else:
+                raise ValueError(f"invalid pool server entry: {raw!r}")
+            servers.append(PoolServer(name=name, host=host, port=port))
+        if not servers:
+            raise ValueError("pool config lists no servers")
+        names = [server.name for server in servers]
+        if len(names) != len(set(names)):
+            raise ValueError("pool server names must be unique")
+        return cls(servers=tuple(servers), policy=normalize_policy(data.get("policy")))
+
+    @classmethod
+    def parse(cls, spec: str) -> "ServerPool":
+        """A pool from a json file path or a comma-separated HOST:PORT list."""
+        path = os.path.expanduser(spec)
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                return cls.from_json(json.load(fh))
+        return cls.from_json([item for item in spec.split(",") if item.strip()])
+
+
+@dataclass(frozen=True)
+class ServerLoad:
+    server: PoolServer
+    sessions: Tuple[str, ...] = ()
+    requests: int = 0
+    memory: int = 0
+
+
+def rendezvous(servers: Sequence[PoolServer], key: str) -> PoolServer:
+    """Highest-random-weight pick: losing a server only moves its own keys."""
+
+    def weight(server: PoolServer) -> bytes:
+        return hashlib.sha256(f"{server.name}\0{key}".encode("utf-8")).digest()
+
+    return max(servers, key=weight)
+
+
+def pick_server(loads: Sequence[ServerLoad], policy: str, *, key: str) -> PoolServer:
+    if not loads:
+        raise RuntimeError("no pool server is reachable")
+    if policy == POLICY_STICKY:
+        return rendezvous([load.server for load in loads], key)
+    if policy == POLICY_LEAST_MEMORY:
+        return min(loads, key=lambda load: (load.memory, load.requests)).server
+    return min(loads, key=lambda load: (load.requests, load.memory)).server
+
+
+def probe_server(server: PoolServer, *, timeout: float = PROBE_TIMEOUT_S) -> ServerLoad:
+    with KnifeClient(
+        ConnectConfig(
+            host=server.host,
+            port=server.port,
+            timeout=timeout,
+            compression=COMPRESSION_OFF,
+        )
+    ) as c:
+        sessions = c.session_list()
+        status = c.request_status()
+    requests = int(status.get("count") or 0) if status.get("active") else 0
+    requests += len(status.get("queued") or [])
+    return ServerLoad(
+        server=server,
+        sessions=tuple(str(item.get("name")) for item in sessions),
+        requests=requests,
+        memory=sum(int(item.get("memory_estimate") or 0) for item in sessions),
+    )
+
+
+class PlacementCache:
+    """Session -> pool server assignments remembered between invocations."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def get(self, session: str) -> Optional[Dict[str, Any]]:
+        entry = self._read().get(session)
+        return entry if isinstance(entry, dict) else None
+
+    def put(self, session: str, server: PoolServer, *, binary: str = "") -> None:
+        data = self._read()
+        data[session] = {
+            "server": server.name,
+            "endpoint": server.endpoint,
+            "binary": binary,
+            "placed_at": time.time(),
+        }
+        self._write(data)
+
+    def remove(self, session: str) -> bool:
+        data = self._read()
+        if data.pop(session, None) is None:
+            return False
+        self._write(data)
+        return True
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+        os.replace(tmp, self._path)
+
+
+class Router:
+    """Finds the pool server for a session, placing new sessions by policy.
+
+    A cached placement wins; otherwise every reachable server is asked which
+    sessions it holds, and a session nobody has goes where the policy says.
+    """
+
+    def __init__(
+        self,
+        pool: ServerPool,
+        cache: PlacementCache,
+        *,
+        probe: Callable[[PoolServer], ServerLoad] = probe_server,
+    ) -> None:
+        self.pool = pool
+        self._cache = cache
+        self._probe = probe
+
+    def resolve(self, session: str, *, binary_path: str = "") -> PoolServer:
+        cached = self._cache.get(session)
+        if cached is not None:
+            server = self.pool.get(str(cached.get("server") or ""))
+            if server is not None:
+                return server
+
+        loads = self.probe_all()
+        for load in loads:
+            if session in load.sessions:
+                self._cache.put(session, load.server)
+                return load.server
+
+        binary = ""
+        if self.pool.policy == POLICY_STICKY and binary_path:
+            binary, _size = file_sha256(binary_path)
+        server = pick_server(loads, self.pool.policy, key=binary or session)
+        self._cache.put(session, server, binary=binary)
+        return server
+
+    def probe_all(self) -> List[ServerLoad]:
+        servers = self.pool.servers
+        with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+            loads = list(pool.map(self._try_probe, servers))
+        return [load for load in loads if load is not None]
+
+    def _try_probe(self, server: PoolServer) -> Optional[ServerLoad]:
+        try:
+            return self._probe(server)
+        except Exception:
+            # unreachable servers take no new sessions
+            return None
+
+    def forget(self, session: str) -> bool:
+        return self._cache.remove(session)
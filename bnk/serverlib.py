@@ -19,9 +19,13 @@ def _bootstrap_lines(tool_root: Path) -> list[str]:
         f"tool_root = {root!r}",
         "if tool_root not in sys.path:",
         "    sys.path.insert(0, tool_root)",
-        "for _k in list(sys.modules.keys()):",
-        "    if _k == 'bnk_serverlib' or _k.startswith('bnk_serverlib.'):",
-        "        del sys.modules[_k]",
+        # servers with a tool loader keep these modules (and their per-view
+        # state) imported; only re-import when nothing else owns them
+        "_reg = sys.modules.get('bnk_serverlib.registry')",
+        "if not getattr(_reg, '_loaded_by_server', False):",
+        "    for _k in list(sys.modules.keys()):",
+        "        if _k == 'bnk_serverlib' or _k.startswith('bnk_serverlib.'):",
+        "            del sys.modules[_k]",
     ]
 
 
@@ -36,7 +40,13 @@ def make_tool_call_code(tool_root: Path, call: ServerlibCall) -> str:
         [
             "from bnk_serverlib.registry import call_tool",
             f"payload = json.loads({payload_json!r})",
-            "__result__ = call_tool(payload['tool'], bv=bv, **(payload.get('params') or {}))",
+            "__result__ = call_tool(",
+            "    payload['tool'],",
+            "    bv=bv,",
+            "    cancel=globals().get('__cancel__'),",
+            "    timings=globals().get('__timings__'),",
+            "    **(payload.get('params') or {}),",
+            ")",
         ]
     )
     return "\n".join(lines)
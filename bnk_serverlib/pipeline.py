@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .tools.cancel import bound_rows, cancellable
+from .tools.cancel import current as current_token
+from .tools.query import parse_query, run_query
+
+# a pipeline chains tools inside the server, e.g. "callers of every function
+# named like 'parse', with their hlil":
+#
+#   [
+#     {"tool": "functions.like", "params": {"pattern": "parse"}},
+#     {"tool": "function.callers", "bind": {"name_or_addr": "start"},
+#      "unique": ["address"]},
+#     {"tool": "il.hlil", "bind": {"name_or_addr": "address"},
+#      "carry": ["name"], "fields": ["name", "text"]},
+#   ]
+#
+# the first stage runs once; every later stage runs once per row of the stage
+# before it, with ``bind`` mapping its params to fields of that row. stages
+# are chained generators, so rows flow through one at a time and nothing in
+# the middle is materialized. a stage may also be just {"query": {...}}.
+
+CallTool = Callable[..., Any]
+
+_STAGE_KEYS = {"tool", "params", "bind", "carry", "unique", "fields", "query"}
+# call_tool's own arguments; a stage sets fields/query through its own keys
+_RESERVED_PARAMS = {"name", "bv", "cancel", "timings", "fields", "query"}
+
+
+@dataclass(frozen=True)
+class Stage:
+    tool: str = ""
+    params: Dict[str, Any] = field(default_factory=dict)
+    bind: Dict[str, str] = field(default_factory=dict)
+    carry: Tuple[str, ...] = ()
+    unique: Optional[Tuple[str, ...]] = None
+    fields: Any = None
+    query: Any = None
+
+
+def _names(value: Any, what: str) -> Tuple[str, ...]:
+    items = value.split(",") if isinstance(value, str) else value
+    if not isinstance(items, (list, tuple)):
+        raise ValueError(f"{what} must be a list of field names")
+    return tuple(str(item).strip() for item in items if str(item).strip())
+
+
+def parse_stage(raw: Any, index: int) -> Stage:
+    if not isinstance(raw, dict):
+        raise ValueError(f"stage {index}: must be a json object")
+    unknown = sorted(set(raw) - _STAGE_KEYS)
+    if unknown:
+        raise ValueError(f"stage {index}: unknown key(s): {', '.join(unknown)}")
+    tool = str(raw.get("tool") or "")
+    if not tool and raw.get("query") is None:
+        raise ValueError(f"stage {index}: needs a tool or a query")
+    params = raw.get("params") or {}
+    bind_map = raw.get("bind") or {}
+    if not isinstance(params, dict) or not isinstance(bind_map, dict):
+        raise ValueError(f"stage {index}: params and bind must be json objects")
+    reserved = sorted(_RESERVED_PARAMS & (set(params) | set(bind_map)))
+    if reserved:
+        raise ValueError(
+            f"stage {index}: reserved param name(s): {', '.join(reserved)}"
+        )
+    if not tool and (params or bind_map or raw.get("fields") is not None):
+        raise ValueError(f"stage {index}: params/bind/fields need a tool")
+    if index == 0 and bind_map:
+        raise ValueError("stage 0: has no input rows to bind from")
+    unique = raw.get("unique")
+    # fail before anything runs, not halfway through the stream
+    parse_query(raw.get("query"))
+    return Stage(
+        tool=tool,
+        params=dict(params),
+        bind={str(k): str(v) for k, v in bind_map.items()},
+        carry=_names(raw.get("carry") or (), "carry"),
+        unique=None if unique in (None, False) else _unique_fields(unique),
+        fields=raw.get("fields"),
+        query=raw.get("query"),
+    )
+
+
+def _unique_fields(value: Any) -> Tuple[str, ...]:
+    # true dedupes on the whole row
+    return () if value is True else _names(value, "unique")
+
+
+def parse_pipeline(stages: Any) -> List[Stage]:
+    if not isinstance(stages, (list, tuple)) or not stages:
+        raise ValueError("pipeline must be a non-empty list of stages")
+    return [parse_stage(raw, index) for index, raw in enumerate(stages)]
+
+
+def _as_rows(value: Any) -> Iterable[Any]:
+    if isinstance(value, dict):
+        return (value,)
+    if isinstance(value, (list, tuple)) or isinstance(value, Iterator):
+        return value
+    return ({"value": value},)
+
+
+def _row_key(row: Any, names: Tuple[str, ...]) -> Any:
+    if not isinstance(row, dict):
+        return repr(row)
+    if names:
+        return tuple(repr(row.get(name)) for name in names)
+    return repr(sorted(row.items(), key=lambda item: item[0]))
+
+
+def _dedupe(rows: Iterable[Any], names: Tuple[str, ...]) -> Iterator[Any]:
+    seen = set()
+    for row in rows:
+        key = _row_key(row, names)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield row
+
+
+def _query_rows(rows: Iterable[Any], spec: Any) -> Iterator[Any]:
+    # a generator, so a sort here waits until the rows are pulled
+    yield from run_query(iter(rows), parse_query(spec))
+
+
+class Pipeline:
+    def __init__(
+        self,
+        stages: List[Stage],
+        *,
+        bv: Any,
+        call: CallTool,
+        token: Optional[Any] = None,
+    ) -> None:
+        self._stages = stages
+        self._bv = bv
+        self._call = call
+        self._token = token
+
+    def rows(self) -> Iterator[Any]:
+        rows: Optional[Iterable[Any]] = None
+        for index, stage in enumerate(self._stages):
+            rows = self._stage_rows(index, stage, rows)
+            if stage.unique is not None:
+                rows = _dedupe(rows, stage.unique)
+        return bound_rows(rows or (), self._token)
+
+    def _stage_rows(
+        self, index: int, stage: Stage, upstream: Optional[Iterable[Any]]
+    ) -> Iterable[Any]:
+        if not stage.tool:
+            return _query_rows(upstream or (), stage.query)
+        if upstream is None:
+            return self._run(index, stage, stage.params, None)
+        return self._fan_out(index, stage, upstream)
+
+    def _fan_out(
+        self, index: int, stage: Stage, upstream: Iterable[Any]
+    ) -> Iterator[Any]:
+        for row in cancellable(upstream, every=16):
+            if not isinstance(row, dict):
+                raise ValueError(f"stage {index}: input rows must be records")
+            params = dict(stage.params)
+            for param, source in stage.bind.items():
+                if source not in row:
+                    raise ValueError(
+                        f"stage {index}: input row has no field {source!r}"
+                    )
+                params[param] = row[source]
+            yield from self._run(index, stage, params, row)
+
+    def _run(
+        self,
+        index: int,
+        stage: Stage,
+        params: Dict[str, Any],
+        source: Optional[Dict[str, Any]],
+    ) -> Iterator[Any]:
+        try:
+            value = self._call(
+                stage.tool,
+                bv=self._bv,
+                cancel=self._token,
+                fields=stage.fields,
+                query=stage.query,
+                **params,
+            )
+        except (KeyError, ValueError) as exc:
+            raise ValueError(f"stage {index} ({stage.tool}): {exc}") from exc
+        for row in _as_rows(value):
+            if source is not None and stage.carry and isinstance(row, dict):
+                row = dict(row)
+                for name in stage.carry:
+                    row.setdefault(name, source.get(name))
+            yield row
+
+
+def run_pipeline(
+    stages: Any, *, bv: Any, call: CallTool, allow: Callable[[str], bool]
+) -> Iterator[Any]:
+    """Rows of the last stage; ``allow`` vets every tool name up front."""
+    parsed = parse_pipeline(stages)
+    for index, stage in enumerate(parsed):
+        if stage.tool and not allow(stage.tool):
+            raise ValueError(f"stage {index}: {stage.tool} cannot run in a pipeline")
+    return Pipeline(parsed, bv=bv, call=call, token=current_token()).rows()
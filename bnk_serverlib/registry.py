@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Tuple
 
+from .pipeline import run_pipeline
+from .tools.addr import addr_info, addr_info_many
 from .tools.binary import binary_summary
+from .tools.cancel import bind
+from .tools.fields import bind as bind_fields
+from .tools.fields import normalize_fields, project
+from .tools.query import parse_query, run_query
+from .tools.data import data_like, data_list
 from .tools.functions import (
     function_callees,
     function_call_sites,
@@ -14,15 +22,29 @@ from .tools.functions import (
 )
 from .tools.il import hlil, llil, mlil
 from .tools.imports import imports_like, imports_list
+from .tools.search import search_many
 from .tools.sections import sections_list
 from .tools.segments import segments_list
 from .tools.strings import strings_like, strings_like_data, xrefs_to_string
 from .tools.symbols import symbols_like
-from .tools.tags import tags_at, tags_function, tags_list, tags_types
+from .tools.tags import (
+    tags_at,
+    tags_function,
+    tags_list,
+    tags_range,
+    tags_rollup,
+    tags_types,
+)
+from .tools.view_cache import TOPIC_TAGS
+# the server's loader (server/plugin/serverlib.py) releases views through these
+from .tools.view_cache import forget as forget_view  # noqa: F401
+from .tools.view_cache import forget_all as forget_all_views  # noqa: F401
+from .tools.view_cache import invalidate as invalidate_view_cache
 from .tools.xrefs import xrefs_to
 from .tools.edit_comments import comment_func_set, comment_view_set
 from .tools.edit_db import db_save, db_save_as, db_status
 from .tools.edit_functions import fn_rename, fn_set_type
+from .tools.edit_import import symbols_import
 from .tools.edit_tags import (
     tag_data_add,
     tag_data_remove_type,
@@ -38,19 +60,56 @@ from .tools.edit_xrefs import (
 )
 
 
+# read tools only inspect the view and may share a session with each other;
+# write tools (and arbitrary exec) get it to themselves
+MODE_READ = "read"
+MODE_WRITE = "write"
+
+
 @dataclass(frozen=True)
 class Tool:
     name: str
     fn: Callable[..., Any]
     doc: str
+    mode: str = MODE_READ
+    # per-view index topics (tools/view_cache.py) the tool updates itself
+    maintains: Tuple[str, ...] = ()
+
+
+def _pipeline_run(*, bv: Any, stages: Any) -> Any:
+    return run_pipeline(stages, bv=bv, call=call_tool, allow=_pipeline_allows)
+
+
+def _pipeline_allows(name: str) -> bool:
+    # a pipeline shares the session like any read tool, so it may only read
+    try:
+        return name != "pipeline.run" and tool_mode(name) == MODE_READ
+    except KeyError:
+        return False
 
 
 _TOOLS: Tuple[Tool, ...] = (
+    Tool(
+        name="addr.info",
+        fn=addr_info,
+        doc="section, function, block, data var, symbol and tags at an address",
+    ),
+    Tool(
+        name="addr.info-many",
+        fn=addr_info_many,
+        doc="addr.info for a list of addresses, in input order",
+    ),
     Tool(
         name="binary.summary",
         fn=binary_summary,
         doc="summary of active binary view",
     ),
+    Tool(
+        name="data.like",
+        fn=data_like,
+        doc="data variables whose name matches a pattern, in address order",
+    ),
+    Tool(name="data.list", fn=data_list, doc="data variables in address order"),
     Tool(name="function.callees", fn=function_callees, doc="callees of a function"),
     Tool(
         name="function.call-sites",
@@ -74,6 +133,16 @@ _TOOLS: Tuple[Tool, ...] = (
         doc="search over imports (substring or regex)",
     ),
     Tool(name="imports.list", fn=imports_list, doc="list imported symbols"),
+    Tool(
+        name="pipeline.run",
+        fn=_pipeline_run,
+        doc="chain read tools server-side, each stage fed the previous rows",
+    ),
+    Tool(
+        name="search.many",
+        fn=search_many,
+        doc="many patterns over functions/imports/symbols/strings in one pass",
+    ),
     Tool(name="sections.list", fn=sections_list, doc="list sections"),
     Tool(name="segments.list", fn=segments_list, doc="list segments"),
     Tool(
@@ -99,49 +168,125 @@ _TOOLS: Tuple[Tool, ...] = (
     Tool(name="tags.at", fn=tags_at, doc="data tags at an address"),
     Tool(name="tags.function", fn=tags_function, doc="function tags for a function"),
     Tool(name="tags.list", fn=tags_list, doc="list data tags (optionally filtered)"),
+    Tool(
+        name="tags.range",
+        fn=tags_range,
+        doc="data tags in an address range [start, end)",
+    ),
+    Tool(
+        name="tags.rollup",
+        fn=tags_rollup,
+        doc="data tag counts per function, by tag type",
+    ),
     Tool(name="tags.types", fn=tags_types, doc="list tag types present in the view"),
     Tool(name="xrefs.to", fn=xrefs_to, doc="xrefs to an address or symbol name"),
-    Tool(name="edit.fn.rename", fn=fn_rename, doc="rename a function"),
-    Tool(name="edit.fn.type", fn=fn_set_type, doc="set a user function type"),
+    Tool(
+        name="edit.fn.rename", fn=fn_rename, doc="rename a function", mode=MODE_WRITE
+    ),
+    Tool(
+        name="edit.fn.type",
+        fn=fn_set_type,
+        doc="set a user function type",
+        mode=MODE_WRITE,
+    ),
+    Tool(
+        name="edit.import",
+        fn=symbols_import,
+        doc="bulk apply function/data names and types from a csv/json mapping file",
+        mode=MODE_WRITE,
+    ),
     Tool(name="edit.var.list", fn=var_list, doc="list variables in a function"),
-    Tool(name="edit.var.rename", fn=var_rename, doc="rename a variable"),
-    Tool(name="edit.var.type", fn=var_set_type, doc="set a variable type"),
+    Tool(
+        name="edit.var.rename",
+        fn=var_rename,
+        doc="rename a variable",
+        mode=MODE_WRITE,
+    ),
+    Tool(
+        name="edit.var.type",
+        fn=var_set_type,
+        doc="set a variable type",
+        mode=MODE_WRITE,
+    ),
     Tool(
         name="edit.comment.view",
         fn=comment_view_set,
         doc="set a view comment at an address",
+        mode=MODE_WRITE,
     ),
     Tool(
         name="edit.comment.func",
         fn=comment_func_set,
         doc="set a function comment at an address",
+        mode=MODE_WRITE,
     ),
     Tool(
         name="edit.db.status", fn=db_status, doc="database status for the current view"
     ),
-    Tool(name="edit.db.save", fn=db_save, doc="save database to its current file"),
-    Tool(name="edit.db.save-as", fn=db_save_as, doc="save database to a new bndb path"),
-    Tool(name="edit.tag.data.add", fn=tag_data_add, doc="add a data tag"),
+    # saving rewrites the database file and updates the view's file metadata
+    Tool(
+        name="edit.db.save",
+        fn=db_save,
+        doc="save database to its current file",
+        mode=MODE_WRITE,
+    ),
+    Tool(
+        name="edit.db.save-as",
+        fn=db_save_as,
+        doc="save database to a new bndb path",
+        mode=MODE_WRITE,
+    ),
+    Tool(
+        name="edit.tag.data.add",
+        fn=tag_data_add,
+        doc="add a data tag",
+        mode=MODE_WRITE,
+        maintains=(TOPIC_TAGS,),
+    ),
     Tool(
         name="edit.tag.data.remove-type",
         fn=tag_data_remove_type,
         doc="remove all data tags of a type at an address",
+        mode=MODE_WRITE,
+        maintains=(TOPIC_TAGS,),
     ),
     Tool(
-        name="edit.tag.func.add", fn=tag_func_add, doc="add a function or address tag"
+        name="edit.tag.func.add",
+        fn=tag_func_add,
+        doc="add a function or address tag",
+        mode=MODE_WRITE,
+        maintains=(TOPIC_TAGS,),
     ),
     Tool(
         name="edit.tag.func.remove-type",
         fn=tag_func_remove_type,
         doc="remove all function or address tags of a type",
+        mode=MODE_WRITE,
+        maintains=(TOPIC_TAGS,),
     ),
-    Tool(name="edit.xref.data.add", fn=xref_data_add, doc="add a user data xref"),
     Tool(
-        name="edit.xref.data.remove", fn=xref_data_remove, doc="remove a user data xref"
+        name="edit.xref.data.add",
+        fn=xref_data_add,
+        doc="add a user data xref",
+        mode=MODE_WRITE,
     ),
-    Tool(name="edit.xref.code.add", fn=xref_code_add, doc="add a user code xref"),
     Tool(
-        name="edit.xref.code.remove", fn=xref_code_remove, doc="remove a user code xref"
+        name="edit.xref.data.remove",
+        fn=xref_data_remove,
+        doc="remove a user data xref",
+        mode=MODE_WRITE,
+    ),
+    Tool(
+        name="edit.xref.code.add",
+        fn=xref_code_add,
+        doc="add a user code xref",
+        mode=MODE_WRITE,
+    ),
+    Tool(
+        name="edit.xref.code.remove",
+        fn=xref_code_remove,
+        doc="remove a user code xref",
+        mode=MODE_WRITE,
     ),
 )
 
@@ -159,14 +304,44 @@ _TOOLS_BY_NAME = _build_tool_map(_TOOLS)
 
 
 def list_tools() -> List[Dict[str, Any]]:
-    return [{"name": tool.name, "doc": tool.doc} for tool in _TOOLS]
+    return [
+        {"name": tool.name, "doc": tool.doc, "mode": tool.mode} for tool in _TOOLS
+    ]
+
+
+def tool_mode(name: str) -> str:
+    """``read`` for tools that only inspect the view, ``write`` otherwise."""
+    tool = _TOOLS_BY_NAME.get(name)
+    if tool is None:
+        raise KeyError(f"unknown tool: {name!r}")
+    return tool.mode
 
 
-def call_tool(name: str, *, bv, **params) -> Any:
+def call_tool(
+    name: str, *, bv, cancel=None, timings=None, fields=None, query=None, **params
+) -> Any:
     if bv is None:
         raise ValueError("bv is required (attach a view first)")
     tool = _TOOLS_BY_NAME.get(name)
     if tool is None:
         known = ", ".join(_TOOLS_BY_NAME)
         raise KeyError(f"unknown tool: {name!r} (known: {known})")
-    return tool.fn(bv=bv, **params)
+    # fields trims every returned record; tools skip the costly ones unasked
+    fields = normalize_fields(fields)
+    # query filters/sorts/groups list results before anything is shipped
+    compiled = parse_query(query)
+    reads = compiled.reads if compiled is not None else ()
+    started = time.perf_counter()
+    try:
+        with bind(cancel), bind_fields(fields, also=reads):
+            result = run_query(tool.fn(bv=bv, **params), compiled)
+            return project(result, fields)
+    finally:
+        if tool.mode == MODE_WRITE:
+            # edits may rename or add what the per-view indexes hold
+            invalidate_view_cache(bv, keep=tool.maintains)
+        # the server aggregates this as the "tool" phase of the request; a
+        # lazy result adds the time its pages take there
+        if timings is not None:
+            elapsed = time.perf_counter() - started
+            timings["tool"] = timings.get("tool", 0.0) + elapsed
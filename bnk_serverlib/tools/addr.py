@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cancel import cancellable
+from .fields import wanted
+from .intervals import IntervalTable
+from .tag_index import tag_index
+from .tags import TagEntryRows
+from .util import function_ranges, hex_addr, parse_int, section_table
+from .view_cache import (
+    TOPIC_DATA_VARS,
+    TOPIC_FUNCTIONS,
+    TOPIC_LAYOUT,
+    TOPIC_SYMBOLS,
+    cached,
+)
+
+# the tables hold only numbers and names: BN objects keep their BinaryView
+# alive, and a cached one would pin the view that weakly keys the cache
+
+
+def _segment_table(bv: Any) -> IntervalTable[str]:
+    return cached(
+        bv,
+        TOPIC_LAYOUT,
+        "segments",
+        lambda: IntervalTable(
+            (int(s.start), int(s.end), _segment_flags(s)) for s in bv.segments
+        ),
+    )
+
+
+def _function_table(bv: Any) -> IntervalTable[Tuple[int, str]]:
+    def build() -> IntervalTable[Tuple[int, str]]:
+        spans = []
+        for func in cancellable(bv.functions):
+            start = int(getattr(func, "start", 0) or 0)
+            name = getattr(func, "name", "") or ""
+            spans.extend((lo, hi, (start, name)) for lo, hi in function_ranges(func))
+        return IntervalTable(spans)
+
+    return cached(bv, TOPIC_FUNCTIONS, "ranges", build)
+
+
+def _data_var_table(bv: Any) -> IntervalTable[None]:
+    def build() -> IntervalTable[None]:
+        spans = []
+        for addr, var in cancellable(bv.data_vars.items()):
+            width = int(getattr(getattr(var, "type", None), "width", 0) or 0)
+            spans.append((int(addr), int(addr) + max(1, width), None))
+        return IntervalTable(spans)
+
+    return cached(bv, TOPIC_DATA_VARS, "ranges", build)
+
+
+def _symbol_table(bv: Any) -> IntervalTable[str]:
+    # symbols have no extent; only ``preceding`` is used on this table
+    def build() -> IntervalTable[str]:
+        return IntervalTable(
+            (int(sym.address), int(sym.address) + 1, getattr(sym, "name", "") or "")
+            for sym in cancellable(bv.get_symbols() or [])
+        )
+
+    return cached(bv, TOPIC_SYMBOLS, "by_address", build)
+
+
+def _segment_flags(seg: Any) -> str:
+    return "".join(
+        flag if getattr(seg, attr, False) else "-"
+        for flag, attr in (("r", "readable"), ("w", "writable"), ("x", "executable"))
+    )
+
+
+class _Lookup:
+    """The per-view tables ``addr.info`` needs, fetched once per call.
+
+    Each table is bisected per address; tables for fields left out of the
+    output are not fetched (or built) at all.
+    """
+
+    def __init__(self, bv: Any) -> None:
+        self.bv = bv
+        self.sections = section_table(bv)
+        self.segments = _segment_table(bv)
+        self.functions = (
+            _function_table(bv) if wanted("functions", "basic_block") else None
+        )
+        self.data_vars = _data_var_table(bv) if wanted("data_var") else None
+        self.symbols = _symbol_table(bv) if wanted("symbol", "label") else None
+        self.tags = tag_index(bv) if wanted("tags") else None
+        self.tag_row = TagEntryRows(bv)
+
+    def info(self, addr: int) -> Dict[str, Any]:
+        section = self.sections.first_containing(addr)
+        segment = self.segments.first_containing(addr)
+        out: Dict[str, Any] = {
+            "address": addr,
+            "address_hex": hex_addr(addr),
+            "section": None if section is None else section[2],
+            "segment": None if segment is None else _segment_dict(segment),
+        }
+
+        if self.functions is not None:
+            funcs: Dict[int, str] = {}
+            for _lo, _hi, (start, name) in self.functions.containing(addr):
+                funcs.setdefault(start, name)
+            out["functions"] = [
+                _function_dict(start, name, addr) for start, name in funcs.items()
+            ]
+            if wanted("basic_block"):
+                # only addresses inside some function pay for the BN lookup
+                out["basic_block"] = _basic_block(self.bv, addr) if funcs else None
+
+        if self.data_vars is not None:
+            var = self.data_vars.first_containing(addr)
+            out["data_var"] = (
+                None if var is None else _data_var_dict(self.bv, var, addr)
+            )
+
+        if self.symbols is not None:
+            # nearest symbol at or before addr, only within the same section
+            # (or segment) so a gap is not labelled after some far symbol
+            floor = section or segment
+            sym = self.symbols.preceding(addr)
+            if sym is not None and floor is not None and sym[0] >= floor[0]:
+                offset = addr - sym[0]
+                name = sym[2]
+                out["symbol"] = {
+                    "name": name,
+                    "address": sym[0],
+                    "address_hex": hex_addr(sym[0]),
+                    "offset": offset,
+                }
+                out["label"] = f"{name}+{offset:#x}" if offset else name
+            else:
+                out["symbol"] = None
+                out["label"] = hex_addr(addr)
+
+        if self.tags is not None:
+            out["tags"] = [
+                self.tag_row(entry) for entry in self.tags.range(addr, addr + 1)
+            ]
+        return out
+
+
+def _segment_dict(found: Tuple[int, int, str]) -> Dict[str, Any]:
+    start, end, flags = found
+    return {
+        "start": start,
+        "start_hex": hex_addr(start),
+        "end": end,
+        "flags": flags,
+    }
+
+
+def _function_dict(start: int, name: str, addr: int) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "address": start,
+        "address_hex": hex_addr(start),
+        "offset": addr - start,
+    }
+
+
+def _basic_block(bv: Any, addr: int) -> Optional[Dict[str, Any]]:
+    for func in bv.get_functions_containing(addr) or []:
+        get_block = getattr(func, "get_basic_block_at", None)
+        block = get_block(addr) if get_block is not None else None
+        if block is not None:
+            start, end = int(block.start), int(block.end)
+            return {
+                "start": start,
+                "start_hex": hex_addr(start),
+                "end": end,
+                "function": getattr(func, "name", "") or "",
+            }
+    return None
+
+
+def _data_var_dict(bv: Any, found: Any, addr: int) -> Dict[str, Any]:
+    start, end, _none = found
+    ty = getattr(bv.get_data_var_at(start), "type", None)
+    return {
+        "address": start,
+        "address_hex": hex_addr(start),
+        "size": end - start,
+        "offset": addr - start,
+        "type": "" if ty is None else str(ty),
+    }
+
+
+def _parse_addr(value: Any) -> int:
+    addr = parse_int(value)
+    if addr is None or addr < 0:
+        raise ValueError(f"invalid address: {value!r}")
+    return addr
+
+
+def addr_info(*, bv: Any, addr: Any) -> Dict[str, Any]:
+    """Section, segment, functions, basic block, data var, symbol and tags at addr."""
+    if bv is None:
+        raise ValueError("bv is required")
+    return _Lookup(bv).info(_parse_addr(addr))
+
+
+def addr_info_many(*, bv: Any, addrs: Any) -> List[Dict[str, Any]]:
+    """``addr.info`` for many addresses, in input order, sharing one set of tables."""
+    if bv is None:
+        raise ValueError("bv is required")
+    if isinstance(addrs, (str, int)) or addrs is None:
+        raise ValueError("addrs must be a list of addresses")
+    parsed = [_parse_addr(value) for value in addrs]
+    lookup = _Lookup(bv)
+    return [lookup.info(addr) for addr in cancellable(parsed)]
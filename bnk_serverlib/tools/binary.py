@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
+from .cancel import cancellable
 from .functions import functions_list
 from .imports import imports_list
 from .sections import sections_list
@@ -17,7 +18,7 @@ def _count_and_sample_strings(
 
     count = 0
     sample: List[Dict[str, Any]] = []
-    for sref in bv.get_strings():
+    for sref in cancellable(bv.get_strings()):
         count += 1
         if len(sample) >= sample_limit:
             continue
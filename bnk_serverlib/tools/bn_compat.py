@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Callable, TypeVar
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
 
 
 T = TypeVar("T")
@@ -44,3 +45,30 @@ def run_on_main_thread(fn: Callable[[], T]) -> T:
     except Exception:
         return fn()
     return box.get("value")  # type: ignore[return-value]
+
+
+@contextmanager
+def deferred_analysis(bv: Any) -> Iterator[None]:
+    # hold analysis and batch symbol updates where the BN version supports it
+    hold = getattr(bv, "set_analysis_hold", None)
+    held = False
+    if callable(hold):
+        try:
+            hold(True)
+            held = True
+        except Exception:
+            held = False
+
+    bulk = getattr(bv, "bulk_modify_symbols", None)
+    try:
+        if callable(bulk):
+            with bulk():
+                yield
+        else:
+            yield
+    finally:
+        if held:
+            try:
+                hold(False)
+            except Exception:
+                pass
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# the server binds one token per request thread; without a server (or for
+# requests that carry none) every helper here is a no-op
+_STATE = threading.local()
+
+
+def current() -> Optional[Any]:
+    return getattr(_STATE, "token", None)
+
+
+@contextmanager
+def bind(token: Optional[Any]) -> Iterator[None]:
+    previous = current()
+    _STATE.token = token
+    try:
+        yield
+    finally:
+        _STATE.token = previous
+
+
+def checkpoint() -> None:
+    """Raise if the current request was interrupted or ran past its deadline."""
+    token = current()
+    if token is not None:
+        token.check()
+
+
+def cancellable(items: Iterable[T], *, every: int = 256) -> Iterator[T]:
+    """Iterate items, checking for cancellation every ``every`` items."""
+    token = current()
+    if token is None:
+        yield from items
+        return
+    for index, item in enumerate(items):
+        if index % every == 0:
+            token.check()
+        yield item
+
+
+def bound_rows(rows: Iterable[T], token: Optional[Any]) -> Iterator[T]:
+    """Advance ``rows`` with ``token`` bound.
+
+    Lazy results run when the server's pager pulls the next row, long after
+    the tool returned and call_tool dropped its binding; without this,
+    cancellable() inside them would see no token.
+    """
+    it = iter(rows)
+    while True:
+        with bind(token):
+            try:
+                row = next(it)
+            except StopIteration:
+                return
+        yield row
+
+
+@contextmanager
+def on_cancel(callback: Callable[[], None]) -> Iterator[None]:
+    """Run ``callback`` (e.g. ``bv.abort_analysis``) if the request is cancelled."""
+    token = current()
+    if token is None:
+        yield
+        return
+    with token.on_cancel(callback):
+        yield
+
+
+def progress_callback() -> Optional[Callable[[int, int], bool]]:
+    """progress_func for BN searches; returning False stops the native scan."""
+    token = current()
+    if token is None:
+        return None
+    return lambda _current, _total: not token.cancelled
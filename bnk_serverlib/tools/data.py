@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .cancel import bound_rows, cancellable, current
+from .fields import requested, wanted
+from .util import hex_addr, make_text_matcher, section_locator, section_range
+
+
+def _walk(bv: Any, start: int, end: int) -> Iterator[Tuple[int, Any]]:
+    """Data variables in [start, end), in address order, one at a time.
+
+    ``get_next_data_var_start_after`` steps through the core's own ordered
+    map, so memory stays flat however many variables the view has; views
+    without it fall back to sorting the ``data_vars`` addresses.
+    """
+    next_after = getattr(bv, "get_next_data_var_start_after", None)
+    if next_after is None:
+        data_vars = bv.data_vars
+        for addr in sorted(a for a in data_vars if start <= a < end):
+            yield addr, data_vars[addr]
+        return
+
+    addr = start
+    var = bv.get_data_var_at(addr)
+    while True:
+        if var is not None:
+            yield addr, var
+        following = next_after(addr)
+        if following is None or following <= addr or following >= end:
+            return
+        addr = int(following)
+        var = bv.get_data_var_at(addr)
+
+
+def _var_name(bv: Any, addr: int, var: Any) -> str:
+    name = getattr(var, "name", None)
+    if name is None:
+        sym = bv.get_symbol_at(addr)
+        name = getattr(sym, "name", None)
+    return name or ""
+
+
+def _region(bv: Any, section: Optional[str]) -> Tuple[int, int]:
+    if section:
+        sec = section_range(bv, section)
+        if not sec:
+            raise ValueError(f"unknown section: {section}")
+        return int(sec[0]), int(sec[1])
+    return int(bv.start), int(bv.end)
+
+
+def _rows(
+    bv: Any,
+    *,
+    section: Optional[str],
+    type_pattern: Optional[str],
+    name_matches: Optional[Callable[[str], bool]],
+    limit: Optional[int],
+) -> Iterator[Dict[str, Any]]:
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be >= 0")
+    start, end = _region(bv, section)
+    type_matches = make_text_matcher(type_pattern) if type_pattern else None
+
+    # decided now: the rows are produced later, outside call_tool's bindings
+    named = name_matches is not None or wanted("name")
+    typed = type_matches is not None or wanted("type")
+    sized = requested("size")
+    auto = requested("auto_defined")
+    locate = section_locator(bv) if requested("section") else None
+
+    def generate() -> Iterator[Dict[str, Any]]:
+        if limit == 0:
+            return
+        count = 0
+        for addr, var in cancellable(_walk(bv, start, end)):
+            name = _var_name(bv, addr, var) if named else None
+            if name_matches is not None and not name_matches(name or ""):
+                continue
+            ty = getattr(var, "type", None)
+            type_text = ("" if ty is None else str(ty)) if typed else None
+            if type_matches is not None and not type_matches(type_text or ""):
+                continue
+            row: Dict[str, Any] = {"address": addr, "address_hex": hex_addr(addr)}
+            if name is not None:
+                row["name"] = name
+            if type_text is not None:
+                row["type"] = type_text
+            if sized:
+                row["size"] = int(getattr(ty, "width", 0) or 0)
+            if auto:
+                row["auto_defined"] = bool(getattr(var, "auto_defined", False))
+            if locate is not None:
+                row["section"] = locate(addr)
+            yield row
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    return bound_rows(generate(), current())
+
+
+def data_list(
+    *,
+    bv: Any,
+    section: Optional[str] = None,
+    type_pattern: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Data variables in address order, streamed; ``type_pattern`` is a substring."""
+    if bv is None:
+        raise ValueError("bv is required")
+    return _rows(
+        bv,
+        section=section,
+        type_pattern=type_pattern,
+        name_matches=None,
+        limit=limit,
+    )
+
+
+def data_like(
+    *,
+    bv: Any,
+    pattern: str,
+    section: Optional[str] = None,
+    type_pattern: Optional[str] = None,
+    case_insensitive: bool = True,
+    regex: bool = False,
+    limit: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """``data.list`` restricted to variables whose name matches ``pattern``."""
+    if bv is None:
+        raise ValueError("bv is required")
+    if pattern is None:
+        raise ValueError("pattern is required")
+    matches = make_text_matcher(pattern, case_insensitive=case_insensitive, regex=regex)
+    return _rows(
+        bv,
+        section=section,
+        type_pattern=type_pattern,
+        name_matches=matches,
+        limit=limit,
+    )
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Tuple
 
+from .cancel import on_cancel
+
 
 def analysis_update(bv: Any, mode: str) -> None:
     if bv is None:
@@ -14,7 +16,8 @@ def analysis_update(bv: Any, mode: str) -> None:
         bv.update_analysis()
         return
     if text == "wait":
-        bv.update_analysis_and_wait()
+        with on_cancel(lambda: bv.abort_analysis()):
+            bv.update_analysis_and_wait()
         return
     raise ValueError("analysis must be one of: none, update, wait")
 
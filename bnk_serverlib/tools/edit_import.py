@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .bn_compat import deferred_analysis
+from .cancel import cancellable
+from .edit_common import analysis_update, parse_type_string
+from .edit_functions import _inject_name
+from .util import parse_int, resolve_target_addrs
+
+
+_FORMATS = {"csv", "tsv", "json", "jsonl"}
+_KINDS = {"auto", "function", "data"}
+
+_FIELD_ALIASES = {
+    "addr": "address",
+    "ea": "address",
+    "symbol": "name",
+    "proto": "type",
+    "prototype": "type",
+}
+
+
+def _detect_format(path: Path, fmt: str) -> str:
+    text = (fmt or "auto").strip().lower()
+    if text in _FORMATS:
+        return text
+    if text != "auto":
+        raise ValueError("format must be one of: auto, csv, tsv, json, jsonl")
+
+    suffix = path.suffix.lower()
+    if suffix in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    if suffix == ".json":
+        return "json"
+    if suffix == ".tsv":
+        return "tsv"
+    return "csv"
+
+
+def _normalize_row(raw: Any) -> Dict[str, Any]:
+    if not isinstance(raw, dict):
+        raise ValueError(f"expected an object per row, got {type(raw).__name__}")
+    out: Dict[str, Any] = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        name = str(key).strip().lower()
+        name = _FIELD_ALIASES.get(name, name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value == "":
+            value = None
+        out[name] = value
+    return out
+
+
+def _iter_delimited(fh: TextIO, delimiter: str) -> Iterator[Dict[str, Any]]:
+    rows = (line for line in fh if line.strip() and not line.lstrip().startswith("#"))
+    for row in csv.DictReader(rows, delimiter=delimiter):
+        yield _normalize_row(row)
+
+
+def _iter_json_lines(fh: TextIO) -> Iterator[Dict[str, Any]]:
+    for line in fh:
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        yield _normalize_row(json.loads(text))
+
+
+def _iter_json_document(fh: TextIO) -> Iterator[Dict[str, Any]]:
+    # a json document has to be parsed whole; use jsonl for streaming input
+    data = json.load(fh)
+    if isinstance(data, dict):
+        for addr, value in data.items():
+            if isinstance(value, dict):
+                row = dict(value)
+                row.setdefault("address", addr)
+            else:
+                row = {"address": addr, "name": value}
+            yield _normalize_row(row)
+        return
+    if not isinstance(data, list):
+        raise ValueError("json mapping file must be a list or an object")
+    for item in data:
+        yield _normalize_row(item)
+
+
+def _iter_rows(fh: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "csv":
+        return _iter_delimited(fh, ",")
+    if fmt == "tsv":
+        return _iter_delimited(fh, "\t")
+    if fmt == "jsonl":
+        return _iter_json_lines(fh)
+    return _iter_json_document(fh)
+
+
+class _TypeCache:
+    """Parses each distinct (kind, type string) once per import."""
+
+    def __init__(self, bv: Any) -> None:
+        self._bv = bv
+        self._parsed: Dict[Tuple[str, str], Tuple[Any, Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._parsed)
+
+    def get(self, kind: str, text: str) -> Any:
+        key = (kind, text)
+        cached = self._parsed.get(key)
+        if cached is None:
+            try:
+                cached = (self._parse(kind, text), None)
+            except Exception as exc:
+                cached = (None, str(exc) or exc.__class__.__name__)
+            self._parsed[key] = cached
+        ty, error = cached
+        if error is not None:
+            raise ValueError(f"could not parse type {text!r}: {error}")
+        return ty
+
+    def _parse(self, kind: str, text: str) -> Any:
+        if kind == "data":
+            ty, _name = parse_type_string(self._bv, text)
+            return ty
+        # prototypes usually carry their own name; only inject one when missing
+        try:
+            ty, _name = self._bv.parse_type_string(text)
+            return ty
+        except Exception:
+            injected = _inject_name(text, "__bnk_tmp")
+            if not injected:
+                raise
+            ty, _name = self._bv.parse_type_string(injected)
+            return ty
+
+
+class _Resolver:
+    """Resolves row targets against views built once per import."""
+
+    def __init__(self, bv: Any) -> None:
+        self._bv = bv
+        self._funcs_by_start: Optional[Dict[int, Any]] = None
+
+    def addresses(self, target: Any) -> List[int]:
+        addr = parse_int(target)
+        if addr is not None:
+            return [addr]
+        return resolve_target_addrs(self._bv, target)
+
+    def function_at(self, addr: int) -> Optional[Any]:
+        if self._funcs_by_start is None:
+            self._funcs_by_start = {}
+            for func in self._bv.functions:
+                start = getattr(func, "start", None)
+                if isinstance(start, int):
+                    self._funcs_by_start[start] = func
+        return self._funcs_by_start.get(addr)
+
+    def create_function(self, addr: int) -> Optional[Any]:
+        self._bv.create_user_function(addr)
+        func = self._bv.get_function_at(addr)
+        if func is not None and self._funcs_by_start is not None:
+            self._funcs_by_start[addr] = func
+        return func
+
+
+def _define_data_symbol(bv: Any, addr: int, name: str) -> None:
+    from binaryninja import Symbol
+    from binaryninja.enums import SymbolType
+
+    bv.define_user_symbol(Symbol(SymbolType.DataSymbol, addr, name))
+
+
+def symbols_import(
+    *,
+    bv: Any,
+    path: str,
+    format: str = "auto",
+    kind: str = "auto",
+    create_functions: bool = False,
+    analysis: str = "none",
+    dry_run: bool = False,
+    conflict_limit: int = 100,
+) -> Dict[str, Any]:
+    if bv is None:
+        raise ValueError("bv is required")
+    if not path:
+        raise ValueError("path is required")
+    if conflict_limit < 0:
+        raise ValueError("conflict_limit must be >= 0")
+
+    default_kind = (kind or "auto").strip().lower()
+    if default_kind not in _KINDS:
+        raise ValueError("kind must be one of: auto, function, data")
+
+    src = Path(str(path)).expanduser()
+    if not src.is_file():
+        raise ValueError(f"mapping file not found: {src}")
+    fmt = _detect_format(src, format)
+
+    types = _TypeCache(bv)
+    resolver = _Resolver(bv)
+
+    counts = {
+        "function_names": 0,
+        "function_types": 0,
+        "data_names": 0,
+        "data_types": 0,
+    }
+    rows = 0
+    skipped = 0
+    conflict_count = 0
+    conflicts: List[Dict[str, Any]] = []
+    # first occurrence wins; later rows that disagree are reported as conflicts
+    seen: Dict[Tuple[int, str, str], str] = {}
+
+    def conflict(index: int, row: Dict[str, Any], reason: str) -> None:
+        nonlocal conflict_count
+        conflict_count += 1
+        if len(conflicts) < conflict_limit:
+            conflicts.append(
+                {
+                    "row": index,
+                    "address": row.get("address"),
+                    "name": row.get("name") or "",
+                    "reason": reason,
+                }
+            )
+
+    def first_value(addr: int, row_kind: str, field: str, value: str) -> bool:
+        key = (addr, row_kind, field)
+        prev = seen.get(key)
+        if prev is None:
+            seen[key] = value
+            return True
+        if prev != value:
+            raise ValueError(f"{field} already mapped to {prev!r}")
+        return False
+
+    started = time.perf_counter()
+    with open(src, "r", encoding="utf-8", newline="") as fh, deferred_analysis(bv):
+        rows_iter = cancellable(_iter_rows(fh, fmt))
+        for index, row in enumerate(rows_iter, start=1):
+            rows += 1
+            target = row.get("address")
+            name = row.get("name")
+            type_text = None if row.get("type") is None else str(row["type"])
+            if target is None or (not name and not type_text):
+                skipped += 1
+                continue
+
+            row_kind = str(row.get("kind") or default_kind).strip().lower()
+            if row_kind not in _KINDS:
+                conflict(index, row, f"unknown kind: {row_kind}")
+                continue
+
+            addrs = resolver.addresses(target)
+            if not addrs:
+                conflict(index, row, "address not found")
+                continue
+            if len(addrs) > 1:
+                conflict(index, row, f"ambiguous target ({len(addrs)} addresses)")
+                continue
+            addr = addrs[0]
+
+            try:
+                func = None
+                if row_kind != "data":
+                    func = resolver.function_at(addr)
+                    if func is None and row_kind == "function":
+                        if not create_functions or dry_run:
+                            raise ValueError("no function at address")
+                        func = resolver.create_function(addr)
+                        if func is None:
+                            raise ValueError("could not create function")
+                applied_kind = "function" if func is not None else "data"
+
+                ty = None
+                if type_text and first_value(addr, applied_kind, "type", type_text):
+                    ty = types.get(applied_kind, type_text)
+                apply_name = bool(name) and first_value(
+                    addr, applied_kind, "name", str(name)
+                )
+            except ValueError as exc:
+                conflict(index, row, str(exc))
+                continue
+
+            if dry_run:
+                continue
+
+            try:
+                if func is not None:
+                    if apply_name:
+                        func.name = str(name)
+                        counts["function_names"] += 1
+                    if ty is not None:
+                        func.set_user_type(ty)
+                        counts["function_types"] += 1
+                else:
+                    if ty is not None:
+                        bv.define_user_data_var(addr, ty)
+                        counts["data_types"] += 1
+                    if apply_name:
+                        _define_data_symbol(bv, addr, str(name))
+                        counts["data_names"] += 1
+            except Exception as exc:
+                conflict(index, row, f"apply failed: {exc}")
+
+    if not dry_run:
+        analysis_update(bv, analysis)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "path": str(src),
+        "format": fmt,
+        "dry_run": bool(dry_run),
+        "rows": rows,
+        "applied": counts,
+        "skipped": skipped,
+        "conflicts": conflict_count,
+        "conflict_samples": conflicts,
+        "distinct_types": len(types),
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1) if elapsed > 0 else float(rows),
+    }
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+from .tag_index import refresh_tags_at
 from .util import parse_int, resolve_function
+from .view_cache import TOPIC_TAGS, muted
 
 
 def tag_data_add(
@@ -25,7 +27,9 @@ def tag_data_add(
         raise ValueError("tag_type is required")
 
     text = "" if data is None else str(data)
-    bv.add_tag(a, tag_type, text, user=bool(user))
+    with muted(TOPIC_TAGS):
+        bv.add_tag(a, tag_type, text, user=bool(user))
+        refresh_tags_at(bv, a)
     return {
         "address": a,
         "address_hex": hex(a),
@@ -53,10 +57,12 @@ def tag_data_remove_type(
     if not tag_type:
         raise ValueError("tag_type is required")
 
-    if user:
-        bv.remove_user_data_tags_of_type(a, tag_type)
-    else:
-        bv.remove_auto_data_tags_of_type(a, tag_type)
+    with muted(TOPIC_TAGS):
+        if user:
+            bv.remove_user_data_tags_of_type(a, tag_type)
+        else:
+            bv.remove_auto_data_tags_of_type(a, tag_type)
+        refresh_tags_at(bv, a)
     return {
         "address": a,
         "address_hex": hex(a),
@@ -92,7 +98,10 @@ def tag_func_add(
         if addr_int is None:
             raise ValueError("addr must be an int or int-like string")
 
-    func.add_tag(tag_type, text, addr=addr_int, auto=bool(auto))
+    with muted(TOPIC_TAGS):
+        func.add_tag(tag_type, text, addr=addr_int, auto=bool(auto))
+        if addr_int is not None:
+            refresh_tags_at(bv, addr_int)
 
     start = int(getattr(func, "start", 0) or 0)
     out = {
@@ -140,10 +149,12 @@ def tag_func_remove_type(
         else:
             func.remove_user_function_tags_of_type(tag_type)
     else:
-        if auto:
-            func.remove_auto_address_tags_of_type(addr_int, tag_type)
-        else:
-            func.remove_user_address_tags_of_type(addr_int, tag_type)
+        with muted(TOPIC_TAGS):
+            if auto:
+                func.remove_auto_address_tags_of_type(addr_int, tag_type)
+            else:
+                func.remove_user_address_tags_of_type(addr_int, tag_type)
+            refresh_tags_at(bv, addr_int)
 
     start = int(getattr(func, "start", 0) or 0)
     out = {
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+
+# call_tool binds the requested output fields per request thread; tools ask
+# ``wanted`` before computing anything expensive (types, block counts)
+_STATE = threading.local()
+
+
+def normalize_fields(fields: Any) -> Optional[List[str]]:
+    """``fields`` as a list of names; accepts a list or a comma-separated str."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        items = fields.split(",")
+    elif isinstance(fields, (list, tuple)):
+        items = [str(item) for item in fields]
+    else:
+        raise ValueError("fields must be a list or a comma-separated string")
+    out: List[str] = []
+    for item in items:
+        name = item.strip()
+        if name and name not in out:
+            out.append(name)
+    if not out:
+        raise ValueError("fields must name at least one field")
+    return out
+
+
+def current() -> Optional[FrozenSet[str]]:
+    return getattr(_STATE, "fields", None)
+
+
+@contextmanager
+def bind(
+    fields: Optional[Iterable[str]], *, also: Iterable[str] = ()
+) -> Iterator[None]:
+    """Bind the output fields; ``also`` names fields a query reads besides them."""
+    previous = (current(), getattr(_STATE, "asked", frozenset()))
+    asked = frozenset(fields or ()) | frozenset(also)
+    _STATE.fields = None if fields is None else asked
+    _STATE.asked = asked
+    try:
+        yield
+    finally:
+        _STATE.fields, _STATE.asked = previous
+
+
+def wanted(*names: str) -> bool:
+    """Whether any of ``names`` is part of the output (always, with no fields)."""
+    fields = current()
+    if fields is None:
+        return True
+    return any(name in fields for name in names)
+
+
+def requested(*names: str) -> bool:
+    """Whether any of ``names`` was asked for by name; gates opt-in fields."""
+    asked = getattr(_STATE, "asked", frozenset())
+    return any(name in asked for name in names)
+
+
+def _trim(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    return {name: record[name] for name in fields if name in record}
+
+
+def _check_known(record: Any, fields: List[str]) -> None:
+    if isinstance(record, dict) and not any(name in record for name in fields):
+        available = ", ".join(sorted(record)) or "none"
+        raise ValueError(
+            f"unknown field(s): {', '.join(fields)} (available: {available})"
+        )
+
+
+def _project_rows(rows: Iterator[Any], fields: List[str]) -> Iterator[Any]:
+    first = True
+    for row in rows:
+        if first:
+            _check_known(row, fields)
+            first = False
+        yield _trim(row, fields) if isinstance(row, dict) else row
+
+
+def project(value: Any, fields: Optional[List[str]]) -> Any:
+    """Keep only ``fields`` of a record, or of every record in a listing."""
+    if fields is None:
+        return value
+    if isinstance(value, dict):
+        _check_known(value, fields)
+        return _trim(value, fields)
+    if isinstance(value, (list, tuple)):
+        return list(_project_rows(iter(value), fields))
+    if isinstance(value, Iterator):
+        return _project_rows(value, fields)
+    return value
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from .cancel import cancellable
+from .fields import requested, wanted
 from .util import (
     enum_name,
     hex_addr,
@@ -29,19 +31,22 @@ def functions_list(
     if limit is not None and limit < 0:
         raise ValueError("limit must be >= 0")
 
+    # size is opt-in: --fields total_bytes or a query sorting by it
+    sized = requested("total_bytes")
     results: List[Dict[str, Any]] = []
-    for func in bv.functions:
+    for func in cancellable(bv.functions):
         if not include_imports and _is_import_function(func):
             continue
 
         start = int(getattr(func, "start", 0) or 0)
-        results.append(
-            {
-                "name": getattr(func, "name", "") or "",
-                "start": start,
-                "start_hex": hex_addr(start),
-            }
-        )
+        row: Dict[str, Any] = {
+            "name": getattr(func, "name", "") or "",
+            "start": start,
+            "start_hex": hex_addr(start),
+        }
+        if sized:
+            row["total_bytes"] = int(getattr(func, "total_bytes", 0) or 0)
+        results.append(row)
         if limit is not None and len(results) >= limit:
             break
     return results
@@ -70,7 +75,7 @@ def functions_like(
     )
 
     results: List[Dict[str, Any]] = []
-    for func in bv.functions:
+    for func in cancellable(bv.functions):
         if not include_imports and _is_import_function(func):
             continue
         name = getattr(func, "name", "") or ""
@@ -100,27 +105,29 @@ def function_info(*, bv: Any, name_or_addr: Any) -> Dict[str, Any]:
 
     calling_conv = getattr(func, "calling_convention", None)
     arch = getattr(func, "arch", None)
+    start = int(getattr(func, "start", 0) or 0)
 
-    total_bytes = int(getattr(func, "total_bytes", 0) or 0)
-    total_bytes_hex = hex_addr(total_bytes)
-
-    try:
-        basic_blocks = len(list(func.basic_blocks))
-    except Exception:
-        basic_blocks = 0
-
-    return {
+    out: Dict[str, Any] = {
         "name": getattr(func, "name", "") or "",
-        "address": int(getattr(func, "start", 0) or 0),
-        "address_hex": hex_addr(int(getattr(func, "start", 0) or 0)),
+        "address": start,
+        "address_hex": hex_addr(start),
         "arch": getattr(arch, "name", "") or "",
         "calling_convention": getattr(calling_conv, "name", "") or "",
-        "total_bytes": total_bytes,
-        "total_bytes_hex": total_bytes_hex,
-        "basic_blocks": basic_blocks,
-        "too_large": bool(getattr(func, "too_large", False)),
-        "type": str(getattr(func, "type", "")),
     }
+    # block walks and type rendering dominate; skip them unless requested
+    if wanted("total_bytes", "total_bytes_hex"):
+        total_bytes = int(getattr(func, "total_bytes", 0) or 0)
+        out["total_bytes"] = total_bytes
+        out["total_bytes_hex"] = hex_addr(total_bytes)
+    if wanted("basic_blocks"):
+        try:
+            out["basic_blocks"] = len(list(func.basic_blocks))
+        except Exception:
+            out["basic_blocks"] = 0
+    out["too_large"] = bool(getattr(func, "too_large", False))
+    if wanted("type"):
+        out["type"] = str(getattr(func, "type", ""))
+    return out
 
 
 def function_callers(
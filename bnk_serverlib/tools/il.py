@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, Iterator, Optional
 
+from .cancel import cancellable
 from .util import hex_addr, resolve_function
 
 
@@ -72,7 +73,7 @@ def _collect_text(
     lines: Iterable[str], *, max_lines: Optional[int]
 ) -> tuple[str, int, bool]:
     out: list[str] = []
-    for idx, line in enumerate(lines):
+    for idx, line in enumerate(cancellable(lines)):
         if max_lines is not None and idx >= max_lines:
             return "\n".join(out), len(out), True
         out.append(line)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from .cancel import cancellable
 from .util import enum_name, hex_addr, make_text_matcher
 
 
@@ -13,8 +14,7 @@ def _import_symbols(bv: Any):
             syms = bv.get_symbols_of_type(sym_type) or []
         except Exception:
             continue
-        for sym in syms:
-            yield sym
+        yield from cancellable(syms)
 
 
 def imports_list(*, bv: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
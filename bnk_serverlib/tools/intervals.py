@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import bisect
+from typing import Generic, Iterable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class IntervalTable(Generic[V]):
+    """Half-open [start, end) spans sorted by start, for address lookups.
+
+    Spans may overlap (functions sharing blocks, nested data); ``max_end``
+    holds the furthest end seen so far, so a lookup walks back from its bisect
+    point only while an earlier span can still reach the address.
+    """
+
+    def __init__(self, spans: Iterable[Tuple[int, int, V]]) -> None:
+        ordered = sorted(
+            (span for span in spans if span[1] > span[0]), key=lambda s: s[0]
+        )
+        self.starts = [start for start, _end, _value in ordered]
+        self.ends = [end for _start, end, _value in ordered]
+        self.values = [value for _start, _end, value in ordered]
+        self.max_end: List[int] = []
+        furthest = 0
+        for end in self.ends:
+            furthest = max(furthest, end)
+            self.max_end.append(furthest)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def containing(self, addr: int) -> List[Tuple[int, int, V]]:
+        """Every span holding ``addr``, innermost (latest start) first."""
+        out: List[Tuple[int, int, V]] = []
+        i = bisect.bisect_right(self.starts, addr) - 1
+        while i >= 0 and self.max_end[i] > addr:
+            if self.ends[i] > addr:
+                out.append((self.starts[i], self.ends[i], self.values[i]))
+            i -= 1
+        return out
+
+    def first_containing(self, addr: int) -> Optional[Tuple[int, int, V]]:
+        found = self.containing(addr)
+        return found[0] if found else None
+
+    def preceding(self, addr: int) -> Optional[Tuple[int, int, V]]:
+        """The span with the greatest start <= ``addr``, holding it or not."""
+        i = bisect.bisect_right(self.starts, addr) - 1
+        if i < 0:
+            return None
+        return self.starts[i], self.ends[i], self.values[i]
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import heapq
+import operator
+import re
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .cancel import cancellable
+
+# post-processing applied by call_tool to list results, so "top 50 largest
+# functions" or "strings per section" only ship the rows that answer it:
+#
+#   {"where": "size >= 0x100 and name ~ '^sub_'", "sort": "-size", "limit": 50}
+#   {"group_by": "section", "sum": ["length"], "sort": "-count"}
+#
+# order: where -> group_by -> sort -> limit; sort + limit keeps a k-sized heap
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<number>0[xX][0-9a-fA-F]+|-?\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<op>==|!=|<=|>=|!~|<|>|~|\(|\))
+      | (?P<name>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"and", "or", "not"}
+_CONSTANTS = {"true": True, "false": False, "null": None}
+
+_COMPARE: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens: List[Tuple[str, Any]] = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"invalid where expression near: {text[pos:]!r}")
+        pos = match.end()
+        kind = match.lastgroup or ""
+        raw = match.group(kind)
+        if kind == "number":
+            value: Any = float(raw) if "." in raw else int(raw, 0)
+            tokens.append(("value", value))
+        elif kind == "string":
+            tokens.append(("value", re.sub(r"\\(.)", r"\1", raw[1:-1])))
+        elif kind == "name" and raw.lower() in _KEYWORDS:
+            tokens.append((raw.lower(), raw))
+        elif kind == "name" and raw.lower() in _CONSTANTS:
+            tokens.append(("value", _CONSTANTS[raw.lower()]))
+        else:
+            tokens.append((kind, raw))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over ``or`` / ``and`` / ``not`` / comparisons."""
+
+    def __init__(self, text: str) -> None:
+        self._tokens = _tokenize(text)
+        self._pos = 0
+        self.fields: List[str] = []
+
+    def parse(self) -> Predicate:
+        if not self._tokens:
+            raise ValueError("where expression is empty")
+        predicate = self._or()
+        if self._pos != len(self._tokens):
+            raise ValueError(f"unexpected {self._tokens[self._pos][1]!r} in where")
+        return predicate
+
+    def _peek(self) -> Optional[Tuple[str, Any]]:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _take(self, kind: Optional[str] = None) -> Tuple[str, Any]:
+        token = self._peek()
+        if token is None or (kind is not None and token[0] != kind):
+            want = kind or "a term"
+            raise ValueError(f"where expression ended early, expected {want}")
+        self._pos += 1
+        return token
+
+    def _or(self) -> Predicate:
+        terms = [self._and()]
+        while self._peek() is not None and self._peek()[0] == "or":
+            self._take()
+            terms.append(self._and())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda row: any(term(row) for term in terms)
+
+    def _and(self) -> Predicate:
+        terms = [self._not()]
+        while self._peek() is not None and self._peek()[0] == "and":
+            self._take()
+            terms.append(self._not())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda row: all(term(row) for term in terms)
+
+    def _not(self) -> Predicate:
+        if self._peek() is not None and self._peek()[0] == "not":
+            self._take()
+            inner = self._not()
+            return lambda row: not inner(row)
+        return self._atom()
+
+    def _atom(self) -> Predicate:
+        token = self._peek()
+        if token is not None and token == ("op", "("):
+            self._take()
+            inner = self._or()
+            if self._take("op")[1] != ")":
+                raise ValueError("unbalanced parentheses in where")
+            return inner
+        name = str(self._take("name")[1])
+        if name not in self.fields:
+            self.fields.append(name)
+        nxt = self._peek()
+        if nxt is None or nxt[0] != "op" or nxt[1] in ("(", ")"):
+            # a bare field tests truthiness: "is_import", "not auto"
+            return lambda row: bool(row.get(name))
+        op = str(self._take("op")[1])
+        value = self._take("value")[1]
+        if op in ("~", "!~"):
+            pattern = re.compile(str(value))
+            negate = op == "!~"
+
+            def matches(row: Dict[str, Any]) -> bool:
+                field = row.get(name)
+                found = field is not None and pattern.search(str(field)) is not None
+                return found != negate
+
+            return matches
+        compare = _COMPARE[op]
+
+        def compares(row: Dict[str, Any]) -> bool:
+            try:
+                return bool(compare(row.get(name), value))
+            except TypeError:
+                # None or mixed types never satisfy an ordering
+                return False
+
+        return compares
+
+
+def parse_where(text: str) -> Tuple[Predicate, List[str]]:
+    """Compile a where expression; returns the predicate and the fields it reads."""
+    parser = _Parser(str(text))
+    return parser.parse(), parser.fields
+
+
+def _sort_keys(spec: Any) -> List[Tuple[str, bool]]:
+    """``"-size,name"`` or ``["-size", "name"]`` -> [(field, descending)]."""
+    items = spec.split(",") if isinstance(spec, str) else list(spec)
+    keys: List[Tuple[str, bool]] = []
+    for item in items:
+        text = str(item).strip()
+        descending = text.startswith("-")
+        name = text.lstrip("+-").strip()
+        if name:
+            keys.append((name, descending))
+    if not keys:
+        raise ValueError("sort must name at least one field")
+    return keys
+
+
+def _str_list(value: Any, what: str) -> List[str]:
+    items = value.split(",") if isinstance(value, str) else list(value or ())
+    out = [str(item).strip() for item in items if str(item).strip()]
+    if value is not None and not out:
+        raise ValueError(f"{what} must name at least one field")
+    return out
+
+
+class _SortKey:
+    """Per-field ascending/descending order with missing values always last."""
+
+    __slots__ = ("values", "keys")
+
+    def __init__(self, row: Dict[str, Any], keys: List[Tuple[str, bool]]) -> None:
+        self.values = [row.get(name) for name, _desc in keys]
+        self.keys = keys
+
+    def __lt__(self, other: "_SortKey") -> bool:
+        for (_name, desc), a, b in zip(self.keys, self.values, other.values):
+            if a == b:
+                continue
+            if a is None or b is None:
+                return b is None
+            try:
+                return a > b if desc else a < b
+            except TypeError:
+                a, b = str(a), str(b)
+                if a == b:
+                    continue
+                return a > b if desc else a < b
+        return False
+
+
+@dataclass(frozen=True)
+class Query:
+    where: Optional[Predicate] = None
+    sort: Tuple[Tuple[str, bool], ...] = ()
+    limit: Optional[int] = None
+    group_by: Tuple[str, ...] = ()
+    sums: Tuple[str, ...] = ()
+    # every field the query reads, so tools do not skip them (see fields.py)
+    reads: Tuple[str, ...] = ()
+
+    def apply(self, rows: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        out: Iterable[Dict[str, Any]] = (
+            _record(row) for row in cancellable(rows, every=256)
+        )
+        if self.where is not None:
+            out = filter(self.where, out)
+        if self.group_by:
+            out = self._grouped(out)
+        if self.sort:
+            keys = list(self.sort)
+            if self.limit is not None:
+                return iter(
+                    heapq.nsmallest(self.limit, out, key=lambda r: _SortKey(r, keys))
+                )
+            return iter(sorted(out, key=lambda r: _SortKey(r, keys)))
+        if self.limit is not None:
+            return islice(out, self.limit)
+        return iter(out)
+
+    def _grouped(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        groups: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for row in rows:
+            key = tuple(_hashable(row.get(name)) for name in self.group_by)
+            group = groups.get(key)
+            if group is None:
+                group = {name: row.get(name) for name in self.group_by}
+                group["count"] = 0
+                for name in self.sums:
+                    group[f"sum_{name}"] = 0
+                groups[key] = group
+            group["count"] += 1
+            for name in self.sums:
+                value = row.get(name)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    group[f"sum_{name}"] += value
+        return iter(groups.values())
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    if not isinstance(row, dict):
+        raise ValueError("query needs a tool that returns records (dicts)")
+    return row
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+def parse_query(spec: Any) -> Optional[Query]:
+    """Build a Query from its json form; ``None`` means no post-processing."""
+    if spec is None:
+        return None
+    if not isinstance(spec, dict):
+        raise ValueError("query must be a json object")
+    unknown = sorted(set(spec) - {"where", "sort", "limit", "group_by", "sum"})
+    if unknown:
+        raise ValueError(f"unknown query key(s): {', '.join(unknown)}")
+
+    reads: List[str] = []
+    where = None
+    if spec.get("where"):
+        where, where_fields = parse_where(spec["where"])
+        reads.extend(where_fields)
+    sort = _sort_keys(spec["sort"]) if spec.get("sort") else []
+    group_by = _str_list(spec.get("group_by"), "group_by")
+    sums = _str_list(spec.get("sum"), "sum")
+    if sums and not group_by:
+        raise ValueError("sum needs group_by")
+    limit = spec.get("limit")
+    if limit is not None:
+        limit = int(limit)
+        if limit < 0:
+            raise ValueError("limit must be >= 0")
+
+    for name in [*group_by, *sums, *(name for name, _desc in sort)]:
+        if name not in reads:
+            reads.append(name)
+    return Query(
+        where=where,
+        sort=tuple(sort),
+        limit=limit,
+        group_by=tuple(group_by),
+        sums=tuple(sums),
+        reads=tuple(reads),
+    )
+
+
+def run_query(value: Any, query: Optional[Query]) -> Any:
+    if query is None:
+        return value
+    if isinstance(value, (dict, str)) or not isinstance(value, Iterable):
+        raise ValueError("query needs a tool that returns a list of records")
+    if isinstance(value, (list, tuple)):
+        return list(query.apply(value))
+    return query.apply(value)
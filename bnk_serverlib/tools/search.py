@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .cancel import cancellable
+from .imports import _import_symbols
+from .symbols import symbol_types
+from .util import enum_name, hex_addr
+
+KINDS = ("functions", "imports", "symbols", "strings")
+
+# text -> indexes of the patterns found in it
+MultiMatcher = Callable[[str], Set[int]]
+
+
+class _Automaton:
+    """Aho-Corasick over plain substrings: one walk per text finds every needle."""
+
+    def __init__(self, needles: List[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, needle in enumerate(needles):
+            node = 0
+            for ch in needle:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (index,)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: Set[int] = set(out[0])
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                hits.update(out[node])
+        return hits
+
+
+def make_multi_matcher(
+    patterns: List[str], *, case_insensitive: bool = True, regex: bool = False
+) -> MultiMatcher:
+    """One matcher for many patterns, instead of a make_text_matcher each."""
+    if not regex:
+        needles = [p.lower() for p in patterns] if case_insensitive else patterns
+        automaton = _Automaton(needles)
+        if case_insensitive:
+            return lambda text: automaton.find(text.lower())
+        return automaton.find
+
+    flags = re.IGNORECASE if case_insensitive else 0
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern, flags))
+        except re.error as exc:
+            raise ValueError(f"invalid regex pattern {pattern!r}: {exc}") from exc
+    try:
+        # a single alternation rejects most texts in one C-level scan
+        combined: Optional[re.Pattern] = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in patterns), flags
+        )
+    except re.error:
+        # backreferences renumber once combined; test each pattern instead
+        combined = None
+
+    def matches(text: str) -> Set[int]:
+        if combined is not None and combined.search(text) is None:
+            return set()
+        return {i for i, rx in enumerate(compiled) if rx.search(text) is not None}
+
+    return matches
+
+
+def _pattern_list(patterns: Any) -> List[str]:
+    if isinstance(patterns, str):
+        items: Iterable[Any] = patterns.splitlines()
+    elif isinstance(patterns, (list, tuple)):
+        items = patterns
+    else:
+        raise ValueError("patterns must be a list or a newline-separated string")
+    out: List[str] = []
+    for item in items:
+        text = str(item)
+        if text and text not in out:
+            out.append(text)
+    if not out:
+        raise ValueError("patterns is required")
+    return out
+
+
+def _kind_list(kinds: Any) -> List[str]:
+    if kinds is None:
+        return list(KINDS)
+    items = kinds.split(",") if isinstance(kinds, str) else list(kinds)
+    out = [str(item).strip().lower() for item in items if str(item).strip()]
+    unknown = sorted(set(out) - set(KINDS))
+    if unknown or not out:
+        raise ValueError(f"kinds must be drawn from: {', '.join(KINDS)}")
+    return out
+
+
+def _symbol_record(kind: str, sym: Any) -> Tuple[str, Dict[str, Any]]:
+    name = getattr(sym, "name", "") or ""
+    addr = getattr(sym, "address", None)
+    return name, {
+        "kind": kind,
+        "name": name,
+        "address": addr,
+        "address_hex": hex_addr(addr),
+        "type": enum_name(getattr(sym, "type", None)),
+    }
+
+
+def _candidates(
+    bv: Any, kind: str, symbol_type: str
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    if kind == "functions":
+        for func in cancellable(bv.functions):
+            name = getattr(func, "name", "") or ""
+            start = int(getattr(func, "start", 0) or 0)
+            yield name, {
+                "kind": "function",
+                "name": name,
+                "start": start,
+                "start_hex": hex_addr(start),
+            }
+    elif kind == "imports":
+        for sym in _import_symbols(bv):
+            yield _symbol_record("import", sym)
+    elif kind == "symbols":
+        for sym_type in symbol_types(symbol_type):
+            try:
+                syms = bv.get_symbols_of_type(sym_type) or []
+            except Exception:
+                continue
+            for sym in cancellable(syms):
+                yield _symbol_record("symbol", sym)
+    else:
+        for sref in cancellable(bv.get_strings()):
+            value = str(sref.value)
+            yield value, {
+                "kind": "string",
+                "address": sref.start,
+                "address_hex": hex_addr(sref.start),
+                "value": value,
+                "length": sref.length,
+            }
+
+
+def search_many(
+    *,
+    bv: Any,
+    patterns: Any,
+    kinds: Any = None,
+    symbol_type: str = "data",
+    case_insensitive: bool = True,
+    regex: bool = False,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    if bv is None:
+        raise ValueError("bv is required")
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be >= 0")
+
+    needles = _pattern_list(patterns)
+    wanted_kinds = _kind_list(kinds)
+    if "symbols" in wanted_kinds:
+        # reject a bad symbol_type before walking anything
+        symbol_types(symbol_type)
+    matcher = make_multi_matcher(
+        needles, case_insensitive=case_insensitive, regex=regex
+    )
+
+    grouped: List[List[Dict[str, Any]]] = [[] for _ in needles]
+    # stop walking once every pattern has its limit
+    open_patterns = 0 if limit == 0 else len(needles)
+    for kind in wanted_kinds:
+        if open_patterns == 0:
+            break
+        for text, record in _candidates(bv, kind, symbol_type):
+            for index in matcher(text):
+                bucket = grouped[index]
+                if limit is not None and len(bucket) >= limit:
+                    continue
+                bucket.append(record)
+                if limit is not None and len(bucket) == limit:
+                    open_patterns -= 1
+            if open_patterns == 0:
+                break
+
+    return [
+        {"pattern": pattern, "count": len(bucket), "matches": bucket}
+        for pattern, bucket in zip(needles, grouped)
+    ]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from .cancel import cancellable, checkpoint, progress_callback
+from .fields import requested, wanted
 from .util import (
     compile_bytes_regex,
     enum_name,
@@ -9,6 +11,7 @@ from .util import (
     make_text_matcher,
     ref_address,
     ref_function_name,
+    section_locator,
     section_range,
 )
 
@@ -59,21 +62,24 @@ def strings_like(
         start, end = sec
         length = end - start
 
+    # the containing section is opt-in (--fields section, --group-by section)
+    locate = section_locator(bv) if requested("section") else None
     matches: List[Dict[str, Any]] = []
     strings = bv.get_strings(start, length) if start is not None else bv.get_strings()
-    for sref in strings:
+    for sref in cancellable(strings):
         value = str(sref.value)
         if not matches_pattern(value):
             continue
-        matches.append(
-            {
-                "address": sref.start,
-                "address_hex": hex_addr(sref.start),
-                "value": value,
-                "type": enum_name(sref.type),
-                "length": sref.length,
-            }
-        )
+        row: Dict[str, Any] = {
+            "address": sref.start,
+            "address_hex": hex_addr(sref.start),
+            "value": value,
+            "type": enum_name(sref.type),
+            "length": sref.length,
+        }
+        if locate is not None:
+            row["section"] = locate(sref.start)
+        matches.append(row)
         if limit is not None and len(matches) >= limit:
             break
     return matches
@@ -92,6 +98,14 @@ def _extract_cstring(
     return data[before:after].decode("utf-8", errors="ignore")
 
 
+def _data_match(bv: Any, addr: int, *, max_len: int) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"address": addr, "address_hex": hex_addr(addr)}
+    # every extraction is a separate view read
+    if wanted("string"):
+        out["string"] = _extract_cstring(bv, addr, max_len=max_len)
+    return out
+
+
 def strings_like_data(
     *,
     bv: Any,
@@ -115,15 +129,9 @@ def strings_like_data(
     if regex:
         data = bytes(bv.read(start, max(0, end - start)))
         compiled = compile_bytes_regex(pattern, case_insensitive=case_insensitive)
-        for match in compiled.finditer(data):
+        for match in cancellable(compiled.finditer(data)):
             addr = start + int(match.start())
-            results.append(
-                {
-                    "address": addr,
-                    "address_hex": hex_addr(addr),
-                    "string": _extract_cstring(bv, addr, max_len=max_len),
-                }
-            )
+            results.append(_data_match(bv, addr, max_len=max_len))
             if limit is not None and len(results) >= limit:
                 break
         return results
@@ -134,16 +142,15 @@ def strings_like_data(
     flags = (
         FindFlag.FindCaseInsensitive if case_insensitive else FindFlag.FindCaseSensitive
     )
-    for addr, _buf in bv.find_all_data(start, end, needle, flags):
-        results.append(
-            {
-                "address": addr,
-                "address_hex": hex_addr(addr),
-                "string": _extract_cstring(bv, addr, max_len=max_len),
-            }
-        )
+    matches = bv.find_all_data(
+        start, end, needle, flags, progress_func=progress_callback()
+    )
+    for addr, _buf in cancellable(matches):
+        results.append(_data_match(bv, addr, max_len=max_len))
         if limit is not None and len(results) >= limit:
             break
+    # an aborted native scan ends early; report it instead of partial results
+    checkpoint()
     return results
 
 
@@ -175,14 +182,15 @@ def xrefs_to_string(
         limit=string_limit,
     )
 
+    with_refs = wanted("refs")
     results: List[Dict[str, Any]] = []
-    for match in matches:
+    for match in cancellable(matches, every=16):
         addr = match.get("address")
         if addr is None:
             continue
 
         refs: List[Dict[str, Any]] = []
-        for ref in bv.get_code_refs(addr):
+        for ref in bv.get_code_refs(addr) if with_refs else ():
             ref_addr = ref_address(ref)
             refs.append(
                 {
@@ -195,7 +203,7 @@ def xrefs_to_string(
             if xref_limit is not None and len(refs) >= xref_limit:
                 break
 
-        if xref_limit is None or len(refs) < xref_limit:
+        if with_refs and (xref_limit is None or len(refs) < xref_limit):
             for ref in bv.get_data_refs(addr):
                 ref_addr = ref_address(ref)
                 refs.append(
@@ -1,8 +1,102 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import bisect
+import fnmatch
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .cancel import cancellable
 from .util import enum_name, hex_addr, make_text_matcher
+from .view_cache import TOPIC_SYMBOLS, cached
+
+MATCH_SUBSTRING = "substring"
+MATCH_PREFIX = "prefix"
+MATCH_GLOB = "glob"
+MATCH_MODES = (MATCH_SUBSTRING, MATCH_PREFIX, MATCH_GLOB)
+
+_GLOB_CHARS = "*?["
+
+
+class NameIndex:
+    """Symbol names of one type sorted by name, plus a case-folded ordering.
+
+    Holds (name, address) pairs rather than BN ``Symbol`` objects, which
+    would keep the view alive (see tools/addr.py). Prefix lookups bisect to
+    the first candidate and stop at the first name past the prefix, so they
+    cost O(log n + k) instead of a full scan.
+    """
+
+    def __init__(self, named: List[Tuple[str, int]]) -> None:
+        named = sorted(named, key=lambda item: item[0])
+        self._names = [name for name, _addr in named]
+        self._rows = named
+        folded = sorted(
+            ((name.lower(), i) for i, (name, _addr) in enumerate(named)),
+            key=lambda item: item[0],
+        )
+        self._folded = [name for name, _i in folded]
+        self._folded_rows = [named[i] for _name, i in folded]
+
+    @classmethod
+    def build(cls, syms: Iterable[Any]) -> "NameIndex":
+        return cls(
+            [
+                (getattr(sym, "name", "") or "", int(getattr(sym, "address", 0) or 0))
+                for sym in syms
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def prefix(
+        self, prefix: str, *, case_insensitive: bool
+    ) -> Iterator[Tuple[str, int]]:
+        keys, rows = self._names, self._rows
+        if case_insensitive:
+            keys, rows, prefix = self._folded, self._folded_rows, prefix.lower()
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                return
+            yield rows[i]
+
+    def glob(
+        self, pattern: str, *, case_insensitive: bool
+    ) -> Iterator[Tuple[str, int]]:
+        # only the literal head narrows the range; the rest is matched per name
+        cut = min((pattern.find(ch) for ch in _GLOB_CHARS if ch in pattern), default=-1)
+        head = pattern if cut < 0 else pattern[:cut]
+        flags = re.IGNORECASE if case_insensitive else 0
+        compiled = re.compile(fnmatch.translate(pattern), flags)
+        for row in self.prefix(head, case_insensitive=case_insensitive):
+            if compiled.match(row[0]):
+                yield row
+
+
+def name_index(bv: Any, sym_type: Any) -> NameIndex:
+    return cached(
+        bv,
+        TOPIC_SYMBOLS,
+        ("names", enum_name(sym_type)),
+        lambda: NameIndex.build(bv.get_symbols_of_type(sym_type) or []),
+    )
+
+
+def symbol_types(symbol_type: str) -> List[Any]:
+    from binaryninja.enums import SymbolType
+
+    symbol_map = {
+        "function": [SymbolType.FunctionSymbol, SymbolType.ImportedFunctionSymbol],
+        "import": [SymbolType.ImportedFunctionSymbol],
+        "import_address": [SymbolType.ImportAddressSymbol],
+        "data": [SymbolType.DataSymbol],
+        "external": [SymbolType.ExternalSymbol],
+    }
+
+    types = symbol_map.get((symbol_type or "").lower())
+    if not types:
+        raise ValueError(f"unknown symbol_type: {symbol_type}")
+    return types
 
 
 def symbols_like(
@@ -12,6 +106,7 @@ def symbols_like(
     symbol_type: str = "function",
     case_insensitive: bool = True,
     regex: bool = False,
+    match: str = MATCH_SUBSTRING,
     limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     if bv is None:
@@ -21,19 +116,13 @@ def symbols_like(
     if limit is not None and limit < 0:
         raise ValueError("limit must be >= 0")
 
-    from binaryninja.enums import SymbolType
+    mode = (match or MATCH_SUBSTRING).strip().lower()
+    if mode not in MATCH_MODES:
+        raise ValueError(f"match must be one of: {', '.join(MATCH_MODES)}")
+    if regex and mode != MATCH_SUBSTRING:
+        raise ValueError("regex only applies to substring matching")
 
-    symbol_map = {
-        "function": [SymbolType.FunctionSymbol, SymbolType.ImportedFunctionSymbol],
-        "import": [SymbolType.ImportedFunctionSymbol],
-        "import_address": [SymbolType.ImportAddressSymbol],
-        "data": [SymbolType.DataSymbol],
-        "external": [SymbolType.ExternalSymbol],
-    }
-
-    types = symbol_map.get((symbol_type or "").lower())
-    if not types:
-        raise ValueError(f"unknown symbol_type: {symbol_type}")
+    types = symbol_types(symbol_type)
 
     matches_pattern = make_text_matcher(
         pattern,
@@ -44,22 +133,32 @@ def symbols_like(
     results: List[Dict[str, Any]] = []
     for sym_type in types:
         try:
-            syms = bv.get_symbols_of_type(sym_type) or []
+            if mode == MATCH_SUBSTRING:
+                rows = _symbol_rows(bv.get_symbols_of_type(sym_type) or [])
+            else:
+                # indexed lookups come back in name order
+                index = name_index(bv, sym_type)
+                lookup = index.prefix if mode == MATCH_PREFIX else index.glob
+                rows = lookup(pattern, case_insensitive=case_insensitive)
         except Exception:
             continue
-        for sym in syms:
-            name = getattr(sym, "name", "") or ""
-            if not matches_pattern(name):
+        type_name = enum_name(sym_type)
+        for name, addr in cancellable(rows):
+            if mode == MATCH_SUBSTRING and not matches_pattern(name):
                 continue
-            addr = getattr(sym, "address", None)
             results.append(
                 {
                     "name": name,
                     "address": addr,
                     "address_hex": hex_addr(addr),
-                    "type": enum_name(getattr(sym, "type", None)),
+                    "type": type_name,
                 }
             )
             if limit is not None and len(results) >= limit:
                 return results
     return results
+
+
+def _symbol_rows(syms: Iterable[Any]) -> Iterator[Tuple[str, Any]]:
+    for sym in syms:
+        yield getattr(sym, "name", "") or "", getattr(sym, "address", None)
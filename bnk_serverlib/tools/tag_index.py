@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import bisect
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .view_cache import TOPIC_TAGS, cached, peek
+
+
+class TagEntry(NamedTuple):
+    """One address tag, as plain values.
+
+    BN ``Tag`` objects are not kept: a core object held here would keep the
+    view alive (see tools/addr.py). Tag type details are looked up by name
+    when a caller asks for them.
+    """
+
+    address: int
+    auto: bool
+    type_name: str
+    data: str
+    tag_id: str
+
+    @classmethod
+    def of(cls, address: int, auto: bool, tag: Any) -> "TagEntry":
+        tt = getattr(tag, "type", None)
+        return cls(
+            address,
+            auto,
+            getattr(tt, "name", "") or "",
+            getattr(tag, "data", "") or "",
+            str(getattr(tag, "id", "") or ""),
+        )
+
+    @property
+    def type_key(self) -> str:
+        return self.type_name.strip().lower()
+
+
+class _Column:
+    """Entries kept sorted by address, with a parallel list for bisect."""
+
+    def __init__(self, entries: List[TagEntry]) -> None:
+        self.addrs = [entry.address for entry in entries]
+        self.entries = entries
+
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        return (
+            bisect.bisect_left(self.addrs, start),
+            bisect.bisect_left(self.addrs, end),
+        )
+
+    def replace_at(self, addr: int, entries: List[TagEntry]) -> None:
+        lo, hi = self.span(addr, addr + 1)
+        self.addrs[lo:hi] = [addr] * len(entries)
+        self.entries[lo:hi] = entries
+
+
+class TagIndex:
+    """Address tags by sorted address, overall and per (case-folded) tag type.
+
+    ``bv.get_tags`` is read once per view for user and auto tags. Each list
+    is also kept in BN's order for ``tags.list``; with ``auto=None`` an auto
+    tag that is also a user tag shows up once, as before. A range query is
+    two bisects plus the rows it returns, and edits refresh just the address
+    they touched.
+    """
+
+    def __init__(self, user: List[TagEntry], auto: List[TagEntry]) -> None:
+        self._listed: Dict[bool, List[TagEntry]] = {False: user, True: auto}
+        # stable sort: at one address, user tags come before auto tags
+        entries = sorted(user + auto, key=lambda entry: entry.address)
+        self._all = _Column(entries)
+        self._by_type: Dict[str, _Column] = {}
+        grouped: Dict[str, List[TagEntry]] = {}
+        for entry in entries:
+            grouped.setdefault(entry.type_key, []).append(entry)
+        for name, rows in grouped.items():
+            self._by_type[name] = _Column(rows)
+
+    @classmethod
+    def build(cls, bv: Any) -> "TagIndex":
+        return cls(
+            _entries(bv.get_tags(auto=False), False),
+            _entries(bv.get_tags(auto=True), True),
+        )
+
+    def __len__(self) -> int:
+        return len(self._all.entries)
+
+    def range(
+        self,
+        start: int,
+        end: int,
+        *,
+        tag_type: Optional[str] = None,
+        auto: Optional[bool] = None,
+    ) -> Iterator[TagEntry]:
+        column = self._column(tag_type)
+        if column is None:
+            return
+        lo, hi = column.span(start, end)
+        yield from _selected(column.entries[lo:hi], auto)
+
+    def entries(
+        self, *, tag_type: Optional[str] = None, auto: Optional[bool] = None
+    ) -> Iterator[TagEntry]:
+        """Tags in ``bv.get_tags`` order: user tags, then auto tags."""
+        if auto is None:
+            listed: Iterable[TagEntry] = self._listed[False] + self._listed[True]
+        else:
+            listed = self._listed[auto]
+        name = (tag_type or "").strip().lower()
+        if name:
+            listed = (entry for entry in listed if entry.type_key == name)
+        yield from _selected(listed, auto)
+
+    def refresh_at(self, bv: Any, addr: int) -> None:
+        """Re-read the tags at one address after an edit."""
+        fresh: List[TagEntry] = []
+        for auto in (False, True):
+            rows = [
+                TagEntry.of(addr, auto, tag)
+                for tag in bv.get_tags_at(addr, auto=auto) or []
+            ]
+            self._listed[auto] = _replaced(self._listed[auto], addr, rows)
+            fresh.extend(rows)
+        self._all.replace_at(addr, fresh)
+        names = set(self._by_type) | {entry.type_key for entry in fresh}
+        for name in names:
+            rows = [entry for entry in fresh if entry.type_key == name]
+            column = self._by_type.get(name)
+            if column is not None:
+                column.replace_at(addr, rows)
+            elif rows:
+                self._by_type[name] = _Column(rows)
+
+    def _column(self, tag_type: Optional[str]) -> Optional[_Column]:
+        name = (tag_type or "").strip().lower()
+        return self._by_type.get(name) if name else self._all
+
+
+def _entries(items: Any, auto: bool) -> List[TagEntry]:
+    out: List[TagEntry] = []
+    for addr, tag in items or []:
+        try:
+            addr_int = int(addr)
+        except Exception:
+            continue
+        out.append(TagEntry.of(addr_int, auto, tag))
+    return out
+
+
+def _selected(entries: Iterable[TagEntry], auto: Optional[bool]) -> Iterator[TagEntry]:
+    if auto is not None:
+        for entry in entries:
+            if entry.auto == auto:
+                yield entry
+        return
+    # user and auto lists can report the same tag; keep its first (user) copy
+    seen: set = set()
+    for entry in entries:
+        if entry.tag_id:
+            key = (entry.address, entry.tag_id)
+            if key in seen:
+                continue
+            seen.add(key)
+        yield entry
+
+
+def _replaced(
+    listed: List[TagEntry], addr: int, rows: List[TagEntry]
+) -> List[TagEntry]:
+    # new tags take the place of the address's old ones, or go at the end
+    at = [i for i, entry in enumerate(listed) if entry.address == addr]
+    if not at:
+        return listed + rows if rows else listed
+    kept = [entry for entry in listed if entry.address != addr]
+    first = at[0]
+    return kept[:first] + rows + kept[first:]
+
+
+def tag_index(bv: Any) -> TagIndex:
+    return cached(bv, TOPIC_TAGS, "address", lambda: TagIndex.build(bv))
+
+
+def refresh_tags_at(bv: Any, addr: int) -> None:
+    """Keep a built index current after an edit tool changed tags at ``addr``."""
+    index = peek(bv, TOPIC_TAGS, "address")
+    if index is not None:
+        index.refresh_at(bv, addr)
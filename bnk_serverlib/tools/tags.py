@@ -2,7 +2,16 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from .util import enum_name, hex_addr, parse_int, resolve_function
+from .cancel import cancellable
+from .fields import wanted
+from .tag_index import TagEntry, tag_index
+from .util import (
+    enum_name,
+    function_ranges,
+    hex_addr,
+    parse_int,
+    resolve_function,
+)
 
 
 def _tag_type_name(tag: Any) -> str:
@@ -20,26 +29,6 @@ def _tag_unique_key(
     return (address, tid_str)
 
 
-def _tags_union(
-    user_items: list[tuple[Any, Any]],
-    auto_items: list[tuple[Any, Any]],
-) -> list[tuple[Any, Any]]:
-    seen: set[tuple[Optional[int], str]] = set()
-    out: list[tuple[Any, Any]] = []
-    for addr, tag in list(user_items) + list(auto_items):
-        addr_int: Optional[int]
-        try:
-            addr_int = int(addr)
-        except Exception:
-            addr_int = None
-        key = _tag_unique_key(tag, address=addr_int)
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append((addr, tag))
-    return out
-
-
 def tags_types(*, bv: Any) -> List[Dict[str, Any]]:
     if bv is None:
         raise ValueError("bv is required")
@@ -72,21 +61,73 @@ def tags_types(*, bv: Any) -> List[Dict[str, Any]]:
 
 def _tag_dict(tag: Any, *, address: Optional[int] = None) -> Dict[str, Any]:
     tt = getattr(tag, "type", None)
-    out = {
-        "tag_type": getattr(tt, "name", "") or "",
-        "tag_icon": getattr(tt, "icon", "") or "",
-        "tag_id": getattr(tag, "id", "") or "",
-        "tag_data": getattr(tag, "data", "") or "",
-        "tag_type_id": getattr(tt, "id", "") or "",
-        "tag_type_type": enum_name(getattr(tt, "type", None)),
-        "tag_type_visible": bool(getattr(tt, "visible", False)),
-    }
+    out: Dict[str, Any] = {"tag_type": getattr(tt, "name", "") or ""}
+    # each attribute is a core call; only fetch what the caller asked for
+    if wanted("tag_icon"):
+        out["tag_icon"] = getattr(tt, "icon", "") or ""
+    if wanted("tag_id"):
+        out["tag_id"] = getattr(tag, "id", "") or ""
+    if wanted("tag_data"):
+        out["tag_data"] = getattr(tag, "data", "") or ""
+    if wanted("tag_type_id"):
+        out["tag_type_id"] = getattr(tt, "id", "") or ""
+    if wanted("tag_type_type"):
+        out["tag_type_type"] = enum_name(getattr(tt, "type", None))
+    if wanted("tag_type_visible"):
+        out["tag_type_visible"] = bool(getattr(tt, "visible", False))
     if address is not None:
         out["address"] = address
         out["address_hex"] = hex_addr(address)
     return out
 
 
+_TYPE_DETAILS = ("tag_icon", "tag_type_id", "tag_type_type", "tag_type_visible")
+
+
+class TagEntryRows:
+    """``_tag_dict`` for tag index entries.
+
+    The index keeps names, not BN objects; the tag type is looked up by
+    name, once per call, and only when a type detail field is wanted.
+    """
+
+    def __init__(self, bv: Any) -> None:
+        self._bv = bv
+        self._types: Dict[str, Any] = {}
+        self._details = wanted(*_TYPE_DETAILS)
+
+    def __call__(self, entry: TagEntry) -> Dict[str, Any]:
+        tt = self._type(entry.type_name) if self._details else None
+        out: Dict[str, Any] = {"tag_type": entry.type_name}
+        if wanted("tag_icon"):
+            out["tag_icon"] = getattr(tt, "icon", "") or ""
+        if wanted("tag_id"):
+            out["tag_id"] = entry.tag_id
+        if wanted("tag_data"):
+            out["tag_data"] = entry.data
+        if wanted("tag_type_id"):
+            out["tag_type_id"] = getattr(tt, "id", "") or ""
+        if wanted("tag_type_type"):
+            out["tag_type_type"] = enum_name(getattr(tt, "type", None))
+        if wanted("tag_type_visible"):
+            out["tag_type_visible"] = bool(getattr(tt, "visible", False))
+        out["address"] = entry.address
+        out["address_hex"] = hex_addr(entry.address)
+        return out
+
+    def _type(self, name: str) -> Any:
+        if name not in self._types:
+            get_tag_type = getattr(self._bv, "get_tag_type", None)
+            if get_tag_type is not None:
+                found = get_tag_type(name)
+            else:
+                found = (getattr(self._bv, "tag_types", {}) or {}).get(name)
+            if isinstance(found, list):
+                found = found[0] if found else None
+            self._types[name] = found
+        return self._types[name]
+
+
 def tags_list(
     *,
     bv: Any,
@@ -99,27 +140,11 @@ def tags_list(
     if limit is not None and limit < 0:
         raise ValueError("limit must be >= 0")
 
-    type_filter = (tag_type or "").strip().lower() or None
-
+    row = TagEntryRows(bv)
     results: List[Dict[str, Any]] = []
-    if auto is None:
-        items = _tags_union(
-            list(bv.get_tags(auto=False) or []),
-            list(bv.get_tags(auto=True) or []),
-        )
-    else:
-        items = list(bv.get_tags(auto=auto) or [])
-
-    for addr, tag in items:
-        if type_filter:
-            if _tag_type_name(tag).lower() != type_filter:
-                continue
-        addr_int: Optional[int]
-        try:
-            addr_int = int(addr)
-        except Exception:
-            addr_int = None
-        results.append(_tag_dict(tag, address=addr_int))
+    entries = tag_index(bv).entries(tag_type=tag_type, auto=auto)
+    for entry in cancellable(entries):
+        results.append(row(entry))
         if limit is not None and len(results) >= limit:
             break
     return results
@@ -217,3 +242,79 @@ def tags_function(
         "address_hex": hex_addr(start),
         "tags": out_tags,
     }
+
+
+def tags_range(
+    *,
+    bv: Any,
+    start: Any,
+    end: Any,
+    tag_type: Optional[str] = None,
+    auto: Optional[bool] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    if bv is None:
+        raise ValueError("bv is required")
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be >= 0")
+
+    lo, hi = parse_int(start), parse_int(end)
+    if lo is None or hi is None:
+        raise ValueError("start and end must be ints or int-like strings")
+    if hi < lo:
+        raise ValueError("end must be >= start")
+
+    row = TagEntryRows(bv)
+    results: List[Dict[str, Any]] = []
+    for entry in tag_index(bv).range(lo, hi, tag_type=tag_type, auto=auto):
+        results.append(row(entry))
+        if limit is not None and len(results) >= limit:
+            break
+    return results
+
+
+def tags_rollup(
+    *,
+    bv: Any,
+    name_or_addr: Any = None,
+    tag_type: Optional[str] = None,
+    auto: Optional[bool] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Address-tag counts per function, by tag type; untagged functions are left out."""
+    if bv is None:
+        raise ValueError("bv is required")
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be >= 0")
+
+    if name_or_addr is not None:
+        func = resolve_function(bv, name_or_addr)
+        if func is None:
+            raise ValueError("function not found")
+        funcs: Any = [func]
+    else:
+        funcs = bv.functions
+
+    index = tag_index(bv)
+    results: List[Dict[str, Any]] = []
+    for func in cancellable(funcs):
+        by_type: Dict[str, int] = {}
+        for lo, hi in function_ranges(func):
+            for entry in index.range(lo, hi, tag_type=tag_type, auto=auto):
+                name = entry.type_name.strip()
+                by_type[name] = by_type.get(name, 0) + 1
+        if not by_type:
+            continue
+        start = int(getattr(func, "start", 0) or 0)
+        results.append(
+            {
+                "function": getattr(func, "name", "") or "",
+                "address": start,
+                "address_hex": hex_addr(start),
+                "count": sum(by_type.values()),
+                "by_type": dict(sorted(by_type.items())),
+            }
+        )
+        if limit is not None and len(results) >= limit:
+            break
+    return results
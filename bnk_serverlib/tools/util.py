@@ -3,6 +3,9 @@ from __future__ import annotations
 import re
 from typing import Any, Callable, Optional, Pattern
 
+from .intervals import IntervalTable
+from .view_cache import TOPIC_LAYOUT, cached
+
 
 def hex_addr(value: Any) -> str:
     if not isinstance(value, int):
@@ -42,14 +45,54 @@ def parse_int(value: Any) -> Optional[int]:
         return None
 
 
+def section_table(bv: Any) -> IntervalTable[str]:
+    """Section names by address, built once per view (tools/view_cache.py)."""
+    return cached(
+        bv,
+        TOPIC_LAYOUT,
+        "sections",
+        lambda: IntervalTable(
+            (int(s.start), int(s.end), s.name) for s in bv.sections.values()
+        ),
+    )
+
+
 def section_range(bv: Any, name: str) -> Optional[tuple[int, int]]:
     if not name:
         return None
-    sections = {s.name.lower(): s for s in bv.sections.values()}
-    sec = sections.get(name.lower())
-    if not sec:
-        return None
-    return sec.start, sec.end
+    sections = cached(
+        bv,
+        TOPIC_LAYOUT,
+        "section_names",
+        lambda: {
+            s.name.lower(): (int(s.start), int(s.end)) for s in bv.sections.values()
+        },
+    )
+    return sections.get(name.lower())
+
+
+def section_locator(bv: Any) -> Callable[[int], Optional[str]]:
+    """addr -> containing section name, bisecting the cached section table."""
+    table = section_table(bv)
+
+    def locate(addr: int) -> Optional[str]:
+        found = table.first_containing(addr)
+        return None if found is None else found[2]
+
+    return locate
+
+
+def function_ranges(func: Any) -> list[tuple[int, int]]:
+    """[start, end) address ranges of a function; its extent when BN has none."""
+    ranges = [
+        (int(r.start), int(r.end))
+        for r in getattr(func, "address_ranges", None) or []
+        if getattr(r, "start", None) is not None
+    ]
+    if ranges:
+        return ranges
+    start = int(getattr(func, "start", 0) or 0)
+    return [(start, start + max(1, int(getattr(func, "total_bytes", 0) or 0)))]
 
 
 def resolve_target_addrs(bv: Any, target: Any) -> list[int]:
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# indexes built from a view and kept for the life of the session; the loaded
+# serverlib stays imported between tool calls (server/plugin/serverlib.py), so
+# module state here outlives a single request. entries are keyed by
+# (topic, detail) and a topic is dropped whenever BN reports a change to it or
+# a write tool that does not maintain it runs.
+TOPIC_SYMBOLS = "symbols"
+TOPIC_TAGS = "tags"
+TOPIC_LAYOUT = "layout"
+TOPIC_FUNCTIONS = "functions"
+TOPIC_DATA_VARS = "data_vars"
+
+# guards _VIEWS only; each view's entries have their own lock
+_LOCK = threading.Lock()
+_MUTED = threading.local()
+_VIEWS: "weakref.WeakKeyDictionary[Any, _ViewState]" = weakref.WeakKeyDictionary()
+
+# BN notifications (binaryninja.enums.NotificationType) each topic depends on;
+# a view's watcher only asks for the ones of topics it has built entries for
+_NOTIFICATIONS: Dict[str, Tuple[str, ...]] = {
+    TOPIC_SYMBOLS: ("SymbolAdded", "SymbolUpdated", "SymbolRemoved"),
+    TOPIC_TAGS: ("TagAdded", "TagUpdated", "TagRemoved"),
+    TOPIC_LAYOUT: (
+        "SectionAdded",
+        "SectionRemoved",
+        "SectionUpdated",
+        "SegmentAdded",
+        "SegmentRemoved",
+        "SegmentUpdated",
+    ),
+    # the function table carries names, so symbol changes count too
+    TOPIC_FUNCTIONS: (
+        "FunctionAdded",
+        "FunctionRemoved",
+        "FunctionUpdated",
+        "SymbolAdded",
+        "SymbolUpdated",
+        "SymbolRemoved",
+    ),
+    TOPIC_DATA_VARS: (
+        "DataVariableAdded",
+        "DataVariableRemoved",
+        "DataVariableUpdated",
+    ),
+}
+
+
+class _ViewState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple[str, Hashable], Any] = {}
+        self.generation: Dict[str, int] = {}
+        # topics BN reported a change to. BN's callbacks only add to this
+        # set, without taking a lock; the next reader applies it (_settle)
+        self.dirty: Set[str] = set()
+        self.watcher: Optional[Any] = None
+        self.watched: FrozenSet[str] = frozenset()
+
+
+def _state(bv: Any, *, create: bool = True) -> Optional[_ViewState]:
+    try:
+        with _LOCK:
+            state = _VIEWS.get(bv)
+            if state is None and create:
+                state = _VIEWS[bv] = _ViewState()
+            return state
+    except TypeError:
+        # not weak-referenceable: nothing is cached for this view
+        return None
+
+
+def _settle(state: _ViewState) -> None:
+    """Apply the changes BN reported since the last call; holds state.lock."""
+    while state.dirty:
+        try:
+            topic = state.dirty.pop()
+        except KeyError:
+            return
+        _drop(state, {topic})
+
+
+def _drop(state: _ViewState, topics: Iterable[str]) -> None:
+    topics = set(topics)
+    for key in [key for key in state.entries if key[0] in topics]:
+        del state.entries[key]
+    for name in topics:
+        state.generation[name] = state.generation.get(name, 0) + 1
+
+
+def cached(bv: Any, topic: str, detail: Hashable, build: Callable[[], T]) -> T:
+    """The entry for (topic, detail), built on first use after a change."""
+    key = (topic, detail)
+    state = _state(bv)
+    if state is None:
+        return build()
+    with state.lock:
+        _settle(state)
+        if key in state.entries:
+            return state.entries[key]
+        generation = state.generation.setdefault(topic, 0)
+    # watch before building so a change made meanwhile is seen
+    _watch(bv, state, topic)
+    # built unlocked (it walks the view); a change meanwhile discards it
+    value = build()
+    with state.lock:
+        _settle(state)
+        if state.generation.get(topic, 0) == generation:
+            state.entries.setdefault(key, value)
+            return state.entries[key]
+    return value
+
+
+def peek(bv: Any, topic: str, detail: Hashable) -> Optional[Any]:
+    """The entry if it is already built; never builds one."""
+    state = _state(bv, create=False)
+    if state is None:
+        return None
+    with state.lock:
+        _settle(state)
+        return state.entries.get((topic, detail))
+
+
+@contextmanager
+def muted(topic: str) -> Iterator[None]:
+    """Ignore BN notifications for ``topic`` raised on this thread.
+
+    For edit tools that update their index entries themselves; the change
+    they make would otherwise throw the whole index away.
+    """
+    previous = getattr(_MUTED, "topics", frozenset())
+    _MUTED.topics = previous | {topic}
+    try:
+        yield
+    finally:
+        _MUTED.topics = previous
+
+
+def invalidate(
+    bv: Any, topic: Optional[str] = None, *, keep: Iterable[str] = ()
+) -> None:
+    """Drop ``topic`` (every topic but ``keep`` when None) for ``bv``."""
+    state = _state(bv, create=False)
+    if state is None:
+        return
+    with state.lock:
+        _settle(state)
+        if topic is not None:
+            _drop(state, {topic})
+        else:
+            _drop(state, set(state.generation) - set(keep))
+
+
+def forget(bv: Any) -> None:
+    """Drop everything held for ``bv`` and stop watching it.
+
+    The server calls this when a session parks, replaces or closes its view,
+    so nothing here outlives the view or keeps its notifications registered.
+    """
+    with _LOCK:
+        try:
+            state = _VIEWS.pop(bv, None)
+        except TypeError:
+            return
+    if state is None:
+        return
+    with state.lock:
+        watcher, state.watcher = state.watcher, None
+    _unregister(bv, watcher)
+
+
+def forget_all() -> None:
+    """``forget`` every view, before the server drops these modules."""
+    with _LOCK:
+        views = list(_VIEWS.keys())
+    for bv in views:
+        forget(bv)
+
+
+def _watch(bv: Any, state: _ViewState, topic: str) -> None:
+    """Make sure the view's watcher hears about changes to ``topic``."""
+    with state.lock:
+        if topic in state.watched:
+            return
+        register = getattr(bv, "register_notification", None)
+        watcher_cls = _watcher_class()
+        if register is None or watcher_cls is None:
+            state.watched = frozenset(_NOTIFICATIONS)
+            return
+        notifications = _notification_flags(state.watched | {topic})
+        if notifications is None:
+            # BN without notification filters calls every callback anyway
+            state.watched = frozenset(_NOTIFICATIONS)
+        else:
+            state.watched = state.watched | {topic}
+        watcher = watcher_cls(state, notifications)
+        try:
+            register(watcher)
+        except Exception:
+            return
+        previous, state.watcher = state.watcher, watcher
+    # registered a wider watcher first, so no change falls in between
+    _unregister(bv, previous)
+
+
+def _unregister(bv: Any, watcher: Optional[Any]) -> None:
+    unregister = getattr(bv, "unregister_notification", None)
+    if watcher is None or unregister is None:
+        return
+    try:
+        unregister(watcher)
+    except Exception:
+        pass
+
+
+def _notification_flags(topics: Iterable[str]) -> Optional[Any]:
+    try:
+        from binaryninja.enums import NotificationType
+    except Exception:
+        return None
+    flags = None
+    for topic in topics:
+        for name in _NOTIFICATIONS[topic]:
+            flag = getattr(NotificationType, name, None)
+            if flag is None:
+                return None
+            flags = flag if flags is None else flags | flag
+    return flags
+
+
+def _notified(state: _ViewState, *topics: str) -> None:
+    muted_topics = getattr(_MUTED, "topics", frozenset())
+    for topic in topics:
+        if topic not in muted_topics:
+            state.dirty.add(topic)
+
+
+_WATCHER_CLASS: Optional[type] = None
+
+
+def _watcher_class() -> Optional[type]:
+    global _WATCHER_CLASS
+    if _WATCHER_CLASS is not None:
+        return _WATCHER_CLASS
+    try:
+        from binaryninja import BinaryDataNotification
+    except Exception:
+        return None
+
+    class _Watcher(BinaryDataNotification):  # type: ignore[misc, valid-type]
+        # callbacks run for every matching analysis event: flag and return
+        def __init__(self, state: _ViewState, notifications: Optional[Any]) -> None:
+            if notifications is None:
+                super().__init__()
+            else:
+                super().__init__(notifications)
+            self._state = state
+
+        def symbol_added(self, view: Any, sym: Any) -> None:
+            _notified(self._state, TOPIC_SYMBOLS, TOPIC_FUNCTIONS)
+
+        def symbol_updated(self, view: Any, sym: Any) -> None:
+            _notified(self._state, TOPIC_SYMBOLS, TOPIC_FUNCTIONS)
+
+        def symbol_removed(self, view: Any, sym: Any) -> None:
+            _notified(self._state, TOPIC_SYMBOLS, TOPIC_FUNCTIONS)
+
+        # tag callback arguments differ between BN versions
+        def tag_added(self, view: Any, *args: Any) -> None:
+            _notified(self._state, TOPIC_TAGS)
+
+        def tag_updated(self, view: Any, *args: Any) -> None:
+            _notified(self._state, TOPIC_TAGS)
+
+        def tag_removed(self, view: Any, *args: Any) -> None:
+            _notified(self._state, TOPIC_TAGS)
+
+        def function_added(self, view: Any, func: Any) -> None:
+            _notified(self._state, TOPIC_FUNCTIONS)
+
+        def function_removed(self, view: Any, func: Any) -> None:
+            _notified(self._state, TOPIC_FUNCTIONS)
+
+        def function_updated(self, view: Any, func: Any) -> None:
+            _notified(self._state, TOPIC_FUNCTIONS)
+
+        def data_var_added(self, view: Any, var: Any) -> None:
+            _notified(self._state, TOPIC_DATA_VARS)
+
+        def data_var_removed(self, view: Any, var: Any) -> None:
+            _notified(self._state, TOPIC_DATA_VARS)
+
+        def data_var_updated(self, view: Any, var: Any) -> None:
+            _notified(self._state, TOPIC_DATA_VARS)
+
+        def section_added(self, view: Any, section: Any) -> None:
+            _notified(self._state, TOPIC_LAYOUT)
+
+        def section_removed(self, view: Any, section: Any) -> None:
+            _notified(self._state, TOPIC_LAYOUT)
+
+        def section_updated(self, view: Any, section: Any) -> None:
+            _notified(self._state, TOPIC_LAYOUT)
+
+        def segment_added(self, view: Any, segment: Any) -> None:
+            _notified(self._state, TOPIC_LAYOUT)
+
+        def segment_removed(self, view: Any, segment: Any) -> None:
+            _notified(self._state, TOPIC_LAYOUT)
+
+        def segment_updated(self, view: Any, segment: Any) -> None:
+            _notified(self._state, TOPIC_LAYOUT)
+
+    _WATCHER_CLASS = _Watcher
+    return _WATCHER_CLASS
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from .cancel import cancellable
+from .fields import wanted
 from .util import hex_addr, ref_address, ref_function_name, resolve_target_addrs
 
 
@@ -22,10 +24,12 @@ def xrefs_to(
     if not addresses:
         raise ValueError("target not found")
 
+    # the containing-function lookup is the costly part of each row
+    named = wanted("function")
     results: List[Dict[str, Any]] = []
-    for addr in addresses:
+    for addr in cancellable(addresses, every=16):
         if include_code:
-            for ref in bv.get_code_refs(addr):
+            for ref in cancellable(bv.get_code_refs(addr)):
                 ref_addr = ref_address(ref)
                 results.append(
                     {
@@ -34,13 +38,13 @@ def xrefs_to(
                         "ref_type": "code",
                         "address": ref_addr,
                         "address_hex": hex_addr(ref_addr),
-                        "function": ref_function_name(ref),
+                        "function": ref_function_name(ref) if named else None,
                     }
                 )
                 if limit is not None and len(results) >= limit:
                     return results
         if include_data:
-            for ref in bv.get_data_refs(addr):
+            for ref in cancellable(bv.get_data_refs(addr)):
                 ref_addr = ref_address(ref)
                 results.append(
                     {
@@ -49,7 +53,7 @@ def xrefs_to(
                         "ref_type": "data",
                         "address": ref_addr,
                         "address_hex": hex_addr(ref_addr),
-                        "function": ref_function_name(ref),
+                        "function": ref_function_name(ref) if named else None,
                     }
                 )
                 if limit is not None and len(results) >= limit:
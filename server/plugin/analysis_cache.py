@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DEFAULT_MAX_BYTES = 20 * 1024**3
+
+# sessions work on private copies; unreferenced copies older than this go
+WORK_GRACE_S = 3600.0
+
+_CHUNK = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def options_digest(options: Optional[Dict[str, Any]]) -> str:
+    raw = json.dumps(options or {}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", text)[:64] or "session"
+
+
+class AnalysisCache:
+    """Analyzed databases keyed by file content and load options.
+
+    Entries are never opened directly: a hit is copied to a per-session work
+    file, so edits saved by one session never leak into later loads. Entries
+    are evicted least-recently-used once they exceed ``max_bytes``.
+    """
+
+    def __init__(self, directory: str = "", *, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._lock = threading.Lock()
+        self._directory = ""
+        self._max_bytes = max_bytes
+        if directory:
+            self.configure(directory, max_bytes=max_bytes)
+
+    def configure(self, directory: str, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        with self._lock:
+            self._directory = os.path.expanduser(directory) if directory else ""
+            self._max_bytes = max(0, int(max_bytes))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._directory)
+
+    def key(self, path: str, options: Optional[Dict[str, Any]] = None) -> str:
+        return f"{file_digest(path)}-{options_digest(options)}"
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self._directory, "entries", f"{key}.bndb")
+
+    def work_path(self, key: str, session: str) -> str:
+        work_dir = os.path.join(self._directory, "work")
+        os.makedirs(work_dir, exist_ok=True)
+        name = f"{_safe_name(session)}-{key[:16]}-{secrets.token_hex(4)}.bndb"
+        return os.path.join(work_dir, name)
+
+    def is_work_path(self, path: str) -> bool:
+        """Whether ``path`` is one of this cache's per-session work copies."""
+        if not self._directory or not path:
+            return False
+        work_dir = os.path.realpath(os.path.join(self._directory, "work"))
+        return os.path.dirname(os.path.realpath(path)) == work_dir
+
+    def checkout(self, key: str, session: str) -> Optional[str]:
+        """Copy a cached database for ``session``; None on a miss."""
+        entry = self.entry_path(key)
+        with self._lock:
+            if not os.path.exists(entry):
+                return None
+            # mtime doubles as the LRU clock
+            os.utime(entry)
+            work = self.work_path(key, session)
+            shutil.copyfile(entry, work)
+            return work
+
+    def store(self, key: str, database: str) -> List[str]:
+        """Copy a freshly analyzed ``database`` in; returns evicted entries."""
+        entry = self.entry_path(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            tmp = f"{entry}.{secrets.token_hex(4)}.tmp"
+            try:
+                shutil.copyfile(database, tmp)
+                os.replace(tmp, entry)
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+            return self._evict_locked(keep=entry)
+
+    def prune_work(self, in_use: Iterable[str], *, grace_s: float = WORK_GRACE_S) -> int:
+        """Delete stale work copies no session references any more."""
+        keep = {os.path.realpath(path) for path in in_use if path}
+        work_dir = os.path.join(self._directory, "work")
+        cutoff = time.time() - grace_s
+        removed = 0
+        with self._lock:
+            for path in _files(work_dir):
+                if os.path.realpath(path) in keep:
+                    continue
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = _files(os.path.join(self._directory, "entries"))
+            return {
+                "directory": self._directory,
+                "entries": len(entries),
+                "bytes": sum(_size(path) for path in entries),
+                "max_bytes": self._max_bytes,
+            }
+
+    def _evict_locked(self, *, keep: str) -> List[str]:
+        entries = _files(os.path.join(self._directory, "entries"))
+        total = sum(_size(path) for path in entries)
+        evicted: List[str] = []
+        for path in sorted(entries, key=_mtime):
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            size = _size(path)
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            evicted.append(path)
+        return evicted
+
+
+def _files(directory: str) -> List[str]:
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [
+        os.path.join(directory, name) for name in names if name.endswith(".bndb")
+    ]
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+
+class RequestCancelled(Exception):
+    """Raised at a cancellation checkpoint once a request's token is cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation for one request.
+
+    Long-running code polls ``check()``; native work registers an abort hook via
+    ``on_cancel`` (for example ``bv.abort_analysis``), which runs as soon as the
+    token is cancelled by an interrupt or its deadline.
+    """
+
+    def __init__(self, *, deadline_s: Optional[float] = None) -> None:
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._timer: Optional[threading.Timer] = None
+        self.reason = ""
+        self.deadline_s = None
+        self.deadline_monotonic: Optional[float] = None
+        if deadline_s is not None and float(deadline_s) > 0:
+            self.deadline_s = float(deadline_s)
+            self.deadline_monotonic = time.monotonic() + self.deadline_s
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self.cancel("deadline exceeded")
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline_monotonic is None:
+            return None
+        return self.deadline_monotonic - time.monotonic()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+        return True
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise RequestCancelled(self.reason or "cancelled")
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        with self._lock:
+            fire_now = self._event.is_set()
+            if not fire_now:
+                self._callbacks.append(callback)
+        if fire_now:
+            try:
+                callback()
+            except Exception:
+                pass
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+    @contextmanager
+    def armed(self) -> Iterator["CancelToken"]:
+        # a timer makes the deadline fire abort hooks even when nobody polls
+        if self.deadline_s is not None:
+            self._timer = threading.Timer(
+                self.deadline_s, self.cancel, args=("deadline exceeded",)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+        try:
+            yield self
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
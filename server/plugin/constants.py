@@ -8,9 +8,23 @@ LOGGER_NAME = SETTINGS_GROUP
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 18812
 DEFAULT_TIMEOUT = 3600  # seconds
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE_DEPTH = 32
+STATE_FILE_NAME = "sessions.json"
+DEFAULT_ANALYSIS_CACHE_MAX_GB = 20
+UPLOAD_DIR_NAME = "uploads"
 
 
 SETTING_AUTOSTART = "autostart"
 SETTING_HOST = "host"
 SETTING_PORT = "port"
 SETTING_TIMEOUT = "timeout"
+SETTING_MAX_CONCURRENCY = "max_concurrency"
+SETTING_MAX_QUEUE_DEPTH = "max_queue_depth"
+SETTING_PERSIST_SESSIONS = "persist_sessions"
+SETTING_STATE_FILE = "state_file"
+SETTING_ANALYSIS_CACHE_DIR = "analysis_cache_dir"
+SETTING_ANALYSIS_CACHE_MAX_GB = "analysis_cache_max_gb"
+SETTING_UPLOAD_DIR = "upload_dir"
+SETTING_EVICT_IDLE_MINUTES = "evict_idle_minutes"
+SETTING_EVICT_MAX_MEMORY_GB = "evict_max_memory_gb"
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
 import json
+import os
 import threading
 from typing import Optional
 
 import binaryninja as bn
 
 from .constants import (
+    DEFAULT_ANALYSIS_CACHE_MAX_GB,
     DEFAULT_HOST,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_QUEUE_DEPTH,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
     PLUGIN_NAME,
     SETTINGS_GROUP,
+    SETTING_ANALYSIS_CACHE_DIR,
+    SETTING_ANALYSIS_CACHE_MAX_GB,
     SETTING_AUTOSTART,
+    SETTING_EVICT_IDLE_MINUTES,
+    SETTING_EVICT_MAX_MEMORY_GB,
     SETTING_HOST,
+    SETTING_MAX_CONCURRENCY,
+    SETTING_MAX_QUEUE_DEPTH,
+    SETTING_PERSIST_SESSIONS,
     SETTING_PORT,
+    SETTING_STATE_FILE,
     SETTING_TIMEOUT,
+    SETTING_UPLOAD_DIR,
+    STATE_FILE_NAME,
+    UPLOAD_DIR_NAME,
 )
+from .eviction import EvictionPolicy
 from .log import err, info, warn
 from .service import (
+    ANALYSIS_CACHE,
+    SCHEDULER,
     SESSIONS,
+    UPLOADS,
     KnifeServerService,
     clear_root_view,
+    configure_eviction,
+    restore_sessions,
     set_root_view_for_start,
     validate_service_imports,
 )
@@ -103,6 +124,133 @@ def _register_settings() -> None:
             "ignore": ignore_scopes,
         },
     )
+    reg(
+        SETTING_MAX_CONCURRENCY,
+        {
+            "title": "Max Concurrent Requests",
+            "description": "Session requests allowed to run at once across all sessions",
+            "type": "number",
+            "minValue": 1,
+            "maxValue": 256,
+            "default": DEFAULT_MAX_CONCURRENCY,
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_MAX_QUEUE_DEPTH,
+        {
+            "title": "Max Queued Requests per Session",
+            "description": "Requests waiting on a busy session beyond this are rejected",
+            "type": "number",
+            "minValue": 0,
+            "maxValue": 4096,
+            "default": DEFAULT_MAX_QUEUE_DEPTH,
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_PERSIST_SESSIONS,
+        {
+            "title": "Persist Sessions",
+            "description": "Remember loaded sessions across restarts; views reopen on first use",
+            "type": "boolean",
+            "default": True,
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_STATE_FILE,
+        {
+            "title": "Session State File",
+            "description": f"Where sessions are remembered (empty: <user dir>/{SETTINGS_GROUP}/{STATE_FILE_NAME})",
+            "type": "string",
+            "default": "",
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_ANALYSIS_CACHE_DIR,
+        {
+            "title": "Analysis Cache Directory",
+            "description": "Reuse analyzed databases for identical binaries and load options (empty disables)",
+            "type": "string",
+            "default": "",
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_ANALYSIS_CACHE_MAX_GB,
+        {
+            "title": "Analysis Cache Size (GB)",
+            "description": "Least recently used databases are evicted beyond this size",
+            "type": "number",
+            "minValue": 0,
+            "maxValue": 65536,
+            "default": DEFAULT_ANALYSIS_CACHE_MAX_GB,
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_UPLOAD_DIR,
+        {
+            "title": "Upload Directory",
+            "description": f"Where files sent with 'session load --upload' are stored (empty: <user dir>/{SETTINGS_GROUP}/{UPLOAD_DIR_NAME})",
+            "type": "string",
+            "default": "",
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_EVICT_IDLE_MINUTES,
+        {
+            "title": "Evict Idle Sessions (minutes)",
+            "description": "Close loaded views unused for this long; they reopen on the next request (0 disables)",
+            "type": "number",
+            "minValue": 0,
+            "maxValue": 100000,
+            "default": 0,
+            "ignore": ignore_scopes,
+        },
+    )
+    reg(
+        SETTING_EVICT_MAX_MEMORY_GB,
+        {
+            "title": "Loaded Views Memory Budget (GB)",
+            "description": "Close least recently used loaded views beyond this estimated total (0 disables)",
+            "type": "number",
+            "minValue": 0,
+            "maxValue": 65536,
+            "default": 0,
+            "ignore": ignore_scopes,
+        },
+    )
+
+
+def _eviction_policy(settings) -> EvictionPolicy:
+    idle_minutes = settings.get_integer(
+        f"{SETTINGS_GROUP}.{SETTING_EVICT_IDLE_MINUTES}"
+    )
+    max_gb = settings.get_integer(f"{SETTINGS_GROUP}.{SETTING_EVICT_MAX_MEMORY_GB}")
+    return EvictionPolicy(
+        max_idle_s=60.0 * int(idle_minutes or 0),
+        max_total_bytes=int(max_gb or 0) * 1024**3,
+    )
+
+
+def _upload_dir(settings) -> str:
+    path = settings.get_string(f"{SETTINGS_GROUP}.{SETTING_UPLOAD_DIR}")
+    if path:
+        return os.path.expanduser(path)
+    return os.path.join(bn.user_directory(), SETTINGS_GROUP, UPLOAD_DIR_NAME)
+
+
+def _state_file(settings) -> str:
+    if not settings.get_bool(f"{SETTINGS_GROUP}.{SETTING_PERSIST_SESSIONS}"):
+        return ""
+    path = settings.get_string(f"{SETTINGS_GROUP}.{SETTING_STATE_FILE}")
+    if path:
+        return os.path.expanduser(path)
+    return os.path.join(bn.user_directory(), SETTINGS_GROUP, STATE_FILE_NAME)
 
 
 def _start_thread(host: str, port: int, timeout: int) -> None:
@@ -179,9 +327,37 @@ class Controller:
             settings.get_integer(f"{SETTINGS_GROUP}.{SETTING_TIMEOUT}") or DEFAULT_TIMEOUT
         )
 
+        max_concurrency = int(
+            settings.get_integer(f"{SETTINGS_GROUP}.{SETTING_MAX_CONCURRENCY}")
+            or DEFAULT_MAX_CONCURRENCY
+        )
+        max_queue_depth = int(
+            settings.get_integer(f"{SETTINGS_GROUP}.{SETTING_MAX_QUEUE_DEPTH}")
+        )
+
         STATE.host = host
         STATE.port = port
         STATE.timeout = timeout
+        SCHEDULER.configure(
+            max_concurrency=max_concurrency,
+            max_queue_depth=max_queue_depth,
+        )
+
+        cache_max_gb = settings.get_integer(
+            f"{SETTINGS_GROUP}.{SETTING_ANALYSIS_CACHE_MAX_GB}"
+        )
+        ANALYSIS_CACHE.configure(
+            settings.get_string(f"{SETTINGS_GROUP}.{SETTING_ANALYSIS_CACHE_DIR}"),
+            max_bytes=int(cache_max_gb) * 1024**3,
+        )
+
+        UPLOADS.configure(_upload_dir(settings))
+
+        state_file = _state_file(settings)
+        restored = restore_sessions(state_file)
+        if restored:
+            info(f"restored {restored} session(s) from {state_file}; views open on first use")
+        configure_eviction(_eviction_policy(settings))
 
         if bv is not None:
             set_root_view_for_start(bv)
@@ -209,14 +385,17 @@ class Controller:
             pass
         STATE.server = None
         STATE.thread = None
+        configure_eviction(EvictionPolicy())
         info("server stopped")
 
     def show_status(self, _bv) -> None:
         running = STATE.running()
         sessions = SESSIONS.list_names()
+        sched = SCHEDULER.snapshot()
         msg = (
             f"running={running} host={STATE.host} port={STATE.port} timeout={STATE.timeout}s "
-            f"sessions={len(sessions)} {sessions}"
+            f"sessions={len(sessions)} {sessions} "
+            f"requests={sched['running']}/{sched['max_concurrency']} queued={sched['queued']}"
         )
         info(msg)
 
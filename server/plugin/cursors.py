@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+MAX_PAGE_ROWS = 100_000
+
+# cursors nobody fetched from for this long are dropped on the next access
+CURSOR_IDLE_S = 300.0
+MAX_CURSORS = 64
+
+_EXHAUSTED = object()
+
+
+def pageable(result: Any) -> bool:
+    """Whether a ``__result__`` is a row sequence that can be sent in pages."""
+    if isinstance(result, (list, tuple)):
+        return True
+    # generators and other lazy iterators, but not str/bytes/dict
+    return isinstance(result, Iterator)
+
+
+def _take(rows: Iterator[Any], count: int) -> Tuple[List[Any], Any]:
+    page: List[Any] = []
+    for row in rows:
+        page.append(row)
+        if len(page) >= count:
+            break
+    # look one row ahead so the last page can say it is the last one
+    return page, next(rows, _EXHAUSTED)
+
+
+@dataclass
+class ResultCursor:
+    id: str
+    session: str
+    rows: Iterator[Any] = field(repr=False)
+    pending: Any = field(default=_EXHAUSTED, repr=False)
+    sent: int = 0
+    # produced by a read-only tool, so fetching may share the session lock
+    shared: bool = False
+    # rows of a serverlib tool result; pulling them is the tool's work
+    tool: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+    # shared fetches can race on one cursor; a generator must not be re-entered
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def next_page(self, count: int) -> List[Any]:
+        with self._lock:
+            return self._next_page_locked(count)
+
+    def _next_page_locked(self, count: int) -> List[Any]:
+        page: List[Any] = []
+        if self.pending is not _EXHAUSTED:
+            page.append(self.pending)
+            self.pending = _EXHAUSTED
+        if len(page) < count:
+            more, self.pending = _take(self.rows, count - len(page))
+            page.extend(more)
+        else:
+            self.pending = next(self.rows, _EXHAUSTED)
+        self.sent += len(page)
+        self.last_used = time.monotonic()
+        return page
+
+    @property
+    def done(self) -> bool:
+        return self.pending is _EXHAUSTED
+
+    def close(self) -> None:
+        close = getattr(self.rows, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class ResultCursors:
+    """Results kept server-side so clients can pull them a page at a time."""
+
+    def __init__(
+        self, *, idle_s: float = CURSOR_IDLE_S, limit: int = MAX_CURSORS
+    ) -> None:
+        self._lock = threading.Lock()
+        self._idle_s = idle_s
+        self._limit = limit
+        self._next_id = 0
+        self._cursors: Dict[str, ResultCursor] = {}
+
+    def first_page(
+        self,
+        session: str,
+        result: Any,
+        page_rows: int,
+        *,
+        shared: bool = False,
+        tool: bool = False,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Split off the first page; returns it and a cursor id for the rest."""
+        page_rows = max(1, min(int(page_rows), MAX_PAGE_ROWS))
+        rows = iter(result)
+        page, pending = _take(rows, page_rows)
+        if pending is _EXHAUSTED:
+            return page, None
+
+        with self._lock:
+            self._expire_locked()
+            if len(self._cursors) >= self._limit:
+                oldest = min(self._cursors.values(), key=lambda c: c.last_used)
+                self._drop_locked(oldest.id)
+            self._next_id += 1
+            cursor = ResultCursor(
+                id=f"c{self._next_id}",
+                session=session,
+                rows=rows,
+                pending=pending,
+                shared=shared,
+                tool=tool,
+            )
+            cursor.sent = len(page)
+            self._cursors[cursor.id] = cursor
+            return page, cursor.id
+
+    def get(self, session: str, cursor_id: str) -> ResultCursor:
+        with self._lock:
+            self._expire_locked()
+            cursor = self._owned_locked(session, cursor_id)
+            if cursor is None:
+                raise KeyError(f"unknown or expired result cursor: {cursor_id}")
+            cursor.last_used = time.monotonic()
+            return cursor
+
+    def fetch(self, session: str, cursor_id: str, max_rows: int) -> Dict[str, Any]:
+        cursor = self.get(session, cursor_id)
+        rows = cursor.next_page(max(1, min(int(max_rows), MAX_PAGE_ROWS)))
+        out: Dict[str, Any] = {"rows": rows, "sent": cursor.sent}
+        if cursor.done:
+            self.close(session, cursor_id)
+        else:
+            out["cursor"] = cursor_id
+        return out
+
+    def close(self, session: str, cursor_id: str) -> bool:
+        with self._lock:
+            if self._owned_locked(session, cursor_id) is None:
+                return False
+            return self._drop_locked(cursor_id)
+
+    def close_session(self, session: str) -> int:
+        with self._lock:
+            ids = [c.id for c in self._cursors.values() if c.session == session]
+            for cursor_id in ids:
+                self._drop_locked(cursor_id)
+            return len(ids)
+
+    def open_count(self) -> int:
+        with self._lock:
+            return len(self._cursors)
+
+    def _expire_locked(self) -> None:
+        cutoff = time.monotonic() - self._idle_s
+        for cursor_id in [
+            c.id for c in self._cursors.values() if c.last_used < cutoff
+        ]:
+            self._drop_locked(cursor_id)
+
+    def _owned_locked(self, session: str, cursor_id: str) -> Optional[ResultCursor]:
+        cursor = self._cursors.get(cursor_id)
+        # another session's cursor reads as unknown: fetching it would run
+        # that session's rows under this session's lock, closing it would
+        # cut off that session's listing
+        if cursor is None or cursor.session != session:
+            return None
+        return cursor
+
+    def _drop_locked(self, cursor_id: str) -> bool:
+        cursor = self._cursors.pop(cursor_id, None)
+        if cursor is None:
+            return False
+        cursor.close()
+        return True
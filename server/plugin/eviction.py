@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+
+# rough core-side cost per analyzed function (IL forms, xrefs, types)
+FUNCTION_BYTES = 48 * 1024
+
+REAPER_INTERVAL_S = 60.0
+
+
+def process_rss() -> int:
+    """Resident set size of this process in bytes; 0 where unknown."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def estimate_view_bytes(bv: Any, *, rss_delta: int = 0) -> int:
+    """Best-effort memory held by a view.
+
+    BN has no per-view accounting, so this takes the larger of the RSS growth
+    seen while the view loaded and a size-based guess from the mapped bytes
+    and function count.
+    """
+    guess = 0
+    try:
+        guess += int(len(bv))
+    except Exception:
+        pass
+    try:
+        guess += len(bv.functions) * FUNCTION_BYTES
+    except Exception:
+        pass
+    return max(int(rss_delta), guess)
+
+
+@dataclass(frozen=True)
+class EvictionPolicy:
+    """Thresholds for closing owned views; 0 disables a limit."""
+
+    max_idle_s: float = 0.0
+    max_total_bytes: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_idle_s > 0 or self.max_total_bytes > 0
+
+
+@dataclass(frozen=True)
+class EvictionCandidate:
+    name: str
+    idle_s: float
+    bytes: int
+
+
+def pick_evictions(
+    candidates: List[EvictionCandidate], policy: EvictionPolicy
+) -> List[str]:
+    """Names to evict: everything idle too long, then LRU until under budget."""
+    picked: List[str] = []
+    remaining: List[EvictionCandidate] = []
+    for cand in candidates:
+        if policy.max_idle_s > 0 and cand.idle_s >= policy.max_idle_s:
+            picked.append(cand.name)
+        else:
+            remaining.append(cand)
+
+    if policy.max_total_bytes > 0:
+        total = sum(cand.bytes for cand in remaining)
+        for cand in sorted(remaining, key=lambda c: c.idle_s, reverse=True):
+            if total <= policy.max_total_bytes:
+                break
+            picked.append(cand.name)
+            total -= cand.bytes
+    return picked
+
+
+class Reaper:
+    """Background thread that runs ``sweep`` every ``interval_s`` seconds."""
+
+    def __init__(
+        self, sweep: Callable[[], Any], *, interval_s: float = REAPER_INTERVAL_S
+    ) -> None:
+        self._sweep = sweep
+        self._interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="knife-reaper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            try:
+                self._sweep()
+            except Exception:
+                # a failed sweep must not kill the reaper; the next one retries
+                pass
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .cancel import CancelToken
+
+
+JOB_PENDING = "pending"
+JOB_LOADING = "loading"
+JOB_ANALYZING = "analyzing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_FINISHED_STATES = {JOB_DONE, JOB_FAILED}
+
+
+def _enum_text(value: Any) -> str:
+    if value is None:
+        return ""
+    name = getattr(value, "name", None)
+    if isinstance(name, str) and name:
+        return name
+    return str(value)
+
+
+def analysis_progress(bv: Any) -> Dict[str, Any]:
+    """Best-effort analysis progress for a (possibly still analyzing) view."""
+    out: Dict[str, Any] = {}
+    if bv is None:
+        return out
+
+    try:
+        progress = bv.analysis_progress
+    except Exception:
+        progress = None
+    if progress is not None:
+        count = getattr(progress, "count", None)
+        total = getattr(progress, "total", None)
+        out["phase"] = _enum_text(getattr(progress, "state", None))
+        if isinstance(count, int) and isinstance(total, int):
+            out["progress_count"] = count
+            out["progress_total"] = total
+            if total > 0:
+                out["percent"] = round(min(100.0, 100.0 * count / total), 1)
+
+    try:
+        out["functions"] = len(bv.functions)
+    except Exception:
+        pass
+    return out
+
+
+@dataclass
+class LoadJob:
+    id: str
+    session: str
+    path: str
+    update_analysis: bool = True
+    state: str = JOB_PENDING
+    error: str = ""
+    bv: Optional[Any] = None
+    started_monotonic: float = field(default_factory=time.monotonic)
+    finished_monotonic: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event)
+    cancel: CancelToken = field(default_factory=CancelToken, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in _FINISHED_STATES
+
+    def set_state(self, state: str, *, bv: Optional[Any] = None) -> None:
+        if bv is not None:
+            self.bv = bv
+        self.state = state
+
+    def finish(self, *, error: str = "") -> None:
+        self.state = JOB_FAILED if error else JOB_DONE
+        self.error = error
+        self.finished_monotonic = time.monotonic()
+        # the session owns the view from here on
+        self.bv = None
+        self.done.set()
+
+    def progress(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"job_id": self.id, "load_state": self.state}
+        if self.state == JOB_ANALYZING:
+            out.update(analysis_progress(self.bv))
+        return out
+
+    def snapshot(self) -> Dict[str, Any]:
+        end = self.finished_monotonic or time.monotonic()
+        out: Dict[str, Any] = {
+            "id": self.id,
+            "session": self.session,
+            "path": self.path,
+            "state": self.state,
+            "done": self.finished,
+            "elapsed_s": max(0.0, end - self.started_monotonic),
+        }
+        if self.state == JOB_ANALYZING:
+            out.update(analysis_progress(self.bv))
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class LoadJobs:
+    """Registry of background loads; keeps the latest job per session."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._by_id: Dict[str, LoadJob] = {}
+        self._latest: Dict[str, str] = {}
+
+    def create(self, session: str, path: str, *, update_analysis: bool) -> LoadJob:
+        with self._lock:
+            current = self.for_session(session)
+            if current is not None and not current.finished:
+                raise RuntimeError(
+                    f"session {session!r} is already loading (job {current.id})"
+                )
+            self._next_id += 1
+            job = LoadJob(
+                id=f"j{self._next_id}",
+                session=session,
+                path=path,
+                update_analysis=update_analysis,
+            )
+            previous = self._latest.get(session)
+            if previous is not None:
+                self._by_id.pop(previous, None)
+            self._by_id[job.id] = job
+            self._latest[session] = job.id
+            return job
+
+    def get(self, job_id: str) -> Optional[LoadJob]:
+        with self._lock:
+            return self._by_id.get(job_id)
+
+    def for_session(self, session: str) -> Optional[LoadJob]:
+        with self._lock:
+            job_id = self._latest.get(session)
+            return None if job_id is None else self._by_id.get(job_id)
+
+    def active(self) -> List[LoadJob]:
+        with self._lock:
+            return [job for job in self._by_id.values() if not job.finished]
+
+    def forget(self, session: str) -> None:
+        with self._lock:
+            job_id = self._latest.get(session)
+            job = None if job_id is None else self._by_id.get(job_id)
+            if job is not None and job.finished:
+                self._latest.pop(session, None)
+                self._by_id.pop(job.id, None)
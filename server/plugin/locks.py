@@ -1,10 +1,157 @@
 from __future__ import annotations
 
 import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
 
-# Serialize short shared Binary Ninja operations. Do not hold this around
-# arbitrary user code, or one sleeping session will stall unrelated sessions.
-BN_LOCK = threading.RLock()
+
+class KeyedLocks:
+    """Per-key reentrant locks, dropped once nobody holds or waits on them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List] = {}  # key -> [RLock, users]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        if not key:
+            yield
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [threading.RLock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._entries.pop(key, None)
+
+
+class RWLock:
+    """Reader/writer lock: shared holders run together, exclusive ones alone.
+
+    The exclusive side is a drop-in for ``threading.RLock`` (``acquire``,
+    ``release``, ``with lock``) and is reentrant. A thread holding it may also
+    take the shared side, but a thread holding only the shared side cannot
+    upgrade. Waiting writers hold back new readers so a steady stream of
+    queries cannot starve an edit.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}  # thread id -> depth
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return True
+            if me in self._readers:
+                raise RuntimeError("cannot upgrade a shared hold to exclusive")
+            self._writers_waiting += 1
+            acquired = False
+            try:
+                acquired = self._wait(
+                    lambda: self._writer is None and not self._readers,
+                    blocking,
+                    timeout,
+                )
+                if acquired:
+                    self._writer = me
+                    self._writer_depth = 1
+                return acquired
+            finally:
+                self._writers_waiting -= 1
+                if not acquired:
+                    # readers held back only by this writer may go ahead
+                    self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    def acquire_shared(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return True
+            acquired = self._wait(
+                lambda: self._writer is None and not self._writers_waiting,
+                blocking,
+                timeout,
+            )
+            if acquired:
+                self._readers[me] = 1
+            return acquired
+
+    def release_shared(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            depth = self._readers.get(me)
+            if depth is None:
+                raise RuntimeError("cannot release un-acquired shared lock")
+            if depth > 1:
+                self._readers[me] = depth - 1
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        self.acquire_shared()
+        try:
+            yield
+        finally:
+            self.release_shared()
+
+    def readers(self) -> int:
+        with self._cond:
+            return len(self._readers)
+
+    def _wait(
+        self, ready: Callable[[], bool], blocking: bool, timeout: float
+    ) -> bool:
+        # caller holds self._cond
+        if not blocking:
+            return ready()
+        if timeout is None or timeout < 0:
+            self._cond.wait_for(ready)
+            return True
+        return self._cond.wait_for(ready, timeout)
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+# Serialize opening the same file (canonical path) across sessions and root
+# loads. Unrelated paths load in parallel; per-session state is guarded by
+# Session.lock (an RWLock) and the shared registries by their own short-lived
+# locks.
+PATH_LOCKS = KeyedLocks()
 
 # root globals are shared across connections; protect them explicitly
 ROOT_LOCK = threading.RLock()
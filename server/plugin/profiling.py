@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+DEFAULT_PROFILE_TOP = 25
+
+SORT_KEYS = {
+    "cumulative": "cumtime_s",
+    "tottime": "tottime_s",
+    "calls": "calls",
+}
+
+# cProfile hooks are process-wide on newer CPythons; one profiled request at a time
+_PROFILE_LOCK = threading.Lock()
+
+
+def normalize_profile_options(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    options = dict(options or {})
+    top = int(options.get("top", DEFAULT_PROFILE_TOP))
+    if top < 1:
+        raise ValueError("profile top must be >= 1")
+    sort = str(options.get("sort") or "cumulative").strip().lower()
+    if sort not in SORT_KEYS:
+        raise ValueError(f"profile sort must be one of: {', '.join(SORT_KEYS)}")
+    dump = str(options.get("dump") or "").strip()
+    return {"top": top, "sort": sort, "dump": os.path.expanduser(dump) if dump else ""}
+
+
+def _area(filename: str) -> str:
+    # separates time spent inside Binary Ninja's API from the script itself
+    if filename == "~" or filename.startswith("<"):
+        return "builtin"
+    parts = filename.replace("\\", "/").split("/")
+    if "binaryninja" in parts:
+        return "binaryninja"
+    return "python"
+
+
+def _function_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def profile_report(
+    profiler: cProfile.Profile, *, top: int, sort: str
+) -> Dict[str, Any]:
+    stats = pstats.Stats(profiler)
+    rows: List[Dict[str, Any]] = []
+    by_area: Dict[str, float] = {}
+    total_calls = 0
+    for func, (primitive, calls, tottime, cumtime, _callers) in stats.stats.items():
+        area = _area(func[0])
+        by_area[area] = by_area.get(area, 0.0) + tottime
+        total_calls += calls
+        rows.append(
+            {
+                "function": _function_label(func),
+                "area": area,
+                "calls": calls,
+                "primitive_calls": primitive,
+                "tottime_s": tottime,
+                "cumtime_s": cumtime,
+                "percall_s": cumtime / calls if calls else 0.0,
+            }
+        )
+
+    key = SORT_KEYS[sort]
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return {
+        "sort": sort,
+        "total_calls": total_calls,
+        "total_s": stats.total_tt,
+        "self_time_by_area": by_area,
+        "functions": len(rows),
+        "top": rows[:top],
+    }
+
+
+@contextmanager
+def profiled(options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Profile the body; the yielded dict is filled with the report on exit."""
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        raise RuntimeError("another request is already being profiled; retry later")
+    report: Dict[str, Any] = {}
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            report.update(
+                profile_report(profiler, top=options["top"], sort=options["sort"])
+            )
+            if options["dump"]:
+                try:
+                    profiler.dump_stats(options["dump"])
+                    report["dump"] = options["dump"]
+                except OSError as exc:
+                    report["dump_error"] = str(exc)
+    finally:
+        _PROFILE_LOCK.release()
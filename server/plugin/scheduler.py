@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+# lower rank runs first
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+
+class SchedulerFull(RuntimeError):
+    """Raised when a request cannot be queued."""
+
+
+def normalize_priority(value: Optional[str]) -> str:
+    text = (value or PRIORITY_INTERACTIVE).strip().lower()
+    if text not in PRIORITIES:
+        raise ValueError(f"priority must be one of: {', '.join(PRIORITIES)}")
+    return text
+
+
+@dataclass
+class Ticket:
+    id: int
+    session: str
+    name: str
+    priority: str
+    shared: bool = False
+    enqueued_monotonic: float = field(default_factory=time.monotonic)
+    started_monotonic: Optional[float] = None
+    cancel: Optional[Any] = field(default=None, repr=False)
+
+    @property
+    def granted(self) -> bool:
+        return self.started_monotonic is not None
+
+    @property
+    def wait_s(self) -> float:
+        end = self.started_monotonic or time.monotonic()
+        return max(0.0, end - self.enqueued_monotonic)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ticket": self.id,
+            "name": self.name,
+            "session": self.session,
+            "priority": self.priority,
+            "shared": self.shared,
+            "wait_s": self.wait_s,
+        }
+
+
+class RequestScheduler:
+    """Admission control for session requests.
+
+    Each session runs one request at a time from per-priority FIFO queues
+    (interactive before batch), except that ``shared`` (read-only) requests
+    may run alongside each other. Across sessions, at most ``max_concurrency``
+    requests run at once; free slots go to the most urgent, oldest waiter.
+    """
+
+    def __init__(self, *, max_concurrency: int = 4, max_queue_depth: int = 32):
+        self._cond = threading.Condition()
+        self._next_id = 0
+        self._max_concurrency = 1
+        self._max_queue_depth = 0
+        self._queues: Dict[str, Dict[str, Deque[Ticket]]] = {}
+        self._running: Dict[int, Ticket] = {}
+        # session -> running tickets; exclusive ones run alone
+        self._session_running: Dict[str, int] = {}
+        self._exclusive_sessions: set[str] = set()
+        self.configure(
+            max_concurrency=max_concurrency,
+            max_queue_depth=max_queue_depth,
+        )
+
+    def configure(
+        self,
+        *,
+        max_concurrency: Optional[int] = None,
+        max_queue_depth: Optional[int] = None,
+    ) -> None:
+        with self._cond:
+            if max_concurrency is not None:
+                if int(max_concurrency) < 1:
+                    raise ValueError("max_concurrency must be >= 1")
+                self._max_concurrency = int(max_concurrency)
+            if max_queue_depth is not None:
+                if int(max_queue_depth) < 0:
+                    raise ValueError("max_queue_depth must be >= 0")
+                self._max_queue_depth = int(max_queue_depth)
+            self._dispatch()
+
+    @contextmanager
+    def admit(
+        self,
+        session: str,
+        name: str,
+        *,
+        priority: Optional[str] = None,
+        cancel: Optional[Any] = None,
+        shared: bool = False,
+    ) -> Iterator[Ticket]:
+        ticket = self._enqueue(
+            session, name, normalize_priority(priority), cancel, shared
+        )
+        try:
+            # a cancelled token wakes the waiter so queued requests can be dropped
+            hook = cancel.on_cancel(self._wake) if cancel is not None else nullcontext()
+            with hook, self._cond:
+                while not ticket.granted:
+                    if cancel is not None:
+                        cancel.check()
+                    self._cond.wait()
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def _wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def cancel_queued(
+        self, session: Optional[str] = None, reason: str = "interrupted"
+    ) -> Optional[Dict[str, Any]]:
+        """Cancel the oldest queued request (optionally for one session)."""
+        with self._cond:
+            waiting = [
+                ticket
+                for name, queues in self._queues.items()
+                if session is None or name == session
+                for queue in queues.values()
+                for ticket in queue
+                if ticket.cancel is not None
+            ]
+        if not waiting:
+            return None
+        target = min(waiting, key=lambda ticket: ticket.id)
+        target.cancel.cancel(reason)
+        return target.snapshot()
+
+    def _enqueue(
+        self,
+        session: str,
+        name: str,
+        priority: str,
+        cancel: Optional[Any],
+        shared: bool = False,
+    ) -> Ticket:
+        with self._cond:
+            queues = self._queues.setdefault(
+                session, {p: deque() for p in PRIORITIES}
+            )
+            waiting = sum(len(q) for q in queues.values())
+            runnable = (
+                waiting == 0
+                and self._can_start(session, shared)
+                and len(self._running) < self._max_concurrency
+            )
+            if not runnable and waiting >= self._max_queue_depth:
+                self._drop_empty(session)
+                raise SchedulerFull(
+                    f"session {session!r} queue is full "
+                    f"({waiting} waiting, max {self._max_queue_depth}); retry later"
+                )
+            self._next_id += 1
+            ticket = Ticket(
+                id=self._next_id,
+                session=session,
+                name=name,
+                priority=priority,
+                shared=shared,
+                cancel=cancel,
+            )
+            queues[priority].append(ticket)
+            self._dispatch()
+            return ticket
+
+    def _release(self, ticket: Ticket) -> None:
+        with self._cond:
+            if self._running.pop(ticket.id, None) is not None:
+                count = self._session_running.get(ticket.session, 0) - 1
+                if count > 0:
+                    self._session_running[ticket.session] = count
+                else:
+                    self._session_running.pop(ticket.session, None)
+                self._exclusive_sessions.discard(ticket.session)
+            else:
+                queues = self._queues.get(ticket.session) or {}
+                queue = queues.get(ticket.priority)
+                if queue is not None and ticket in queue:
+                    queue.remove(ticket)
+            self._drop_empty(ticket.session)
+            self._dispatch()
+
+    def _drop_empty(self, session: str) -> None:
+        queues = self._queues.get(session)
+        if queues is None or session in self._session_running:
+            return
+        if not any(queues.values()):
+            self._queues.pop(session, None)
+
+    def _can_start(self, session: str, shared: bool) -> bool:
+        if session in self._exclusive_sessions:
+            return False
+        return shared or session not in self._session_running
+
+    def _dispatch(self) -> None:
+        # caller holds self._cond
+        granted = False
+        while len(self._running) < self._max_concurrency:
+            best: Optional[Ticket] = None
+            best_key: Optional[tuple[int, int]] = None
+            for session, queues in self._queues.items():
+                for rank, priority in enumerate(PRIORITIES):
+                    queue = queues[priority]
+                    if not queue:
+                        continue
+                    # FIFO per session: a blocked head holds back later reads
+                    if not self._can_start(session, queue[0].shared):
+                        break
+                    key = (rank, queue[0].id)
+                    if best_key is None or key < best_key:
+                        best, best_key = queue[0], key
+                    break
+            if best is None:
+                break
+
+            self._queues[best.session][best.priority].popleft()
+            best.started_monotonic = time.monotonic()
+            self._running[best.id] = best
+            self._session_running[best.session] = (
+                self._session_running.get(best.session, 0) + 1
+            )
+            if not best.shared:
+                self._exclusive_sessions.add(best.session)
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def queued(self, session: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._cond:
+            out: List[Dict[str, Any]] = []
+            for name, queues in self._queues.items():
+                if session is not None and name != session:
+                    continue
+                position = 0
+                for priority in PRIORITIES:
+                    for ticket in queues[priority]:
+                        position += 1
+                        snap = ticket.snapshot()
+                        snap["position"] = position
+                        out.append(snap)
+            out.sort(key=lambda item: item["ticket"])
+            return out
+
+    def snapshot(self, session: Optional[str] = None) -> Dict[str, Any]:
+        queued = self.queued(session)
+        with self._cond:
+            running = [
+                ticket.snapshot()
+                for ticket in self._running.values()
+                if session is None or ticket.session == session
+            ]
+            return {
+                "max_concurrency": self._max_concurrency,
+                "max_queue_depth": self._max_queue_depth,
+                "running": len(running),
+                "queued": len(queued),
+                "queue": queued,
+            }
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Optional, Tuple
+
+
+PACKAGE = "bnk_serverlib"
+
+# set on a registry module the loader imported; the client's exec bootstrap
+# (bnk/serverlib.py) leaves such modules in place instead of re-importing them
+LOADED_MARK = "_loaded_by_server"
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+def package_fingerprint(package_dir: str) -> Fingerprint:
+    """(path, mtime, size) for every source file under ``package_dir``."""
+    out = []
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            out.append((os.path.relpath(path, package_dir), st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+class ServerlibLoader:
+    """Imports the tool registry from a client-supplied tool root.
+
+    The exec bootstrap re-imports the package on every call so edits show up
+    at once. Here the import is kept until a source file changes, which is
+    cheaper and keeps concurrent tool calls on one set of modules.
+    """
+
+    def __init__(self, package: str = PACKAGE) -> None:
+        self._lock = threading.Lock()
+        self._package = package
+        self._root = ""
+        self._fingerprint: Optional[Fingerprint] = None
+        self._registry: Optional[ModuleType] = None
+
+    def registry(self, tool_root: str) -> ModuleType:
+        root = os.path.realpath(os.path.expanduser(str(tool_root or "")))
+        package_dir = os.path.join(root, self._package)
+        if not os.path.isfile(os.path.join(package_dir, "registry.py")):
+            raise ValueError(f"no {self._package} package under tool root: {tool_root}")
+        fingerprint = package_fingerprint(package_dir)
+        with self._lock:
+            if (
+                self._registry is not None
+                and self._root == root
+                and self._fingerprint == fingerprint
+            ):
+                return self._registry
+            if root not in sys.path:
+                sys.path.insert(0, root)
+            if self._registry is not None:
+                # the old modules' per-view state would otherwise never be dropped
+                self._call(self._registry, "forget_all_views")
+            self._purge()
+            importlib.invalidate_caches()
+            registry = importlib.import_module(f"{self._package}.registry")
+            setattr(registry, LOADED_MARK, True)
+            self._root = root
+            self._fingerprint = fingerprint
+            self._registry = registry
+            return registry
+
+    def release_view(self, bv: Optional[Any]) -> None:
+        """Drop the per-view indexes the loaded registry keeps for ``bv``.
+
+        Called when a session lets go of a view (park, replace, close). It
+        goes through the registry this loader imported, not ``sys.modules``,
+        which an exec-path import may have replaced since.
+        """
+        if bv is None:
+            return
+        with self._lock:
+            registry = self._registry
+        self._call(registry, "forget_view", bv)
+
+    @staticmethod
+    def _call(registry: Optional[ModuleType], name: str, *args: Any) -> None:
+        fn = getattr(registry, name, None)
+        if fn is None:
+            return
+        try:
+            fn(*args)
+        except Exception:
+            pass
+
+    def _purge(self) -> None:
+        prefix = f"{self._package}."
+        for key in list(sys.modules):
+            if key == self._package or key.startswith(prefix):
+                del sys.modules[key]
+
+
+SERVERLIB = ServerlibLoader()
+
+
+def release_view(bv: Optional[Any]) -> None:
+    """``SERVERLIB.release_view``, for the session code."""
+    SERVERLIB.release_view(bv)
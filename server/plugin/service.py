@@ -4,12 +4,15 @@ import ctypes
 import importlib
 import io
 import json
+import os
+import pickle
+import re
 import sys
 import threading
 import time
 import traceback
-from dataclasses import dataclass
-from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from contextlib import contextmanager, nullcontext
 from contextlib import redirect_stderr, redirect_stdout
 from typing import Any, Callable, Dict, List, Optional
 
@@ -23,21 +26,73 @@ except Exception as _exc:  # pragma: no cover - Binary Ninja will have deps inst
 else:
     _RPYC_IMPORT_ERROR = None
 
-from .locks import BN_LOCK, ROOT_LOCK
+from .analysis_cache import AnalysisCache
+from .cancel import CancelToken, RequestCancelled
+from .eviction import (
+    EvictionCandidate,
+    EvictionPolicy,
+    Reaper,
+    estimate_view_bytes,
+    pick_evictions,
+    process_rss,
+)
+from .cursors import ResultCursors, pageable
+from .locks import PATH_LOCKS, ROOT_LOCK
 from .constants import PLUGIN_NAME, SETTINGS_GROUP
-from .log import dbg
+from .jobs import JOB_ANALYZING, JOB_LOADING, LoadJob, LoadJobs
+from .log import dbg, info, warn
+from .profiling import normalize_profile_options, profiled
 from .root_state import reset_root_globals, root_bv, root_globals, set_root_bv
-from .sessions import Session, SessionManager
+from .scheduler import RequestScheduler, Ticket
+from .serverlib import SERVERLIB
+from .session_state import SessionRecord, SessionStateStore
+from .uploads import UploadStore
+from .wire import WireCodec, codec_for
+from .wire import decode as decode_wire
+from .stats import (
+    BYTES_REQUEST,
+    BYTES_RESPONSE,
+    PHASE_COMPILE,
+    PHASE_COMPRESS,
+    PHASE_EXEC,
+    PHASE_LOCK,
+    PHASE_QUEUE,
+    PHASE_SERIALIZE,
+    PHASE_TOOL,
+    PHASE_TOTAL,
+    PhaseTimer,
+    RequestStats,
+    stats_label,
+)
+from .sessions import (
+    Session,
+    SessionManager,
+    _safe_filename,
+    canonical_session_path,
+    safe_close_bv,
+)
 from .views import find_shared_view, shared_view_inventory
 
 
 SESSIONS = SessionManager()
+JOBS = LoadJobs()
+SCHEDULER = RequestScheduler()
+STATS = RequestStats()
+CURSORS = ResultCursors()
+SESSION_STATE = SessionStateStore()
+ANALYSIS_CACHE = AnalysisCache()
+UPLOADS = UploadStore()
+EVICTION_POLICY = EvictionPolicy()
+REAPER = Reaper(lambda: evict_sessions())
 
 _ServiceBase = getattr(rpyc, "Service", object) if rpyc is not None else object
 _ACTIVE_REQUEST_LOCK = threading.RLock()
 _ACTIVE_REQUESTS: Dict[int, "ActiveRequest"] = {}
 _ACTIVE_REQUEST_NEXT_ID = 0
 
+# how often a request waiting on a session lock re-checks its cancel token
+_LOCK_POLL_S = 0.25
+
 
 @dataclass(frozen=True)
 class ActiveRequest:
@@ -46,6 +101,11 @@ class ActiveRequest:
     thread_id: int
     started_monotonic: float
     session: Optional[str] = None
+    progress: Optional[Callable[[], Dict[str, Any]]] = None
+    priority: Optional[str] = None
+    wait_s: Optional[float] = None
+    cancel: Optional[CancelToken] = None
+    timer: Optional[PhaseTimer] = None
 
     def snapshot(self) -> Dict[str, Any]:
         out: Dict[str, Any] = {
@@ -56,6 +116,23 @@ class ActiveRequest:
         }
         if self.session:
             out["session"] = self.session
+        if self.priority:
+            out["priority"] = self.priority
+        if self.wait_s is not None:
+            out["wait_s"] = self.wait_s
+        if self.cancel is not None:
+            remaining = self.cancel.remaining()
+            if remaining is not None:
+                out["deadline_remaining_s"] = max(0.0, remaining)
+            if self.cancel.cancelled:
+                out["cancelled"] = self.cancel.reason
+        if self.timer is not None and self.timer.phases:
+            out["phases"] = dict(self.timer.phases)
+        if self.progress is not None:
+            try:
+                out.update(self.progress())
+            except Exception:
+                pass
         return out
 
 
@@ -132,21 +209,167 @@ def _busy_sessions() -> set[str]:
 
 
 @contextmanager
-def _track_active_request(name: str, *, session: Optional[str] = None):
-    token = _next_request_id()
+def _track_active_request(
+    name: str,
+    *,
+    session: Optional[str] = None,
+    progress: Optional[Callable[[], Dict[str, Any]]] = None,
+    ticket: Optional[Ticket] = None,
+    cancel: Optional[CancelToken] = None,
+    timer: Optional[PhaseTimer] = None,
+    label: Optional[str] = None,
+):
+    request_id = _next_request_id()
+    timer = timer or PhaseTimer()
+    started = time.perf_counter()
+    # idle eviction keys off the last request a session served
+    sess = SESSIONS.get_optional(session) if session else None
+    if sess is not None:
+        sess.touch()
     with _ACTIVE_REQUEST_LOCK:
-        _ACTIVE_REQUESTS[token] = ActiveRequest(
-            id=token,
+        _ACTIVE_REQUESTS[request_id] = ActiveRequest(
+            id=request_id,
             name=name,
             session=session,
             thread_id=threading.get_ident(),
             started_monotonic=time.monotonic(),
+            progress=progress,
+            priority=None if ticket is None else ticket.priority,
+            wait_s=None if ticket is None else ticket.wait_s,
+            cancel=cancel,
+            timer=timer,
         )
     try:
-        yield token
+        yield request_id
     finally:
         with _ACTIVE_REQUEST_LOCK:
-            _ACTIVE_REQUESTS.pop(token, None)
+            _ACTIVE_REQUESTS.pop(request_id, None)
+        if sess is not None:
+            sess.touch()
+        if ticket is not None:
+            timer.add(PHASE_QUEUE, ticket.wait_s)
+        # total covers the whole server-side latency, waits included
+        timer.add(
+            PHASE_TOTAL,
+            time.perf_counter()
+            - started
+            + timer.phases.get(PHASE_QUEUE, 0.0)
+            + timer.phases.get(PHASE_LOCK, 0.0),
+        )
+        STATS.record(label or stats_label(name, session), timer.phases, timer.sizes)
+
+
+@contextmanager
+def _hold_session_lock(
+    sess: Session, cancel: CancelToken, timer: PhaseTimer, *, shared: bool = False
+):
+    if shared:
+        acquire, release = sess.lock.acquire_shared, sess.lock.release_shared
+    else:
+        acquire, release = sess.lock.acquire, sess.lock.release
+    # poll so an interrupt or deadline can drop a request still waiting here
+    with timer.measure(PHASE_LOCK):
+        while not acquire(timeout=_LOCK_POLL_S):
+            cancel.check()
+    try:
+        yield
+    finally:
+        release()
+
+
+@contextmanager
+def _hold_restored_session(
+    sess: Session, cancel: CancelToken, timer: PhaseTimer, *, shared: bool = False
+):
+    """Hold the session lock; a shared hold also sees the view reopened."""
+    while True:
+        if shared and sess.pending_restore is not None:
+            # reopening the view changes the session; do it exclusively
+            with _hold_session_lock(sess, cancel, timer):
+                _ensure_restored(sess, cancel)
+        with _hold_session_lock(sess, cancel, timer, shared=shared):
+            if shared and sess.bv is None and sess.pending_restore is not None:
+                # evicted again before the shared hold; reopen and retry
+                continue
+            yield
+            return
+
+
+def _encode_payload(
+    payload: Dict[str, Any], timer: PhaseTimer, wire: Optional[WireCodec] = None
+) -> bytes:
+    # serialize here rather than in the client's obtain() so the cost is
+    # measured and paid while the request is still accounted for
+    with timer.measure(PHASE_SERIALIZE):
+        try:
+            raw = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as exc:
+            result = payload.pop("result", None)
+            payload["ok"] = False
+            payload["error"] = (
+                f"result of type {type(result).__name__} is not serializable: {exc}"
+            )
+            raw = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    data = raw
+    if wire is not None and wire.name:
+        with timer.measure(PHASE_COMPRESS):
+            data = wire.encode(raw)
+    timer.add_bytes(BYTES_RESPONSE, len(raw), len(data))
+    return data
+
+
+def _decode_request(value: Any, timer: PhaseTimer) -> str:
+    """Request text (code, params json) as sent: str, or an encoded envelope."""
+    if isinstance(value, str):
+        size = len(value.encode("utf-8"))
+        timer.add_bytes(BYTES_REQUEST, size, size)
+        return value
+    data = bytes(value)
+    with timer.measure(PHASE_COMPRESS):
+        raw = decode_wire(data)
+    timer.add_bytes(BYTES_REQUEST, len(raw), len(data))
+    return raw.decode("utf-8")
+
+
+def _page_result(
+    payload: Dict[str, Any],
+    session: str,
+    page_rows: Optional[int],
+    timer: PhaseTimer,
+    *,
+    shared: bool = False,
+    tool: bool = False,
+) -> Dict[str, Any]:
+    # lazy results are produced here, still under the session lock
+    if "result" not in payload or not pageable(payload["result"]):
+        return payload
+    result = payload["result"]
+    try:
+        with timer.measure(PHASE_EXEC):
+            if page_rows:
+                rows, cursor_id = CURSORS.first_page(
+                    session, result, page_rows, shared=shared, tool=tool
+                )
+                payload["result"] = rows
+                if cursor_id is not None:
+                    payload["cursor"] = cursor_id
+            elif not isinstance(result, (list, tuple)):
+                payload["result"] = list(result)
+    except Exception:
+        payload.pop("result", None)
+        payload["ok"] = False
+        payload["error"] = traceback.format_exc()
+    return payload
+
+
+def _profile_options(profile_json: Optional[str]) -> Optional[Dict[str, Any]]:
+    if profile_json is None:
+        return None
+    return normalize_profile_options(json.loads(profile_json))
+
+
+def _cancelled_payload(exc: RequestCancelled) -> Dict[str, Any]:
+    return {"ok": False, "stdout": "", "stderr": "", "error": f"cancelled: {exc}"}
 
 
 def _async_raise(thread_id: int, exc_type: type[BaseException]) -> bool:
@@ -177,6 +400,9 @@ def _async_raise(thread_id: int, exc_type: type[BaseException]) -> bool:
 def _interrupt_active_request(session: Optional[str] = None) -> Dict[str, Any]:
     requests = _select_active_requests(session=session)
     if not requests:
+        queued = SCHEDULER.cancel_queued(session)
+        if queued is not None:
+            return {"ok": True, "interrupted": True, "active": False, "queued": queued}
         return {"ok": True, "interrupted": False, "active": False}
 
     caller_thread_id = threading.get_ident()
@@ -195,7 +421,10 @@ def _interrupt_active_request(session: Optional[str] = None) -> Dict[str, Any]:
             error="cannot interrupt current request thread",
         )
 
-    interrupted = _async_raise(target.thread_id, KeyboardInterrupt)
+    # the token stops cooperative loops and fires native abort hooks; the
+    # injected exception covers plain Python code that never checks it
+    cancelled = target.cancel is not None and target.cancel.cancel("interrupted")
+    interrupted = _async_raise(target.thread_id, KeyboardInterrupt) or cancelled
     dbg(
         f"interrupt request id={target.id} name={target.name} thread={target.thread_id} interrupted={interrupted}"
     )
@@ -217,20 +446,31 @@ def _run_exec(
     argv0: str,
     argv=None,
     capture_output: bool = True,
+    cancel: Optional[CancelToken] = None,
+    timer: Optional[PhaseTimer] = None,
+    profile: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     argv = argv or []
+    timer = timer or PhaseTimer()
 
     stdout = io.StringIO()
     stderr = io.StringIO()
     old_argv = sys.argv
     sys.argv = [argv0] + list(argv)
+    # tools pick this up through bnk_serverlib's cancel checkpoints
+    g["__cancel__"] = cancel
+    g["__timings__"] = timer.phases
+    report: Optional[Dict[str, Any]] = None
     try:
-        compiled = make_compiled()
-        if capture_output:
-            with redirect_stdout(stdout), redirect_stderr(stderr):
+        with timer.measure(PHASE_COMPILE):
+            compiled = make_compiled()
+        profiling = profiled(profile) if profile else nullcontext(None)
+        with timer.measure(PHASE_EXEC), profiling as report:
+            if capture_output:
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    exec(compiled, g, g)
+            else:
                 exec(compiled, g, g)
-        else:
-            exec(compiled, g, g)
 
         payload: Dict[str, Any] = {
             "ok": True,
@@ -244,6 +484,13 @@ def _run_exec(
             "stderr": stderr.getvalue(),
             "error": "KeyboardInterrupt",
         }
+    except RequestCancelled as exc:
+        payload = {
+            "ok": False,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "error": f"cancelled: {exc}",
+        }
     except SystemExit as exc:
         code = exc.code
         ok = code in (0, None)
@@ -264,14 +511,24 @@ def _run_exec(
         }
     finally:
         sys.argv = old_argv
+        g.pop("__cancel__", None)
+        g.pop("__timings__", None)
 
     if "__result__" in g:
         payload["result"] = g["__result__"]
+    if report is not None:
+        payload["profile"] = report
     return payload
 
 
 def _run_file(
-    path: str, g: Dict[str, Any], argv=None, capture_output: bool = True
+    path: str,
+    g: Dict[str, Any],
+    argv=None,
+    capture_output: bool = True,
+    cancel: Optional[CancelToken] = None,
+    timer: Optional[PhaseTimer] = None,
+    profile: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     g.pop("__result__", None)
     g["__file__"] = path
@@ -289,11 +546,20 @@ def _run_file(
         argv0=path,
         argv=argv,
         capture_output=capture_output,
+        cancel=cancel,
+        timer=timer,
+        profile=profile,
     )
 
 
 def _run_code(
-    code: str, g: Dict[str, Any], argv=None, capture_output: bool = True
+    code: str,
+    g: Dict[str, Any],
+    argv=None,
+    capture_output: bool = True,
+    cancel: Optional[CancelToken] = None,
+    timer: Optional[PhaseTimer] = None,
+    profile: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     g.pop("__result__", None)
     g["__file__"] = None
@@ -309,12 +575,70 @@ def _run_code(
         argv0="<knife_server>",
         argv=argv,
         capture_output=capture_output,
+        cancel=cancel,
+        timer=timer,
+        profile=profile,
     )
 
 
+def _tool_is_read_only(registry: Any, tool: str) -> bool:
+    tool_mode = getattr(registry, "tool_mode", None)
+    if tool_mode is None:
+        return False
+    try:
+        return tool_mode(tool) == "read"
+    except KeyError:
+        # unknown tools fail inside call_tool with the list of known names
+        return False
+
+
+def _run_tool(
+    registry: Any,
+    tool: str,
+    params: Dict[str, Any],
+    bv: Any,
+    *,
+    cancel: CancelToken,
+    timer: PhaseTimer,
+    profile: Optional[Dict[str, Any]] = None,
+    session: str = "",
+    page_rows: Optional[int] = None,
+    shared: bool = False,
+) -> Dict[str, Any]:
+    # no stdout capture: redirecting sys.stdout would clash between readers
+    payload: Dict[str, Any] = {"ok": True, "stdout": "", "stderr": ""}
+    report: Optional[Dict[str, Any]] = None
+    try:
+        profiling = profiled(profile) if profile else nullcontext(None)
+        with profiling as report:
+            with timer.measure(PHASE_EXEC):
+                payload["result"] = registry.call_tool(
+                    tool, bv=bv, cancel=cancel, timings=timer.phases, **params
+                )
+            # a lazy result only does its work as rows are taken: time and
+            # profile the first page as part of the tool
+            with timer.measure(PHASE_TOOL):
+                payload = _page_result(
+                    payload, session, page_rows, timer, shared=shared, tool=True
+                )
+    except KeyboardInterrupt:
+        payload.update(ok=False, error="KeyboardInterrupt")
+    except RequestCancelled as exc:
+        payload.update(ok=False, error=f"cancelled: {exc}")
+    except Exception:
+        payload.update(ok=False, error=traceback.format_exc())
+    if report is not None:
+        payload["profile"] = report
+    return payload
+
+
 def _session_snapshot(name: str) -> Dict[str, Any]:
     sess = SESSIONS.get(name)
-    return _snapshot_session(sess, busy=name in _busy_sessions())
+    snap = _snapshot_session(sess, busy=name in _busy_sessions())
+    job = JOBS.for_session(name)
+    if job is not None:
+        snap["load"] = job.snapshot()
+    return snap
 
 
 def _session_snapshots() -> List[Dict[str, Any]]:
@@ -339,6 +663,19 @@ def _snapshot_session(sess: Session, *, busy: bool) -> Dict[str, Any]:
     return snap
 
 
+def _session_wait_snapshot(name: str, job: Optional[LoadJob]) -> Dict[str, Any]:
+    try:
+        snap = _session_snapshot(name)
+    except KeyError:
+        # a failed load into a new session removes the session again
+        if job is None:
+            raise
+        snap = {"name": name, "mode": "empty", "target": "", "busy": False}
+        snap["load"] = job.snapshot()
+    snap["done"] = job is None or job.finished
+    return snap
+
+
 def _release_owned_path(session_name: str, path: str) -> None:
     if path:
         SESSIONS.release_owned_path(session_name, path)
@@ -355,6 +692,441 @@ def _release_previous_owned_path(
         _release_owned_path(session_name, previous_owned_path)
 
 
+def _database_path(bv: Any) -> str:
+    try:
+        file_obj = bv.file
+        if not file_obj.has_database:
+            return ""
+        filename = str(file_obj.filename or "")
+    except Exception:
+        return ""
+    return filename if filename.endswith(".bndb") else ""
+
+
+def _save_session_record(record: SessionRecord) -> None:
+    try:
+        SESSION_STATE.put(record)
+    except OSError as exc:
+        warn(f"could not write session state {SESSION_STATE.path}: {exc}")
+
+
+def _forget_session_record(name: str) -> None:
+    try:
+        SESSION_STATE.remove(name)
+    except OSError as exc:
+        warn(f"could not write session state {SESSION_STATE.path}: {exc}")
+
+
+def _record_session_load(
+    name: str,
+    path: str,
+    bv: Any,
+    *,
+    options: Dict[str, Any],
+    update_analysis: bool,
+) -> None:
+    target = canonical_session_path(path)
+    bndb = target if target.endswith(".bndb") else _database_path(bv)
+    _save_session_record(
+        SessionRecord(
+            name=name,
+            target=target,
+            bndb=bndb,
+            options=dict(options),
+            update_analysis=bool(update_analysis),
+        )
+    )
+
+
+def _refresh_session_record(name: str, sess: Session) -> None:
+    # pick up databases saved by scripts (edit.db.save-as and friends)
+    record = SESSION_STATE.get(name)
+    if record is None or not sess.owns_bv or sess.bv is None:
+        return
+    bndb = _database_path(sess.bv)
+    if bndb and bndb != record.bndb:
+        _save_session_record(replace(record, bndb=bndb, saved_at=0.0))
+
+
+def _note_memory(sess: Session, bv: Any, rss_before: int) -> None:
+    rss_delta = process_rss() - rss_before if rss_before else 0
+    sess.memory_estimate = estimate_view_bytes(bv, rss_delta=rss_delta)
+
+
+def _ensure_restored(sess: Session, cancel: CancelToken) -> None:
+    """Reopen a session's view restored from state or evicted while idle."""
+    record = sess.pending_restore
+    if record is None or sess.bv is not None:
+        return
+    open_path = record.open_path
+    dbg(f"restoring session {sess.name} from {open_path}")
+    rss_before = process_rss()
+    with PATH_LOCKS.hold(sess.owned_path):
+        cache_key = _analysis_cache_key(
+            open_path, record.options, record.update_analysis
+        )
+        bv, cache_state = _load_target(sess.name, open_path, record.options, cache_key)
+    if record.update_analysis:
+        try:
+            _analyze_view(bv, cancel)
+            _store_analysis(sess.name, bv, cache_key, cache_state)
+        except BaseException:
+            safe_close_bv(bv)
+            raise
+    sess.set_bv(bv, owned=True, owned_path=sess.owned_path)
+    _note_memory(sess, bv, rss_before)
+
+
+def restore_sessions(state_path: str) -> int:
+    """Register sessions from ``state_path``; their views open lazily."""
+    restored = 0
+    for record in SESSION_STATE.configure(state_path):
+        if record.mode != "load" or SESSIONS.get_optional(record.name) is not None:
+            continue
+        try:
+            claimed = SESSIONS.claim_owned_path(record.name, record.target)
+        except ValueError as exc:
+            warn(f"not restoring session {record.name}: {exc}")
+            continue
+        sess = SESSIONS.open(record.name)
+        with sess.lock:
+            sess.owned_path = claimed
+            sess.pending_restore = record
+        restored += 1
+    return restored
+
+
+def _open_databases() -> set[str]:
+    paths: set[str] = set()
+    for name in SESSIONS.list_names():
+        sess = SESSIONS.get_optional(name)
+        if sess is None:
+            continue
+        if sess.bv is not None:
+            paths.add(_database_path(sess.bv))
+        if sess.pending_restore is not None:
+            paths.add(sess.pending_restore.bndb)
+    paths.discard("")
+    return paths
+
+
+def _open_files() -> set[str]:
+    """Databases plus the raw files loaded sessions have open."""
+    paths = _open_databases()
+    for name in SESSIONS.list_names():
+        sess = SESSIONS.get_optional(name)
+        if sess is not None and sess.bv is not None:
+            paths.add(_safe_filename(sess.bv))
+    paths.discard("")
+    return paths
+
+
+def _analysis_cache_key(
+    path: str, options: Dict[str, Any], update_analysis: bool
+) -> str:
+    # only analyzed loads of raw files are worth caching
+    if not ANALYSIS_CACHE.enabled or not update_analysis or path.endswith(".bndb"):
+        return ""
+    try:
+        return ANALYSIS_CACHE.key(path, options)
+    except OSError as exc:
+        warn(f"analysis cache: cannot hash {path}: {exc}")
+        return ""
+
+
+def _load_target(
+    name: str, path: str, options: Dict[str, Any], cache_key: str
+) -> tuple[Any, str]:
+    """Load ``path``, or a private copy of its cached database on a hit.
+
+    An uploaded blob is never opened in place either; the session gets its
+    own copy so saves cannot change content stored under its sha256.
+    """
+    open_path = UPLOADS.checkout(path, name)
+    if open_path != path:
+        UPLOADS.prune_work(_open_files() | {open_path})
+    cache_state = "miss" if cache_key else ""
+    if cache_key:
+        try:
+            work = ANALYSIS_CACHE.checkout(cache_key, name)
+        except OSError as exc:
+            warn(f"analysis cache: checkout failed for {path}: {exc}")
+            work = None
+        if work is not None:
+            open_path, cache_state = work, "hit"
+            dbg(f"analysis cache hit for {path}: {work}")
+            ANALYSIS_CACHE.prune_work(_open_databases() | {work})
+    bv = binaryninja.load(open_path, update_analysis=False, options=options)
+    if bv is None:
+        raise RuntimeError(f"failed to load view from {path!r}")
+    return bv, cache_state
+
+
+def _store_analysis(name: str, bv: Any, cache_key: str, cache_state: str) -> str:
+    if cache_state != "miss":
+        return cache_state
+    work = ANALYSIS_CACHE.work_path(cache_key, name)
+    try:
+        # the session keeps working in this database; the cache gets a copy
+        if not bv.create_database(work):
+            warn(f"analysis cache: could not save {work}")
+            return cache_state
+        ANALYSIS_CACHE.store(cache_key, work)
+        ANALYSIS_CACHE.prune_work(_open_databases() | {work})
+    except OSError as exc:
+        warn(f"analysis cache: store failed: {exc}")
+        return cache_state
+    return "stored"
+
+
+def _view_modified(bv: Any) -> bool:
+    try:
+        return bool(bv.file.modified)
+    except Exception:
+        return False
+
+
+def _evicted_directory() -> str:
+    if not SESSION_STATE.path:
+        return ""
+    return os.path.join(os.path.dirname(SESSION_STATE.path), "evicted")
+
+
+def _eviction_database(name: str) -> str:
+    if ANALYSIS_CACHE.enabled:
+        return ANALYSIS_CACHE.work_path("evicted", name)
+    directory = _evicted_directory()
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        return os.path.join(directory, f"{safe}-{int(time.time())}.bndb")
+    return ""
+
+
+def _is_server_copy(bndb: str) -> bool:
+    """Whether ``bndb`` is a database the server made, not the user's own."""
+    if ANALYSIS_CACHE.is_work_path(bndb):
+        return True
+    directory = _evicted_directory()
+    if not directory:
+        return False
+    return os.path.dirname(os.path.realpath(bndb)) == os.path.realpath(directory)
+
+
+def _save_before_eviction(name: str, bv: Any, bndb: str) -> str:
+    try:
+        # a database the user opened is theirs: unsaved work goes to a copy
+        if bndb and _is_server_copy(bndb):
+            return bndb if bv.file.save_auto_snapshot() else ""
+        path = _eviction_database(name)
+        if path and bv.create_database(path):
+            return path
+    except Exception as exc:
+        warn(f"evict {name}: saving the database failed: {exc}")
+    return ""
+
+
+def _evict_session(name: str, sess: Session) -> bool:
+    # never wait: a session that is busy right now is not idle
+    if not sess.lock.acquire(blocking=False):
+        return False
+    try:
+        if sess.bv is None or not sess.owns_bv:
+            return False
+        record = SESSION_STATE.get(name) or SessionRecord(
+            name=name, target=sess.owned_path
+        )
+        bndb = _database_path(sess.bv)
+        if _view_modified(sess.bv):
+            bndb = _save_before_eviction(name, sess.bv, bndb)
+            if not bndb:
+                # nowhere to keep unsaved work; leave the view resident
+                return False
+        if bndb and bndb != record.bndb:
+            record = replace(record, bndb=bndb, saved_at=0.0)
+            _save_session_record(record)
+        CURSORS.close_session(name)
+        sess.park(record, reason="evicted")
+        info(f"evicted idle session {name}; it reopens on its next request")
+        return True
+    finally:
+        sess.lock.release()
+
+
+def evict_sessions(policy: Optional[EvictionPolicy] = None) -> List[str]:
+    """Close owned views that break the eviction policy."""
+    policy = policy or EVICTION_POLICY
+    if not policy.enabled:
+        return []
+    busy = _busy_sessions()
+    candidates: List[EvictionCandidate] = []
+    by_name: Dict[str, Session] = {}
+    for name in SESSIONS.list_names():
+        sess = SESSIONS.get_optional(name)
+        if sess is None or sess.bv is None or not sess.owns_bv or name in busy:
+            continue
+        by_name[name] = sess
+        candidates.append(
+            EvictionCandidate(
+                name=name, idle_s=sess.idle_s(), bytes=sess.memory_estimate
+            )
+        )
+    return [
+        name
+        for name in pick_evictions(candidates, policy)
+        if _evict_session(name, by_name[name])
+    ]
+
+
+def configure_eviction(policy: EvictionPolicy) -> None:
+    global EVICTION_POLICY
+    EVICTION_POLICY = policy
+    if policy.enabled:
+        REAPER.start()
+    else:
+        REAPER.stop()
+
+
+def _abort_analysis(bv: Any) -> Callable[[], None]:
+    def abort() -> None:
+        fn = getattr(bv, "abort_analysis", None)
+        if callable(fn):
+            fn()
+
+    return abort
+
+
+def _analyze_view(bv: Any, cancel: CancelToken) -> None:
+    # views are loaded with update_analysis=False and analyzed here so the
+    # analysis can be aborted through BN; async exceptions never reach a thread
+    # blocked in the core
+    cancel.check()
+    with cancel.on_cancel(_abort_analysis(bv)):
+        bv.update_analysis_and_wait()
+    cancel.check()
+
+
+def _run_background_load(
+    job: LoadJob,
+    sess: Session,
+    *,
+    options: Dict[str, Any],
+    claimed_path: str,
+    claimed_new_path: bool,
+    created_session: bool,
+) -> None:
+    name = job.session
+    bv = None
+    try:
+        with _track_active_request(
+            f"session.{name}.session_load",
+            session=name,
+            progress=job.progress,
+            cancel=job.cancel,
+        ):
+            job.set_state(JOB_LOADING)
+            rss_before = process_rss()
+            with PATH_LOCKS.hold(claimed_path):
+                cache_key = _analysis_cache_key(job.path, options, job.update_analysis)
+                bv, cache_state = _load_target(name, job.path, options, cache_key)
+
+            if job.update_analysis:
+                job.set_state(JOB_ANALYZING, bv=bv)
+                _analyze_view(bv, job.cancel)
+                _store_analysis(name, bv, cache_key, cache_state)
+
+            with sess.lock:
+                if SESSIONS.get_optional(name) is not sess:
+                    raise RuntimeError("session was closed during load")
+                # lazy cursors iterate the view being replaced
+                CURSORS.close_session(name)
+                replace_info = sess.set_bv(bv, owned=True, owned_path=claimed_path)
+                _note_memory(sess, bv, rss_before)
+                _record_session_load(
+                    name,
+                    job.path,
+                    bv,
+                    options=options,
+                    update_analysis=job.update_analysis,
+                )
+                bv = None
+                _release_previous_owned_path(
+                    name,
+                    replace_info,
+                    keep_path=claimed_path,
+                )
+    except BaseException as exc:  # includes KeyboardInterrupt from request interrupt
+        safe_close_bv(bv)
+        if claimed_new_path:
+            _release_owned_path(name, claimed_path)
+        if created_session:
+            with sess.lock:
+                if sess.bv is None and SESSIONS.get_optional(name) is sess:
+                    SESSIONS.close(name)
+        message = str(exc).strip() or exc.__class__.__name__
+        dbg(f"background load {job.id} for session {name} failed: {message}")
+        job.finish(error=message)
+        return
+    job.finish()
+
+
+def _start_background_load(
+    name: str,
+    path: str,
+    *,
+    update_analysis: bool,
+    options: Dict[str, Any],
+) -> Dict[str, Any]:
+    sess = SESSIONS.get_optional(name)
+    created_session = sess is None
+    claimed_path = ""
+    claimed_new_path = False
+    if created_session:
+        claimed_path = SESSIONS.claim_owned_path(name, path)
+        claimed_new_path = bool(claimed_path)
+        sess, created_session = SESSIONS.open_with_created(name)
+
+    try:
+        job = JOBS.create(name, path, update_analysis=update_analysis)
+    except Exception:
+        if claimed_new_path:
+            _release_owned_path(name, claimed_path)
+        if created_session:
+            SESSIONS.close(name)
+        raise
+
+    try:
+        if not claimed_path:
+            with sess.lock:
+                previous_owned_path = sess.owned_path
+                claimed_path = SESSIONS.claim_owned_path(name, path)
+                claimed_new_path = bool(
+                    claimed_path and claimed_path != previous_owned_path
+                )
+    except Exception as exc:
+        job.finish(error=str(exc))
+        raise
+
+    thread = threading.Thread(
+        target=_run_background_load,
+        args=(job, sess),
+        kwargs={
+            "options": options,
+            "claimed_path": claimed_path,
+            "claimed_new_path": claimed_new_path,
+            "created_session": created_session,
+        },
+        name=f"knife-load-{job.id}",
+        daemon=True,
+    )
+    thread.start()
+
+    out = _snapshot_session(sess, busy=True)
+    out["job_id"] = job.id
+    out["load"] = job.snapshot()
+    return out
+
+
 class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server threads
     """RPyC service exposing root and session primitives."""
 
@@ -362,6 +1134,8 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
 
     def __init__(self):
         _ensure_rpyc()
+        # one service instance per connection, so this is per client
+        self._wire = WireCodec()
 
     def on_connect(self, conn):
         dbg(f"connect open: {conn}")
@@ -374,13 +1148,25 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
     def exposed_request_status(self, session: Optional[str] = None):
         snap = _active_request_snapshot(session=session)
         if snap is None:
-            return {"active": False}
-        snap["active"] = True
+            snap = {"active": False}
+        else:
+            snap["active"] = True
+        queued = SCHEDULER.queued(session)
+        if queued:
+            snap["queued"] = queued
         return snap
 
     def exposed_request_interrupt(self, session: Optional[str] = None):
         return _interrupt_active_request(session=session)
 
+    def exposed_wire_negotiate(self, codecs, min_bytes: Optional[int] = None):
+        """Pick payload compression for this connection from the client's list."""
+        self._wire = codec_for([str(name) for name in codecs or ()], min_bytes)
+        return {"codec": self._wire.name, "min_bytes": self._wire.min_bytes}
+
+    def exposed_request_stats(self, reset: bool = False):
+        return STATS.snapshot(reset=bool(reset))
+
     def exposed_bv(self):
         return root_bv()
 
@@ -414,15 +1200,50 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
                 )
 
     def exposed_session_run_file(
-        self, name: str, path: str, argv=None, capture_output: bool = True
+        self,
+        name: str,
+        path: str,
+        argv=None,
+        capture_output: bool = True,
+        priority: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        label: Optional[str] = None,
+        profile_json: Optional[str] = None,
+        page_rows: Optional[int] = None,
     ):
+        profile = _profile_options(profile_json)
         sess = SESSIONS.get(name)
-        with sess.lock:
-            with _track_active_request(f"session.{name}.run_file", session=name):
-                sess.globals["bv"] = sess.bv
-                return _run_file(
-                    path, sess.globals, argv=argv, capture_output=capture_output
-                )
+        request_name = f"session.{name}.run_file"
+        cancel = CancelToken(deadline_s=deadline_s)
+        timer = PhaseTimer()
+        try:
+            with cancel.armed(), SCHEDULER.admit(
+                name, request_name, priority=priority, cancel=cancel
+            ) as ticket:
+                with _hold_session_lock(sess, cancel, timer), _track_active_request(
+                    request_name,
+                    session=name,
+                    ticket=ticket,
+                    cancel=cancel,
+                    timer=timer,
+                    label=label,
+                ):
+                    _ensure_restored(sess, cancel)
+                    sess.globals["bv"] = sess.bv
+                    payload = _run_file(
+                        path,
+                        sess.globals,
+                        argv=argv,
+                        capture_output=capture_output,
+                        cancel=cancel,
+                        timer=timer,
+                        profile=profile,
+                    )
+                    payload = _page_result(payload, name, page_rows, timer)
+                    _refresh_session_record(name, sess)
+                    return _encode_payload(payload, timer, self._wire)
+        except RequestCancelled as exc:
+            return _encode_payload(_cancelled_payload(exc), timer, self._wire)
 
     def exposed_binaryview_load(
         self,
@@ -433,7 +1254,8 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
         options = {}
         if options_json is not None:
             options = json.loads(options_json)
-        with BN_LOCK:
+        path_key = canonical_session_path(source) if isinstance(source, str) else ""
+        with PATH_LOCKS.hold(path_key):
             with _track_active_request("root.binaryview_load"):
                 return binaryninja.load(
                     source, update_analysis=update_analysis, options=options
@@ -456,17 +1278,27 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
         except KeyError:
             return {"name": name, "closed": False}
 
-        with sess.lock, BN_LOCK:
+        job = JOBS.for_session(name)
+        if job is not None and not job.finished:
+            job.cancel.cancel("session closed")
+
+        with sess.lock:
             with _track_active_request(f"session.{name}.session_close", session=name):
                 out = sess.detach_bv(close_owned=True)
                 _release_previous_owned_path(name, out)
+        JOBS.forget(name)
+        CURSORS.close_session(name)
+        _forget_session_record(name)
         return {"name": name, "closed": SESSIONS.close(name)}
 
     def exposed_session_reset(self, name: str, keep_bv: bool = True):
         sess = SESSIONS.get(name)
-        with sess.lock, BN_LOCK:
+        CURSORS.close_session(name)
+        with sess.lock:
             with _track_active_request(f"session.{name}.session_reset", session=name):
                 out = sess.reset(keep_bv=keep_bv)
+                if not keep_bv:
+                    _forget_session_record(name)
                 _release_previous_owned_path(name, out)
                 snap = sess.snapshot(busy=False)
                 snap["reset"] = True
@@ -478,16 +1310,17 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
         view_id: str,
         include_unnamed: bool = False,
     ):
-        with BN_LOCK:
-            bv, info = find_shared_view(
-                view_id,
-                include_unnamed=include_unnamed,
-            )
+        bv, info = find_shared_view(
+            view_id,
+            include_unnamed=include_unnamed,
+        )
 
         sess = SESSIONS.open(name)
-        with sess.lock, BN_LOCK:
+        with sess.lock:
             with _track_active_request(f"session.{name}.session_attach", session=name):
+                CURSORS.close_session(name)
                 replace_info = sess.set_bv(bv, owned=False)
+                _forget_session_record(name)
                 _release_previous_owned_path(name, replace_info)
                 out = sess.snapshot(busy=False)
                 out["id"] = info.get("id", "")
@@ -503,11 +1336,25 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
         path: str,
         update_analysis: bool = True,
         options_json: Optional[str] = None,
+        background: bool = False,
+        deadline_s: Optional[float] = None,
     ):
         options = {}
         if options_json is not None:
             options = json.loads(options_json)
 
+        if background:
+            return _start_background_load(
+                name,
+                path,
+                update_analysis=bool(update_analysis),
+                options=options,
+            )
+
+        job = JOBS.for_session(name)
+        if job is not None and not job.finished:
+            raise RuntimeError(f"session {name!r} is already loading (job {job.id})")
+
         sess = SESSIONS.get_optional(name)
         created_session = sess is None
         claimed_path = ""
@@ -517,7 +1364,8 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
             claimed_new_path = bool(claimed_path)
             sess, created_session = SESSIONS.open_with_created(name)
 
-        with sess.lock, BN_LOCK:
+        cancel = CancelToken(deadline_s=deadline_s)
+        with cancel.armed(), sess.lock:
             previous_owned_path = sess.owned_path
             try:
                 if not claimed_path:
@@ -525,14 +1373,32 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
                     claimed_new_path = bool(
                         claimed_path and claimed_path != previous_owned_path
                     )
-                with _track_active_request(f"session.{name}.session_load", session=name):
-                    bv = binaryninja.load(
-                        path, update_analysis=update_analysis, options=options
-                    )
-                    if bv is None:
-                        raise RuntimeError(f"failed to load view from {path!r}")
-
+                with PATH_LOCKS.hold(claimed_path), _track_active_request(
+                    f"session.{name}.session_load", session=name, cancel=cancel
+                ):
+                    rss_before = process_rss()
+                    cache_key = _analysis_cache_key(path, options, update_analysis)
+                    bv, cache_state = _load_target(name, path, options, cache_key)
+                    if update_analysis:
+                        try:
+                            _analyze_view(bv, cancel)
+                            cache_state = _store_analysis(
+                                name, bv, cache_key, cache_state
+                            )
+                        except BaseException:
+                            safe_close_bv(bv)
+                            raise
+
+                    CURSORS.close_session(name)
                     replace_info = sess.set_bv(bv, owned=True, owned_path=claimed_path)
+                    _note_memory(sess, bv, rss_before)
+                    _record_session_load(
+                        name,
+                        path,
+                        bv,
+                        options=options,
+                        update_analysis=bool(update_analysis),
+                    )
                     _release_previous_owned_path(
                         name,
                         replace_info,
@@ -543,6 +1409,8 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
                         out["replaced"] = True
                     if replace_info.get("previous_closed"):
                         out["previous_closed"] = True
+                    if cache_state:
+                        out["analysis_cache"] = cache_state
                     return out
             except Exception:
                 if claimed_new_path:
@@ -553,11 +1421,44 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
                     SESSIONS.close(name)
                 raise
 
+    def exposed_upload_has(self, sha256: str, name: str = ""):
+        return {"sha256": sha256, "path": UPLOADS.has(sha256, name) or ""}
+
+    def exposed_upload_begin(self, sha256: str, size: int, name: str = ""):
+        return UPLOADS.begin(sha256, size, name)
+
+    def exposed_upload_chunk(
+        self, upload_id: str, offset: int, data: bytes, encoded: bool = False
+    ):
+        timer = PhaseTimer()
+        data = bytes(data)
+        wire_size = len(data)
+        if encoded:
+            with timer.measure(PHASE_COMPRESS):
+                data = decode_wire(data)
+        timer.add_bytes(BYTES_REQUEST, len(data), wire_size)
+        STATS.record("upload.chunk", timer.phases, timer.sizes)
+        return UPLOADS.chunk(upload_id, offset, data)
+
+    def exposed_upload_finish(self, upload_id: str):
+        return {"upload_id": upload_id, "path": UPLOADS.finish(upload_id)}
+
+    def exposed_upload_abort(self, upload_id: str):
+        return {"upload_id": upload_id, "aborted": UPLOADS.abort(upload_id)}
+
+    def exposed_session_wait(self, name: str, timeout: Optional[float] = None):
+        job = JOBS.for_session(name)
+        if job is not None:
+            job.done.wait(None if timeout is None else max(0.0, float(timeout)))
+        return _session_wait_snapshot(name, job)
+
     def exposed_session_detach(self, name: str):
         sess = SESSIONS.get(name)
-        with sess.lock, BN_LOCK:
+        with sess.lock:
             with _track_active_request(f"session.{name}.session_detach", session=name):
+                CURSORS.close_session(name)
                 out = sess.detach_bv(close_owned=True)
+                _forget_session_record(name)
                 _release_previous_owned_path(name, out)
                 snap = sess.snapshot(busy=False)
                 if out.get("had_attached"):
@@ -567,30 +1468,189 @@ class KnifeServerService(_ServiceBase):  # instantiated by rpyc in server thread
                 return snap
 
     def exposed_view_list(self, include_unnamed: bool = False, full: bool = False):
-        with BN_LOCK:
-            with _track_active_request("view_list"):
-                views = []
-                entries = shared_view_inventory(
-                    include_unnamed=include_unnamed,
-                    full=full,
-                )
-                for _bv_ref, info in entries:
-                    views.append(dict(info))
-                return views
+        with _track_active_request("view_list"):
+            views = []
+            entries = shared_view_inventory(
+                include_unnamed=include_unnamed,
+                full=full,
+            )
+            for _bv_ref, info in entries:
+                views.append(dict(info))
+            return views
 
     def exposed_run_code(
-        self, name: str, code: str, argv=None, capture_output: bool = True
+        self,
+        name: str,
+        code: str,
+        argv=None,
+        capture_output: bool = True,
+        priority: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        label: Optional[str] = None,
+        profile_json: Optional[str] = None,
+        page_rows: Optional[int] = None,
     ):
+        profile = _profile_options(profile_json)
         sess = SESSIONS.get(name)
-        with sess.lock:
-            with _track_active_request(f"session.{name}.run_code", session=name):
-                # A sleeping or network-bound script in one session must not hold
-                # the global BN lock and starve unrelated sessions.
-                # keep session globals in sync with attached bv
-                sess.globals["bv"] = sess.bv
-                return _run_code(
-                    code, sess.globals, argv=argv, capture_output=capture_output
-                )
+        request_name = f"session.{name}.run_code"
+        # the deadline normally mirrors the client timeout, so a request the
+        # client gave up on stops at its next checkpoint instead of running on
+        cancel = CancelToken(deadline_s=deadline_s)
+        timer = PhaseTimer()
+        code = _decode_request(code, timer)
+        try:
+            with cancel.armed(), SCHEDULER.admit(
+                name, request_name, priority=priority, cancel=cancel
+            ) as ticket:
+                with _hold_session_lock(sess, cancel, timer), _track_active_request(
+                    request_name,
+                    session=name,
+                    ticket=ticket,
+                    cancel=cancel,
+                    timer=timer,
+                    label=label,
+                ):
+                    # A sleeping or network-bound script in one session only holds
+                    # that session's lock and must not starve unrelated sessions.
+                    # keep session globals in sync with attached bv
+                    _ensure_restored(sess, cancel)
+                    sess.globals["bv"] = sess.bv
+                    payload = _run_code(
+                        code,
+                        sess.globals,
+                        argv=argv,
+                        capture_output=capture_output,
+                        cancel=cancel,
+                        timer=timer,
+                        profile=profile,
+                    )
+                    payload = _page_result(payload, name, page_rows, timer)
+                    _refresh_session_record(name, sess)
+                    return _encode_payload(payload, timer, self._wire)
+        except RequestCancelled as exc:
+            return _encode_payload(_cancelled_payload(exc), timer, self._wire)
+
+    def exposed_session_tool_call(
+        self,
+        name: str,
+        tool: str,
+        params_json: str,
+        tool_root: str,
+        priority: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        label: Optional[str] = None,
+        profile_json: Optional[str] = None,
+        page_rows: Optional[int] = None,
+    ):
+        profile = _profile_options(profile_json)
+        sess = SESSIONS.get(name)
+        request_name = f"session.{name}.tool.{tool}"
+        cancel = CancelToken(deadline_s=deadline_s)
+        timer = PhaseTimer()
+        params_json = _decode_request(params_json, timer)
+        params = json.loads(params_json) if params_json else {}
+        try:
+            registry = SERVERLIB.registry(tool_root)
+        except Exception:
+            error = traceback.format_exc()
+            payload = {"ok": False, "stdout": "", "stderr": "", "error": error}
+            return _encode_payload(payload, timer, self._wire)
+        # read-only tools share the session; edits run alone like exec does
+        shared = _tool_is_read_only(registry, tool)
+        try:
+            with cancel.armed(), SCHEDULER.admit(
+                name, request_name, priority=priority, cancel=cancel, shared=shared
+            ) as ticket:
+                with _hold_restored_session(
+                    sess, cancel, timer, shared=shared
+                ), _track_active_request(
+                    request_name,
+                    session=name,
+                    ticket=ticket,
+                    cancel=cancel,
+                    timer=timer,
+                    label=label,
+                ):
+                    if not shared:
+                        _ensure_restored(sess, cancel)
+                    payload = _run_tool(
+                        registry,
+                        tool,
+                        params,
+                        sess.bv,
+                        cancel=cancel,
+                        timer=timer,
+                        profile=profile,
+                        session=name,
+                        page_rows=page_rows,
+                        shared=shared,
+                    )
+                    if not shared:
+                        _refresh_session_record(name, sess)
+                    return _encode_payload(payload, timer, self._wire)
+        except RequestCancelled as exc:
+            return _encode_payload(_cancelled_payload(exc), timer, self._wire)
+
+    def exposed_tool_list(self, tool_root: str):
+        # served from the loader's registry, not the exec bootstrap, so the
+        # loaded modules and their per-view state are left alone
+        timer = PhaseTimer()
+        payload: Dict[str, Any] = {"ok": True, "stdout": "", "stderr": ""}
+        try:
+            payload["result"] = SERVERLIB.registry(tool_root).list_tools()
+        except Exception:
+            payload = dict(payload, ok=False, error=traceback.format_exc())
+        return _encode_payload(payload, timer, self._wire)
+
+    def exposed_result_fetch(
+        self,
+        name: str,
+        cursor_id: str,
+        max_rows: int = 1000,
+        deadline_s: Optional[float] = None,
+        label: Optional[str] = None,
+    ):
+        sess = SESSIONS.get(name)
+        request_name = f"session.{name}.result_fetch"
+        cancel = CancelToken(deadline_s=deadline_s)
+        timer = PhaseTimer()
+        try:
+            cursor = CURSORS.get(name, cursor_id)
+            shared, tool = cursor.shared, cursor.tool
+        except KeyError:
+            shared = tool = False
+        try:
+            with cancel.armed():
+                # lazy cursors may still be running tool code against the view
+                with _hold_session_lock(
+                    sess, cancel, timer, shared=shared
+                ), _track_active_request(
+                    request_name,
+                    session=name,
+                    cancel=cancel,
+                    timer=timer,
+                    label=label,
+                ):
+                    try:
+                        # later pages of a lazy tool result are tool time too
+                        with timer.measure(PHASE_EXEC), (
+                            timer.measure(PHASE_TOOL) if tool else nullcontext()
+                        ):
+                            page = CURSORS.fetch(name, cursor_id, max_rows)
+                    except KeyError as exc:
+                        payload = {"ok": False, "error": str(exc.args[0])}
+                    except Exception:
+                        CURSORS.close(name, cursor_id)
+                        payload = {"ok": False, "error": traceback.format_exc()}
+                    else:
+                        payload = dict(page, ok=True)
+                    return _encode_payload(payload, timer, self._wire)
+        except RequestCancelled as exc:
+            payload = {"ok": False, "error": f"cancelled: {exc}"}
+            return _encode_payload(payload, timer, self._wire)
+
+    def exposed_result_close(self, name: str, cursor_id: str):
+        return {"cursor": cursor_id, "closed": CURSORS.close(name, cursor_id)}
 
 
 def validate_service_imports() -> Optional[str]:
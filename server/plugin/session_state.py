@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+STATE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """What it takes to bring a loaded session back after a restart."""
+
+    name: str
+    target: str
+    mode: str = "load"
+    bndb: str = ""
+    options: Dict[str, Any] = field(default_factory=dict)
+    update_analysis: bool = True
+    saved_at: float = 0.0
+
+    @property
+    def open_path(self) -> str:
+        # a saved database restores without re-running analysis
+        if self.bndb and os.path.exists(self.bndb):
+            return self.bndb
+        return self.target
+
+    def to_json(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SessionRecord":
+        options = data.get("options") or {}
+        return cls(
+            name=str(data["name"]),
+            target=str(data["target"]),
+            mode=str(data.get("mode") or "load"),
+            bndb=str(data.get("bndb") or ""),
+            options=dict(options) if isinstance(options, dict) else {},
+            update_analysis=bool(data.get("update_analysis", True)),
+            saved_at=float(data.get("saved_at") or 0.0),
+        )
+
+
+class SessionStateStore:
+    """Session records mirrored to a JSON state file.
+
+    Without a path the records are kept in memory only (idle eviction still
+    needs them to reopen views). Writes go through a temp file and
+    ``os.replace`` so a crash never leaves a half-written state file behind.
+    """
+
+    def __init__(self, path: str = "") -> None:
+        self._lock = threading.Lock()
+        self._path = ""
+        self._records: Dict[str, SessionRecord] = {}
+        if path:
+            self.configure(path)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def configure(self, path: str) -> List[SessionRecord]:
+        """Point the store at ``path`` and return the records found there."""
+        path = os.path.expanduser(path) if path else ""
+        with self._lock:
+            self._path = path
+            if not path:
+                return []
+            found = self._read_locked()
+            # sessions loaded earlier in this process win over stale entries
+            merged = dict(found, **self._records)
+            self._records = merged
+            if merged != found:
+                self._write_locked()
+            return list(found.values())
+
+    def get(self, name: str) -> Optional[SessionRecord]:
+        with self._lock:
+            return self._records.get(name)
+
+    def records(self) -> List[SessionRecord]:
+        with self._lock:
+            return [self._records[name] for name in sorted(self._records)]
+
+    def put(self, record: SessionRecord) -> bool:
+        """Store ``record``; returns False when nothing changed."""
+        with self._lock:
+            current = self._records.get(record.name)
+            if current is not None and _same(current, record):
+                return False
+            if not record.saved_at:
+                record = SessionRecord(**dict(record.to_json(), saved_at=time.time()))
+            self._records[record.name] = record
+            if self._path:
+                self._write_locked()
+            return True
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            if self._records.pop(name, None) is None:
+                return False
+            if self._path:
+                self._write_locked()
+            return True
+
+    def _read_locked(self) -> Dict[str, SessionRecord]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return {}
+        out: Dict[str, SessionRecord] = {}
+        for raw in data.get("sessions") or []:
+            try:
+                record = SessionRecord.from_json(raw)
+            except (KeyError, TypeError, ValueError):
+                continue
+            out[record.name] = record
+        return out
+
+    def _write_locked(self) -> None:
+        data = {
+            "version": STATE_VERSION,
+            "sessions": [
+                self._records[name].to_json() for name in sorted(self._records)
+            ],
+        }
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(tmp, self._path)
+
+
+def _same(a: SessionRecord, b: SessionRecord) -> bool:
+    left = dict(a.to_json(), saved_at=0.0)
+    right = dict(b.to_json(), saved_at=0.0)
+    return left == right
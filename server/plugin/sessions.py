@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import binaryninja  # type: ignore
 
+from .locks import RWLock
+from .serverlib import release_view
+
 
 def _new_globals(bv: Optional[Any]) -> Dict[str, Any]:
     g: Dict[str, Any] = {
@@ -43,7 +47,7 @@ def _safe_getattr(obj: Any, name: str, default: Any = "") -> Any:
         return default
 
 
-def _safe_close_bv(bv: Optional[Any]) -> bool:
+def safe_close_bv(bv: Optional[Any]) -> bool:
     if bv is None:
         return False
     try:
@@ -72,16 +76,43 @@ def canonical_session_path(path: str) -> str:
 @dataclass
 class Session:
     name: str
-    lock: threading.RLock = field(default_factory=threading.RLock)
+    # read-only tool calls share it; exec, edits and view changes take it
+    # exclusively (``with sess.lock``)
+    lock: RWLock = field(default_factory=RWLock)
     bv: Optional[Any] = None
     owns_bv: bool = False
     owned_path: str = ""
     globals: Dict[str, Any] = field(default_factory=dict)
+    # SessionRecord from the state file, opened on the session's first request
+    pending_restore: Optional[Any] = None
+    restore_reason: str = "pending"
+    last_used: float = field(default_factory=time.time)
+    memory_estimate: int = 0
 
     def __post_init__(self) -> None:
         self.globals = _new_globals(self.bv)
         self.globals["__session_name__"] = self.name
 
+    def touch(self) -> None:
+        self.last_used = time.time()
+
+    def idle_s(self) -> float:
+        return max(0.0, time.time() - self.last_used)
+
+    def park(self, record: Any, *, reason: str = "evicted") -> bool:
+        """Close the owned view but keep the session able to reopen it."""
+        if self.bv is None or not self.owns_bv:
+            return False
+        release_view(self.bv)
+        closed = safe_close_bv(self.bv)
+        self.bv = None
+        self.owns_bv = False
+        self.memory_estimate = 0
+        self.pending_restore = record
+        self.restore_reason = reason
+        self.globals["bv"] = None
+        return closed
+
     def set_bv(
         self,
         bv: Optional[Any],
@@ -95,13 +126,18 @@ class Session:
         replaced = prev_bv is not None and prev_bv is not bv
         previous_closed = False
 
+        if replaced:
+            release_view(prev_bv)
         # Close previously loaded views to avoid leaked references / locked DB handles.
         if replaced and prev_owned:
-            previous_closed = _safe_close_bv(prev_bv)
+            previous_closed = safe_close_bv(prev_bv)
 
         self.bv = bv
         self.owns_bv = bool(owned and bv is not None)
         self.owned_path = str(owned_path or "") if self.owns_bv else ""
+        self.pending_restore = None
+        self.restore_reason = "pending"
+        self.memory_estimate = 0
         self.globals["bv"] = bv
         return {
             "replaced": replaced,
@@ -110,6 +146,17 @@ class Session:
         }
 
     def snapshot(self, *, busy: bool = False) -> Dict[str, Any]:
+        if self.bv is None and self.pending_restore is not None:
+            return {
+                "name": self.name,
+                "mode": "load",
+                "target": self.pending_restore.target,
+                "busy": bool(busy),
+                "restore": self.restore_reason,
+                "last_used": self.last_used,
+                "idle_s": self.idle_s(),
+            }
+
         if self.bv is None:
             return {
                 "name": self.name,
@@ -132,8 +179,12 @@ class Session:
                 "arch": _safe_getattr(arch, "name", "") or str(arch or ""),
                 "analysis_state": _safe_getattr(analysis_state, "name", "")
                 or str(analysis_state or ""),
+                "last_used": self.last_used,
+                "idle_s": self.idle_s(),
             }
         )
+        if self.owns_bv:
+            info["memory_estimate"] = self.memory_estimate
         return info
 
     def detach_bv(self, *, close_owned: bool = True) -> Dict[str, Any]:
@@ -142,12 +193,15 @@ class Session:
         prev_owned_path = self.owned_path
         had_attached = prev_bv is not None
         closed = False
+        release_view(prev_bv)
         if had_attached and close_owned and prev_owned:
-            closed = _safe_close_bv(prev_bv)
+            closed = safe_close_bv(prev_bv)
 
         self.bv = None
         self.owns_bv = False
         self.owned_path = ""
+        self.pending_restore = None
+        self.memory_estimate = 0
         self.globals["bv"] = None
         return {
             "had_attached": had_attached,
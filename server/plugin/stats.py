@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+PHASE_QUEUE = "queue"
+PHASE_LOCK = "lock"
+PHASE_COMPILE = "compile"
+PHASE_EXEC = "exec"
+PHASE_TOOL = "tool"
+PHASE_SERIALIZE = "serialize"
+PHASE_COMPRESS = "compress"
+PHASE_TOTAL = "total"
+
+# display order for stats output; unknown phases sort after these
+PHASES = (
+    PHASE_TOTAL,
+    PHASE_QUEUE,
+    PHASE_LOCK,
+    PHASE_COMPILE,
+    PHASE_EXEC,
+    PHASE_TOOL,
+    PHASE_SERIALIZE,
+    PHASE_COMPRESS,
+)
+
+# payload directions; each records raw and on-the-wire sizes
+BYTES_REQUEST = "request"
+BYTES_RESPONSE = "response"
+
+QUANTILES = (0.50, 0.95, 0.99)
+
+# log-spaced buckets from 1us; 2**0.25 growth keeps quantiles within ~19%
+_BUCKET_MIN_S = 1e-6
+_BUCKET_GROWTH = 2 ** 0.25
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+
+
+def _bucket_index(value_s: float) -> int:
+    if value_s <= _BUCKET_MIN_S:
+        return 0
+    return int(math.ceil(math.log(value_s / _BUCKET_MIN_S) / _LOG_GROWTH))
+
+
+def _bucket_upper(index: int) -> float:
+    return _BUCKET_MIN_S * _BUCKET_GROWTH**index
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram over log-spaced buckets."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def record(self, value_s: float) -> None:
+        value_s = max(0.0, float(value_s))
+        self.count += 1
+        self.total_s += value_s
+        self.max_s = max(self.max_s, value_s)
+        index = _bucket_index(value_s)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(q * self.count)))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max_s)
+        return self.max_s
+
+    def snapshot(self) -> Dict[str, float]:
+        out: Dict[str, float] = {
+            "count": self.count,
+            "mean_ms": 1000.0 * self.total_s / self.count if self.count else 0.0,
+        }
+        for q in QUANTILES:
+            out[f"p{int(round(q * 100))}_ms"] = 1000.0 * self.quantile(q)
+        out["max_ms"] = 1000.0 * self.max_s
+        return out
+
+
+class PhaseTimer:
+    """Collects per-phase durations for one request."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+
+    def add(self, phase: str, elapsed_s: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(0.0, elapsed_s)
+
+    def add_bytes(self, kind: str, raw: int, wire: int) -> None:
+        """Count a payload of ``raw`` bytes that took ``wire`` bytes to send."""
+        for key, value in ((f"{kind}_raw", raw), (f"{kind}_wire", wire)):
+            self.sizes[key] = self.sizes.get(key, 0) + max(0, int(value))
+
+    def measure(self, phase: str) -> "_PhaseSpan":
+        return _PhaseSpan(self, phase)
+
+
+class _PhaseSpan:
+    def __init__(self, timer: PhaseTimer, phase: str) -> None:
+        self._timer = timer
+        self._phase = phase
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *_exc) -> None:
+        self._timer.add(self._phase, time.perf_counter() - self._started)
+
+
+def _phase_order(phase: str) -> tuple[int, str]:
+    try:
+        return PHASES.index(phase), phase
+    except ValueError:
+        return len(PHASES), phase
+
+
+class RequestStats:
+    """Latency histograms keyed by request label and phase, plus byte totals."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._bytes: Dict[str, Dict[str, List[int]]] = {}  # [count, total, max]
+        self._since = time.time()
+
+    def record(
+        self,
+        label: str,
+        phases: Dict[str, float],
+        sizes: Optional[Dict[str, int]] = None,
+    ) -> None:
+        with self._lock:
+            by_phase = self._histograms.setdefault(label, {})
+            for phase, elapsed_s in phases.items():
+                hist = by_phase.get(phase)
+                if hist is None:
+                    hist = by_phase[phase] = LatencyHistogram()
+                hist.record(elapsed_s)
+            by_kind = self._bytes.setdefault(label, {}) if sizes else {}
+            for kind, size in (sizes or {}).items():
+                entry = by_kind.setdefault(kind, [0, 0, 0])
+                entry[0] += 1
+                entry[1] += size
+                entry[2] = max(entry[2], size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._bytes.clear()
+            self._since = time.time()
+
+    def snapshot(self, *, reset: bool = False) -> Dict[str, object]:
+        with self._lock:
+            rows: List[Dict[str, object]] = []
+            for label in sorted(self._histograms):
+                by_phase = self._histograms[label]
+                for phase in sorted(by_phase, key=_phase_order):
+                    row: Dict[str, object] = {"name": label, "phase": phase}
+                    row.update(by_phase[phase].snapshot())
+                    rows.append(row)
+            out: Dict[str, object] = {
+                "since": self._since,
+                "window_s": max(0.0, time.time() - self._since),
+                "stats": rows,
+            }
+            byte_rows = [
+                _bytes_row(label, self._bytes[label]) for label in sorted(self._bytes)
+            ]
+            if byte_rows:
+                out["bytes"] = byte_rows
+            if reset:
+                self._histograms.clear()
+                self._bytes.clear()
+                self._since = time.time()
+            return out
+
+
+def _bytes_row(label: str, by_kind: Dict[str, List[int]]) -> Dict[str, object]:
+    row: Dict[str, object] = {"name": label}
+    for kind in sorted(by_kind):
+        _count, total, largest = by_kind[kind]
+        row[f"{kind}_total"] = total
+        row[f"{kind}_max"] = largest
+    for side in (BYTES_REQUEST, BYTES_RESPONSE):
+        raw = by_kind.get(f"{side}_raw", [0, 0, 0])[1]
+        wire = by_kind.get(f"{side}_wire", [0, 0, 0])[1]
+        if raw:
+            row[f"{side}_ratio"] = wire / raw
+    return row
+
+
+def stats_label(name: str, session: Optional[str] = None) -> str:
+    """Aggregate per-session request names (session.NAME.op) under ``op``."""
+    if session:
+        prefix = f"session.{session}."
+        if name.startswith(prefix):
+            return name[len(prefix) :]
+    return name
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import secrets
+import shutil
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+
+MAX_CHUNK_BYTES = 16 * 1024**2
+
+# unfinished uploads nobody wrote to for this long are dropped
+UPLOAD_IDLE_S = 600.0
+
+# session copies nobody has open are kept this long after their last change
+WORK_GRACE_S = 3600.0
+
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _check_digest(sha256: str) -> str:
+    digest = str(sha256 or "").strip().lower()
+    if not _SHA256_RE.match(digest):
+        raise ValueError(f"invalid sha256: {sha256!r}")
+    return digest
+
+
+def _safe_basename(name: str) -> str:
+    # keep the extension: BN picks the view type (e.g. .bndb) from it
+    base = os.path.basename(str(name or "").replace("\\", "/"))
+    base = re.sub(r"[^A-Za-z0-9_.+-]", "_", base).lstrip(".")
+    return base[:128] or "blob"
+
+
+@dataclass
+class _Upload:
+    id: str
+    sha256: str
+    size: int
+    name: str
+    tmp_path: str
+    received: int = 0
+    hasher: Any = field(default_factory=hashlib.sha256, repr=False)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class UploadStore:
+    """Content-addressed store for files sent to the server in chunks.
+
+    Blobs live at ``<dir>/blobs/<sha256>/<name>``. Uploading content the
+    store already has costs one ``has`` round trip; the same bytes under a
+    different name are hard-linked (or copied) by ``begin`` instead of
+    re-sent. Blobs are read-only and must still match their sha256, so
+    sessions never open one directly: ``checkout`` gives each load its own
+    copy under ``<dir>/work``.
+    """
+
+    def __init__(self, directory: str = "") -> None:
+        self._lock = threading.Lock()
+        self._directory = ""
+        self._uploads: Dict[str, _Upload] = {}
+        if directory:
+            self.configure(directory)
+
+    def configure(self, directory: str) -> None:
+        with self._lock:
+            self._directory = os.path.expanduser(directory) if directory else ""
+
+    def _require_directory(self) -> str:
+        if not self._directory:
+            raise RuntimeError("uploads are not configured on this server")
+        return self._directory
+
+    def _blob_dir(self, sha256: str) -> str:
+        return os.path.join(self._require_directory(), "blobs", sha256)
+
+    def has(self, sha256: str, name: str = "") -> Optional[str]:
+        """Server path of the blob under ``name``, or None if not stored so.
+
+        Only looks; content stored under another name is linked by ``begin``.
+        """
+        digest = _check_digest(sha256)
+        path = os.path.join(self._blob_dir(digest), _safe_basename(name))
+        with self._lock:
+            return path if os.path.isfile(path) else None
+
+    def begin(self, sha256: str, size: int, name: str = "") -> Dict[str, Any]:
+        digest = _check_digest(sha256)
+        size = int(size)
+        if size < 0:
+            raise ValueError("size must be >= 0")
+        base = _safe_basename(name)
+        with self._lock:
+            self._expire_locked()
+            existing = self._existing_locked(digest, base)
+            if existing is not None:
+                return {"exists": True, "path": existing}
+            partial = os.path.join(self._require_directory(), "partial")
+            os.makedirs(partial, exist_ok=True)
+            upload_id = secrets.token_hex(8)
+            upload = _Upload(
+                id=upload_id,
+                sha256=digest,
+                size=size,
+                name=base,
+                tmp_path=os.path.join(partial, f"{upload_id}.part"),
+            )
+            open(upload.tmp_path, "wb").close()
+            self._uploads[upload_id] = upload
+            return {"exists": False, "upload_id": upload_id, "offset": 0}
+
+    def chunk(self, upload_id: str, offset: int, data: bytes) -> Dict[str, Any]:
+        if len(data) > MAX_CHUNK_BYTES:
+            raise ValueError(f"chunk larger than {MAX_CHUNK_BYTES} bytes")
+        upload = self._get(upload_id)
+        # chunks for one upload arrive in order over one connection
+        if int(offset) != upload.received:
+            raise ValueError(
+                f"upload {upload_id}: expected offset {upload.received}, got {offset}"
+            )
+        if upload.received + len(data) > upload.size:
+            raise ValueError(f"upload {upload_id}: more data than the declared size")
+        with open(upload.tmp_path, "ab") as fh:
+            fh.write(data)
+        upload.hasher.update(data)
+        upload.received += len(data)
+        upload.last_used = time.monotonic()
+        return {"upload_id": upload_id, "received": upload.received}
+
+    def finish(self, upload_id: str) -> str:
+        upload = self._get(upload_id)
+        with self._lock:
+            self._uploads.pop(upload_id, None)
+        try:
+            if upload.received != upload.size:
+                raise ValueError(
+                    f"upload {upload_id}: got {upload.received} of {upload.size} bytes"
+                )
+            if upload.hasher.hexdigest() != upload.sha256:
+                raise ValueError(f"upload {upload_id}: sha256 mismatch")
+            blob_dir = self._blob_dir(upload.sha256)
+            os.makedirs(blob_dir, exist_ok=True)
+            path = os.path.join(blob_dir, upload.name)
+            os.replace(upload.tmp_path, path)
+            os.chmod(path, _READ_ONLY)
+            return path
+        finally:
+            if os.path.exists(upload.tmp_path):
+                os.unlink(upload.tmp_path)
+
+    def abort(self, upload_id: str) -> bool:
+        with self._lock:
+            upload = self._uploads.pop(upload_id, None)
+        if upload is None:
+            return False
+        if os.path.exists(upload.tmp_path):
+            os.unlink(upload.tmp_path)
+        return True
+
+    def _get(self, upload_id: str) -> _Upload:
+        with self._lock:
+            upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise KeyError(f"unknown or expired upload: {upload_id}")
+        return upload
+
+    def _existing_locked(self, digest: str, base: str) -> Optional[str]:
+        blob_dir = self._blob_dir(digest)
+        try:
+            names = sorted(os.listdir(blob_dir))
+        except OSError:
+            return None
+        if not names:
+            return None
+        path = os.path.join(blob_dir, base)
+        if base in names:
+            return path
+        source = os.path.join(blob_dir, names[0])
+        try:
+            os.link(source, path)
+        except OSError:
+            shutil.copyfile(source, path)
+            os.chmod(path, _READ_ONLY)
+        return path
+
+    def checkout(self, path: str, session: str) -> str:
+        """A private, writable copy of a stored blob for ``session`` to open.
+
+        Saving a database, or BN writing next to the file it opened, would
+        otherwise change the blob (and every hard-linked alias of it) under
+        its sha256. Paths outside the store come back unchanged.
+        """
+        if not self._directory:
+            return path
+        blobs = os.path.realpath(os.path.join(self._directory, "blobs"))
+        real = os.path.realpath(path)
+        if os.path.commonpath([blobs, real]) != blobs:
+            return path
+        work_dir = os.path.join(self._directory, "work")
+        os.makedirs(work_dir, exist_ok=True)
+        name = f"{_safe_basename(session)}-{secrets.token_hex(4)}-"
+        work = os.path.join(work_dir, name + os.path.basename(real))
+        shutil.copyfile(real, work)
+        os.chmod(work, stat.S_IMODE(os.stat(work).st_mode) | stat.S_IWUSR)
+        return work
+
+    def prune_work(
+        self, in_use: Iterable[str], *, grace_s: float = WORK_GRACE_S
+    ) -> int:
+        """Delete stale session copies (and files saved beside them) not in use."""
+        if not self._directory:
+            return 0
+        keep = {os.path.realpath(path) for path in in_use if path}
+        work_dir = os.path.join(self._directory, "work")
+        cutoff = time.time() - grace_s
+        removed = 0
+        try:
+            names = os.listdir(work_dir)
+        except OSError:
+            return 0
+        for name in names:
+            path = os.path.join(work_dir, name)
+            if os.path.realpath(path) in keep:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _expire_locked(self) -> None:
+        cutoff = time.monotonic() - UPLOAD_IDLE_S
+        for upload_id in [
+            u.id for u in self._uploads.values() if u.last_used < cutoff
+        ]:
+            upload = self._uploads.pop(upload_id)
+            if os.path.exists(upload.tmp_path):
+                os.unlink(upload.tmp_path)
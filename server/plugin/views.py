@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import weakref
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -7,6 +8,8 @@ from .bn_compat import run_on_main_thread, safe_getattr, safe_str, view_filename
 from .log import dbg
 
 
+# shared across connections; only held for the id lookup itself
+_SHARED_VIEW_LOCK = threading.Lock()
 _SHARED_VIEW_IDS: Dict[int, str] = {}
 _SHARED_VIEW_NEXT_ID = 0
 
@@ -81,13 +84,14 @@ def view_info_full(bv: Any) -> Dict[str, Any]:
 def _shared_view_id(bv: Any) -> str:
     global _SHARED_VIEW_NEXT_ID
     key = id(bv)
-    existing = _SHARED_VIEW_IDS.get(key)
-    if existing is not None:
-        return existing
-    _SHARED_VIEW_NEXT_ID += 1
-    view_id = f"v{_SHARED_VIEW_NEXT_ID}"
-    _SHARED_VIEW_IDS[key] = view_id
-    return view_id
+    with _SHARED_VIEW_LOCK:
+        existing = _SHARED_VIEW_IDS.get(key)
+        if existing is not None:
+            return existing
+        _SHARED_VIEW_NEXT_ID += 1
+        view_id = f"v{_SHARED_VIEW_NEXT_ID}"
+        _SHARED_VIEW_IDS[key] = view_id
+        return view_id
 
 
 def merge_csv_field(current: str, new_value: str) -> str:
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import lzma
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# keep in sync with bnk/wire.py: both ends must agree on the envelope
+
+
+CODEC_ZLIB = "zlib"
+CODEC_LZMA = "lzma"
+
+# payloads smaller than this are cheaper to send than to compress
+DEFAULT_MIN_BYTES = 64 * 1024
+
+# pickles start with b"\x80", so a leading NUL can never be a bare payload
+_MAGIC = b"\x00bnkz:"
+
+_CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    CODEC_ZLIB: (lambda raw: zlib.compress(raw, 6), zlib.decompress),
+    CODEC_LZMA: (lambda raw: lzma.compress(raw, preset=1), lzma.decompress),
+}
+
+
+def negotiate(offered: Sequence[str]) -> str:
+    """First offered codec this side supports; "" turns compression off."""
+    for name in offered or ():
+        if str(name) in _CODECS:
+            return str(name)
+    return ""
+
+
+def is_encoded(data: bytes) -> bool:
+    return data[: len(_MAGIC)] == _MAGIC
+
+
+def decode(data: bytes) -> bytes:
+    if not is_encoded(data):
+        return data
+    name, sep, body = data[len(_MAGIC) :].partition(b":")
+    codec = _CODECS.get(name.decode("ascii", "replace")) if sep else None
+    if codec is None:
+        raise ValueError(f"unknown payload encoding: {name!r}")
+    return codec[1](body)
+
+
+@dataclass(frozen=True)
+class WireCodec:
+    """Compression agreed for one connection; an empty name sends raw bytes."""
+
+    name: str = ""
+    min_bytes: int = DEFAULT_MIN_BYTES
+
+    def encode(self, raw: bytes) -> bytes:
+        if not self.name or len(raw) < self.min_bytes:
+            return raw
+        packed = _MAGIC + self.name.encode("ascii") + b":" + _CODECS[self.name][0](raw)
+        # already-compressed content (packed binaries) gains nothing
+        return packed if len(packed) < len(raw) else raw
+
+
+def codec_for(offered: Sequence[str], min_bytes: Optional[int] = None) -> WireCodec:
+    name = negotiate(offered)
+    if min_bytes is None:
+        return WireCodec(name=name)
+    return WireCodec(name=name, min_bytes=max(0, int(min_bytes)))
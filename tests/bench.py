@@ -0,0 +1,313 @@
+"""Time every serverlib tool against synthetic views of increasing size.
+
+    python -m tests.bench                      # 1k and 100k functions
+    python -m tests.bench --scales 1k,100k,1m  # add the 1M view
+    python -m tests.bench --tools strings --save base.json
+    python -m tests.bench --compare base.json --max-ratio 2
+
+Every tool in ``bnk_serverlib.registry._TOOLS`` needs an entry in ``CASES``;
+tests/test_bench.py enforces that so new tools get benchmarked too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from bnk.output import dump_json, format_text
+from bnk_serverlib.registry import _TOOLS, call_tool
+
+from .fakebn import SyntheticView, installed
+
+Params = Callable[[SyntheticView, Path], Dict[str, Any]]
+
+
+def _mid(view: SyntheticView) -> Any:
+    return view.functions[view.n_functions // 2]
+
+
+def _mid_name(view: SyntheticView, _tmp: Path) -> Dict[str, Any]:
+    return {"name_or_addr": _mid(view).name}
+
+
+def _mid_addr(view: SyntheticView, _tmp: Path) -> Dict[str, Any]:
+    return {"name_or_addr": hex(_mid(view).start)}
+
+
+def _tagged_addr(view: SyntheticView) -> int:
+    return next(iter(view.data_tags), view.TEXT)
+
+
+def _import_file(view: SyntheticView, tmp: Path) -> Dict[str, Any]:
+    path = tmp / f"import-{view.n_functions}.jsonl"
+    if not path.exists():
+        rows = max(1, view.n_functions // 10)
+        step = max(1, view.n_functions // rows)
+        with path.open("w", encoding="utf-8") as fh:
+            for k in range(rows):
+                func = view.functions[(k * step) % view.n_functions]
+                fh.write(
+                    json.dumps(
+                        {
+                            "address": hex(func.start),
+                            "name": func.name,
+                            "type": f"int{8 << (k % 4)}_t f(int)",
+                        }
+                    )
+                    + "\n"
+                )
+    return {"path": str(path)}
+
+
+def _code_xref(view: SyntheticView, _tmp: Path) -> Dict[str, Any]:
+    func = _mid(view)
+    return {"from_addr": hex(func.start + 0x30), "to_addr": hex(view.TEXT)}
+
+
+def _data_xref(view: SyntheticView, _tmp: Path) -> Dict[str, Any]:
+    return {"from_addr": hex(view.data), "to_addr": hex(view.string_starts[0])}
+
+
+CASES: Dict[str, Params] = {
+    "addr.info": lambda view, tmp: {"addr": hex(_tagged_addr(view))},
+    "addr.info-many": lambda view, tmp: {
+        "addrs": [
+            view.TEXT + k * (view.end - view.TEXT) // 5000 for k in range(5000)
+        ]
+    },
+    "binary.summary": lambda view, tmp: {},
+    "data.like": lambda view, tmp: {"pattern": "g_packet"},
+    "data.list": lambda view, tmp: {"type_pattern": "int"},
+    "function.callees": _mid_name,
+    "function.call-sites": _mid_name,
+    "function.callers": _mid_name,
+    "function.info": _mid_addr,
+    "functions.like": lambda view, tmp: {"pattern": "parse_"},
+    "functions.list": lambda view, tmp: {},
+    "il.hlil": _mid_addr,
+    "il.llil": _mid_addr,
+    "il.mlil": _mid_addr,
+    "imports.like": lambda view, tmp: {"pattern": "read"},
+    "imports.list": lambda view, tmp: {},
+    "pipeline.run": lambda view, tmp: {
+        "stages": [
+            {"tool": "functions.like", "params": {"pattern": "parse_", "limit": 50}},
+            {"tool": "function.callers", "bind": {"name_or_addr": "start"}},
+            {"query": {"group_by": "name", "sort": "-count", "limit": 10}},
+        ]
+    },
+    "search.many": lambda view, tmp: {
+        "patterns": [f"parse_table_{k}" for k in range(0, 5000, 10)]
+        + ["password", "read", "g_buffer"],
+    },
+    "sections.list": lambda view, tmp: {},
+    "segments.list": lambda view, tmp: {},
+    "strings.like": lambda view, tmp: {"pattern": "password"},
+    "strings.like-data": lambda view, tmp: {"pattern": "password", "limit": 100},
+    "strings.xrefs": lambda view, tmp: {"pattern": "password", "string_limit": 100},
+    "symbols.like": lambda view, tmp: {"pattern": "handle_"},
+    "tags.at": lambda view, tmp: {"addr": hex(_tagged_addr(view))},
+    "tags.function": lambda view, tmp: {"name_or_addr": hex(view.TEXT)},
+    "tags.list": lambda view, tmp: {},
+    "tags.range": lambda view, tmp: {
+        "start": hex(view.TEXT),
+        "end": hex(view.TEXT + view.n_functions * view.FUNC_SIZE // 2),
+    },
+    "tags.rollup": lambda view, tmp: {},
+    "tags.types": lambda view, tmp: {},
+    "xrefs.to": lambda view, tmp: {"target": hex(view.string_starts[0])},
+    "edit.fn.rename": lambda view, tmp: {
+        "name_or_addr": hex(_mid(view).start),
+        "new_name": "bench_renamed",
+    },
+    "edit.fn.type": lambda view, tmp: {
+        "name_or_addr": hex(_mid(view).start),
+        "proto": "int32_t f(int32_t a)",
+    },
+    "edit.import": _import_file,
+    "edit.var.list": _mid_addr,
+    "edit.var.rename": lambda view, tmp: {
+        "name_or_addr": hex(_mid(view).start),
+        "var": "arg1",
+        "new_name": "arg1",
+    },
+    "edit.var.type": lambda view, tmp: {
+        "name_or_addr": hex(_mid(view).start),
+        "var": 1,
+        "type": "uint64_t",
+    },
+    "edit.comment.view": lambda view, tmp: {"addr": hex(view.TEXT), "comment": "x"},
+    "edit.comment.func": lambda view, tmp: {
+        "name_or_addr": hex(view.TEXT),
+        "addr": hex(view.TEXT + 4),
+        "comment": "x",
+    },
+    "edit.db.status": lambda view, tmp: {},
+    "edit.db.save": lambda view, tmp: {},
+    "edit.db.save-as": lambda view, tmp: {"path": str(tmp / "bench.bndb")},
+    "edit.tag.data.add": lambda view, tmp: {
+        "addr": hex(view.TEXT + 8),
+        "tag_type": "Bugs",
+        "data": "bench",
+    },
+    "edit.tag.data.remove-type": lambda view, tmp: {
+        "addr": hex(view.TEXT + 8),
+        "tag_type": "Bugs",
+    },
+    "edit.tag.func.add": lambda view, tmp: {
+        "name_or_addr": hex(view.TEXT),
+        "tag_type": "TODO",
+        "data": "bench",
+    },
+    "edit.tag.func.remove-type": lambda view, tmp: {
+        "name_or_addr": hex(view.TEXT),
+        "tag_type": "TODO",
+    },
+    "edit.xref.data.add": _data_xref,
+    "edit.xref.data.remove": _data_xref,
+    "edit.xref.code.add": _code_xref,
+    "edit.xref.code.remove": _code_xref,
+}
+
+
+def parse_scale(text: str) -> int:
+    raw = text.strip().lower()
+    mult = 1
+    if raw.endswith("k"):
+        mult, raw = 1_000, raw[:-1]
+    elif raw.endswith("m"):
+        mult, raw = 1_000_000, raw[:-1]
+    value = int(float(raw) * mult)
+    if value < 1:
+        raise ValueError(f"scale must be >= 1: {text!r}")
+    return value
+
+
+def _result_size(value: Any) -> Optional[int]:
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, dict):
+        for key in ("rows", "count", "line_count"):
+            if isinstance(value.get(key), int):
+                return value[key]
+    return None
+
+
+def run_case(
+    view: SyntheticView, tool: str, tmp: Path, *, repeat: int
+) -> Dict[str, Any]:
+    params = CASES[tool](view, tmp)
+    times: List[float] = []
+    result: Any = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call_tool(tool, bv=view, **params)
+        if isinstance(result, Iterator):
+            # lazy results cost nothing until the server pages them out
+            result = list(result)
+        times.append(time.perf_counter() - started)
+    return {
+        "tool": tool,
+        "scale": view.n_functions,
+        "best_ms": round(1000.0 * min(times), 3),
+        "mean_ms": round(1000.0 * sum(times) / len(times), 3),
+        "rows": _result_size(result),
+    }
+
+
+def run(
+    scales: List[int],
+    *,
+    repeat: int = 3,
+    tools: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    names = [tool.name for tool in _TOOLS]
+    if tools:
+        names = [name for name in names if any(part in name for part in tools)]
+    rows: List[Dict[str, Any]] = []
+    with installed(), tempfile.TemporaryDirectory(prefix="bnk-bench-") as tmp_dir:
+        tmp = Path(tmp_dir)
+        for scale in scales:
+            started = time.perf_counter()
+            view = SyntheticView(functions=scale)
+            rows.append(
+                {
+                    "tool": "(build view)",
+                    "scale": scale,
+                    "best_ms": round(1000.0 * (time.perf_counter() - started), 3),
+                    "mean_ms": None,
+                    "rows": None,
+                }
+            )
+            for name in names:
+                rows.append(run_case(view, name, tmp, repeat=repeat))
+    return rows
+
+
+def compare(
+    rows: List[Dict[str, Any]], baseline: List[Dict[str, Any]], *, max_ratio: float
+) -> List[Dict[str, Any]]:
+    """Rows whose best time regressed by more than ``max_ratio`` vs baseline."""
+    before = {(row["tool"], row["scale"]): row for row in baseline}
+    regressions: List[Dict[str, Any]] = []
+    for row in rows:
+        old = before.get((row["tool"], row["scale"]))
+        if old is None or row["tool"].startswith("("):
+            continue
+        # sub-millisecond timings are mostly noise
+        floor = max(float(old["best_ms"]), 1.0)
+        ratio = float(row["best_ms"]) / floor
+        if ratio > max_ratio:
+            regressions.append(dict(row, baseline_ms=old["best_ms"], ratio=ratio))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.bench")
+    parser.add_argument("--scales", default="1k,100k", help="e.g. 1k,100k,1m")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--tools", default="", help="comma-separated substrings of tool names"
+    )
+    parser.add_argument("--json", action="store_true", help="print json rows")
+    parser.add_argument("--save", help="write results to this json file")
+    parser.add_argument("--compare", help="baseline json from an earlier --save")
+    parser.add_argument("--max-ratio", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be >= 1")
+    try:
+        scales = [parse_scale(part) for part in args.scales.split(",") if part.strip()]
+    except ValueError as exc:
+        parser.error(str(exc))
+    tools = [part.strip() for part in args.tools.split(",") if part.strip()]
+
+    rows = run(scales, repeat=args.repeat, tools=tools)
+    if args.json:
+        print(dump_json(rows, pretty=True))
+    else:
+        print(format_text(rows))
+
+    if args.save:
+        Path(args.save).write_text(
+            dump_json(rows, pretty=True) + "\n", encoding="utf-8"
+        )
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(rows, baseline, max_ratio=args.max_ratio)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.max_ratio:g}x:")
+            print(format_text(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
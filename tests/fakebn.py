@@ -0,0 +1,928 @@
+"""Offline stand-in for the parts of the binaryninja API the serverlib tools use.
+
+``installed()`` puts a fake ``binaryninja`` package into ``sys.modules`` for
+the duration of a block, and ``SyntheticView`` builds a deterministic
+BinaryView-like object with a configurable number of functions, strings,
+symbols, tags and xrefs. Nothing here aims to match BN's analysis results;
+it only has to keep the tools' data access patterns (and costs) realistic.
+"""
+
+from __future__ import annotations
+
+import bisect
+import enum
+import sys
+import types
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class SymbolType(enum.Enum):
+    FunctionSymbol = 0
+    ImportAddressSymbol = 1
+    ImportedFunctionSymbol = 2
+    DataSymbol = 3
+    ImportedDataSymbol = 4
+    ExternalSymbol = 5
+    LibraryFunctionSymbol = 6
+
+
+class FindFlag(enum.Enum):
+    FindCaseSensitive = 0
+    FindCaseInsensitive = 1
+
+
+class StringType(enum.Enum):
+    AsciiString = 0
+    Utf16String = 1
+
+
+class SectionSemantics(enum.Enum):
+    DefaultSectionSemantics = 0
+    ReadOnlyCodeSectionSemantics = 1
+    ReadOnlyDataSectionSemantics = 2
+    ReadWriteDataSectionSemantics = 3
+    ExternalSectionSemantics = 4
+
+
+class TagTypeType(enum.Enum):
+    UserTagType = 0
+
+
+class AnalysisState(enum.Enum):
+    IdleState = 0
+
+
+class VariableSourceType(enum.Enum):
+    StackVariableSourceType = 0
+
+
+@dataclass(frozen=True)
+class Named:
+    name: str
+
+
+class Symbol:
+    __slots__ = ("type", "address", "name")
+
+    def __init__(self, sym_type: SymbolType, address: int, name: str) -> None:
+        self.type = sym_type
+        self.address = address
+        self.name = name
+
+    @property
+    def full_name(self) -> str:
+        return self.name
+
+
+class StringReference:
+    __slots__ = ("start", "length", "value", "type")
+
+    def __init__(self, start: int, value: str) -> None:
+        self.start = start
+        self.length = len(value)
+        self.value = value
+        self.type = StringType.AsciiString
+
+
+class ReferenceSource:
+    __slots__ = ("function", "address")
+
+    def __init__(self, function: Any, address: int) -> None:
+        self.function = function
+        self.address = address
+
+
+class TagType:
+    def __init__(self, name: str, icon: str, type_id: int) -> None:
+        self.name = name
+        self.icon = icon
+        self.id = f"tt{type_id}"
+        self.type = TagTypeType.UserTagType
+        self.visible = True
+
+
+class Tag:
+    __slots__ = ("id", "type", "data")
+    _next_id = 0
+
+    def __init__(self, tag_type: TagType, data: str) -> None:
+        Tag._next_id += 1
+        self.id = f"t{Tag._next_id}"
+        self.type = tag_type
+        self.data = data
+
+
+class FakeType:
+    __slots__ = ("text", "width")
+
+    def __init__(self, text: str, width: int = 8) -> None:
+        self.text = text
+        self.width = width
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class DataVariable:
+    def __init__(
+        self, view: "SyntheticView", address: int, ty: Any, *, auto_defined: bool
+    ) -> None:
+        self._view = view
+        self.address = address
+        self.type = ty
+        self.auto_defined = auto_defined
+
+    @property
+    def name(self) -> Optional[str]:
+        sym = self._view.get_symbol_at(self.address)
+        return None if sym is None else sym.name
+
+
+class BasicBlock:
+    def __init__(self, function: "Function", start: int, end: int) -> None:
+        self.function = function
+        self.start = start
+        self.end = end
+        self.length = end - start
+
+
+class Instruction:
+    __slots__ = ("address", "text")
+
+    def __init__(self, address: int, text: str) -> None:
+        self.address = address
+        self.text = text
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class _IL:
+    def __init__(self, func: "Function", kind: str) -> None:
+        self._func = func
+        self._kind = kind
+
+    @property
+    def instructions(self) -> List[Instruction]:
+        start = self._func.start
+        return [
+            Instruction(start + 4 * k, f"{self._kind} r{k % 8} = r{(k + 1) % 8} + {k}")
+            for k in range(self._func.il_length)
+        ]
+
+    @property
+    def root(self) -> Any:
+        lines = [f"int32_t var_{k} = arg1 + {k};" for k in range(self._func.il_length)]
+        return types.SimpleNamespace(lines=lines)
+
+
+class Variable:
+    __slots__ = (
+        "identifier",
+        "storage",
+        "index",
+        "name",
+        "last_seen_name",
+        "type",
+        "source_type",
+        "is_parameter_variable",
+    )
+
+    def __init__(self, identifier: int, name: str, *, parameter: bool) -> None:
+        self.identifier = identifier
+        self.storage = -8 * (identifier + 1)
+        self.index = identifier
+        self.name = name
+        self.last_seen_name = name
+        self.type = FakeType("int64_t")
+        self.source_type = VariableSourceType.StackVariableSourceType
+        self.is_parameter_variable = parameter
+
+    @classmethod
+    def from_identifier(cls, func: "Function", identifier: int) -> "Variable":
+        for var in func.vars:
+            if var.identifier == identifier:
+                return var
+        raise ValueError("variable not found")
+
+    def set_name_async(self, name: str) -> None:
+        self.last_seen_name = self.name
+        self.name = name
+
+    def set_type_async(self, ty: Any) -> None:
+        self.type = ty
+
+
+class Function:
+    def __init__(self, view: "SyntheticView", index: int, start: int, symbol: Symbol):
+        self._view = view
+        self.index = index
+        self.start = start
+        self.symbol = symbol
+        self.total_bytes = view.FUNC_SIZE
+        self.too_large = False
+        self.has_user_type = False
+        self.arch = view.arch
+        self.calling_convention = Named("sysv")
+        self.il_length = 8 + index % 32
+        self._type: Optional[Any] = None
+        self._vars: Optional[List[Variable]] = None
+        self.comments: Dict[int, str] = {}
+        self.user_code_refs: set[Tuple[int, int]] = set()
+
+    @property
+    def name(self) -> str:
+        return self.symbol.name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._view._rename_function(self, value)
+
+    @property
+    def type(self) -> Any:
+        return self._type or FakeType(f"int64_t {self.name}(int64_t arg1)")
+
+    @property
+    def basic_blocks(self) -> List[int]:
+        return list(range(1 + self.index % 5))
+
+    def get_basic_block_at(self, addr: int) -> Optional[BasicBlock]:
+        count = len(self.basic_blocks)
+        size = self.total_bytes // count
+        if not self.start <= addr < self.start + size * count:
+            return None
+        start = self.start + (addr - self.start) // size * size
+        return BasicBlock(self, start, start + size)
+
+    @property
+    def callers(self) -> List["Function"]:
+        return [
+            self._view.function_at_index(i)
+            for i in self._view.caller_indexes(self.index)
+        ]
+
+    @property
+    def callees(self) -> List["Function"]:
+        return [
+            self._view.function_at_index(i)
+            for i in self._view.callee_indexes(self.index)
+        ]
+
+    @property
+    def call_sites(self) -> List[ReferenceSource]:
+        return [
+            ReferenceSource(self, self.start + off) for off in self._view.CALL_OFFSETS
+        ]
+
+    @property
+    def hlil(self) -> _IL:
+        return _IL(self, "hlil")
+
+    @property
+    def mlil(self) -> _IL:
+        return _IL(self, "mlil")
+
+    @property
+    def llil(self) -> _IL:
+        return _IL(self, "llil")
+
+    @property
+    def vars(self) -> List[Variable]:
+        if self._vars is None:
+            self._vars = [
+                Variable(0, "arg1", parameter=True),
+                Variable(1, "var_10", parameter=False),
+                Variable(2, "var_18", parameter=False),
+            ]
+        return self._vars
+
+    def get_variable_by_name(self, name: str) -> Optional[Variable]:
+        for var in self.vars:
+            if var.name == name:
+                return var
+        return None
+
+    def set_user_type(self, proto: Any) -> None:
+        self._type = proto if not isinstance(proto, str) else FakeType(proto)
+        self.has_user_type = True
+
+    def set_comment_at(self, addr: int, text: str) -> None:
+        self.comments[addr] = text
+
+    # function tags live in the view so tags.* see them
+
+    def get_function_tags(self, auto: Optional[bool] = None) -> List[Tag]:
+        return self._view._function_tags(self.start, auto)
+
+    def add_tag(
+        self, tag_type: str, data: str, addr: Optional[int] = None, auto: bool = False
+    ):
+        tt = self._view._tag_type(tag_type)
+        tag = Tag(tt, data)
+        if addr is None:
+            self._view.function_tags.setdefault(self.start, []).append((tag, auto))
+        else:
+            self._view.data_tags.setdefault(addr, []).append((tag, auto))
+        return tag
+
+    def _remove_function_tags(self, tag_type: str, auto: bool) -> None:
+        items = self._view.function_tags.get(self.start, [])
+        self._view.function_tags[self.start] = [
+            (tag, a)
+            for tag, a in items
+            if not (a == auto and tag.type.name == tag_type)
+        ]
+
+    def remove_user_function_tags_of_type(self, tag_type: str) -> None:
+        self._remove_function_tags(tag_type, False)
+
+    def remove_auto_function_tags_of_type(self, tag_type: str) -> None:
+        self._remove_function_tags(tag_type, True)
+
+    def remove_user_address_tags_of_type(self, addr: int, tag_type: str) -> None:
+        self._view._remove_data_tags(addr, tag_type, False)
+
+    def remove_auto_address_tags_of_type(self, addr: int, tag_type: str) -> None:
+        self._view._remove_data_tags(addr, tag_type, True)
+
+    def add_user_code_ref(self, from_addr: int, to_addr: int) -> None:
+        self.user_code_refs.add((from_addr, to_addr))
+
+    def remove_user_code_ref(self, from_addr: int, to_addr: int) -> None:
+        self.user_code_refs.discard((from_addr, to_addr))
+
+
+class Section:
+    def __init__(self, name: str, start: int, end: int, semantics: SectionSemantics):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.length = end - start
+        self.semantics = semantics
+
+
+class Segment:
+    def __init__(self, start: int, end: int, *, writable: bool, executable: bool):
+        self.start = start
+        self.end = end
+        self.length = end - start
+        self.data_offset = start - SyntheticView.BASE
+        self.data_end = self.data_offset + self.length
+        self.data_length = self.length
+        self.readable = True
+        self.writable = writable
+        self.executable = executable
+        self.auto_defined = True
+
+
+class NotificationType(enum.IntFlag):
+    SymbolAdded = enum.auto()
+    SymbolUpdated = enum.auto()
+    SymbolRemoved = enum.auto()
+    TagAdded = enum.auto()
+    TagUpdated = enum.auto()
+    TagRemoved = enum.auto()
+    FunctionAdded = enum.auto()
+    FunctionRemoved = enum.auto()
+    FunctionUpdated = enum.auto()
+    DataVariableAdded = enum.auto()
+    DataVariableRemoved = enum.auto()
+    DataVariableUpdated = enum.auto()
+    SectionAdded = enum.auto()
+    SectionRemoved = enum.auto()
+    SectionUpdated = enum.auto()
+    SegmentAdded = enum.auto()
+    SegmentRemoved = enum.auto()
+    SegmentUpdated = enum.auto()
+
+
+class BinaryDataNotification:
+    """Base class for view observers; every callback is a no-op."""
+
+    def __init__(self, notifications: Optional[NotificationType] = None) -> None:
+        self.notifications = notifications
+
+
+class FileMetadata:
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.original_filename = filename
+        self.has_database = False
+        self.modified = False
+
+
+_VERBS = ("init", "parse", "read", "write", "handle", "check", "alloc", "free")
+_NOUNS = ("buffer", "header", "config", "packet", "string", "table", "entry", "node")
+_TAG_TYPES = (("Bugs", "B"), ("Important", "!"), ("Crashes", "X"), ("TODO", "T"))
+
+
+def function_name(index: int) -> str:
+    if index % 3 == 2:
+        return f"sub_{SyntheticView.TEXT + index * SyntheticView.FUNC_SIZE:x}"
+    return f"{_VERBS[index % 8]}_{_NOUNS[(index // 8) % 8]}_{index}"
+
+
+def string_value(index: int) -> str:
+    if index % 1000 == 7:
+        return f"bad password for user {index}"
+    return f"{_NOUNS[index % 8]} {_VERBS[(index // 8) % 8]} message {index}"
+
+
+class SyntheticView:
+    """Deterministic BinaryView stand-in.
+
+    Layout: functions in .text (FUNC_SIZE bytes each), NUL-terminated strings
+    in .rodata, 8-byte data symbols in .data and imports in .extern/.got.
+    Call graph and string xrefs are derived arithmetically from indexes, so
+    they cost no memory at large scales.
+    """
+
+    BASE = 0x400000
+    TEXT = 0x401000
+    FUNC_SIZE = 0x40
+    CALL_OFFSETS = (0x08, 0x18)
+    CALLEE_STEPS = (1, 7)
+
+    def __init__(
+        self,
+        *,
+        functions: int = 1000,
+        strings: Optional[int] = None,
+        data_symbols: Optional[int] = None,
+        imports: Optional[int] = None,
+        tags: Optional[int] = None,
+        filename: str = "/synthetic/a.out",
+    ) -> None:
+        if functions < 1:
+            raise ValueError("functions must be >= 1")
+        self.n_functions = functions
+        self.n_strings = functions if strings is None else strings
+        self.n_data = functions // 2 if data_symbols is None else data_symbols
+        self.n_imports = max(1, functions // 10) if imports is None else imports
+        n_tags = functions // 4 if tags is None else tags
+
+        self.name = filename.rsplit("/", 1)[-1]
+        self.view_type = "ELF"
+        self.arch = Named("x86_64")
+        self.platform = Named("linux-x86_64")
+        self.analysis_state = AnalysisState.IdleState
+        self.file = FileMetadata(filename)
+        self.analysis_updates = 0
+        self.comments: Dict[int, str] = {}
+        self.user_data_refs: Dict[int, set[int]] = {}
+        self.data_vars: Dict[int, Any] = {}
+        self._data_var_starts: Optional[List[int]] = None
+
+        self._build_layout()
+        self._build_functions()
+        self._build_strings()
+        self._build_symbols()
+        self._build_tags(n_tags)
+
+    # construction
+
+    def _build_layout(self) -> None:
+        text_end = self.TEXT + self.n_functions * self.FUNC_SIZE
+        self.rodata = _align(text_end + 0x1000)
+        # strings are packed later; reserve a generous upper bound first
+        self._text_end = text_end
+
+    def _build_functions(self) -> None:
+        self.functions: List[Function] = []
+        self._by_start: Dict[int, Function] = {}
+        for index in range(self.n_functions):
+            start = self.TEXT + index * self.FUNC_SIZE
+            func = Function(
+                self,
+                index,
+                start,
+                Symbol(SymbolType.FunctionSymbol, start, function_name(index)),
+            )
+            self.functions.append(func)
+            self._by_start[start] = func
+        self._by_name: Optional[Dict[str, List[Function]]] = None
+
+    def _build_strings(self) -> None:
+        chunks: List[bytes] = []
+        self.string_starts: List[int] = []
+        self._strings: List[StringReference] = []
+        offset = 0
+        for index in range(self.n_strings):
+            value = string_value(index)
+            raw = value.encode("ascii") + b"\x00"
+            addr = self.rodata + offset
+            self.string_starts.append(addr)
+            self._strings.append(StringReference(addr, value))
+            chunks.append(raw)
+            offset += len(raw)
+        self.rodata_bytes = b"".join(chunks)
+        self._rodata_lower: Optional[bytes] = None
+        self.rodata_end = self.rodata + len(self.rodata_bytes)
+
+        self.data = _align(self.rodata_end + 0x1000)
+        self.data_end = self.data + 8 * max(1, self.n_data)
+        self.extern = _align(self.data_end + 0x1000)
+        self.extern_end = self.extern + 8 * self.n_imports
+        self.got = _align(self.extern_end + 0x1000)
+        self.got_end = self.got + 8 * self.n_imports
+
+        self.start = self.BASE
+        self.end = self.got_end
+        self.length = self.end - self.start
+        self.entry_point = self.TEXT
+
+        self.sections = {
+            ".text": Section(
+                ".text",
+                self.TEXT,
+                self._text_end,
+                SectionSemantics.ReadOnlyCodeSectionSemantics,
+            ),
+            ".rodata": Section(
+                ".rodata",
+                self.rodata,
+                self.rodata_end,
+                SectionSemantics.ReadOnlyDataSectionSemantics,
+            ),
+            ".data": Section(
+                ".data",
+                self.data,
+                self.data_end,
+                SectionSemantics.ReadWriteDataSectionSemantics,
+            ),
+            ".extern": Section(
+                ".extern",
+                self.extern,
+                self.extern_end,
+                SectionSemantics.ExternalSectionSemantics,
+            ),
+            ".got": Section(
+                ".got",
+                self.got,
+                self.got_end,
+                SectionSemantics.ReadOnlyDataSectionSemantics,
+            ),
+        }
+        self.segments = [
+            Segment(self.BASE, self._text_end, writable=False, executable=True),
+            Segment(self.rodata, self.rodata_end, writable=False, executable=False),
+            Segment(self.data, self.got_end, writable=True, executable=False),
+        ]
+
+    def _build_symbols(self) -> None:
+        by_type: Dict[SymbolType, List[Symbol]] = {t: [] for t in SymbolType}
+        by_type[SymbolType.FunctionSymbol] = [f.symbol for f in self.functions]
+        for k in range(self.n_data):
+            by_type[SymbolType.DataSymbol].append(
+                Symbol(
+                    SymbolType.DataSymbol, self.data + 8 * k, f"g_{_NOUNS[k % 8]}_{k}"
+                )
+            )
+        for k in range(self.n_imports):
+            name = f"{_VERBS[k % 8]}{_NOUNS[(k // 8) % 8]}{k}"
+            by_type[SymbolType.ImportedFunctionSymbol].append(
+                Symbol(SymbolType.ImportedFunctionSymbol, self.extern + 8 * k, name)
+            )
+            by_type[SymbolType.ImportAddressSymbol].append(
+                Symbol(SymbolType.ImportAddressSymbol, self.got + 8 * k, name)
+            )
+        self._symbols_by_type = by_type
+        self._symbols_by_name: Optional[Dict[str, List[Symbol]]] = None
+        self._symbols_by_addr: Optional[Dict[int, Symbol]] = None
+        for sym in by_type[SymbolType.DataSymbol]:
+            self.data_vars[sym.address] = DataVariable(
+                self, sym.address, FakeType("uint64_t"), auto_defined=True
+            )
+
+    def _build_tags(self, n_tags: int) -> None:
+        self.tag_types = {
+            name: TagType(name, icon, i) for i, (name, icon) in enumerate(_TAG_TYPES)
+        }
+        # addr -> [(tag, auto)]
+        self.data_tags: Dict[int, List[Tuple[Tag, bool]]] = {}
+        self.function_tags: Dict[int, List[Tuple[Tag, bool]]] = {}
+        types_ = list(self.tag_types.values())
+        for k in range(n_tags):
+            func = self.functions[(k * 4) % self.n_functions]
+            tag = Tag(types_[k % len(types_)], f"note {k}")
+            auto = k % 2 == 1
+            if k % 5 == 0:
+                self.function_tags.setdefault(func.start, []).append((tag, auto))
+            else:
+                self.data_tags.setdefault(func.start + 4, []).append((tag, auto))
+
+    # call graph / xrefs (arithmetic, no storage)
+
+    def function_at_index(self, index: int) -> Function:
+        return self.functions[index % self.n_functions]
+
+    def callee_indexes(self, index: int) -> List[int]:
+        return [(index + step) % self.n_functions for step in self.CALLEE_STEPS]
+
+    def caller_indexes(self, index: int) -> List[int]:
+        return [(index - step) % self.n_functions for step in self.CALLEE_STEPS]
+
+    def _string_code_ref_indexes(self, index: int) -> List[int]:
+        return [(index * 7 + 1) % self.n_functions, (index * 31 + 3) % self.n_functions]
+
+    def get_code_refs(
+        self, addr: int, length: Optional[int] = None
+    ) -> List[ReferenceSource]:
+        func = self._by_start.get(addr)
+        if func is not None:
+            return [
+                ReferenceSource(
+                    self.functions[caller], self.functions[caller].start + off
+                )
+                for caller, off in zip(
+                    self.caller_indexes(func.index), self.CALL_OFFSETS
+                )
+            ]
+        index = self._string_index(addr)
+        if index is not None:
+            return [
+                ReferenceSource(self.functions[i], self.functions[i].start + 0x20)
+                for i in self._string_code_ref_indexes(index)
+            ]
+        return []
+
+    def get_data_refs(self, addr: int, length: Optional[int] = None) -> List[int]:
+        refs: List[int] = []
+        index = self._string_index(addr)
+        if index is not None and index % 4 == 0 and self.n_data:
+            refs.append(self.data + 8 * ((index // 4) % self.n_data))
+        refs.extend(sorted(self.user_data_refs.get(addr, ())))
+        return refs
+
+    def add_user_data_ref(self, from_addr: int, to_addr: int) -> None:
+        self.user_data_refs.setdefault(to_addr, set()).add(from_addr)
+
+    def remove_user_data_ref(self, from_addr: int, to_addr: int) -> None:
+        self.user_data_refs.get(to_addr, set()).discard(from_addr)
+
+    def _string_index(self, addr: int) -> Optional[int]:
+        if not self.rodata <= addr < self.rodata_end:
+            return None
+        i = bisect.bisect_left(self.string_starts, addr)
+        if i < len(self.string_starts) and self.string_starts[i] == addr:
+            return i
+        return None
+
+    # functions and symbols
+
+    def get_function_at(self, addr: int) -> Optional[Function]:
+        return self._by_start.get(addr)
+
+    def get_functions_containing(self, addr: int) -> List[Function]:
+        if not self.TEXT <= addr < self._text_end:
+            return []
+        return [self.functions[(addr - self.TEXT) // self.FUNC_SIZE]]
+
+    def get_functions_by_name(self, name: str) -> List[Function]:
+        if self._by_name is None:
+            index: Dict[str, List[Function]] = {}
+            for func in self.functions:
+                index.setdefault(func.name, []).append(func)
+            self._by_name = index
+        return list(self._by_name.get(name, []))
+
+    def _rename_function(self, func: Function, name: str) -> None:
+        func.symbol = Symbol(func.symbol.type, func.start, name)
+        self._symbols_by_type[SymbolType.FunctionSymbol][func.index] = func.symbol
+        self._by_name = None
+        self._symbols_by_name = None
+        self._symbols_by_addr = None
+
+    def get_symbols_of_type(self, sym_type: SymbolType) -> List[Symbol]:
+        return list(self._symbols_by_type.get(sym_type, []))
+
+    def get_symbols_by_name(self, name: str) -> List[Symbol]:
+        if self._symbols_by_name is None:
+            index: Dict[str, List[Symbol]] = {}
+            for syms in self._symbols_by_type.values():
+                for sym in syms:
+                    index.setdefault(sym.name, []).append(sym)
+            self._symbols_by_name = index
+        return list(self._symbols_by_name.get(name, []))
+
+    def define_user_symbol(self, sym: Symbol) -> None:
+        func = self._by_start.get(sym.address)
+        if func is not None and sym.type == SymbolType.FunctionSymbol:
+            self._rename_function(func, sym.name)
+            return
+        self._symbols_by_type.setdefault(sym.type, []).append(sym)
+        self._symbols_by_name = None
+        self._symbols_by_addr = None
+
+    def get_symbols(self) -> List[Symbol]:
+        return [sym for syms in self._symbols_by_type.values() for sym in syms]
+
+    def get_symbol_at(self, addr: int) -> Optional[Symbol]:
+        if self._symbols_by_addr is None:
+            index: Dict[int, Symbol] = {}
+            for sym in self.get_symbols():
+                index.setdefault(sym.address, sym)
+            self._symbols_by_addr = index
+        return self._symbols_by_addr.get(addr)
+
+    def define_user_data_var(self, addr: int, ty: Any) -> None:
+        self.data_vars[addr] = DataVariable(self, addr, ty, auto_defined=False)
+        self._data_var_starts = None
+
+    def get_data_var_at(self, addr: int) -> Optional[DataVariable]:
+        return self.data_vars.get(addr)
+
+    def get_next_data_var_start_after(self, addr: int) -> int:
+        if self._data_var_starts is None:
+            self._data_var_starts = sorted(self.data_vars)
+        i = bisect.bisect_right(self._data_var_starts, addr)
+        return self._data_var_starts[i] if i < len(self._data_var_starts) else self.end
+
+    def create_user_function(self, addr: int) -> Optional[Function]:
+        return self._by_start.get(addr)
+
+    def parse_type_string(self, text: str) -> Tuple[FakeType, str]:
+        decl = str(text).strip().rstrip(";")
+        name = decl.rsplit(" ", 1)[-1] if " " in decl else decl
+        return FakeType(decl), name
+
+    # strings and raw bytes
+
+    def get_strings(self, start: Optional[int] = None, length: Optional[int] = None):
+        if start is None:
+            return list(self._strings)
+        end = start + (length or 0)
+        lo = bisect.bisect_left(self.string_starts, start)
+        hi = bisect.bisect_left(self.string_starts, end)
+        return self._strings[lo:hi]
+
+    def read(self, addr: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        out = bytearray(length)
+        lo = max(addr, self.rodata)
+        hi = min(addr + length, self.rodata_end)
+        if lo < hi:
+            out[lo - addr : hi - addr] = self.rodata_bytes[
+                lo - self.rodata : hi - self.rodata
+            ]
+        return bytes(out)
+
+    def find_all_data(
+        self,
+        start: int,
+        end: int,
+        data: bytes,
+        flags: FindFlag = FindFlag.FindCaseSensitive,
+        progress_func: Optional[Callable[[int, int], bool]] = None,
+        match_callback: Optional[Callable[[int, Any], bool]] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        haystack = self.rodata_bytes
+        needle = bytes(data)
+        if flags == FindFlag.FindCaseInsensitive:
+            if self._rodata_lower is None:
+                self._rodata_lower = haystack.lower()
+            haystack = self._rodata_lower
+            needle = needle.lower()
+        lo = max(start, self.rodata) - self.rodata
+        hi = min(end, self.rodata_end) - self.rodata
+        total = max(0, hi - lo)
+        pos = lo
+        while needle and pos < hi:
+            found = haystack.find(needle, pos, hi)
+            if found == -1:
+                break
+            if progress_func is not None and not progress_func(found - lo, total):
+                return
+            yield self.rodata + found, self.rodata_bytes[found : found + len(needle)]
+            pos = found + 1
+
+    # tags
+
+    def _tag_type(self, name: str) -> TagType:
+        tt = self.tag_types.get(name)
+        if tt is None:
+            tt = self.tag_types[name] = TagType(name, "?", len(self.tag_types))
+        return tt
+
+    def _function_tags(self, start: int, auto: Optional[bool]) -> List[Tag]:
+        return [
+            tag
+            for tag, a in self.function_tags.get(start, [])
+            if auto is None or a == auto
+        ]
+
+    def get_tags(self, auto: Optional[bool] = None) -> List[Tuple[int, Tag]]:
+        out: List[Tuple[int, Tag]] = []
+        for addr in sorted(self.data_tags):
+            for tag, a in self.data_tags[addr]:
+                if auto is None or a == auto:
+                    out.append((addr, tag))
+        return out
+
+    def get_tags_at(self, addr: int, auto: Optional[bool] = None) -> List[Tag]:
+        return [
+            tag for tag, a in self.data_tags.get(addr, []) if auto is None or a == auto
+        ]
+
+    def add_tag(self, addr: int, tag_type: str, data: str, user: bool = True) -> Tag:
+        tag = Tag(self._tag_type(tag_type), data)
+        self.data_tags.setdefault(addr, []).append((tag, not user))
+        return tag
+
+    def _remove_data_tags(self, addr: int, tag_type: str, auto: bool) -> None:
+        items = self.data_tags.get(addr)
+        if not items:
+            return
+        kept = [(t, a) for t, a in items if not (a == auto and t.type.name == tag_type)]
+        if kept:
+            self.data_tags[addr] = kept
+        else:
+            del self.data_tags[addr]
+
+    def remove_user_data_tags_of_type(self, addr: int, tag_type: str) -> None:
+        self._remove_data_tags(addr, tag_type, False)
+
+    def remove_auto_data_tags_of_type(self, addr: int, tag_type: str) -> None:
+        self._remove_data_tags(addr, tag_type, True)
+
+    # analysis and database
+
+    def set_comment_at(self, addr: int, text: str) -> None:
+        self.comments[addr] = text
+
+    def update_analysis(self) -> None:
+        self.analysis_updates += 1
+
+    def update_analysis_and_wait(self) -> None:
+        self.analysis_updates += 1
+
+    def abort_analysis(self) -> None:
+        pass
+
+    def save_auto_snapshot(self, settings: Any = None) -> bool:
+        self.file.modified = False
+        return self.file.has_database
+
+    def create_database(self, path: str, settings: Any = None) -> bool:
+        self.file.filename = path
+        self.file.has_database = True
+        self.file.modified = False
+        return True
+
+
+def _align(addr: int, alignment: int = 0x1000) -> int:
+    return (addr + alignment - 1) & ~(alignment - 1)
+
+
+def _make_modules() -> Dict[str, types.ModuleType]:
+    root = types.ModuleType("binaryninja")
+    root.__path__ = []  # mark as a package so submodule imports resolve
+    root.__fake__ = True
+    root.BinaryDataNotification = BinaryDataNotification
+    root.Symbol = Symbol
+    root.SymbolType = SymbolType
+    root.core_version = lambda: "0.0.0-fake"
+
+    enums = types.ModuleType("binaryninja.enums")
+    for cls in (
+        SymbolType,
+        FindFlag,
+        StringType,
+        SectionSemantics,
+        TagTypeType,
+        AnalysisState,
+        VariableSourceType,
+        NotificationType,
+    ):
+        setattr(enums, cls.__name__, cls)
+        setattr(root, cls.__name__, cls)
+
+    variable = types.ModuleType("binaryninja.variable")
+    variable.Variable = Variable
+
+    root.enums = enums
+    root.variable = variable
+    return {
+        "binaryninja": root,
+        "binaryninja.enums": enums,
+        "binaryninja.variable": variable,
+    }
+
+
+@contextmanager
+def installed() -> Iterator[types.ModuleType]:
+    """Temporarily install the fake ``binaryninja`` package into sys.modules."""
+    modules = _make_modules()
+    saved = {name: sys.modules.get(name) for name in modules}
+    sys.modules.update(modules)
+    try:
+        yield modules["binaryninja"]
+    finally:
+        for name, previous in saved.items():
+            if previous is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = previous
@@ -0,0 +1,115 @@
+import gc
+import unittest
+import weakref
+
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.intervals import IntervalTable
+from bnk_serverlib.tools.view_cache import TOPIC_FUNCTIONS, forget, peek
+from tests.fakebn import SyntheticView, installed
+
+
+class IntervalTableTests(unittest.TestCase):
+    def test_overlapping_spans_match_a_linear_scan(self) -> None:
+        spans = [(0, 100, "outer"), (10, 20, "a"), (15, 40, "b"), (60, 61, "c")]
+        spans += [(200, 200, "empty"), (150, 300, "late")]
+        table = IntervalTable(spans)
+        for addr in range(-1, 310):
+            expected = sorted(v for lo, hi, v in spans if lo <= addr < hi)
+            got = sorted(v for _lo, _hi, v in table.containing(addr))
+            self.assertEqual(got, expected, addr)
+        self.assertEqual(table.first_containing(16), (15, 40, "b"))
+        self.assertEqual(table.preceding(120), (60, 61, "c"))
+        self.assertIsNone(table.preceding(-1))
+
+
+class AddrInfoTests(unittest.TestCase):
+    def test_code_address_resolves_function_block_and_label(self) -> None:
+        with installed():
+            view = SyntheticView(functions=300)
+            func = view.functions[4]
+            info = call_tool("addr.info", bv=view, addr=hex(func.start + 4))
+
+        self.assertEqual(info["section"], ".text")
+        self.assertEqual(info["segment"]["flags"], "r-x")
+        self.assertEqual(
+            info["functions"],
+            [
+                {
+                    "name": func.name,
+                    "address": func.start,
+                    "address_hex": hex(func.start),
+                    "offset": 4,
+                }
+            ],
+        )
+        self.assertEqual(info["basic_block"]["start"], func.start)
+        self.assertEqual(info["label"], f"{func.name}+0x4")
+        self.assertIsNone(info["data_var"])
+        self.assertEqual([t["address"] for t in info["tags"]], [func.start + 4])
+
+    def test_data_and_unmapped_addresses(self) -> None:
+        with installed():
+            view = SyntheticView(functions=100)
+            data = call_tool("addr.info", bv=view, addr=view.data + 8 * 3 + 2)
+            gap = call_tool("addr.info", bv=view, addr=view.rodata_end + 0x10)
+            outside = call_tool("addr.info", bv=view, addr=0)
+
+        self.assertEqual(data["section"], ".data")
+        self.assertEqual(data["data_var"]["address"], view.data + 24)
+        self.assertEqual(data["data_var"]["offset"], 2)
+        self.assertEqual(data["label"], "g_packet_3+0x2")
+        self.assertEqual(data["functions"], [])
+        self.assertIsNone(gap["section"])
+        self.assertEqual(gap["label"], hex(view.rodata_end + 0x10))
+        self.assertIsNone(outside["segment"])
+        self.assertEqual(outside["label"], "0x0")
+
+    def test_many_matches_single_lookups_in_input_order(self) -> None:
+        with installed():
+            view = SyntheticView(functions=200)
+            addrs = [view.got + 8, view.TEXT + 0x41, view.rodata, view.TEXT]
+            many = call_tool("addr.info-many", bv=view, addrs=[hex(a) for a in addrs])
+            single = [call_tool("addr.info", bv=view, addr=a) for a in addrs]
+            labels = call_tool("addr.info-many", bv=view, addrs=addrs, fields=["label"])
+            built = peek(view, TOPIC_FUNCTIONS, "ranges") is not None
+            with self.assertRaisesRegex(ValueError, "invalid address"):
+                call_tool("addr.info-many", bv=view, addrs=["0x10", "nope"])
+
+        self.assertEqual(many, single)
+        self.assertEqual([row["address"] for row in many], addrs)
+        self.assertEqual(labels, [{"label": row["label"]} for row in many])
+        self.assertTrue(built)
+
+    def test_fields_skip_tables_they_do_not_need(self) -> None:
+        with installed():
+            view = SyntheticView(functions=50)
+            info = call_tool("addr.info", bv=view, addr=view.TEXT, fields="section")
+            built = peek(view, TOPIC_FUNCTIONS, "ranges")
+
+        self.assertEqual(info, {"section": ".text"})
+        self.assertIsNone(built)
+
+    def test_built_tables_do_not_keep_the_view_alive(self) -> None:
+        # fakebn functions and data vars hold their view, like BN's do
+        with installed():
+            view = SyntheticView(functions=50)
+            call_tool("addr.info", bv=view, addr=view.data)
+            self.assertIsNotNone(peek(view, TOPIC_FUNCTIONS, "ranges"))
+            ref = weakref.ref(view)
+            del view
+            gc.collect()
+
+        self.assertIsNone(ref())
+
+    def test_forget_drops_the_view_state(self) -> None:
+        with installed():
+            view = SyntheticView(functions=20)
+            call_tool("addr.info", bv=view, addr=view.TEXT)
+            forget(view)
+            dropped = peek(view, TOPIC_FUNCTIONS, "ranges")
+
+        self.assertIsNone(dropped)
+
+
+if __name__ == "__main__":
+    unittest.main()
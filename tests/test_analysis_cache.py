@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+import unittest
+
+from server.plugin.analysis_cache import AnalysisCache, file_digest, options_digest
+
+
+class AnalysisCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.binary = self._write("target.bin", b"\x7fELF" + b"\x00" * 64)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as fh:
+            fh.write(data)
+        return path
+
+    def test_key_depends_on_content_and_options(self) -> None:
+        cache = AnalysisCache(os.path.join(self.root, "cache"))
+        with open(self.binary, "rb") as fh:
+            copy = self._write("copy.bin", fh.read())
+
+        self.assertEqual(cache.key(self.binary), cache.key(copy))
+        self.assertNotEqual(cache.key(self.binary), cache.key(copy, {"a": 1}))
+        self.assertEqual(options_digest({"a": 1, "b": 2}), options_digest({"b": 2, "a": 1}))
+        self.assertEqual(len(file_digest(self.binary)), 64)
+
+    def test_hits_are_private_copies(self) -> None:
+        cache = AnalysisCache(os.path.join(self.root, "cache"))
+        key = cache.key(self.binary)
+        self.assertIsNone(cache.checkout(key, "demo"))
+
+        database = self._write("analyzed.bndb", b"analysis")
+        cache.store(key, database)
+        work = cache.checkout(key, "demo")
+
+        self.assertIsNotNone(work)
+        self.assertNotEqual(work, cache.entry_path(key))
+        with open(work, "wb") as fh:
+            fh.write(b"edited")
+        with open(cache.entry_path(key), "rb") as fh:
+            self.assertEqual(fh.read(), b"analysis")
+
+    def test_only_work_copies_count_as_work_paths(self) -> None:
+        cache = AnalysisCache(os.path.join(self.root, "cache"))
+        key = cache.key(self.binary)
+        cache.store(key, self._write("analyzed.bndb", b"analysis"))
+
+        self.assertTrue(cache.is_work_path(cache.checkout(key, "demo")))
+        self.assertFalse(cache.is_work_path(cache.entry_path(key)))
+        self.assertFalse(cache.is_work_path(self._write("user.bndb", b"mine")))
+        self.assertFalse(AnalysisCache().is_work_path(self.binary))
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        cache = AnalysisCache(os.path.join(self.root, "cache"), max_bytes=25)
+        database = self._write("analyzed.bndb", b"x" * 10)
+        cache.store("old", database)
+        cache.store("used", database)
+        past = time.time() - 100
+        os.utime(cache.entry_path("old"), (past, past))
+        os.utime(cache.entry_path("used"), (past, past))
+        cache.checkout("used", "demo")
+
+        evicted = cache.store("new", database)
+
+        self.assertEqual(evicted, [cache.entry_path("old")])
+        self.assertEqual(cache.snapshot()["entries"], 2)
+
+    def test_stale_unreferenced_work_copies_are_pruned(self) -> None:
+        cache = AnalysisCache(os.path.join(self.root, "cache"))
+        cache.store("k", self._write("analyzed.bndb", b"x"))
+        in_use = cache.checkout("k", "a")
+        stale = cache.checkout("k", "b")
+        fresh = cache.checkout("k", "c")
+        past = time.time() - 7200
+        for path in (in_use, stale):
+            os.utime(path, (past, past))
+
+        self.assertEqual(cache.prune_work([in_use]), 1)
+        self.assertTrue(os.path.exists(in_use))
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+
+
+if __name__ == "__main__":
+    unittest.main()
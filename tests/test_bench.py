@@ -0,0 +1,50 @@
+import unittest
+
+from bnk_serverlib.registry import _TOOLS, call_tool
+from tests.bench import CASES, compare, parse_scale, run
+from tests.fakebn import SyntheticView, installed
+
+
+class BenchCoverageTests(unittest.TestCase):
+    def test_every_registered_tool_has_a_bench_case(self) -> None:
+        self.assertEqual(sorted(CASES), sorted(tool.name for tool in _TOOLS))
+
+    def test_every_tool_runs_against_a_small_synthetic_view(self) -> None:
+        rows = run([200], repeat=1)
+
+        tools = {row["tool"] for row in rows}
+        self.assertTrue(set(CASES) <= tools)
+
+    def test_scale_suffixes(self) -> None:
+        self.assertEqual(parse_scale("1k"), 1_000)
+        self.assertEqual(parse_scale("1m"), 1_000_000)
+        self.assertEqual(parse_scale("250"), 250)
+
+    def test_compare_flags_slowdowns(self) -> None:
+        baseline = [{"tool": "a", "scale": 10, "best_ms": 10.0}]
+        rows = [{"tool": "a", "scale": 10, "best_ms": 50.0}]
+
+        self.assertEqual(len(compare(rows, baseline, max_ratio=2.0)), 1)
+        self.assertEqual(compare(rows, baseline, max_ratio=10.0), [])
+
+
+class SyntheticViewTests(unittest.TestCase):
+    def test_tool_results_follow_the_synthetic_layout(self) -> None:
+        with installed():
+            view = SyntheticView(functions=2000)
+
+            hits = call_tool("strings.like", bv=view, pattern="password")
+            data_hits = call_tool("strings.like-data", bv=view, pattern="PASSWORD")
+            callers = call_tool("function.callers", bv=view, name_or_addr=view.TEXT)
+            imports = call_tool("functions.list", bv=view, include_imports=False)
+
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(
+            [h["address"] for h in data_hits][:1], [hits[0]["address"] + 4]
+        )
+        self.assertEqual(len(callers), 2)
+        self.assertEqual(len(imports), 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
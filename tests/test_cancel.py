@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+
+from bnk_serverlib.tools.cancel import bind, cancellable, checkpoint
+from server.plugin.cancel import CancelToken, RequestCancelled
+
+
+class CancelTokenTests(unittest.TestCase):
+    def test_deadline_cancels_and_runs_abort_hooks(self) -> None:
+        token = CancelToken(deadline_s=0.05)
+        aborted = threading.Event()
+
+        with token.armed(), token.on_cancel(aborted.set):
+            self.assertTrue(aborted.wait(2.0))
+
+        self.assertTrue(token.cancelled)
+        with self.assertRaisesRegex(RequestCancelled, "deadline exceeded"):
+            token.check()
+
+    def test_hook_registered_after_cancel_fires_immediately(self) -> None:
+        token = CancelToken()
+        token.cancel("interrupted")
+        calls: list[str] = []
+
+        with token.on_cancel(lambda: calls.append("abort")):
+            pass
+
+        self.assertEqual(calls, ["abort"])
+        self.assertFalse(token.cancel("again"))
+        self.assertEqual(token.reason, "interrupted")
+
+    def test_no_deadline_never_expires(self) -> None:
+        token = CancelToken(deadline_s=0)
+
+        self.assertIsNone(token.remaining())
+        self.assertFalse(token.cancelled)
+
+
+class ToolCheckpointTests(unittest.TestCase):
+    def test_checkpoints_are_noops_without_a_token(self) -> None:
+        checkpoint()
+        self.assertEqual(list(cancellable(range(3))), [0, 1, 2])
+
+    def test_cancellable_stops_bound_loops(self) -> None:
+        token = CancelToken()
+        seen: list[int] = []
+
+        with bind(token):
+            with self.assertRaises(RequestCancelled):
+                for item in cancellable(range(100), every=10):
+                    seen.append(item)
+                    if item == 15:
+                        token.cancel("interrupted")
+
+        self.assertEqual(len(seen), 20)
+        checkpoint()
+
+    def test_expired_deadline_is_seen_without_a_timer(self) -> None:
+        token = CancelToken(deadline_s=0.01)
+        time.sleep(0.02)
+
+        with bind(token):
+            with self.assertRaisesRegex(RequestCancelled, "deadline"):
+                checkpoint()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from server.plugin.cursors import ResultCursors, pageable
+
+
+class ResultCursorTests(unittest.TestCase):
+    def test_small_results_need_no_cursor(self) -> None:
+        cursors = ResultCursors()
+
+        rows, cursor_id = cursors.first_page("demo", [1, 2, 3], 3)
+
+        self.assertEqual(rows, [1, 2, 3])
+        self.assertIsNone(cursor_id)
+        self.assertEqual(cursors.open_count(), 0)
+
+    def test_pages_until_the_last_one_drops_the_cursor(self) -> None:
+        cursors = ResultCursors()
+        rows, cursor_id = cursors.first_page("demo", list(range(10)), 4)
+
+        second = cursors.fetch("demo", cursor_id, 4)
+        third = cursors.fetch("demo", cursor_id, 4)
+
+        self.assertEqual(rows, [0, 1, 2, 3])
+        self.assertEqual(second, {"rows": [4, 5, 6, 7], "sent": 8, "cursor": cursor_id})
+        self.assertEqual(third, {"rows": [8, 9], "sent": 10})
+        with self.assertRaisesRegex(KeyError, "unknown or expired"):
+            cursors.fetch("demo", cursor_id, 4)
+
+    def test_generators_are_pulled_one_page_at_a_time(self) -> None:
+        produced: list[int] = []
+
+        def rows():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        cursors = ResultCursors()
+        _rows, cursor_id = cursors.first_page("demo", rows(), 10)
+
+        self.assertEqual(len(produced), 11)
+        cursors.fetch("demo", cursor_id, 10)
+        self.assertEqual(len(produced), 21)
+
+    def test_close_session_drops_only_that_sessions_cursors(self) -> None:
+        cursors = ResultCursors()
+        cursors.first_page("a", list(range(5)), 1)
+        cursors.first_page("b", list(range(5)), 1)
+
+        self.assertEqual(cursors.close_session("b"), 1)
+        self.assertEqual(cursors.open_count(), 1)
+
+    def test_cursors_are_only_fetched_by_their_own_session(self) -> None:
+        produced: list[int] = []
+
+        def rows():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        cursors = ResultCursors()
+        _rows, cursor_id = cursors.first_page("b", rows(), 2)
+        pulled = len(produced)
+
+        with self.assertRaisesRegex(KeyError, "unknown or expired"):
+            cursors.fetch("a", cursor_id, 4)
+        with self.assertRaisesRegex(KeyError, "unknown or expired"):
+            cursors.get("a", cursor_id)
+        self.assertEqual(len(produced), pulled)
+        self.assertEqual(cursors.fetch("b", cursor_id, 4)["rows"], [2, 3, 4, 5])
+
+    def test_cursors_are_only_closed_by_their_own_session(self) -> None:
+        cursors = ResultCursors()
+        _rows, cursor_id = cursors.first_page("b", list(range(5)), 1)
+
+        self.assertFalse(cursors.close("a", cursor_id))
+        self.assertEqual(cursors.open_count(), 1)
+        self.assertTrue(cursors.close("b", cursor_id))
+        self.assertEqual(cursors.open_count(), 0)
+
+    def test_cursor_remembers_whether_it_came_from_a_shared_request(self) -> None:
+        cursors = ResultCursors()
+        _rows, shared_id = cursors.first_page("a", list(range(5)), 1, shared=True)
+        _rows, exclusive_id = cursors.first_page("a", list(range(5)), 1)
+
+        self.assertTrue(cursors.get("a", shared_id).shared)
+        self.assertFalse(cursors.get("a", exclusive_id).shared)
+
+    def test_cursor_remembers_whether_it_holds_tool_rows(self) -> None:
+        cursors = ResultCursors()
+        _rows, tool_id = cursors.first_page("a", iter(range(5)), 1, tool=True)
+        _rows, exec_id = cursors.first_page("a", iter(range(5)), 1)
+
+        self.assertTrue(cursors.get("a", tool_id).tool)
+        self.assertFalse(cursors.get("a", exec_id).tool)
+
+    def test_idle_cursors_expire(self) -> None:
+        cursors = ResultCursors(idle_s=0.0)
+        _rows, cursor_id = cursors.first_page("a", list(range(5)), 1)
+
+        with self.assertRaisesRegex(KeyError, "unknown or expired"):
+            cursors.fetch("a", cursor_id, 1)
+
+    def test_only_row_sequences_are_pageable(self) -> None:
+        self.assertTrue(pageable([1]))
+        self.assertTrue(pageable(iter([1])))
+        self.assertFalse(pageable({"a": 1}))
+        self.assertFalse(pageable("text"))
+
+
+if __name__ == "__main__":
+    unittest.main()
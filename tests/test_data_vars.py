@@ -0,0 +1,64 @@
+import types
+import unittest
+
+from bnk_serverlib.registry import call_tool
+from tests.fakebn import FakeType, SyntheticView, installed
+
+
+class DataVarTests(unittest.TestCase):
+    def test_list_streams_in_address_order_with_filters(self) -> None:
+        with installed():
+            view = SyntheticView(functions=200)
+            view.define_user_data_var(view.rodata + 16, FakeType("char[16]", 16))
+            rows = call_tool("data.list", bv=view)
+            self.assertIsInstance(rows, types.GeneratorType)
+            rows = list(rows)
+            in_data = list(call_tool("data.list", bv=view, section=".data", limit=5))
+            chars = list(call_tool("data.list", bv=view, type_pattern="CHAR"))
+            with self.assertRaisesRegex(ValueError, "unknown section"):
+                call_tool("data.list", bv=view, section=".nope")
+
+        addrs = [row["address"] for row in rows]
+        self.assertEqual(addrs, sorted(view.data_vars))
+        self.assertEqual(rows[0]["name"], "")
+        self.assertEqual(
+            rows[1],
+            {
+                "address": view.data,
+                "address_hex": hex(view.data),
+                "name": "g_buffer_0",
+                "type": "uint64_t",
+            },
+        )
+        self.assertEqual([row["address"] for row in in_data], addrs[1:6])
+        self.assertEqual([row["type"] for row in chars], ["char[16]"])
+
+    def test_like_matches_names_and_takes_opt_in_fields(self) -> None:
+        with installed():
+            view = SyntheticView(functions=200)
+            rows = list(
+                call_tool(
+                    "data.like",
+                    bv=view,
+                    pattern="g_packet",
+                    limit=3,
+                    fields=["name", "size", "section"],
+                )
+            )
+            regex = list(call_tool("data.like", bv=view, pattern=r"_1\d$", regex=True))
+
+        self.assertEqual(
+            rows,
+            [
+                {"name": f"g_packet_{k}", "size": 8, "section": ".data"}
+                for k in (3, 11, 19)
+            ],
+        )
+        self.assertEqual(
+            [row["name"].rsplit("_", 1)[1] for row in regex],
+            [str(k) for k in range(10, 20)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
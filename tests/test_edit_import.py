@@ -0,0 +1,80 @@
+import io
+import os
+import tempfile
+import unittest
+
+from bnk_serverlib.tools.edit_import import _iter_rows, symbols_import
+
+
+class _Func:
+    def __init__(self, start: int, name: str) -> None:
+        self.start = start
+        self.name = name
+        self.user_type = None
+
+    def set_user_type(self, ty) -> None:
+        self.user_type = ty
+
+
+class _View:
+    def __init__(self, funcs) -> None:
+        self.functions = funcs
+        self.parsed: list[str] = []
+
+    def parse_type_string(self, text: str):
+        self.parsed.append(text)
+        return f"type<{text}>", "name"
+
+    def get_symbols_by_name(self, _name: str):
+        return []
+
+
+class EditImportTests(unittest.TestCase):
+    def test_rows_accept_aliases_and_comments(self) -> None:
+        fh = io.StringIO("# exported\naddr,symbol,proto\n0x10,main,int main()\n")
+
+        rows = list(_iter_rows(fh, "csv"))
+
+        self.assertEqual(
+            rows, [{"address": "0x10", "name": "main", "type": "int main()"}]
+        )
+
+    def test_json_mapping_rows(self) -> None:
+        fh = io.StringIO('{"0x10": "main", "0x20": {"name": "helper"}}')
+
+        rows = list(_iter_rows(fh, "json"))
+
+        self.assertEqual(
+            rows,
+            [
+                {"address": "0x10", "name": "main"},
+                {"name": "helper", "address": "0x20"},
+            ],
+        )
+
+    def test_import_parses_each_type_once_and_reports_conflicts(self) -> None:
+        funcs = [_Func(0x10, "sub_10"), _Func(0x20, "sub_20")]
+        bv = _View(funcs)
+        lines = [
+            '{"address": "0x10", "name": "a", "type": "int f(int)"}',
+            '{"address": "0x20", "name": "b", "type": "int f(int)"}',
+            '{"address": "0x10", "name": "other"}',
+            '{"address": "0x30", "name": "missing", "kind": "function"}',
+        ]
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", delete=False, encoding="utf-8"
+        ) as fh:
+            fh.write("\n".join(lines))
+        self.addCleanup(os.unlink, fh.name)
+
+        out = symbols_import(bv=bv, path=fh.name)
+
+        self.assertEqual(bv.parsed, ["int f(int)"])
+        self.assertEqual([f.name for f in funcs], ["a", "b"])
+        self.assertEqual(out["applied"]["function_types"], 2)
+        self.assertEqual(out["conflicts"], 2)
+        self.assertEqual(out["distinct_types"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
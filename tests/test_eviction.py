@@ -0,0 +1,57 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from server.plugin.eviction import (
+    FUNCTION_BYTES,
+    EvictionCandidate,
+    EvictionPolicy,
+    Reaper,
+    estimate_view_bytes,
+    pick_evictions,
+)
+
+
+class _View(SimpleNamespace):
+    def __len__(self) -> int:
+        return self.size
+
+
+class EvictionPolicyTests(unittest.TestCase):
+    def test_disabled_policy_evicts_nothing(self) -> None:
+        cands = [EvictionCandidate("a", idle_s=1e6, bytes=1 << 40)]
+
+        self.assertFalse(EvictionPolicy().enabled)
+        self.assertEqual(pick_evictions(cands, EvictionPolicy()), [])
+
+    def test_idle_sessions_go_first_then_lru_until_under_budget(self) -> None:
+        cands = [
+            EvictionCandidate("stale", idle_s=4000, bytes=10),
+            EvictionCandidate("older", idle_s=300, bytes=60),
+            EvictionCandidate("recent", idle_s=10, bytes=60),
+            EvictionCandidate("newest", idle_s=1, bytes=30),
+        ]
+        policy = EvictionPolicy(max_idle_s=3600, max_total_bytes=100)
+
+        self.assertEqual(pick_evictions(cands, policy), ["stale", "older"])
+
+    def test_estimate_uses_the_larger_of_rss_growth_and_view_size(self) -> None:
+        bv = _View(size=1000, functions=[object()] * 2)
+
+        self.assertEqual(estimate_view_bytes(bv), 1000 + 2 * FUNCTION_BYTES)
+        self.assertEqual(estimate_view_bytes(bv, rss_delta=1 << 30), 1 << 30)
+        self.assertEqual(estimate_view_bytes(object()), 0)
+
+    def test_reaper_sweeps_until_stopped(self) -> None:
+        swept = threading.Event()
+        reaper = Reaper(swept.set, interval_s=0.01)
+
+        reaper.start()
+        try:
+            self.assertTrue(swept.wait(2.0))
+        finally:
+            reaper.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.fields import bind, normalize_fields, project, wanted
+from tests.fakebn import SyntheticView, installed
+
+
+class FieldsTests(unittest.TestCase):
+    def test_normalize_accepts_lists_and_comma_strings(self) -> None:
+        self.assertIsNone(normalize_fields(None))
+        self.assertEqual(normalize_fields(" name, address ,name"), ["name", "address"])
+        self.assertEqual(normalize_fields(("a", "b")), ["a", "b"])
+        with self.assertRaisesRegex(ValueError, "at least one"):
+            normalize_fields(" , ")
+
+    def test_wanted_is_true_without_a_binding(self) -> None:
+        self.assertTrue(wanted("type"))
+        with bind(["name"]):
+            self.assertTrue(wanted("name", "type"))
+            self.assertFalse(wanted("type"))
+        self.assertTrue(wanted("type"))
+
+    def test_project_trims_records_and_streams(self) -> None:
+        rows = [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+
+        self.assertEqual(project(rows, ["b"]), [{"b": 2}, {"b": 4}])
+        self.assertEqual(project({"a": 1, "b": 2}, ["a"]), {"a": 1})
+        self.assertEqual(list(project(iter(rows), ["a"])), [{"a": 1}, {"a": 3}])
+        self.assertIs(project(rows, None), rows)
+
+    def test_unknown_fields_list_what_is_available(self) -> None:
+        with self.assertRaisesRegex(ValueError, r"unknown field\(s\): nope.*a, b"):
+            project([{"a": 1, "b": 2}], ["nope"])
+
+
+class CallToolFieldsTests(unittest.TestCase):
+    def test_function_info_skips_unrequested_fields(self) -> None:
+        with installed():
+            view = SyntheticView(functions=50)
+            full = call_tool("function.info", bv=view, name_or_addr=hex(view.TEXT))
+            slim = call_tool(
+                "function.info",
+                bv=view,
+                name_or_addr=hex(view.TEXT),
+                fields="name,address",
+            )
+
+        self.assertIn("type", full)
+        self.assertEqual(slim, {"name": full["name"], "address": full["address"]})
+
+    def test_listing_tools_are_projected(self) -> None:
+        with installed():
+            view = SyntheticView(functions=50)
+            rows = call_tool(
+                "functions.list", bv=view, include_imports=False, fields=["name"]
+            )
+
+        self.assertEqual(len(rows), 50)
+        self.assertTrue(all(list(row) == ["name"] for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from types import SimpleNamespace
+
+from server.plugin.jobs import JOB_ANALYZING, LoadJobs, analysis_progress
+
+
+class LoadJobTests(unittest.TestCase):
+    def test_one_active_load_per_session(self) -> None:
+        jobs = LoadJobs()
+        job = jobs.create("demo", "/tmp/a", update_analysis=True)
+
+        with self.assertRaisesRegex(RuntimeError, "already loading"):
+            jobs.create("demo", "/tmp/b", update_analysis=True)
+
+        job.finish()
+        again = jobs.create("demo", "/tmp/b", update_analysis=True)
+
+        self.assertIsNone(jobs.get(job.id))
+        self.assertIs(jobs.for_session("demo"), again)
+
+    def test_progress_reports_phase_and_percent(self) -> None:
+        bv = SimpleNamespace(
+            analysis_progress=SimpleNamespace(
+                state=SimpleNamespace(name="AnalyzeState"), count=25, total=100
+            ),
+            functions=[object()] * 3,
+        )
+        jobs = LoadJobs()
+        job = jobs.create("demo", "/tmp/a", update_analysis=True)
+        job.set_state(JOB_ANALYZING, bv=bv)
+
+        snap = job.snapshot()
+
+        self.assertEqual(analysis_progress(bv)["phase"], "AnalyzeState")
+        self.assertEqual(snap["percent"], 25.0)
+        self.assertEqual(snap["functions"], 3)
+        self.assertFalse(snap["done"])
+
+        job.finish(error="boom")
+        self.assertTrue(job.done.is_set())
+        self.assertEqual(job.snapshot()["state"], "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import threading
+import time
+import unittest
+
+from server.plugin.locks import KeyedLocks, RWLock
+
+
+class KeyedLocksTests(unittest.TestCase):
+    def test_distinct_keys_do_not_block_each_other(self) -> None:
+        locks = KeyedLocks()
+        acquired = threading.Event()
+
+        def other() -> None:
+            with locks.hold("/bin/b"):
+                acquired.set()
+
+        with locks.hold("/bin/a"):
+            thread = threading.Thread(target=other)
+            thread.start()
+            self.assertTrue(acquired.wait(2.0))
+            thread.join()
+
+    def test_same_key_serializes_and_entries_are_dropped(self) -> None:
+        locks = KeyedLocks()
+        acquired = threading.Event()
+
+        def other() -> None:
+            with locks.hold("/bin/a"):
+                acquired.set()
+
+        with locks.hold("/bin/a"):
+            thread = threading.Thread(target=other)
+            thread.start()
+            self.assertFalse(acquired.wait(0.1))
+        thread.join(2.0)
+
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(len(locks), 0)
+
+
+class RWLockTests(unittest.TestCase):
+    def test_readers_share_and_writers_wait_for_them(self) -> None:
+        lock = RWLock()
+        both_in = threading.Barrier(2, timeout=2.0)
+        written = threading.Event()
+
+        def reader() -> None:
+            with lock.shared():
+                both_in.wait()
+                both_in.wait()
+
+        def writer() -> None:
+            with lock:
+                written.set()
+
+        with lock.shared():
+            other = threading.Thread(target=reader)
+            other.start()
+            both_in.wait()
+            self.assertEqual(lock.readers(), 2)
+            both_in.wait()
+            other.join(2.0)
+
+            thread = threading.Thread(target=writer)
+            thread.start()
+            self.assertFalse(written.wait(0.1))
+        thread.join(2.0)
+        self.assertTrue(written.is_set())
+
+    def test_waiting_writer_holds_back_new_readers(self) -> None:
+        lock = RWLock()
+        order: list[str] = []
+
+        def writer() -> None:
+            with lock:
+                order.append("write")
+
+        def reader() -> None:
+            with lock.shared():
+                order.append("read")
+
+        lock.acquire_shared()
+        w = threading.Thread(target=writer)
+        w.start()
+        while not lock._writers_waiting:
+            time.sleep(0.01)
+        r = threading.Thread(target=reader)
+        r.start()
+        time.sleep(0.05)
+        self.assertEqual(order, [])
+        self.assertEqual(lock.readers(), 1)
+        lock.release_shared()
+        w.join(2.0)
+        r.join(2.0)
+        self.assertEqual(order, ["write", "read"])
+
+    def test_exclusive_side_is_reentrant_and_can_read(self) -> None:
+        lock = RWLock()
+        with lock:
+            with lock:
+                with lock.shared():
+                    self.assertEqual(lock.readers(), 1)
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+
+    def test_shared_hold_cannot_upgrade(self) -> None:
+        lock = RWLock()
+        with lock.shared():
+            with self.assertRaisesRegex(RuntimeError, "upgrade"):
+                lock.acquire(timeout=0.1)
+        with self.assertRaises(RuntimeError):
+            lock.release()
+
+    def test_timed_out_writer_lets_readers_in(self) -> None:
+        lock = RWLock()
+        entered = threading.Event()
+
+        def hold() -> None:
+            with lock.shared():
+                entered.set()
+                time.sleep(0.2)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        self.assertTrue(entered.wait(2.0))
+        self.assertFalse(lock.acquire(timeout=0.05))
+        self.assertTrue(lock.acquire_shared(timeout=1.0))
+        lock.release_shared()
+        thread.join(2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
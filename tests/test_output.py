@@ -1,7 +1,8 @@
+import io
 import json
 import unittest
 
-from bnk.output import dump_json, format_text
+from bnk.output import dump_json, format_text, write_ndjson, write_text
 
 
 class TextOutputTests(unittest.TestCase):
@@ -41,6 +42,25 @@ class TextOutputTests(unittest.TestCase):
         self.assertTrue(text.startswith("[0]"))
         self.assertIn("refs", text)
 
+    def test_run_result_keeps_profile_after_the_result(self) -> None:
+        text = format_text(
+            {
+                "ok": True,
+                "stdout": "",
+                "stderr": "",
+                "result": 3,
+                "profile": {
+                    "total_s": 0.5,
+                    "top": [{"function": "x.py:1(f)", "calls": 2, "cumtime_s": 0.5}],
+                },
+            }
+        )
+
+        lines = text.splitlines()
+        self.assertEqual(lines[0], "3")
+        self.assertEqual(lines[1], "profile:")
+        self.assertIn("x.py:1(f)", text)
+
     def test_json_output_keeps_original_values(self) -> None:
         rows = [{"value": "line1\nline2\t\x00"}]
 
@@ -49,5 +69,123 @@ class TextOutputTests(unittest.TestCase):
         self.assertEqual(payload, rows)
 
 
+class StreamingTableTests(unittest.TestCase):
+    def test_small_results_match_format_text(self) -> None:
+        rows = [
+            {"address_hex": "0x1", "name": "main", "length": 5},
+            {"address_hex": "0x20", "name": "parse_header", "length": 120},
+        ]
+        out = io.StringIO()
+
+        write_text(rows, out)
+
+        self.assertEqual(out.getvalue(), format_text(rows) + "\n")
+
+    def test_rows_stream_before_the_source_is_exhausted(self) -> None:
+        out = io.StringIO()
+        seen_before_end: list[int] = []
+
+        def rows():
+            for i in range(50):
+                if i == 49:
+                    seen_before_end.append(out.getvalue().count("\n"))
+                yield {"address_hex": hex(i), "name": f"sub_{i}"}
+
+        write_text(rows(), out, sample_rows=4)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 52)
+        self.assertGreater(seen_before_end[0], 40)
+        self.assertTrue(lines[0].startswith("name"))
+
+    def test_widths_come_from_the_sample(self) -> None:
+        rows = [{"name": "a", "n": 1}, {"name": "b" * 30, "n": 2}]
+        out = io.StringIO()
+
+        write_text(rows, out, sample_rows=1)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "name  n")
+        self.assertEqual(lines[2], "a     1")
+        self.assertEqual(lines[3], ("b" * 30) + "  2")
+
+    def test_late_nested_cells_and_new_keys_stay_on_one_line(self) -> None:
+        rows = [{"name": "a"}, {"name": "b", "refs": [1, 2]}]
+        out = io.StringIO()
+
+        write_text(rows, out, sample_rows=1)
+
+        self.assertEqual(out.getvalue().splitlines()[-1], "b  refs=[1,2]")
+
+    def test_non_tabular_samples_fall_back_to_block_rendering(self) -> None:
+        rows = [{"name": "a", "refs": []}]
+        out = io.StringIO()
+
+        write_text(iter(rows), out)
+
+        self.assertEqual(out.getvalue(), format_text(rows) + "\n")
+
+    def test_paged_run_results_stream_their_rows(self) -> None:
+        rows = [{"name": f"sub_{i}", "length": i} for i in range(3)]
+        payload = {"ok": True, "stdout": "", "stderr": "", "result": iter(rows)}
+        out = io.StringIO()
+
+        write_text(payload, out)
+
+        self.assertEqual(out.getvalue(), format_text(rows) + "\n")
+
+    def test_run_results_with_output_stream_under_their_header(self) -> None:
+        rows = [{"name": f"sub_{i}", "length": i} for i in range(3)]
+        payload = {
+            "ok": True,
+            "stdout": "hi\n",
+            "stderr": "",
+            "result": rows,
+            "profile": {"total_s": 0.5},
+        }
+        streamed = {**payload, "result": iter(rows)}
+        out = io.StringIO()
+
+        write_text(streamed, out)
+
+        self.assertEqual(out.getvalue(), format_text(payload) + "\n")
+        self.assertIn("result:\n  name ", out.getvalue())
+
+    def test_list_results_inside_a_payload_stream_too(self) -> None:
+        out = io.StringIO()
+        seen_before_end: list[int] = []
+
+        def rows():
+            for i in range(50):
+                if i == 49:
+                    seen_before_end.append(out.getvalue().count("\n"))
+                yield {"name": f"sub_{i}"}
+
+        payload = {"ok": True, "stdout": "", "stderr": "", "result": rows()}
+        write_text(payload, out, sample_rows=4)
+        listed = io.StringIO()
+        write_text({**payload, "result": [{"name": "a"}, {"name": "b"}]}, listed)
+
+        self.assertGreater(seen_before_end[0], 40)
+        self.assertEqual(listed.getvalue(), "name\n----\na\nb\n")
+
+
+class NdjsonOutputTests(unittest.TestCase):
+    def test_records_are_written_one_per_line(self) -> None:
+        out = io.StringIO()
+
+        write_ndjson(iter([{"a": 1}, {"a": "x\ny"}]), out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"a": 1}, {"a": "x\ny"}])
+
+    def test_scalars_and_mappings_are_a_single_line(self) -> None:
+        out = io.StringIO()
+
+        write_ndjson({"name": "demo"}, out)
+
+        self.assertEqual(out.getvalue(), '{"name":"demo"}\n')
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from typing import Any, Dict, List
+
+from bnk_serverlib.pipeline import parse_pipeline, run_pipeline
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.cancel import bind, current
+from server.plugin.cancel import CancelToken
+from tests.fakebn import SyntheticView, installed
+
+
+class _Recorder:
+    """Stand-in for call_tool that logs calls and the token bound at each."""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+        self.tokens: List[Any] = []
+
+    def __call__(self, tool: str, **kwargs: Any) -> Any:
+        self.tokens.append(current())
+        kwargs.pop("bv")
+        self.calls.append({"tool": tool, **kwargs})
+        if tool == "list":
+            return [{"id": i, "tag": "even" if i % 2 == 0 else "odd"} for i in range(4)]
+        return [{"child": kwargs["parent"] * 10 + k} for k in range(2)]
+
+
+class PipelineTests(unittest.TestCase):
+    def test_stages_stream_one_input_row_at_a_time(self) -> None:
+        call = _Recorder()
+        rows = run_pipeline(
+            [
+                {"tool": "list"},
+                {"tool": "expand", "bind": {"parent": "id"}, "carry": ["tag"]},
+            ],
+            bv=object(),
+            call=call,
+            allow=lambda name: True,
+        )
+
+        self.assertEqual(call.calls, [])
+        self.assertEqual(next(rows), {"child": 0, "tag": "even"})
+        self.assertEqual([c["tool"] for c in call.calls], ["list", "expand"])
+        self.assertEqual(len(list(rows)), 7)
+        self.assertEqual(len(call.calls), 5)
+
+    def test_query_stage_and_unique(self) -> None:
+        rows = run_pipeline(
+            [
+                {"tool": "list", "unique": ["tag"]},
+                {"query": {"where": "tag == 'odd'"}},
+            ],
+            bv=object(),
+            call=_Recorder(),
+            allow=lambda name: True,
+        )
+
+        self.assertEqual(list(rows), [{"id": 1, "tag": "odd"}])
+
+    def test_cancel_token_is_bound_while_rows_are_pulled(self) -> None:
+        call = _Recorder()
+        token = CancelToken()
+        with bind(token):
+            rows = run_pipeline(
+                [{"tool": "list"}, {"tool": "expand", "bind": {"parent": "id"}}],
+                bv=object(),
+                call=call,
+                allow=lambda name: True,
+            )
+        # pulled after the binding is gone, as the server's pager does
+        list(rows)
+
+        self.assertEqual(set(call.tokens), {token})
+        self.assertTrue(all(c["cancel"] is token for c in call.calls))
+
+    def test_bad_pipelines_fail_before_running(self) -> None:
+        call = _Recorder()
+        bad = [
+            [],
+            [{"bind": {"a": "b"}}],
+            [{"tool": "list", "bind": {"a": "b"}}],
+            [{"tool": "list", "bogus": 1}],
+            [{"tool": "list", "query": {"order": "x"}}],
+            [{"tool": "list", "params": {"bv": 1}}],
+            [{"tool": "list", "params": {"fields": ["a"]}}],
+            [{"tool": "list"}, {"tool": "list", "bind": {"cancel": "a"}}],
+        ]
+        for stages in bad:
+            with self.assertRaises(ValueError, msg=stages):
+                parse_pipeline(stages)
+        with self.assertRaisesRegex(ValueError, "cannot run in a pipeline"):
+            run_pipeline(
+                [{"tool": "list"}], bv=object(), call=call, allow=lambda n: False
+            )
+        self.assertEqual(call.calls, [])
+
+
+class RegistryPipelineTests(unittest.TestCase):
+    def test_functions_to_callers_inside_the_registry(self) -> None:
+        with installed():
+            view = SyntheticView(functions=200)
+            rows = list(
+                call_tool(
+                    "pipeline.run",
+                    bv=view,
+                    stages=[
+                        {"tool": "functions.like", "params": {"pattern": "parse_"}},
+                        {
+                            "tool": "function.callers",
+                            "bind": {"name_or_addr": "start"},
+                            "unique": ["address"],
+                        },
+                    ],
+                    fields="name",
+                )
+            )
+            with self.assertRaisesRegex(ValueError, "edit.fn.rename"):
+                call_tool(
+                    "pipeline.run",
+                    bv=view,
+                    stages=[{"tool": "edit.fn.rename"}],
+                )
+
+        self.assertTrue(rows)
+        self.assertTrue(all(list(row) == ["name"] for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
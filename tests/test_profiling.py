@@ -0,0 +1,38 @@
+import unittest
+
+from server.plugin.profiling import normalize_profile_options, profiled
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_report_lists_hot_functions(self) -> None:
+        options = normalize_profile_options({"top": 5, "sort": "cumulative"})
+
+        with profiled(options) as report:
+            _busy(20000)
+
+        self.assertLessEqual(len(report["top"]), 5)
+        self.assertTrue(any("_busy" in row["function"] for row in report["top"]))
+        self.assertGreater(report["total_calls"], 0)
+        self.assertIn("python", report["self_time_by_area"])
+
+    def test_only_one_profiled_request_at_a_time(self) -> None:
+        options = normalize_profile_options(None)
+
+        with profiled(options):
+            with self.assertRaisesRegex(RuntimeError, "already being profiled"):
+                with profiled(options):
+                    pass
+
+    def test_invalid_options_are_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "sort"):
+            normalize_profile_options({"sort": "name"})
+        with self.assertRaisesRegex(ValueError, "top"):
+            normalize_profile_options({"top": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.query import parse_query, parse_where, run_query
+from tests.fakebn import SyntheticView, installed
+
+ROWS = [
+    {"name": "sub_10", "size": 0x40, "section": ".text"},
+    {"name": "main", "size": 0x200, "section": ".text"},
+    {"name": "init", "size": 0x10, "section": ".init"},
+    {"name": "sub_30", "size": None, "section": ".text"},
+]
+
+
+class WhereTests(unittest.TestCase):
+    def test_comparisons_regex_and_boolean_logic(self) -> None:
+        pred, reads = parse_where(
+            "size >= 0x40 and not name ~ '^sub_' or name == 'init'"
+        )
+
+        self.assertEqual([r["name"] for r in ROWS if pred(r)], ["main", "init"])
+        self.assertEqual(reads, ["size", "name"])
+
+    def test_missing_or_mixed_values_do_not_match_orderings(self) -> None:
+        pred, _reads = parse_where("(size < 0x20)")
+
+        self.assertEqual([r["name"] for r in ROWS if pred(r)], ["init"])
+
+    def test_malformed_expressions_are_rejected(self) -> None:
+        for text in ("", "size >", "size > 1 1", "(size > 1", "size $ 1"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_where(text)
+
+
+class QueryTests(unittest.TestCase):
+    def test_top_k_sorts_descending_with_missing_last(self) -> None:
+        query = parse_query({"sort": "-size", "limit": 3})
+
+        self.assertEqual(
+            [r["name"] for r in run_query(ROWS, query)], ["main", "sub_10", "init"]
+        )
+        everything = run_query(ROWS, parse_query({"sort": "size,name"}))
+        self.assertEqual(everything[-1]["name"], "sub_30")
+
+    def test_group_by_counts_and_sums(self) -> None:
+        query = parse_query({"group_by": "section", "sum": ["size"], "sort": "-count"})
+
+        self.assertEqual(
+            run_query(ROWS, query),
+            [
+                {"section": ".text", "count": 3, "sum_size": 0x240},
+                {"section": ".init", "count": 1, "sum_size": 0x10},
+            ],
+        )
+
+    def test_streams_filters_lazily_and_rejects_non_listings(self) -> None:
+        query = parse_query({"where": "size", "limit": 1})
+
+        out = run_query(iter(ROWS), query)
+        self.assertEqual(list(out), [ROWS[0]])
+        with self.assertRaisesRegex(ValueError, "list of records"):
+            run_query({"name": "main"}, query)
+        with self.assertRaisesRegex(ValueError, "unknown query key"):
+            parse_query({"order": "size"})
+        with self.assertRaisesRegex(ValueError, "group_by"):
+            parse_query({"sum": "size"})
+
+
+class CallToolQueryTests(unittest.TestCase):
+    def test_largest_functions_and_strings_per_section(self) -> None:
+        with installed():
+            view = SyntheticView(functions=100)
+            top = call_tool(
+                "functions.list",
+                bv=view,
+                query={"sort": "-total_bytes,-start", "limit": 5},
+                fields="name,total_bytes",
+            )
+            plain = call_tool("functions.list", bv=view, limit=1)
+            sections = call_tool(
+                "strings.like",
+                bv=view,
+                pattern="",
+                query={"group_by": "section", "sum": "length"},
+            )
+
+        self.assertEqual(len(top), 5)
+        self.assertEqual(set(top[0]), {"name", "total_bytes"})
+        self.assertNotIn("total_bytes", plain[0])
+        self.assertTrue(sections)
+        self.assertTrue(all(row["section"] and row["count"] for row in sections))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,13 @@
 import unittest
 
-from bnk_serverlib.registry import Tool, _build_tool_map, list_tools
+from bnk_serverlib.registry import (
+    MODE_READ,
+    MODE_WRITE,
+    Tool,
+    _build_tool_map,
+    list_tools,
+    tool_mode,
+)
 
 
 def _noop(**_kwargs):
@@ -22,6 +29,20 @@ class RegistryTests(unittest.TestCase):
         with self.assertRaisesRegex(RuntimeError, "duplicate"):
             _build_tool_map(tools)
 
+    def test_edit_tools_are_writes_except_inspection(self) -> None:
+        modes = {tool["name"]: tool["mode"] for tool in list_tools()}
+
+        self.assertEqual(set(modes.values()), {MODE_READ, MODE_WRITE})
+        for name, mode in modes.items():
+            if not name.startswith("edit."):
+                self.assertEqual(mode, MODE_READ, name)
+        self.assertEqual(tool_mode("edit.var.list"), MODE_READ)
+        self.assertEqual(tool_mode("edit.db.status"), MODE_READ)
+        self.assertEqual(tool_mode("edit.db.save"), MODE_WRITE)
+        self.assertEqual(tool_mode("edit.fn.rename"), MODE_WRITE)
+        with self.assertRaisesRegex(KeyError, "unknown tool"):
+            tool_mode("no.such.tool")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,142 @@
+import json
+import os
+import tempfile
+import unittest
+
+from bnk.routing import (
+    POLICY_LEAST_MEMORY,
+    POLICY_STICKY,
+    PlacementCache,
+    PoolServer,
+    Router,
+    ServerLoad,
+    ServerPool,
+    pick_server,
+    rendezvous,
+)
+
+
+def _servers(*names: str) -> tuple:
+    return tuple(
+        PoolServer(name=name, host=f"{name}.lan", port=18812) for name in names
+    )
+
+
+class ServerPoolTests(unittest.TestCase):
+    def test_parses_endpoint_lists_and_json_files(self) -> None:
+        pool = ServerPool.parse("a.lan:1, b.lan:2")
+        self.assertEqual([s.endpoint for s in pool.servers], ["a.lan:1", "b.lan:2"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pool.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(
+                    {
+                        "policy": "sticky",
+                        "servers": [{"name": "big", "host": "10.0.0.6"}, "c.lan:3"],
+                    },
+                    fh,
+                )
+            pool = ServerPool.parse(path)
+
+        self.assertEqual(pool.policy, POLICY_STICKY)
+        self.assertEqual(pool.get("big"), PoolServer("big", "10.0.0.6", 18812))
+        self.assertEqual(pool.get("c.lan:3").port, 3)
+
+    def test_rejects_bad_configs(self) -> None:
+        with self.assertRaisesRegex(ValueError, "no servers"):
+            ServerPool.from_json({"servers": []})
+        with self.assertRaisesRegex(ValueError, "unique"):
+            ServerPool.from_json(["a:1", "a:1"])
+        with self.assertRaisesRegex(ValueError, "placement policy"):
+            ServerPool.from_json({"servers": ["a:1"], "policy": "random"})
+
+
+class PlacementTests(unittest.TestCase):
+    def test_least_loaded_and_least_memory(self) -> None:
+        a, b = _servers("a", "b")
+        loads = [
+            ServerLoad(server=a, requests=3, memory=1),
+            ServerLoad(server=b, requests=1, memory=9),
+        ]
+
+        self.assertEqual(pick_server(loads, "least-loaded", key="x"), b)
+        self.assertEqual(pick_server(loads, POLICY_LEAST_MEMORY, key="x"), a)
+        with self.assertRaisesRegex(RuntimeError, "reachable"):
+            pick_server([], "least-loaded", key="x")
+
+    def test_rendezvous_only_moves_keys_of_a_lost_server(self) -> None:
+        servers = _servers("a", "b", "c")
+        keys = [f"sha{i}" for i in range(200)]
+        before = {key: rendezvous(servers, key) for key in keys}
+        after = {key: rendezvous(servers[:2], key) for key in keys}
+
+        moved = [key for key in keys if before[key] != after[key]]
+        self.assertTrue(moved)
+        self.assertTrue(all(before[key].name == "c" for key in moved))
+
+
+class RouterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = PlacementCache(os.path.join(self._tmp.name, "placements.json"))
+        self.servers = _servers("a", "b")
+        self.probed: list = []
+        self.loads = {
+            "a": ServerLoad(server=self.servers[0], sessions=("old",), requests=5),
+            "b": ServerLoad(server=self.servers[1], requests=0),
+        }
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _probe(self, server: PoolServer) -> ServerLoad:
+        self.probed.append(server.name)
+        load = self.loads.get(server.name)
+        if load is None:
+            raise OSError("connection refused")
+        return load
+
+    def _router(self, policy: str = "least-loaded") -> Router:
+        pool = ServerPool(servers=self.servers, policy=policy)
+        return Router(pool, self.cache, probe=self._probe)
+
+    def test_existing_sessions_are_found_and_new_ones_placed(self) -> None:
+        router = self._router()
+
+        self.assertEqual(router.resolve("old").name, "a")
+        self.assertEqual(router.resolve("new").name, "b")
+        self.assertEqual(self.cache.get("new")["endpoint"], "b.lan:18812")
+
+    def test_cached_placements_skip_probing_until_forgotten(self) -> None:
+        router = self._router()
+        router.resolve("new")
+        self.probed.clear()
+
+        self.assertEqual(router.resolve("new").name, "b")
+        self.assertEqual(self.probed, [])
+
+        self.assertTrue(router.forget("new"))
+        router.resolve("new")
+        self.assertEqual(sorted(self.probed), ["a", "b"])
+
+    def test_unreachable_servers_take_no_sessions(self) -> None:
+        del self.loads["b"]
+
+        self.assertEqual(self._router().resolve("new").name, "a")
+
+    def test_sticky_placement_follows_binary_content(self) -> None:
+        path = os.path.join(self._tmp.name, "target.bin")
+        with open(path, "wb") as fh:
+            fh.write(b"\x7fELF" + bytes(64))
+        router = self._router(POLICY_STICKY)
+
+        first = router.resolve("one", binary_path=path)
+        second = router.resolve("two", binary_path=path)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.cache.get("one")["binary"]), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import threading
+import time
+import unittest
+
+from server.plugin.cancel import CancelToken, RequestCancelled
+from server.plugin.scheduler import RequestScheduler, SchedulerFull
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class SchedulerTests(unittest.TestCase):
+    def test_interactive_requests_run_before_queued_batch(self) -> None:
+        sched = RequestScheduler(max_concurrency=1, max_queue_depth=8)
+        order: list[str] = []
+        release = threading.Event()
+
+        def run(name: str, priority: str) -> None:
+            with sched.admit("demo", name, priority=priority):
+                order.append(name)
+                if name == "first":
+                    release.wait(2.0)
+
+        threads = [threading.Thread(target=run, args=("first", "batch"))]
+        threads[0].start()
+        self.assertTrue(_wait_for(lambda: order == ["first"]))
+        for name, priority in (("batch", "batch"), ("interactive", "interactive")):
+            thread = threading.Thread(target=run, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            self.assertTrue(
+                _wait_for(lambda: any(q["name"] == name for q in sched.queued()))
+            )
+
+        queued = {item["name"]: item["position"] for item in sched.queued("demo")}
+        self.assertEqual(queued, {"batch": 2, "interactive": 1})
+
+        release.set()
+        for thread in threads:
+            thread.join(2.0)
+        self.assertEqual(order, ["first", "interactive", "batch"])
+
+    def test_full_queue_rejects_immediately(self) -> None:
+        sched = RequestScheduler(max_concurrency=4, max_queue_depth=0)
+
+        with sched.admit("demo", "running"):
+            with self.assertRaisesRegex(SchedulerFull, "queue is full"):
+                with sched.admit("demo", "rejected"):
+                    pass
+            with sched.admit("other", "independent"):
+                pass
+
+        self.assertEqual(sched.snapshot()["running"], 0)
+
+    def test_cancelled_waiter_leaves_the_queue(self) -> None:
+        sched = RequestScheduler(max_concurrency=1, max_queue_depth=8)
+        token = CancelToken()
+        errors: list[BaseException] = []
+
+        def wait() -> None:
+            try:
+                with sched.admit("demo", "queued", cancel=token):
+                    pass
+            except RequestCancelled as exc:
+                errors.append(exc)
+
+        with sched.admit("demo", "running"):
+            thread = threading.Thread(target=wait)
+            thread.start()
+            self.assertTrue(_wait_for(lambda: len(sched.queued()) == 1))
+
+            cancelled = sched.cancel_queued("demo")
+            thread.join(2.0)
+
+            self.assertEqual(cancelled["name"], "queued")
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(sched.queued(), [])
+
+    def test_shared_requests_run_together_but_not_with_exclusive(self) -> None:
+        sched = RequestScheduler(max_concurrency=4, max_queue_depth=8)
+        started: list[str] = []
+
+        with sched.admit("demo", "read-1", shared=True):
+            with sched.admit("demo", "read-2", shared=True):
+                self.assertEqual(sched.snapshot("demo")["running"], 2)
+
+                def write() -> None:
+                    with sched.admit("demo", "write"):
+                        started.append("write")
+
+                thread = threading.Thread(target=write)
+                thread.start()
+                self.assertTrue(_wait_for(lambda: len(sched.queued()) == 1))
+                self.assertEqual(started, [])
+        thread.join(2.0)
+        self.assertEqual(started, ["write"])
+
+    def test_reads_queue_behind_a_waiting_exclusive_request(self) -> None:
+        sched = RequestScheduler(max_concurrency=4, max_queue_depth=8)
+        order: list[str] = []
+
+        def run(name: str, shared: bool) -> None:
+            with sched.admit("demo", name, shared=shared):
+                order.append(name)
+
+        threads = []
+        with sched.admit("demo", "read-1", shared=True):
+            for name, shared in (("write", False), ("read-2", True)):
+                thread = threading.Thread(target=run, args=(name, shared))
+                thread.start()
+                threads.append(thread)
+                self.assertTrue(
+                    _wait_for(lambda: any(q["name"] == name for q in sched.queued()))
+                )
+            self.assertEqual(order, [])
+        for thread in threads:
+            thread.join(2.0)
+        self.assertEqual(order, ["write", "read-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
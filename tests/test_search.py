@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.search import make_multi_matcher
+from tests.fakebn import SyntheticView, installed
+
+
+class MultiMatcherTests(unittest.TestCase):
+    def test_automaton_agrees_with_substring_checks(self) -> None:
+        rng = random.Random(7)
+        needles = ["he", "she", "his", "hers", "a", "aab", "ab", "b", "bab"]
+        matcher = make_multi_matcher(needles, case_insensitive=False)
+
+        for _ in range(300):
+            text = "".join(rng.choice("abehirs") for _ in range(rng.randint(0, 12)))
+            expected = {i for i, needle in enumerate(needles) if needle in text}
+            self.assertEqual(matcher(text), expected, text)
+
+    def test_case_folding_and_regex_mode(self) -> None:
+        folded = make_multi_matcher(["Parse", "TABLE"])
+        self.assertEqual(folded("parse_table_3"), {0, 1})
+
+        rx = make_multi_matcher([r"^parse_", r"_\d$", r"(a)\1"], regex=True)
+        self.assertEqual(rx("parse_table_3"), {0, 1})
+        self.assertEqual(rx("aa"), {2})
+        with self.assertRaisesRegex(ValueError, "invalid regex pattern"):
+            make_multi_matcher(["("], regex=True)
+
+
+class SearchManyTests(unittest.TestCase):
+    def test_matches_the_single_pattern_tools_grouped_by_pattern(self) -> None:
+        with installed():
+            view = SyntheticView(functions=300)
+            groups = call_tool(
+                "search.many",
+                bv=view,
+                patterns=["parse_table", "password", "nothing-here"],
+                kinds="functions,strings",
+            )
+            functions = call_tool("functions.like", bv=view, pattern="parse_table")
+            strings = call_tool("strings.like", bv=view, pattern="password")
+            capped = call_tool(
+                "search.many", bv=view, patterns="parse_\nread_", limit=2
+            )
+
+        by_pattern = {group["pattern"]: group for group in groups}
+        self.assertEqual(
+            [m["name"] for m in by_pattern["parse_table"]["matches"]],
+            [f["name"] for f in functions],
+        )
+        self.assertEqual(
+            [m["value"] for m in by_pattern["password"]["matches"]],
+            [s["value"] for s in strings],
+        )
+        self.assertEqual(by_pattern["nothing-here"]["count"], 0)
+        self.assertEqual([group["count"] for group in capped], [2, 2])
+
+    def test_rejects_unknown_kinds(self) -> None:
+        with installed():
+            view = SyntheticView(functions=10)
+            with self.assertRaisesRegex(ValueError, "kinds"):
+                call_tool("search.many", bv=view, patterns=["a"], kinds="bogus")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from bnk.serverlib import make_tool_list_code
+from server.plugin.serverlib import SERVERLIB, ServerlibLoader
+from tests.fakebn import SyntheticView, installed
+
+PACKAGE = "fake_serverlib"
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+class ServerlibLoaderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        os.makedirs(os.path.join(self.root, PACKAGE))
+        open(os.path.join(self.root, PACKAGE, "__init__.py"), "w").close()
+        self._write_registry("read")
+
+    def tearDown(self) -> None:
+        for key in [k for k in sys.modules if k.split(".")[0] == PACKAGE]:
+            del sys.modules[key]
+        if self.root in sys.path:
+            sys.path.remove(self.root)
+        self._tmp.cleanup()
+
+    def _write_registry(self, mode: str) -> None:
+        path = os.path.join(self.root, PACKAGE, "registry.py")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(f"def tool_mode(name):\n    return {mode!r}\n")
+            fh.write("released = []\n")
+            fh.write("def forget_view(bv):\n    released.append(bv)\n")
+            fh.write("def forget_all_views():\n    released.append('all')\n")
+        # make the edit visible even on filesystems with coarse mtimes
+        stamp = time.time() + (1 if mode == "write" else 0)
+        os.utime(path, (stamp, stamp))
+
+    def test_registry_is_reused_until_a_source_file_changes(self) -> None:
+        loader = ServerlibLoader(package=PACKAGE)
+
+        first = loader.registry(self.root)
+        self.assertIs(loader.registry(self.root), first)
+        self.assertEqual(first.tool_mode("x"), "read")
+
+        self._write_registry("write")
+        second = loader.registry(self.root)
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second.tool_mode("x"), "write")
+
+    def test_views_are_released_through_the_loaded_registry(self) -> None:
+        loader = ServerlibLoader(package=PACKAGE)
+        first = loader.registry(self.root)
+        # an exec-path import drops the loaded modules from sys.modules
+        for key in [k for k in sys.modules if k.split(".")[0] == PACKAGE]:
+            del sys.modules[key]
+
+        loader.release_view("view")
+        loader.release_view(None)
+        self._write_registry("write")
+        second = loader.registry(self.root)
+
+        self.assertEqual(first.released, ["view", "all"])
+        self.assertEqual(second.released, [])
+
+    def test_missing_package_is_rejected(self) -> None:
+        loader = ServerlibLoader(package=PACKAGE)
+
+        with self.assertRaisesRegex(ValueError, "no fake_serverlib package"):
+            loader.registry(os.path.join(self.root, "elsewhere"))
+
+
+class _WatchedView(SyntheticView):
+    """SyntheticView that records its notification observers."""
+
+    def __init__(self) -> None:
+        super().__init__(functions=50)
+        self.watchers: list = []
+
+    def register_notification(self, watcher: object) -> None:
+        self.watchers.append(watcher)
+
+    def unregister_notification(self, watcher: object) -> None:
+        self.watchers.remove(watcher)
+
+
+class ReleaseViewTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._modules = {
+            key: mod
+            for key, mod in sys.modules.items()
+            if key.split(".")[0] == "bnk_serverlib"
+        }
+
+    def tearDown(self) -> None:
+        for key in [k for k in sys.modules if k.split(".")[0] == "bnk_serverlib"]:
+            del sys.modules[key]
+        sys.modules.update(self._modules)
+
+    def test_closing_a_session_after_tool_list_releases_its_view(self) -> None:
+        with installed():
+            from server.plugin.sessions import Session
+
+            registry = SERVERLIB.registry(REPO_ROOT)
+            view_cache = sys.modules["bnk_serverlib.tools.view_cache"]
+            view = _WatchedView()
+            sess = Session(name="demo")
+            sess.set_bv(view)
+            registry.call_tool("addr.info", bv=view, addr=view.rodata)
+            built = view_cache.peek(view, view_cache.TOPIC_LAYOUT, "sections")
+            # `tool list` from this client, then the exec bootstrap older ones send
+            listed = SERVERLIB.registry(REPO_ROOT).list_tools()
+            exec(make_tool_list_code(Path(REPO_ROOT)), {})
+            same_modules = sys.modules["bnk_serverlib.tools.view_cache"] is view_cache
+            registry.call_tool("addr.info", bv=view, addr=view.rodata)
+            watching = len(view.watchers)
+            sess.detach_bv()
+
+        self.assertIsNotNone(built)
+        self.assertTrue(listed)
+        self.assertTrue(same_modules)
+        self.assertEqual(watching, 1)
+        self.assertIsNone(view_cache.peek(view, view_cache.TOPIC_LAYOUT, "sections"))
+        self.assertEqual(view.watchers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+from server.plugin.session_state import SessionRecord, SessionStateStore
+
+
+class SessionStateStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "state", "sessions.json")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_records_survive_a_restart(self) -> None:
+        store = SessionStateStore(self.path)
+        store.put(
+            SessionRecord(
+                name="demo",
+                target="/bin/ls",
+                options={"analysis.mode": "basic"},
+                update_analysis=False,
+            )
+        )
+
+        restored = SessionStateStore().configure(self.path)
+
+        self.assertEqual(len(restored), 1)
+        self.assertEqual(restored[0].name, "demo")
+        self.assertEqual(restored[0].options, {"analysis.mode": "basic"})
+        self.assertFalse(restored[0].update_analysis)
+        self.assertGreater(restored[0].saved_at, 0.0)
+
+    def test_unchanged_records_are_not_rewritten(self) -> None:
+        store = SessionStateStore(self.path)
+        record = SessionRecord(name="demo", target="/bin/ls")
+
+        self.assertTrue(store.put(record))
+        self.assertFalse(store.put(record))
+        self.assertTrue(store.remove("demo"))
+        self.assertEqual(SessionStateStore(self.path).records(), [])
+
+    def test_store_without_a_path_keeps_records_in_memory(self) -> None:
+        store = SessionStateStore()
+
+        self.assertTrue(store.put(SessionRecord(name="demo", target="/bin/ls")))
+        self.assertEqual(store.get("demo").target, "/bin/ls")
+        self.assertEqual(store.configure(""), [])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_saved_database_is_preferred_when_present(self) -> None:
+        bndb = os.path.join(self._tmp.name, "ls.bndb")
+        record = SessionRecord(name="demo", target="/bin/ls", bndb=bndb)
+
+        self.assertEqual(record.open_path, "/bin/ls")
+        with open(bndb, "wb"):
+            pass
+        self.assertEqual(record.open_path, bndb)
+
+    def test_corrupt_or_foreign_state_files_are_ignored(self) -> None:
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as fh:
+            json.dump({"version": 99, "sessions": [{"name": "x", "target": "y"}]}, fh)
+
+        self.assertEqual(SessionStateStore().configure(self.path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from server.plugin.stats import LatencyHistogram, PhaseTimer, RequestStats, stats_label
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_quantiles_are_within_bucket_error(self) -> None:
+        hist = LatencyHistogram()
+        for ms in range(1, 101):
+            hist.record(ms / 1000.0)
+
+        snap = hist.snapshot()
+
+        self.assertEqual(snap["count"], 100)
+        self.assertAlmostEqual(snap["mean_ms"], 50.5, places=6)
+        for key, expected in (("p50_ms", 50.0), ("p95_ms", 95.0), ("p99_ms", 99.0)):
+            self.assertGreaterEqual(snap[key], expected)
+            self.assertLessEqual(snap[key], expected * 1.2)
+        self.assertAlmostEqual(snap["max_ms"], 100.0, places=6)
+
+    def test_empty_histogram_reports_zeroes(self) -> None:
+        self.assertEqual(LatencyHistogram().quantile(0.99), 0.0)
+
+
+class RequestStatsTests(unittest.TestCase):
+    def test_rows_per_label_and_phase_with_reset(self) -> None:
+        stats = RequestStats()
+        timer = PhaseTimer()
+        timer.add("exec", 0.02)
+        timer.add("total", 0.03)
+        timer.add("lock", 0.001)
+        stats.record("tool:strings.like", timer.phases)
+        stats.record("run_code", {"total": 0.5})
+
+        snap = stats.snapshot(reset=True)
+
+        rows = [(row["name"], row["phase"]) for row in snap["stats"]]
+        self.assertEqual(
+            rows,
+            [
+                ("run_code", "total"),
+                ("tool:strings.like", "total"),
+                ("tool:strings.like", "lock"),
+                ("tool:strings.like", "exec"),
+            ],
+        )
+        self.assertEqual(stats.snapshot()["stats"], [])
+
+    def test_payload_sizes_are_totalled_per_label(self) -> None:
+        stats = RequestStats()
+        for raw, wire in ((1000, 250), (3000, 750)):
+            timer = PhaseTimer()
+            timer.add_bytes("response", raw, wire)
+            timer.add_bytes("request", 10, 10)
+            stats.record("tool:il.hlil", timer.phases, timer.sizes)
+        stats.record("ping", {"total": 0.001})
+
+        rows = stats.snapshot()["bytes"]
+
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row["name"], "tool:il.hlil")
+        self.assertEqual(row["response_raw_total"], 4000)
+        self.assertEqual(row["response_wire_total"], 1000)
+        self.assertEqual(row["response_raw_max"], 3000)
+        self.assertAlmostEqual(row["response_ratio"], 0.25)
+        self.assertAlmostEqual(row["request_ratio"], 1.0)
+
+    def test_session_names_aggregate_by_operation(self) -> None:
+        self.assertEqual(stats_label("session.demo.run_code", "demo"), "run_code")
+        self.assertEqual(stats_label("root.eval"), "root.eval")
+
+
+if __name__ == "__main__":
+    unittest.main()
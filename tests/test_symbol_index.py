@@ -0,0 +1,171 @@
+import fnmatch
+import unittest
+from types import SimpleNamespace
+
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.symbols import NameIndex
+from bnk_serverlib.tools.view_cache import (
+    TOPIC_FUNCTIONS,
+    TOPIC_SYMBOLS,
+    TOPIC_TAGS,
+    cached,
+    forget,
+    invalidate,
+    muted,
+    peek,
+)
+from tests.fakebn import SyntheticView, installed
+
+NAMES = [
+    "sub_401000",
+    "Sub_40",
+    "sub_5",
+    "Java_foo",
+    "java_bar",
+    "_ZN7android3Foo",
+    "main",
+]
+
+
+class _View:
+    """Weak-referenceable stand-in for a BinaryView."""
+
+
+class _WatchedView:
+    """Stand-in that keeps the observers registered on it."""
+
+    def __init__(self) -> None:
+        self.watchers: list = []
+
+    def register_notification(self, watcher: object) -> None:
+        self.watchers.append(watcher)
+
+    def unregister_notification(self, watcher: object) -> None:
+        self.watchers.remove(watcher)
+
+
+def _index() -> NameIndex:
+    return NameIndex.build(
+        SimpleNamespace(name=name, address=i) for i, name in enumerate(NAMES)
+    )
+
+
+class NameIndexTests(unittest.TestCase):
+    def test_prefix_lookups_respect_case_folding(self) -> None:
+        index = _index()
+
+        def names(prefix: str, ci: bool) -> list:
+            return [name for name, _a in index.prefix(prefix, case_insensitive=ci)]
+
+        self.assertEqual(names("sub_4", False), ["sub_401000"])
+        self.assertEqual(sorted(names("SUB_4", True)), ["Sub_40", "sub_401000"])
+        self.assertEqual(names("Java_", False), ["Java_foo"])
+        self.assertEqual(names("zzz", True), [])
+        self.assertEqual(len(names("", False)), len(NAMES))
+
+    def test_rows_are_names_and_addresses(self) -> None:
+        rows = list(_index().prefix("main", case_insensitive=False))
+
+        self.assertEqual(rows, [("main", NAMES.index("main"))])
+
+    def test_glob_matches_like_fnmatch(self) -> None:
+        index = _index()
+        for pattern in ("sub_*", "*_foo", "_ZN7android*Foo", "sub_?", "[Jj]ava_*"):
+            got = sorted(n for n, _a in index.glob(pattern, case_insensitive=False))
+            expected = sorted(n for n in NAMES if fnmatch.fnmatchcase(n, pattern))
+            self.assertEqual(got, expected, pattern)
+
+
+class ViewCacheTests(unittest.TestCase):
+    def test_entries_are_reused_until_invalidated(self) -> None:
+        view = _View()
+        builds: list = []
+
+        def build() -> int:
+            builds.append(1)
+            return len(builds)
+
+        self.assertEqual(cached(view, "t", "a", build), 1)
+        self.assertEqual(cached(view, "t", "a", build), 1)
+        invalidate(view, "other")
+        self.assertEqual(cached(view, "t", "a", build), 1)
+        invalidate(view, "t")
+        self.assertEqual(cached(view, "t", "a", build), 2)
+
+    def test_change_during_build_is_not_cached(self) -> None:
+        view = _View()
+
+        def racing_build() -> str:
+            invalidate(view, "t")
+            return "stale"
+
+        self.assertEqual(cached(view, "t", "a", racing_build), "stale")
+        self.assertEqual(cached(view, "t", "a", lambda: "fresh"), "fresh")
+
+
+class WatcherTests(unittest.TestCase):
+    def test_watcher_asks_only_for_the_notifications_of_built_topics(self) -> None:
+        with installed() as bn:
+            flags = bn.enums.NotificationType
+            view = _WatchedView()
+            cached(view, TOPIC_SYMBOLS, "a", lambda: 1)
+            first = [w.notifications for w in view.watchers]
+            cached(view, TOPIC_FUNCTIONS, "a", lambda: 2)
+            second = [w.notifications for w in view.watchers]
+            forget(view)
+
+        self.assertEqual(len(first), 1)
+        self.assertIn(flags.SymbolAdded, first[0])
+        self.assertNotIn(flags.FunctionUpdated, first[0])
+        self.assertEqual(len(second), 1)
+        self.assertIn(flags.FunctionUpdated, second[0])
+        self.assertEqual(view.watchers, [])
+
+    def test_notifications_only_mark_topics_and_readers_drop_them(self) -> None:
+        with installed():
+            view = _WatchedView()
+            cached(view, TOPIC_SYMBOLS, "a", lambda: "old")
+            cached(view, TOPIC_TAGS, "a", lambda: "tags")
+            watcher = view.watchers[0]
+            watcher.symbol_added(view, None)
+            with muted(TOPIC_TAGS):
+                watcher.tag_added(view, None)
+            rebuilt = cached(view, TOPIC_SYMBOLS, "a", lambda: "new")
+            kept = peek(view, TOPIC_TAGS, "a")
+            forget(view)
+
+        self.assertEqual(rebuilt, "new")
+        self.assertEqual(kept, "tags")
+
+
+class SymbolsLikeIndexTests(unittest.TestCase):
+    def test_prefix_and_glob_agree_with_substring_and_follow_edits(self) -> None:
+        with installed():
+            view = SyntheticView(functions=500)
+            scan = call_tool("symbols.like", bv=view, pattern="parse_table")
+            prefix = call_tool(
+                "symbols.like", bv=view, pattern="PARSE_TABLE", match="prefix"
+            )
+            glob = call_tool("symbols.like", bv=view, pattern="parse_t*", match="glob")
+            target = prefix[0]
+            call_tool(
+                "edit.fn.rename",
+                bv=view,
+                name_or_addr=hex(target["address"]),
+                new_name="zz_renamed",
+            )
+            after = call_tool("symbols.like", bv=view, pattern="zz_", match="prefix")
+            with self.assertRaisesRegex(ValueError, "regex"):
+                call_tool(
+                    "symbols.like", bv=view, pattern="x", match="glob", regex=True
+                )
+
+        self.assertEqual(
+            sorted(r["name"] for r in prefix), sorted(r["name"] for r in scan)
+        )
+        self.assertEqual([r["name"] for r in glob], [r["name"] for r in prefix])
+        self.assertEqual([r["name"] for r in after], ["zz_renamed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
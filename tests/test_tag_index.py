@@ -0,0 +1,103 @@
+import unittest
+
+from bnk_serverlib.registry import call_tool
+from bnk_serverlib.tools.tag_index import tag_index
+from bnk_serverlib.tools.view_cache import TOPIC_TAGS, peek
+from tests.fakebn import SyntheticView, installed
+
+
+class TagIndexTests(unittest.TestCase):
+    def test_range_matches_a_full_scan(self) -> None:
+        with installed():
+            view = SyntheticView(functions=400)
+            lo = view.TEXT + 50 * view.FUNC_SIZE
+            hi = view.TEXT + 150 * view.FUNC_SIZE
+            everything = call_tool("tags.list", bv=view)
+            ranged = call_tool("tags.range", bv=view, start=hex(lo), end=hex(hi))
+            typed = call_tool("tags.range", bv=view, start=lo, end=hi, tag_type="BUGS")
+
+        expected = sorted(
+            (t for t in everything if lo <= t["address"] < hi),
+            key=lambda t: t["address"],
+        )
+        self.assertTrue(expected)
+        self.assertEqual(ranged, expected)
+        self.assertEqual(
+            typed, [t for t in expected if t["tag_type"].lower() == "bugs"]
+        )
+
+    def test_list_keeps_bn_order_and_the_auto_split(self) -> None:
+        with installed():
+            view = SyntheticView(functions=200)
+            user_tags = view.get_tags(auto=False)
+            auto_tags = view.get_tags(auto=True)
+            # BN can report one tag in both lists; tags.list shows it once
+            view.get_tags = lambda auto=None: (
+                auto_tags if auto else user_tags + auto_tags[:1]
+            )
+            listed = call_tool("tags.list", bv=view, fields=["address", "tag_id"])
+            autos = call_tool("tags.list", bv=view, auto=True, fields=["tag_id"])
+            typed = call_tool("tags.list", bv=view, tag_type="bugs")
+            index = tag_index(view)
+
+        self.assertEqual(
+            [(t["address"], t["tag_id"]) for t in listed],
+            [(addr, tag.id) for addr, tag in user_tags + auto_tags],
+        )
+        self.assertEqual(
+            [t["tag_id"] for t in autos], [tag.id for _a, tag in auto_tags]
+        )
+        self.assertEqual(
+            [t["tag_data"] for t in typed],
+            [tag.data for _a, tag in user_tags + auto_tags if tag.type.name == "Bugs"],
+        )
+        self.assertTrue(typed)
+        for entry in index.entries():
+            self.assertTrue(all(isinstance(v, (int, str)) for v in entry))
+
+    def test_rollup_counts_tags_inside_each_function(self) -> None:
+        with installed():
+            view = SyntheticView(functions=200)
+            rollup = call_tool("tags.rollup", bv=view)
+            everything = call_tool("tags.list", bv=view)
+            one = call_tool("tags.rollup", bv=view, name_or_addr=rollup[0]["address"])
+
+        self.assertEqual(sum(row["count"] for row in rollup), len(everything))
+        self.assertEqual(one, rollup[:1])
+        self.assertEqual(sum(rollup[0]["by_type"].values()), rollup[0]["count"])
+
+    def test_edit_tools_update_the_index_in_place(self) -> None:
+        with installed():
+            view = SyntheticView(functions=100)
+            index = tag_index(view)
+            before = len(index)
+            addr = view.TEXT + 3
+            call_tool(
+                "edit.tag.data.add", bv=view, addr=addr, tag_type="Bugs", data="x"
+            )
+            added = call_tool("tags.range", bv=view, start=addr, end=addr + 1)
+            call_tool("edit.tag.data.remove-type", bv=view, addr=addr, tag_type="Bugs")
+            removed = call_tool("tags.range", bv=view, start=addr, end=addr + 1)
+            same_index = peek(view, TOPIC_TAGS, "address") is index
+            call_tool(
+                "edit.fn.rename", bv=view, name_or_addr=view.TEXT, new_name="other"
+            )
+            dropped = peek(view, TOPIC_TAGS, "address") is None
+
+        self.assertEqual([t["tag_data"] for t in added], ["x"])
+        self.assertEqual(removed, [])
+        self.assertTrue(same_index)
+        self.assertEqual(len(index), before)
+        self.assertTrue(dropped)
+
+    def test_range_arguments_are_validated(self) -> None:
+        with installed():
+            view = SyntheticView(functions=10)
+            with self.assertRaisesRegex(ValueError, "end must be"):
+                call_tool("tags.range", bv=view, start=10, end=5)
+            with self.assertRaisesRegex(ValueError, "int-like"):
+                call_tool("tags.range", bv=view, start="x", end=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from bnk.client import KnifeClient
+from bnk.wire import WireCodec
+from server.plugin.uploads import UploadStore
+from server.plugin.wire import decode
+
+
+def _client_for(store: UploadStore) -> KnifeClient:
+    client = KnifeClient.__new__(KnifeClient)
+    client.root = SimpleNamespace(
+        upload_has=lambda sha256, name: {"path": store.has(sha256, name) or ""},
+        upload_begin=store.begin,
+        upload_chunk=store.chunk,
+        upload_finish=lambda upload_id: {"path": store.finish(upload_id)},
+        upload_abort=store.abort,
+    )
+    return client
+
+
+class UploadStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = UploadStore(os.path.join(self._tmp.name, "store"))
+        self.data = os.urandom(10_000)
+        self.sha = hashlib.sha256(self.data).hexdigest()
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _local(self, name: str) -> str:
+        path = os.path.join(self._tmp.name, name)
+        with open(path, "wb") as fh:
+            fh.write(self.data)
+        return path
+
+    def test_chunks_are_verified_and_stored_by_hash(self) -> None:
+        upload_id = self.store.begin(self.sha, len(self.data), "a.out")["upload_id"]
+        self.store.chunk(upload_id, 0, self.data[:4000])
+
+        with self.assertRaisesRegex(ValueError, "expected offset 4000"):
+            self.store.chunk(upload_id, 0, self.data[:4000])
+        self.store.chunk(upload_id, 4000, self.data[4000:])
+        path = self.store.finish(upload_id)
+
+        self.assertEqual(os.path.basename(path), "a.out")
+        self.assertIn(self.sha, path)
+        self.assertEqual(self.store.has(self.sha, "a.out"), path)
+
+    def test_blobs_are_read_only_and_has_only_looks(self) -> None:
+        upload_id = self.store.begin(self.sha, len(self.data), "a.out")["upload_id"]
+        self.store.chunk(upload_id, 0, self.data)
+        path = self.store.finish(upload_id)
+        alias = os.path.join(os.path.dirname(path), "b.bndb")
+
+        self.assertFalse(os.stat(path).st_mode & 0o222)
+        self.assertIsNone(self.store.has(self.sha, "b.bndb"))
+        self.assertFalse(os.path.exists(alias))
+        self.assertEqual(
+            self.store.begin(self.sha, len(self.data), "b.bndb"),
+            {"exists": True, "path": alias},
+        )
+
+    def test_checkout_gives_each_load_a_private_copy(self) -> None:
+        client = _client_for(self.store)
+        blob = client.upload_file(self._local("a.bndb"))["path"]
+        outside = self._local("plain.bin")
+
+        first = self.store.checkout(blob, "s1")
+        second = self.store.checkout(blob, "s2")
+        with open(first, "ab") as fh:
+            fh.write(b"saved")
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.endswith("a.bndb"))
+        self.assertEqual(self.store.checkout(outside, "s1"), outside)
+        with open(blob, "rb") as fh:
+            self.assertEqual(hashlib.sha256(fh.read()).hexdigest(), self.sha)
+        self.assertEqual(self.store.prune_work({first}, grace_s=0.0), 1)
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+
+    def test_corrupt_uploads_are_rejected(self) -> None:
+        upload_id = self.store.begin(self.sha, len(self.data), "a.out")["upload_id"]
+        self.store.chunk(upload_id, 0, b"x" * len(self.data))
+
+        with self.assertRaisesRegex(ValueError, "sha256 mismatch"):
+            self.store.finish(upload_id)
+        self.assertIsNone(self.store.has(self.sha))
+
+    def test_client_upload_skips_known_content(self) -> None:
+        client = _client_for(self.store)
+
+        first = client.upload_file(self._local("a.out"), chunk_size=3000)
+        again = client.upload_file(self._local("a.out"))
+        renamed = client.upload_file(self._local("b.bndb"))
+
+        self.assertTrue(first["uploaded"])
+        self.assertFalse(again["uploaded"])
+        self.assertEqual(again["path"], first["path"])
+        self.assertFalse(renamed["uploaded"])
+        self.assertTrue(renamed["path"].endswith("b.bndb"))
+        with open(renamed["path"], "rb") as fh:
+            self.assertEqual(fh.read(), self.data)
+
+    def test_compressed_chunks_are_unpacked_before_storing(self) -> None:
+        self.data = b"\x90" * 50_000
+        self.sha = hashlib.sha256(self.data).hexdigest()
+        sent: list[int] = []
+
+        def chunk(upload_id, offset, data, encoded=False):
+            sent.append(len(data))
+            if encoded:
+                data = decode(data)
+            return self.store.chunk(upload_id, offset, data)
+
+        client = _client_for(self.store)
+        client.root.upload_chunk = chunk
+        client._wire = WireCodec(name="zlib", min_bytes=1024)
+
+        out = client.upload_file(self._local("sled.bin"), chunk_size=20_000)
+
+        self.assertTrue(out["uploaded"])
+        self.assertLess(sum(sent), len(self.data) // 10)
+        with open(out["path"], "rb") as fh:
+            self.assertEqual(fh.read(), self.data)
+
+    def test_names_cannot_escape_the_store(self) -> None:
+        result = self.store.begin(self.sha, len(self.data), "../../etc/passwd")
+        self.store.chunk(result["upload_id"], 0, self.data)
+
+        path = self.store.finish(result["upload_id"])
+
+        self.assertTrue(path.startswith(os.path.join(self._tmp.name, "store")))
+        self.assertEqual(os.path.basename(path), "passwd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import pickle
+import unittest
+
+from bnk import wire as client_wire
+from server.plugin import wire as server_wire
+from server.plugin.wire import WireCodec, codec_for, decode, negotiate
+
+
+class WireCodecTests(unittest.TestCase):
+    def test_large_payloads_round_trip_through_each_codec(self) -> None:
+        lines = [
+            f"{0x401000 + 4 * i:#x}  mov eax, dword [ebp-0x{i % 64:x}]"
+            for i in range(20_000)
+        ]
+        raw = pickle.dumps({"result": lines})
+        for name in ("zlib", "lzma"):
+            packed = WireCodec(name=name).encode(raw)
+
+            self.assertLess(len(packed), len(raw) // 4, name)
+            self.assertEqual(decode(packed), raw)
+
+    def test_small_and_incompressible_payloads_stay_raw(self) -> None:
+        codec = WireCodec(name="zlib", min_bytes=1024)
+        small = pickle.dumps("x" * 100)
+        noise = os.urandom(4096)
+
+        self.assertIs(codec.encode(small), small)
+        self.assertIs(codec.encode(noise), noise)
+        self.assertIs(WireCodec().encode(noise), noise)
+        self.assertEqual(decode(small), small)
+
+    def test_negotiation_picks_the_first_supported_codec(self) -> None:
+        self.assertEqual(negotiate(["brotli", "lzma", "zlib"]), "lzma")
+        self.assertEqual(negotiate(["brotli"]), "")
+        self.assertEqual(codec_for(["zlib"], 0).min_bytes, 0)
+
+    def test_unknown_envelopes_are_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "unknown payload encoding"):
+            decode(b"\x00bnkz:zstd:abc")
+
+    def test_client_and_server_agree_on_the_envelope(self) -> None:
+        raw = b"bnk " * 50_000
+        to_server = client_wire.WireCodec(name="zlib").encode(raw)
+        to_client = server_wire.WireCodec(name="lzma").encode(raw)
+
+        self.assertEqual(server_wire.decode(to_server), raw)
+        self.assertEqual(client_wire.decode(to_client), raw)
+
+
+if __name__ == "__main__":
+    unittest.main()